@@ -0,0 +1,345 @@
+# analytics/parquet_export.py
+"""Oyuncu koleksiyonunun Parquet'e akış halinde aktarımı (pyarrow)
+
+Mongo cursor'ından parça parça okunan dokümanlar üç tabloya yazılır:
+
+    players          skaler alanlar + düzleştirilmiş istatistikler
+                     season__<stat>, scouting__<stat>__per90/__percentile
+                     (float64), league_stats__<alan> (int64)
+    transfers        fbrefId, seq + transferHistory girişleri
+    similar_players  fbrefId, rank + similarPlayers girişleri
+
+Dosyalar Hive biçiminde bölümlenir (pandas/pyarrow/Spark bölümleri tanır):
+
+    <dizin>/<tablo>/snapshot_date=YYYY-MM-DD/league=<lig>/part-HHMMSSmmm-NNN.parquet
+
+Her (tablo, lig) bölümü için tek bir ParquetWriter açık kalır ve her parça
+bir row group olarak eklenir; bellekte sadece bir parça tutulur. Sonradan
+yeni bir stat ismi gelirse o bölüm için daha geniş şemalı yeni bir part
+dosyası açılır (read_table şemaları birleştirir).
+
+Artımlı modda sadece modifiedAt'i son aktarımdaki en yeni modifiedAt'ten
+(_state.json) büyük olan dokümanlar yazılır; modifiedAt kısmi alan
+güncellemelerinde de (update_player_fields, bulk_update_fields) ilerlediği
+için bunlar da aktarımlara girer. Her aktarım _snapshots.jsonl
+dosyasına bir satır ekler.
+"""
+import json
+import logging
+import os
+from datetime import datetime
+from config.settings import Settings
+
+PLAYERS = 'players'
+TRANSFERS = 'transfers'
+SIMILAR_PLAYERS = 'similar_players'
+TABLES = (PLAYERS, TRANSFERS, SIMILAR_PLAYERS)
+
+STATE_FILE = '_state.json'
+SNAPSHOTS_FILE = '_snapshots.jsonl'
+
+# Dokümanda okunan alanlar (projection)
+EXPORT_FIELDS = (
+    'fbrefId', 'firstName', 'lastName', 'fullName', 'age', 'contractEnd', 'preferredFoot', 'team', 'league',
+    'country', 'height', 'weight', 'detailedPosition', 'photo', 'createdAt', 'updatedAt', 'scoutingUpdatedAt',
+    'leagueStats', 'seasonStats', 'scoutingReport', 'transferHistory', 'similarPlayers', 'modifiedAt',
+)
+
+# Sabit sütunlar: isim -> tür (league ve snapshot_date bölüm sütunlarıdır, dosyaya yazılmaz)
+PLAYER_COLUMNS = {
+    'fbrefId': 'string', 'firstName': 'string', 'lastName': 'string', 'fullName': 'string', 'age': 'int64',
+    'contractEnd': 'string', 'preferredFoot': 'string', 'team': 'string', 'country': 'string',
+    'height': 'string', 'weight': 'string', 'detailedPosition': 'string', 'photo': 'string',
+    'createdAt': 'timestamp', 'updatedAt': 'timestamp', 'scoutingUpdatedAt': 'timestamp',
+}
+LEAGUE_STATS_KEYS = ('matches', 'starts', 'minutes', 'goals', 'assists')
+TRANSFER_COLUMNS = {
+    'fbrefId': 'string', 'seq': 'int64', 'season': 'string', 'date': 'string',
+    'fromTeam': 'string', 'toTeam': 'string', 'fee': 'string',
+}
+SIMILAR_COLUMNS = {
+    'fbrefId': 'string', 'rank': 'int64', 'similarFbrefId': 'string', 'name': 'string', 'url': 'string',
+    'similarity': 'float64',
+}
+
+
+def _arrow_type(kind):
+    import pyarrow as pa
+
+    return {
+        'string': pa.string(),
+        'int64': pa.int64(),
+        'float64': pa.float64(),
+        'timestamp': pa.timestamp('us'),
+    }[kind]
+
+
+def _to_int(value):
+    if isinstance(value, bool) or value is None:
+        return None
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return None
+
+
+def _to_float(value):
+    if isinstance(value, bool) or not isinstance(value, (int, float)):
+        return None
+    return float(value)
+
+
+def _to_timestamp(value):
+    if isinstance(value, datetime):
+        return value
+    if isinstance(value, str):
+        try:
+            return datetime.fromisoformat(value)
+        except ValueError:
+            return None
+    return None
+
+
+def _to_string(value):
+    return None if value is None else str(value)
+
+
+CONVERTERS = {'string': _to_string, 'int64': _to_int, 'float64': _to_float, 'timestamp': _to_timestamp}
+
+
+def _partition_value(value):
+    """Dizin adı olarak kullanılabilir bölüm değeri"""
+    return str(value or 'Unknown').replace('/', '_').replace(os.sep, '_')
+
+
+def flatten_player(doc):
+    """Doküman -> (players satırı, transfer satırları, benzer oyuncu satırları)"""
+    row = {name: CONVERTERS[kind](doc.get(name)) for name, kind in PLAYER_COLUMNS.items()}
+
+    league_stats = doc.get('leagueStats') or {}
+    if isinstance(league_stats, dict):
+        for key in LEAGUE_STATS_KEYS:
+            row[f'league_stats__{key}'] = _to_int(league_stats.get(key))
+
+    season = doc.get('seasonStats') or {}
+    if isinstance(season, dict):
+        for name, value in season.items():
+            value = _to_float(value)
+            if value is not None:
+                row[f'season__{name}'] = value
+
+    scouting = doc.get('scoutingReport') or {}
+    if isinstance(scouting, dict):
+        for name, entry in scouting.items():
+            if not isinstance(entry, dict):
+                continue
+            for key in ('per90', 'percentile'):
+                value = _to_float(entry.get(key))
+                if value is not None:
+                    row[f'scouting__{name}__{key}'] = value
+
+    fbref_id = row['fbrefId']
+    transfers = []
+    for seq, transfer in enumerate(doc.get('transferHistory') or []):
+        if isinstance(transfer, dict):
+            transfers.append(dict({name: _to_string(transfer.get(name)) for name in TRANSFER_COLUMNS
+                                   if name not in ('fbrefId', 'seq')}, fbrefId=fbref_id, seq=seq))
+
+    similar = []
+    for rank, entry in enumerate(doc.get('similarPlayers') or [], start=1):
+        if isinstance(entry, dict):
+            similar.append({
+                'fbrefId': fbref_id,
+                'rank': rank,
+                'similarFbrefId': _to_string(entry.get('fbrefId')),
+                'name': _to_string(entry.get('name')),
+                'url': _to_string(entry.get('url')),
+                'similarity': _to_float(entry.get('similarity')),
+            })
+    return row, transfers, similar
+
+
+class _PartitionWriter:
+    """Bir (tablo, lig) bölümüne row group ekleyen açık ParquetWriter"""
+
+    __slots__ = ('path', 'schema', 'names', 'writer', 'rows')
+
+    def __init__(self, path, schema, compression):
+        import pyarrow.parquet as pq
+
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        self.path = path
+        self.schema = schema
+        self.names = set(schema.names)
+        self.writer = pq.ParquetWriter(path, schema, compression=compression)
+        self.rows = 0
+
+    def write(self, rows):
+        import pyarrow as pa
+
+        self.writer.write_table(pa.Table.from_pylist(rows, schema=self.schema))
+        self.rows += len(rows)
+
+    def close(self):
+        self.writer.close()
+
+
+class ParquetExporter:
+    """Dokümanları bölümlenmiş Parquet dosyalarına akış halinde yazar"""
+
+    def __init__(self, path=None, batch_size=None, compression=None, snapshot_date=None):
+        self.path = path or Settings.PARQUET_EXPORT_DIR
+        self.batch_size = batch_size or Settings.PARQUET_BATCH_SIZE
+        self.compression = compression or Settings.PARQUET_COMPRESSION
+        self.started_at = datetime.utcnow()
+        self.snapshot_date = snapshot_date or self.started_at.strftime('%Y-%m-%d')
+        self.stat_columns = {}  # Görülen istatistik sütunları (sıralı) - bölümler aynı şemayı paylaşsın
+        self.writers = {}  # (tablo, lig) -> _PartitionWriter
+        self.parts = {}  # (tablo, lig) -> açılan part sayısı
+        self.files = []
+        self.counts = dict.fromkeys(TABLES, 0)
+
+    # --- Durum ---
+
+    def load_state(self):
+        state_path = os.path.join(self.path, STATE_FILE)
+        if not os.path.exists(state_path):
+            return {}
+        try:
+            with open(state_path, encoding='utf-8') as f:
+                return json.load(f)
+        except Exception as e:
+            logging.warning(f"Parquet aktarım durumu okunamadı ({state_path}): {e}")
+            return {}
+
+    @property
+    def watermark(self):
+        """Son aktarımdaki en yeni modifiedAt (artımlı mod için) - yoksa None"""
+        value = self.load_state().get('watermark')
+        return datetime.fromisoformat(value) if value else None
+
+    def _save_state(self, watermark, mode):
+        os.makedirs(self.path, exist_ok=True)
+        state = self.load_state()
+        if watermark and (not state.get('watermark') or watermark > state['watermark']):
+            state['watermark'] = watermark
+        state['lastSnapshot'] = self.snapshot_date
+        state['lastExportAt'] = datetime.utcnow().isoformat()
+
+        tmp_path = os.path.join(self.path, f"{STATE_FILE}.{os.getpid()}.tmp")
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(state, f, indent=2)
+        os.replace(tmp_path, os.path.join(self.path, STATE_FILE))
+
+        with open(os.path.join(self.path, SNAPSHOTS_FILE), 'a', encoding='utf-8') as f:
+            f.write(json.dumps({
+                'snapshotDate': self.snapshot_date,
+                'mode': mode,
+                'startedAt': self.started_at.isoformat(),
+                'watermark': watermark,
+                'rows': self.counts,
+                'files': [os.path.relpath(path, self.path) for path in self.files],
+            }) + '\n')
+
+    # --- Yazma ---
+
+    def _schema(self, table):
+        import pyarrow as pa
+
+        if table == PLAYERS:
+            fields = [(name, _arrow_type(kind)) for name, kind in PLAYER_COLUMNS.items()]
+            fields += [(f'league_stats__{key}', pa.int64()) for key in LEAGUE_STATS_KEYS]
+            fields += [(name, pa.float64()) for name in self.stat_columns]
+        else:
+            columns = TRANSFER_COLUMNS if table == TRANSFERS else SIMILAR_COLUMNS
+            fields = [(name, _arrow_type(kind)) for name, kind in columns.items()]
+        return pa.schema(fields)
+
+    def _writer(self, table, league, rows):
+        """Bölümün açık writer'ı; satırlarda şemada olmayan sütun varsa yeni part açılır"""
+        key = (table, league)
+        writer = self.writers.get(key)
+        if writer is not None and table == PLAYERS and any(name not in writer.names for row in rows for name in row):
+            writer.close()
+            writer = None
+        if writer is None:
+            part = self.parts.get(key, 0)
+            self.parts[key] = part + 1
+            path = os.path.join(self.path, table, f"snapshot_date={self.snapshot_date}",
+                                f"league={_partition_value(league)}",
+                                f"part-{self.started_at.strftime('%H%M%S%f')[:-3]}-{part:03d}.parquet")
+            writer = self.writers[key] = _PartitionWriter(path, self._schema(table), self.compression)
+            self.files.append(path)
+        return writer
+
+    def write_batch(self, docs):
+        """Bir parça dokümanı lig bölümlerine yazar"""
+        by_league = {}
+        for doc in docs:
+            player, transfers, similar = flatten_player(doc)
+            if not player['fbrefId']:
+                continue
+            for name in player:
+                if name.startswith(('season__', 'scouting__')) and name not in self.stat_columns:
+                    self.stat_columns[name] = True
+            tables = by_league.setdefault(doc.get('league'), {table: [] for table in TABLES})
+            tables[PLAYERS].append(player)
+            tables[TRANSFERS].extend(transfers)
+            tables[SIMILAR_PLAYERS].extend(similar)
+
+        for league, tables in by_league.items():
+            for table, rows in tables.items():
+                if rows:
+                    self._writer(table, league, rows).write(rows)
+                    self.counts[table] += len(rows)
+
+    def export(self, players, mode='full'):
+        """Doküman iterator'ını (cursor) parça parça yazar -> {tablo: satır sayısı}"""
+        watermark = None
+        batch = []
+        try:
+            for doc in players:
+                updated_at = doc.get('modifiedAt') or doc.get('updatedAt')
+                if isinstance(updated_at, datetime) and (watermark is None or updated_at.isoformat() > watermark):
+                    watermark = updated_at.isoformat()
+                batch.append(doc)
+                if len(batch) >= self.batch_size:
+                    self.write_batch(batch)
+                    batch = []
+                    logging.info(f"Parquet aktarımı: {self.counts[PLAYERS]} oyuncu")
+            if batch:
+                self.write_batch(batch)
+        finally:
+            self.close()
+
+        self._save_state(watermark, mode)
+        return dict(self.counts)
+
+    def close(self):
+        for writer in self.writers.values():
+            try:
+                writer.close()
+            except Exception as e:
+                logging.error(f"Parquet dosyası kapatılamadı ({writer.path}): {e}")
+        self.writers = {}
+
+
+def read_table(table, path=None, snapshot_date=None, leagues=None, columns=None):
+    """Aktarılan tabloyu pandas DataFrame olarak okur (part dosyalarının şemaları birleştirilir)"""
+    import pyarrow as pa
+    import pyarrow.dataset as ds
+
+    source = os.path.join(path or Settings.PARQUET_EXPORT_DIR, table)
+    partitioning = ds.partitioning(pa.schema([('snapshot_date', pa.string()), ('league', pa.string())]),
+                                   flavor='hive')
+    dataset = ds.dataset(source, format='parquet', partitioning=partitioning)
+    schemas = [dataset.schema] + [fragment.physical_schema for fragment in dataset.get_fragments()]
+    dataset = ds.dataset(source, format='parquet', partitioning=partitioning, schema=pa.unify_schemas(schemas))
+
+    condition = None
+    if snapshot_date:
+        condition = ds.field('snapshot_date') == snapshot_date
+    if leagues:
+        league_condition = ds.field('league').isin(list(leagues))
+        condition = league_condition if condition is None else condition & league_condition
+    return dataset.to_table(columns=columns, filter=condition).to_pandas()
@@ -0,0 +1,323 @@
+# analytics/percentiles.py
+"""Kayıtlı sezon istatistiklerinden yerel scouting raporu (per90 + percentile)
+
+FBRef'in scouting sayfasındaki değerler, seasonStats'tan hesaplanabilen
+per-90 değerleri ve pozisyon grubundaki oyunculara göre percentile'lardır.
+Bu modül tüm oyuncular için tek geçişte, NumPy ile aynı hesabı yapar:
+
+    1. oyuncu × stat matrisi (sayaç stat'lar dakikaya bölünüp 90 ile çarpılır,
+       oran stat'lar olduğu gibi alınır)
+    2. dakika eşiğini geçen oyuncular pozisyon grubu ve lige (league) veya
+       pozisyon grubuna ve "Big 5" liglerine (top5) göre karşılaştırma
+       havuzlarına ayrılır
+    3. her sütunda havuz sıralanır, oyuncuların değerleri searchsorted ile
+       yerleştirilir: percentile = (küçük + eşit / 2) / havuz * 100
+
+Sonuç scoutingReport ile aynı biçimdedir: {stat adı: {per90, percentile}}.
+"""
+import logging
+import re
+from datetime import datetime
+from config.leagues import TOP5_LEAGUES
+from config.settings import Settings
+
+COUNT = 'count'  # Dakikaya göre per-90'a çevrilir
+RATE = 'rate'  # Oran/yüzde - olduğu gibi
+
+# scoutingReport stat adı -> (seasonStats anahtarı, tür)
+SCOUTING_STATS = {
+    'Non-Penalty Goals': ('goals_pens', COUNT),
+    'Non-Penalty xG': ('nonPenaltyExpectedGoals', COUNT),
+    'Shots Total': ('shots', COUNT),
+    'Assists': ('assists', COUNT),
+    'xAG: Exp. Assisted Goals': ('expectedAssistedGoals', COUNT),
+    'npxG + xAG': ('npxg_xg_assist', COUNT),
+    'Shot-Creating Actions': ('sca', COUNT),
+    'Passes Attempted': ('passes', COUNT),
+    'Pass Completion %': ('passAccuracy', RATE),
+    'Progressive Passes': ('progressive_passes', COUNT),
+    'Progressive Carries': ('progressive_carries', COUNT),
+    'Successful Take-Ons': ('take_ons_won', COUNT),
+    'Touches (Att Pen)': ('touches_att_pen_area', COUNT),
+    'Progressive Passes Rec': ('progressive_passes_received', COUNT),
+    'Tackles': ('tackles', COUNT),
+    'Interceptions': ('interceptions', COUNT),
+    'Blocks': ('blocks', COUNT),
+    'Clearances': ('clearances', COUNT),
+    'Aerials Won': ('aerialsWon', COUNT),
+    # Şut
+    'Goals': ('goals', COUNT),
+    'Shots on target': ('shotsOnTarget', COUNT),
+    'Shots on target %': ('shots_on_target_pct', RATE),
+    'Goals/Shot': ('goals_per_shot', RATE),
+    'Goals/Shot on target': ('goals_per_shot_on_target', RATE),
+    'Average Shot Distance': ('average_shot_distance', RATE),
+    'Shots from Free kicks': ('shots_free_kicks', COUNT),
+    'Penalty Kicks Made': ('pens_made', COUNT),
+    'Penalty Kicks Attempted': ('pens_att', COUNT),
+    'xG: Expected Goals': ('expectedGoals', COUNT),
+    'npxG: Non-Penalty xG': ('nonPenaltyExpectedGoals', COUNT),
+    'npxG/Shot': ('npxg_per_shot', RATE),
+    'Goals - xG': ('xg_net', COUNT),
+    'Non-Penalty Goals - npxG': ('npxg_net', COUNT),
+    # Pas
+    'Passes Completed': ('passesCompleted', COUNT),
+    'Total Passing Distance': ('passes_total_distance', COUNT),
+    'Progressive Passing Distance': ('passes_progressive_distance', COUNT),
+    'Passes Completed (Short)': ('passes_completed_short', COUNT),
+    'Passes Attempted (Short)': ('passes_short', COUNT),
+    'Pass Completion % (Short)': ('passes_pct_short', RATE),
+    'Passes Completed (Medium)': ('passes_completed_medium', COUNT),
+    'Passes Attempted (Medium)': ('passes_medium', COUNT),
+    'Pass Completion % (Medium)': ('passes_pct_medium', RATE),
+    'Passes Completed (Long)': ('passes_completed_long', COUNT),
+    'Passes Attempted (Long)': ('passes_long', COUNT),
+    'Pass Completion % (Long)': ('passes_pct_long', RATE),
+    'Key Passes': ('assisted_shots', COUNT),
+    'Passes into Final Third': ('passes_into_final_third', COUNT),
+    'Passes into Penalty Area': ('passes_into_penalty_area', COUNT),
+    'Crosses into Penalty Area': ('crosses_into_penalty_area', COUNT),
+    # Pas türleri
+    'Live-ball passes': ('passes_live', COUNT),
+    'Dead-ball passes': ('passes_dead', COUNT),
+    'Passes from Free kicks': ('passes_free_kicks', COUNT),
+    'Through balls': ('through_balls', COUNT),
+    'Switches': ('passes_switches', COUNT),
+    'Crosses': ('crosses', COUNT),
+    'Throw-ins taken': ('throw_ins', COUNT),
+    'Corner kicks': ('corner_kicks', COUNT),
+    'Inswinging Corner Kicks': ('corner_kicks_in', COUNT),
+    'Outswinging Corner Kicks': ('corner_kicks_out', COUNT),
+    'Straight Corner Kicks': ('corner_kicks_straight', COUNT),
+    'Passes Offside': ('passes_offsides', COUNT),
+    'Passes Blocked': ('passes_blocked', COUNT),
+    # Şut / gol yaratma
+    'SCA (Live-ball Pass)': ('sca_passes_live', COUNT),
+    'SCA (Dead-ball Pass)': ('sca_passes_dead', COUNT),
+    'SCA (Take-On)': ('sca_take_ons', COUNT),
+    'SCA (Shot)': ('sca_shots', COUNT),
+    'SCA (Fouls Drawn)': ('sca_fouled', COUNT),
+    'SCA (Defensive Action)': ('sca_defense', COUNT),
+    'Goal-Creating Actions': ('gca', COUNT),
+    'GCA (Live-ball Pass)': ('gca_passes_live', COUNT),
+    'GCA (Dead-ball Pass)': ('gca_passes_dead', COUNT),
+    'GCA (Take-On)': ('gca_take_ons', COUNT),
+    'GCA (Shot)': ('gca_shots', COUNT),
+    'GCA (Fouls Drawn)': ('gca_fouled', COUNT),
+    'GCA (Defensive Action)': ('gca_defense', COUNT),
+    # Savunma
+    'Tackles Won': ('tackles_won', COUNT),
+    'Tackles (Def 3rd)': ('tackles_def_3rd', COUNT),
+    'Tackles (Mid 3rd)': ('tackles_mid_3rd', COUNT),
+    'Tackles (Att 3rd)': ('tackles_att_3rd', COUNT),
+    'Dribblers Tackled': ('challenge_tackles', COUNT),
+    'Dribbles Challenged': ('challenges', COUNT),
+    '% of Dribblers Tackled': ('challenge_tackles_pct', RATE),
+    'Challenges Lost': ('challenges_lost', COUNT),
+    'Shots Blocked': ('blocked_shots', COUNT),
+    'Tkl+Int': ('tackles_interceptions', COUNT),
+    'Errors': ('errors', COUNT),
+    # Top hakimiyeti
+    'Touches': ('touches', COUNT),
+    'Touches (Def Pen)': ('touches_def_pen_area', COUNT),
+    'Touches (Def 3rd)': ('touches_def_3rd', COUNT),
+    'Touches (Mid 3rd)': ('touches_mid_3rd', COUNT),
+    'Touches (Att 3rd)': ('touches_att_3rd', COUNT),
+    'Touches (Live-Ball)': ('touches_live_ball', COUNT),
+    'Take-Ons Attempted': ('take_ons', COUNT),
+    'Successful Take-On %': ('take_ons_won_pct', RATE),
+    'Times Tackled During Take-On': ('take_ons_tackled', COUNT),
+    'Tackled During Take-On Percentage': ('take_ons_tackled_pct', RATE),
+    'Carries': ('carries', COUNT),
+    'Total Carrying Distance': ('carries_distance', COUNT),
+    'Progressive Carrying Distance': ('carries_progressive_distance', COUNT),
+    'Carries into Final Third': ('carries_into_final_third', COUNT),
+    'Carries into Penalty Area': ('carries_into_penalty_area', COUNT),
+    'Miscontrols': ('miscontrols', COUNT),
+    'Dispossessed': ('dispossessed', COUNT),
+    'Passes Received': ('passes_received', COUNT),
+    # Diğer
+    'Yellow Cards': ('yellowCards', COUNT),
+    'Red Cards': ('redCards', COUNT),
+    'Second Yellow Card': ('cards_yellow_red', COUNT),
+    'Fouls Committed': ('foulsCommitted', COUNT),
+    'Fouls Drawn': ('foulsDrawn', COUNT),
+    'Offsides': ('offsides', COUNT),
+    'Penalty Kicks Won': ('pens_won', COUNT),
+    'Penalty Kicks Conceded': ('pens_conceded', COUNT),
+    'Own Goals': ('own_goals', COUNT),
+    'Ball Recoveries': ('ball_recoveries', COUNT),
+    'Aerials Lost': ('aerialsLost', COUNT),
+    '% of Aerials Won': ('aerialDuelSuccessRate', RATE),
+}
+
+MINUTES_KEY = 'minutesPlayed'
+PEER_SETS = ('league', 'top5')
+
+# Pozisyon grupları (FBRef'in karşılaştırma gruplarının sadeleştirilmiş hali)
+POSITION_GROUPS = ('GK', 'CB', 'FB', 'DM', 'CM', 'AM', 'FW')
+_POSITION_TOKENS = re.compile(r'[a-z]+')
+
+
+def position_group(position):
+    """'FW-MF (AM-WM, right)', 'DF (CB)', 'MF,FW' gibi değerlerden pozisyon grubu - bilinmiyorsa None"""
+    if not position:
+        return None
+    tokens = _POSITION_TOKENS.findall(str(position).lower())
+    if 'gk' in tokens:
+        return 'GK'
+    primary = next((token for token in tokens if token in ('df', 'mf', 'fw')), None)
+    detail = set(tokens)
+
+    if primary == 'df':
+        return 'FB' if detail & {'fb', 'lb', 'rb', 'wb'} else 'CB'
+    if primary == 'mf':
+        if detail & {'am', 'wm', 'lw', 'rw'}:
+            return 'AM'
+        return 'DM' if 'dm' in detail else 'CM'
+    if primary == 'fw':
+        return 'AM' if detail & {'am', 'wm', 'lw', 'rw'} and 'cf' not in detail else 'FW'
+    return None
+
+
+def _to_float(value):
+    if value is None or isinstance(value, bool):
+        return float('nan')
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return float('nan')
+
+
+class PercentileEngine:
+    """Tüm oyuncular için tek geçişte per-90 ve pozisyon grubu percentile'ları"""
+
+    def __init__(self, min_minutes=None, peer_set=None, min_peers=None, stats=None):
+        self.min_minutes = Settings.PERCENTILE_MIN_MINUTES if min_minutes is None else min_minutes
+        self.peer_set = peer_set or Settings.PERCENTILE_PEER_SET
+        self.min_peers = Settings.PERCENTILE_MIN_PEERS if min_peers is None else min_peers
+        self.stats = stats or SCOUTING_STATS
+        if self.peer_set not in PEER_SETS:
+            raise ValueError(f"Bilinmeyen karşılaştırma grubu: {self.peer_set} ({', '.join(PEER_SETS)})")
+
+        self.names = list(self.stats)
+        self.keys = [key for key, _ in self.stats.values()]
+
+    def build_matrix(self, players):
+        """(fbrefId'ler, ligler, gruplar, dakikalar, per-90 matrisi) - eksik değerler NaN"""
+        import numpy as np
+
+        ids, leagues, groups, minutes, rows = [], [], [], [], []
+        for player in players:
+            stats = player.get('seasonStats') or {}
+            if not isinstance(stats, dict):
+                continue
+            ids.append(player.get('fbrefId'))
+            leagues.append(player.get('league'))
+            groups.append(position_group(player.get('detailedPosition')))
+            minutes.append(_to_float(stats.get(MINUTES_KEY)))
+            rows.append([stats.get(key) for key in self.keys])
+
+        try:
+            # Yaygın durum: sayılar ve None (NumPy None'ı NaN yapar)
+            matrix = np.array(rows, dtype=np.float64)
+        except (TypeError, ValueError):
+            matrix = np.array([[_to_float(value) for value in row] for row in rows], dtype=np.float64)
+        matrix = matrix.reshape(len(rows), len(self.keys))
+        minutes = np.array(minutes, dtype=np.float64)
+
+        # Sayaç stat'lar per-90'a (dakika 0/bilinmiyorsa NaN)
+        counts = np.array([kind == COUNT for _, kind in self.stats.values()])
+        with np.errstate(divide='ignore', invalid='ignore'):
+            nineties = np.where(minutes > 0, minutes / 90.0, np.nan)
+            matrix[:, counts] = matrix[:, counts] / nineties[:, None]
+
+        return ids, np.array(leagues, dtype=object), np.array(groups, dtype=object), minutes, matrix
+
+    @staticmethod
+    def rank(pool, values):
+        """Her sütunda values'un pool içindeki percentile'ı (0-100); NaN -> NaN"""
+        import numpy as np
+
+        result = np.full(values.shape, np.nan)
+        for column in range(values.shape[1]):
+            reference = pool[:, column]
+            reference = np.sort(reference[~np.isnan(reference)])
+            if not len(reference):
+                continue
+            target = values[:, column]
+            present = ~np.isnan(target)
+            below = np.searchsorted(reference, target[present], side='left')
+            equal = np.searchsorted(reference, target[present], side='right') - below
+            result[present, column] = (below + equal / 2.0) / len(reference) * 100.0
+        return result
+
+    def compute(self, players):
+        """{fbrefId: (rapor, meta)} - dakika eşiğinin altındakiler ve grubu bilinmeyenler dahil edilmez"""
+        import numpy as np
+
+        ids, leagues, groups, minutes, per90 = self.build_matrix(players)
+        if not ids:
+            return {}
+
+        eligible = (minutes >= self.min_minutes) & (groups != None)  # noqa: E711 - object dizisinde eleman bazlı
+        in_top5 = np.isin(leagues, TOP5_LEAGUES)
+        percentiles = np.full(per90.shape, np.nan)
+        peers = np.zeros(len(ids), dtype=np.int64)
+
+        for group in POSITION_GROUPS:
+            group_mask = eligible & (groups == group)
+            if not group_mask.any():
+                continue
+
+            if self.peer_set == 'top5':
+                # Herkes Big 5'teki aynı pozisyon grubuna göre sıralanır
+                partitions = [(group_mask, group_mask & in_top5)]
+            else:
+                partitions = [(group_mask & (leagues == league), group_mask & (leagues == league))
+                              for league in set(leagues[group_mask])]
+
+            for target_mask, pool_mask in partitions:
+                pool_size = int(pool_mask.sum())
+                if pool_size < self.min_peers:
+                    continue
+                percentiles[target_mask] = self.rank(per90[pool_mask], per90[target_mask])
+                peers[target_mask] = pool_size
+
+        # Yuvarlama ve sınırlama vektörel; satırlar Python listesi olarak dolaşılır
+        rows = np.flatnonzero(eligible)
+        per90_rows = np.round(per90[rows], 2).tolist()
+        # FBRef gibi 1-99 arası tamsayı; NaN -> -1 (percentile yok)
+        rank_rows = np.where(np.isnan(percentiles[rows]), -1,
+                             np.clip(np.rint(percentiles[rows]), 1, 99)).astype(np.int64).tolist()
+
+        computed_at = datetime.utcnow()
+        results = {}
+        for row, values, ranks in zip(rows.tolist(), per90_rows, rank_rows):
+            report = {}
+            for name, value, rank in zip(self.names, values, ranks):
+                if value != value:  # NaN
+                    continue
+                report[name] = {'per90': value, 'percentile': rank} if rank >= 0 else {'per90': value}
+
+            results[ids[row]] = (report, {
+                'positionGroup': groups[row],
+                'peerSet': self.peer_set,
+                'peers': int(peers[row]),
+                'minMinutes': self.min_minutes,
+                'minutes': float(minutes[row]),
+                'computedAt': computed_at,
+            })
+        return results
+
+    def updates(self, players, field=None):
+        """DatabaseManager.bulk_update_fields için {fbrefId: {alan: rapor, alan+'Meta': meta}}"""
+        field = field or Settings.PERCENTILE_FIELD
+        results = self.compute(players)
+        logging.info(f"Yerel percentile: {len(results)} oyuncu "
+                     f"({self.peer_set}, min {self.min_minutes} dk, {len(self.names)} stat)")
+        updates = {}
+        for fbref_id, (report, meta) in results.items():
+            # Hesaplama zamanı sadece meta'da tutulur (computedAt değişiklik sayılmaz, aynı rapor yeniden yazılmaz)
+            updates[fbref_id] = {field: report, f"{field}Meta": meta}
+        return updates
@@ -0,0 +1,317 @@
+# analytics/similarity.py
+"""Kayıtlı istatistiklerden benzer oyuncular (NumPy cosine k-NN)
+
+FBRef'in "Similar Players" bloğu sabit 10 oyuncu ve kendi karşılaştırma
+grubuyla sınırlıdır. Bu modül aynı işi kendi verimizle yapar:
+
+    1. Her pozisyon grubu için seçili stat'lardan per-90 vektörleri
+       (PercentileEngine.build_matrix) - dakika eşiğinin altındakiler dışarıda
+    2. Grup içinde normalize (zscore: standart sapma cinsinden, ±3'te kırpılır;
+       percentile: grup içi sıra) ve birim uzunluğa getirme -> cosine = iç çarpım
+    3. Sorgu: grubun tüm vektörleriyle tek matris çarpımı (brute force) veya
+       clusters > 0 ise küresel k-means merkezlerinden en yakın `probe`
+       kümenin üyeleriyle (budama; yeterli aday yoksa tam taramaya düşer)
+
+Lig, yaş ve sözleşme bitiş yılı filtreleri adaylara maske olarak uygulanır.
+Sonuçlar similarPlayers biçimindedir: {name, fbrefId, url, similarity}.
+"""
+import logging
+import re
+import warnings
+from config.settings import Settings
+from analytics.percentiles import POSITION_GROUPS, SCOUTING_STATS, PercentileEngine
+
+NORMALIZATIONS = ('zscore', 'percentile')
+ZSCORE_CLIP = 3.0
+KMEANS_ITERATIONS = 10
+
+_ATTACK = ['Non-Penalty Goals', 'Non-Penalty xG', 'Shots Total', 'npxG/Shot', 'Touches (Att Pen)']
+_CREATION = ['Assists', 'xAG: Exp. Assisted Goals', 'Shot-Creating Actions', 'Key Passes',
+             'Passes into Penalty Area', 'Crosses into Penalty Area']
+_PROGRESSION = ['Progressive Passes', 'Progressive Carries', 'Progressive Passes Rec',
+                'Successful Take-Ons', 'Carries into Final Third']
+_PASSING = ['Passes Attempted', 'Pass Completion %', 'Passes into Final Third',
+            'Pass Completion % (Long)', 'Switches']
+_DEFENSE = ['Tackles', 'Interceptions', 'Blocks', 'Clearances', 'Ball Recoveries',
+            '% of Dribblers Tackled']
+_AERIAL = ['Aerials Won', '% of Aerials Won']
+
+# Pozisyon grubu -> benzerlikte kullanılan stat'lar (SCOUTING_STATS isimleri)
+FEATURES = {
+    'GK': ['Passes Attempted', 'Pass Completion %', 'Passes Attempted (Long)', 'Pass Completion % (Long)',
+           'Touches', 'Errors'],
+    'CB': _DEFENSE + _AERIAL + _PASSING + ['Progressive Passes', 'Progressive Carries'],
+    'FB': _DEFENSE + _PROGRESSION + ['Crosses', 'Crosses into Penalty Area', 'Shot-Creating Actions',
+                                     'Pass Completion %'],
+    'DM': _DEFENSE + _PASSING + _PROGRESSION,
+    'CM': _PASSING + _PROGRESSION + _CREATION + ['Tackles', 'Interceptions', 'Ball Recoveries'],
+    'AM': _ATTACK + _CREATION + _PROGRESSION + ['Touches', 'Miscontrols', 'Dispossessed'],
+    'FW': _ATTACK + _CREATION + _AERIAL + ['Progressive Passes Rec', 'Successful Take-Ons',
+                                           'Goals - xG'],
+}
+
+_YEAR = re.compile(r'\b(?:19|20)\d{2}\b')
+
+
+def contract_year(value):
+    """'June 30, 2027' / '2027-06-30' / datetime -> 2027 (bilinmiyorsa None)"""
+    if value is None:
+        return None
+    year = getattr(value, 'year', None)
+    if year:
+        return year
+    match = _YEAR.search(str(value))
+    return int(match.group()) if match else None
+
+
+def player_url(fbref_id, name):
+    slug = re.sub(r'\s+', '-', (name or '').strip())
+    return f"{Settings.FBREF_BASE_URL}/en/players/{fbref_id}/{slug}"
+
+
+def _to_number(value):
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return float('nan')
+
+
+class _GroupIndex:
+    """Bir pozisyon grubunun normalize vektörleri ve (varsa) küme yapısı"""
+
+    __slots__ = ('rows', 'vectors', 'positions', 'centroids', 'members')
+
+    def __init__(self, rows, vectors):
+        self.rows = rows  # Grup satırı -> indeks satırı
+        self.vectors = vectors  # float32, birim uzunluk
+        self.positions = {int(row): position for position, row in enumerate(rows)}
+        self.centroids = None
+        self.members = None  # küme -> grup satırları
+
+    def cluster(self, count, seed=42):
+        """Küresel k-means (cosine); count grup boyutundan büyükse kümeleme yapılmaz"""
+        import numpy as np
+
+        if count <= 1 or count >= len(self.rows):
+            return
+        rng = np.random.default_rng(seed)
+        centroids = self.vectors[rng.choice(len(self.rows), count, replace=False)].copy()
+        assignments = None
+        for _ in range(KMEANS_ITERATIONS):
+            new_assignments = np.argmax(self.vectors @ centroids.T, axis=1)
+            if assignments is not None and np.array_equal(assignments, new_assignments):
+                break
+            assignments = new_assignments
+            for cluster in range(count):
+                members = self.vectors[assignments == cluster]
+                if len(members):
+                    center = members.sum(axis=0)
+                    norm = np.linalg.norm(center)
+                    if norm > 0:
+                        centroids[cluster] = center / norm
+
+        self.centroids = centroids
+        order = np.argsort(assignments, kind='stable')
+        bounds = np.searchsorted(assignments[order], np.arange(count + 1))
+        self.members = [order[bounds[i]:bounds[i + 1]] for i in range(count)]
+
+    def candidates(self, vector, probe):
+        """Sorgu vektörüne en yakın `probe` kümenin üyeleri (kümeleme yoksa None = hepsi)"""
+        import numpy as np
+
+        if self.centroids is None or not probe or probe >= len(self.centroids):
+            return None
+        scores = self.centroids @ vector
+        nearest = np.argpartition(-scores, probe - 1)[:probe]
+        return np.concatenate([self.members[cluster] for cluster in nearest])
+
+
+class SimilarityIndex:
+    """Pozisyon grubu bazında cosine benzerlik indeksi"""
+
+    def __init__(self, normalization=None, clusters=None, probe=None, min_minutes=None, features=None):
+        self.normalization = normalization or Settings.SIMILARITY_NORMALIZATION
+        if self.normalization not in NORMALIZATIONS:
+            raise ValueError(f"Bilinmeyen normalizasyon: {self.normalization} ({', '.join(NORMALIZATIONS)})")
+        self.clusters = Settings.SIMILARITY_CLUSTERS if clusters is None else clusters
+        self.probe = Settings.SIMILARITY_PROBE if probe is None else probe
+        self.min_minutes = Settings.SIMILARITY_MIN_MINUTES if min_minutes is None else min_minutes
+        self.features = features or FEATURES
+
+        self.ids = []
+        self.index = {}  # fbrefId -> satır
+        self.groups = {}  # pozisyon grubu -> _GroupIndex
+        self.names = self.leagues = self.teams = self.ages = self.contract_years = self.row_groups = None
+
+    def __len__(self):
+        return len(self.ids)
+
+    def __contains__(self, fbref_id):
+        return fbref_id in self.index
+
+    # --- Kurulum ---
+
+    def build(self, players):
+        """Oyuncu dokümanlarından indeksi kurar (seasonStats, detailedPosition, league, team, age, contractEnd)"""
+        import numpy as np
+
+        players = [player for player in players if player.get('fbrefId')]
+        engine = PercentileEngine(min_minutes=self.min_minutes, peer_set='league', stats=SCOUTING_STATS)
+        ids, leagues, groups, minutes, per90 = engine.build_matrix(players)
+        by_id = {player['fbrefId']: player for player in players}
+
+        eligible = np.flatnonzero((minutes >= self.min_minutes) & (groups != None))  # noqa: E711
+        self.ids = [ids[row] for row in eligible]
+        self.index = {fbref_id: row for row, fbref_id in enumerate(self.ids)}
+        self.leagues = leagues[eligible]
+        self.row_groups = groups[eligible]
+        self.names = [by_id[fbref_id].get('fullName') for fbref_id in self.ids]
+        self.teams = np.array([by_id[fbref_id].get('team') for fbref_id in self.ids], dtype=object)
+        self.ages = np.array([_to_number(by_id[fbref_id].get('age')) for fbref_id in self.ids])
+        self.contract_years = np.array([_to_number(contract_year(by_id[fbref_id].get('contractEnd')))
+                                        for fbref_id in self.ids])
+        per90 = per90[eligible]
+
+        columns = {name: column for column, name in enumerate(engine.names)}
+        self.groups = {}
+        for group in POSITION_GROUPS:
+            rows = np.flatnonzero(self.row_groups == group)
+            names = [name for name in self.features.get(group, ()) if name in columns]
+            if not len(rows) or not names:
+                continue
+            matrix = per90[np.ix_(rows, [columns[name] for name in names])]
+            self.groups[group] = _GroupIndex(rows, self.normalize(matrix))
+            if self.clusters:
+                self.groups[group].cluster(self.clusters_for(len(rows)))
+
+        logging.info(f"Benzerlik indeksi: {len(self.ids)} oyuncu, "
+                     f"{', '.join(f'{g} {len(gi.rows)}' for g, gi in self.groups.items())}")
+        return self
+
+    def clusters_for(self, size):
+        """clusters < 0: grup boyutunun karekökü kadar küme"""
+        return int(size ** 0.5) if self.clusters < 0 else self.clusters
+
+    def normalize(self, matrix):
+        """Grup içinde normalize edilmiş, birim uzunlukta float32 vektörler (eksik değer = grup ortalaması)"""
+        import numpy as np
+
+        if self.normalization == 'percentile':
+            # Grup içi sıra (0-1), ortalama 0 olacak şekilde kaydırılır
+            scaled = PercentileEngine.rank(matrix, matrix) / 100.0 - 0.5
+        else:
+            with warnings.catch_warnings():
+                warnings.simplefilter('ignore', RuntimeWarning)  # Tamamen boş sütunlar
+                mean = np.nanmean(matrix, axis=0)
+                std = np.nanstd(matrix, axis=0)
+            scaled = (matrix - mean) / np.where(std > 0, std, 1.0)
+            scaled = np.clip(scaled, -ZSCORE_CLIP, ZSCORE_CLIP)
+
+        scaled = np.nan_to_num(scaled, nan=0.0).astype(np.float32)
+        norms = np.linalg.norm(scaled, axis=1, keepdims=True)
+        return scaled / np.where(norms > 0, norms, 1.0)
+
+    # --- Sorgu ---
+
+    def filter_mask(self, rows, league=None, min_age=None, max_age=None, contract_until=None):
+        """rows (indeks satırları) için filtreye uyanlar - filtre yoksa None"""
+        import numpy as np
+
+        mask = None
+
+        def combine(current, condition):
+            return condition if current is None else current & condition
+
+        if league:
+            leagues = [league] if isinstance(league, str) else list(league)
+            mask = combine(mask, np.isin(self.leagues[rows], leagues))
+        if min_age is not None:
+            mask = combine(mask, self.ages[rows] >= min_age)
+        if max_age is not None:
+            mask = combine(mask, self.ages[rows] <= max_age)
+        if contract_until is not None:
+            # Sözleşmesi verilen yılda veya önce bitenler (bilinmeyenler hariç)
+            mask = combine(mask, self.contract_years[rows] <= contract_until)
+        return mask
+
+    def query(self, fbref_id, k=None, probe=None, **filters):
+        """Oyuncuya en benzer k oyuncu (aynı pozisyon grubundan) - indekste yoksa boş liste"""
+        k = k or Settings.SIMILARITY_NEIGHBOURS
+        row = self.index.get(fbref_id)
+        if row is None:
+            return []
+        group = self.groups.get(self.row_groups[row])
+        if group is None:
+            return []
+        position = group.positions[row]
+        vector = group.vectors[position]
+
+        probe = self.probe if probe is None else probe
+        candidates = group.candidates(vector, probe)
+        results = self._top_k(group, vector, candidates, position, k, filters)
+        if candidates is not None and len(results) < k:
+            # Budanmış adaylar filtreden sonra yetmedi - tam tarama
+            results = self._top_k(group, vector, None, position, k, filters)
+        return results
+
+    def _top_k(self, group, vector, candidates, exclude, k, filters):
+        import numpy as np
+
+        positions = np.arange(len(group.rows)) if candidates is None else candidates
+        scores = group.vectors[positions] @ vector
+        keep = positions != exclude
+        mask = self.filter_mask(group.rows[positions], **filters)
+        if mask is not None:
+            keep &= mask
+        positions, scores = positions[keep], scores[keep]
+        if not len(positions):
+            return []
+
+        top = np.argpartition(-scores, min(k, len(scores)) - 1)[:k]
+        top = top[np.argsort(-scores[top], kind='stable')]
+        return [self.entry(group.rows[positions[i]], scores[i]) for i in top]
+
+    def neighbours_all(self, k=None, block_size=1024, **filters):
+        """Tüm oyuncular için k komşu (toplu, brute force): {fbrefId: [giriş]}"""
+        import numpy as np
+
+        k = k or Settings.SIMILARITY_NEIGHBOURS
+        results = {}
+        for group in self.groups.values():
+            size = len(group.rows)
+            allowed = self.filter_mask(group.rows, **filters)
+            count = min(k, size - 1 if allowed is None else int(allowed.sum()))
+            for start in range(0, size, block_size):
+                stop = min(start + block_size, size)
+                scores = group.vectors[start:stop] @ group.vectors.T
+                scores[np.arange(stop - start), np.arange(start, stop)] = -np.inf  # Kendisi
+                if allowed is not None:
+                    scores[:, ~allowed] = -np.inf
+                if count <= 0:
+                    for position in range(start, stop):
+                        results[self.ids[group.rows[position]]] = []
+                    continue
+
+                top = np.argpartition(-scores, count - 1, axis=1)[:, :count]
+                top_scores = np.take_along_axis(scores, top, axis=1)
+                order = np.argsort(-top_scores, axis=1, kind='stable')
+                top = np.take_along_axis(top, order, axis=1)
+                top_scores = np.take_along_axis(top_scores, order, axis=1)
+
+                for offset, (neighbours, neighbour_scores) in enumerate(zip(top.tolist(), top_scores.tolist())):
+                    results[self.ids[group.rows[start + offset]]] = [
+                        self.entry(group.rows[position], score)
+                        for position, score in zip(neighbours, neighbour_scores)
+                        if score != float('-inf')
+                    ]
+        return results
+
+    def entry(self, row, score):
+        fbref_id = self.ids[row]
+        name = self.names[row]
+        return {
+            'name': name,
+            'fbrefId': fbref_id,
+            'url': player_url(fbref_id, name),
+            'similarity': round(float(score), 4),
+        }
@@ -0,0 +1,241 @@
+# analytics/stat_matrix.py
+"""Diskte oyuncu × stat float32 matrisi (numpy.memmap ile paylaşılır)
+
+Analiz işleri (percentile, benzerlik, lig ortalamaları) her seferinde
+Mongo'dan tüm dokümanları çekmek yerine bu matrisi açar. Dizin yapısı:
+
+    meta.json        boyut, matris dosyası, sürüm, modifiedAt filigranı
+    matrix.<v>.f32   satır sırasıyla ham float32 (kapasite kadar satır)
+    rows.txt         satır -> fbrefId (satır başına bir ID)
+    columns.txt      sütun -> seasonStats anahtarı
+
+Sayısal olmayan/eksik değerler NaN'dır. Güncelleme (StatMatrixWriter.refresh)
+sadece modifiedAt'i filigrandan yeni oyuncuları okur (modifiedAt her değişen
+yazımda ilerler; modifiedAt'i olmayan eski dokümanlarda updatedAt kullanılır). Mevcut satırlar yerinde yazılır, yeni oyuncular
+sona eklenir (dosya gerektikçe büyür). Yeni bir stat
+ismi gelirse matris daha geniş yeni bir sürüm dosyasına kopyalanır.
+
+Okuyucular boyutu meta.json'dan alır; rows/columns dosyaları sadece sona
+eklenerek büyüdüğü ve genişleyen matris yeni isimli dosyaya yazıldığı için
+güncelleme sırasında açılmış bir StatMatrix tutarlı kalır.
+"""
+import json
+import logging
+import os
+from datetime import datetime
+from config.settings import Settings
+
+META_FILE = 'meta.json'
+ROWS_FILE = 'rows.txt'
+COLUMNS_FILE = 'columns.txt'
+DTYPE = 'float32'
+MIN_CAPACITY = 1024
+
+
+def _write_atomic(path, text):
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        f.write(text)
+    os.replace(tmp_path, path)
+
+
+def _read_lines(path, count):
+    if not count:
+        return []
+    with open(path, encoding='utf-8') as f:
+        lines = f.read().split('\n')
+    return lines[:count]
+
+
+def _read_meta(path):
+    meta_path = os.path.join(path, META_FILE)
+    if not os.path.exists(meta_path):
+        return None
+    with open(meta_path, encoding='utf-8') as f:
+        return json.load(f)
+
+
+class StatMatrix:
+    """Salt okunur matris: matrix (memmap), ids, columns ve isim -> konum sözlükleri"""
+
+    def __init__(self, path=None):
+        import numpy as np
+
+        self.path = path or Settings.STAT_MATRIX_DIR
+        self.meta = _read_meta(self.path)
+        if self.meta is None:
+            raise FileNotFoundError(f"Stat matrisi bulunamadı: {self.path} (python main.py matrix)")
+
+        rows, cols = self.meta['rows'], self.meta['columns']
+        self.ids = _read_lines(os.path.join(self.path, ROWS_FILE), rows)
+        self.columns = _read_lines(os.path.join(self.path, COLUMNS_FILE), cols)
+        self.index = {fbref_id: row for row, fbref_id in enumerate(self.ids)}
+        self.column_index = {name: col for col, name in enumerate(self.columns)}
+
+        if rows and cols:
+            data = np.memmap(os.path.join(self.path, self.meta['matrixFile']), dtype=DTYPE, mode='r',
+                             shape=(self.meta['capacity'], cols))
+            self.matrix = data[:rows]
+        else:
+            self.matrix = np.empty((rows, cols), dtype=DTYPE)
+
+    def __len__(self):
+        return len(self.ids)
+
+    def __contains__(self, fbref_id):
+        return fbref_id in self.index
+
+    @property
+    def updated_at(self):
+        return self.meta.get('updatedAt')
+
+    def row(self, fbref_id):
+        """Oyuncunun stat vektörü (kopyasız görünüm) - yoksa None"""
+        row = self.index.get(fbref_id)
+        return None if row is None else self.matrix[row]
+
+    def column(self, name):
+        """Bir stat'ın tüm oyunculardaki değerleri - yoksa None"""
+        col = self.column_index.get(name)
+        return None if col is None else self.matrix[:, col]
+
+    def get(self, fbref_id, name):
+        row, col = self.index.get(fbref_id), self.column_index.get(name)
+        if row is None or col is None:
+            return None
+        return float(self.matrix[row, col])
+
+
+class StatMatrixWriter:
+    """Dokümanlardan matrisi oluşturur veya artımlı günceller (tek yazar varsayılır)"""
+
+    def __init__(self, path=None):
+        self.path = path or Settings.STAT_MATRIX_DIR
+
+    def load_state(self):
+        """(meta, ids, columns) - matris yoksa (None, [], [])"""
+        meta = _read_meta(self.path)
+        if meta is None:
+            return None, [], []
+        return (meta, _read_lines(os.path.join(self.path, ROWS_FILE), meta['rows']),
+                _read_lines(os.path.join(self.path, COLUMNS_FILE), meta['columns']))
+
+    @property
+    def watermark(self):
+        """Son güncellemedeki en yeni modifiedAt (artımlı okuma için) - yoksa None"""
+        meta = _read_meta(self.path)
+        if not meta or not meta.get('watermark'):
+            return None
+        return datetime.fromisoformat(meta['watermark'])
+
+    def refresh(self, players, full=False):
+        """Oyuncuları matrise yazar -> (güncellenen, eklenen) satır sayıları
+
+        players: fbrefId, seasonStats ve modifiedAt/updatedAt içeren dokümanlar. full=True
+        ise mevcut matris yok sayılıp baştan oluşturulur.
+        """
+        import numpy as np
+
+        os.makedirs(self.path, exist_ok=True)
+        previous = _read_meta(self.path)
+        meta, ids, columns = (None, [], []) if full else self.load_state()
+        index = {fbref_id: row for row, fbref_id in enumerate(ids)}
+        column_index = {name: col for col, name in enumerate(columns)}
+        old_rows, old_columns = len(ids), len(columns)
+        watermark = meta.get('watermark') if meta else None
+
+        # Güncellenen oyuncular: satır ve {sütun: değer}
+        updates = {}
+        for player in players:
+            fbref_id = player.get('fbrefId')
+            stats = player.get('seasonStats')
+            if not fbref_id or not isinstance(stats, dict):
+                continue
+            values = {}
+            for name, value in stats.items():
+                if isinstance(value, bool) or not isinstance(value, (int, float)):
+                    continue
+                col = column_index.get(name)
+                if col is None:
+                    col = column_index[name] = len(columns)
+                    columns.append(name)
+                values[col] = value
+
+            row = index.get(fbref_id)
+            if row is None:
+                row = index[fbref_id] = len(ids)
+                ids.append(fbref_id)
+            updates[row] = values
+
+            updated_at = player.get('modifiedAt') or player.get('updatedAt')
+            if isinstance(updated_at, datetime) and (watermark is None or updated_at.isoformat() > watermark):
+                watermark = updated_at.isoformat()
+
+        if not updates:
+            return 0, 0
+
+        rows, cols = len(ids), len(columns)
+        version = previous['version'] if previous else 0
+        capacity = meta['capacity'] if meta else 0
+        matrix_file = meta['matrixFile'] if meta else None
+        rewrite = meta is None or cols != old_columns
+
+        if rewrite:
+            # Yeni (daha geniş) sürüm dosyası; eski satırlar kopyalanır
+            version += 1
+            capacity = max(MIN_CAPACITY, rows * 2 if meta else rows)
+            new_file = f"matrix.{version}.f32"
+            data = np.memmap(os.path.join(self.path, new_file), dtype=DTYPE, mode='w+', shape=(capacity, cols))
+            data[:] = np.nan
+            if meta is not None and old_rows and old_columns:
+                old = np.memmap(os.path.join(self.path, matrix_file), dtype=DTYPE, mode='r',
+                                shape=(meta['capacity'], old_columns))
+                data[:old_rows, :old_columns] = old[:old_rows]
+                del old
+            old_file = previous['matrixFile'] if previous else None
+            matrix_file = new_file
+        else:
+            old_file = None
+            if rows > capacity:
+                # Dosya büyütülür (yeni satırlar aşağıda tamamen yazılır)
+                capacity = max(rows, capacity * 2)
+                with open(os.path.join(self.path, matrix_file), 'r+b') as f:
+                    f.truncate(capacity * cols * np.dtype(DTYPE).itemsize)
+            data = np.memmap(os.path.join(self.path, matrix_file), dtype=DTYPE, mode='r+', shape=(capacity, cols))
+
+        # Güncellenen satırlar baştan yazılır (silinen stat'lar NaN olur)
+        if updates:
+            row_numbers = np.fromiter(updates, dtype=np.int64, count=len(updates))
+            block = np.full((len(updates), cols), np.nan, dtype=DTYPE)
+            for offset, values in enumerate(updates.values()):
+                if values:
+                    block[offset, list(values)] = list(values.values())
+            data[row_numbers] = block
+        data.flush()
+        del data
+
+        # Önce satır/sütun isimleri (sadece sona ekleme), en son meta
+        if rows != old_rows or rewrite:
+            _write_atomic(os.path.join(self.path, ROWS_FILE), '\n'.join(ids))
+        if cols != old_columns or rewrite:
+            _write_atomic(os.path.join(self.path, COLUMNS_FILE), '\n'.join(columns))
+        _write_atomic(os.path.join(self.path, META_FILE), json.dumps({
+            'version': version,
+            'matrixFile': matrix_file,
+            'dtype': DTYPE,
+            'rows': rows,
+            'columns': cols,
+            'capacity': capacity,
+            'watermark': watermark,
+            'updatedAt': datetime.utcnow().isoformat(),
+        }, indent=2))
+
+        if old_file:
+            try:
+                # Açık memmap'ler (Linux/macOS) eski dosyayı okumaya devam eder
+                os.remove(os.path.join(self.path, old_file))
+            except OSError as e:
+                logging.warning(f"Eski matris dosyası silinemedi ({old_file}): {e}")
+
+        added = rows - old_rows
+        return len(updates) - added, added
@@ -0,0 +1,200 @@
+# benchmarks/bench_crawl.py
+"""Sanal zamanlı tam lig taraması simülasyonu
+
+Gerçek FBRefScraper.scrape_all_leagues akışını (retry, 429 backoff, Selenium
+fallback ve oyuncular/ligler arası beklemeler dahil) ağ erişimi ve gerçek
+bekleme olmadan çalıştırır. Tüm beklemeler VirtualClock üzerinden geçer; ağ
+gecikmesi sahte sunucudaki dağılımlarla sanal saate eklenir. Böylece saatler
+sürecek bir tarama birkaç saniyede simüle edilir ve rate limiting kararları
+kontrol edilebilir.
+
+Kullanım:
+    python -m benchmarks.bench_crawl --players 50
+    python -m benchmarks.bench_crawl --players 100 --latency lognormal:-1.5,0.5 --rate-429 0.05 --client-rate 0.5
+"""
+import argparse
+import json
+import logging
+import random
+import time
+from collections import defaultdict
+
+from benchmarks.fake_fbref_server import ClientRateLimiter, parse_latency
+from main import FBRefScraper
+from models.memory_database import MemoryDatabase
+from monitoring.instrumentation import percentile
+from scrapers.clock import VirtualClock
+from scrapers.page_corpus import PageCorpus
+
+LEAGUE_NAME = 'Premier League'
+
+
+class SimulatedResponse:
+    def __init__(self, status_code, content, headers=None):
+        self.status_code = status_code
+        self.content = content
+        self.headers = headers or {}
+
+
+class SimulatedTransport:
+    """Sahte sunucu davranışını süreç içinde, sanal saat üzerinde taklit eder"""
+
+    def __init__(self, clock, corpus=None, latency=None, rate_403=0.0, rate_429=0.0,
+                 client_rate=0.0, client_burst=1, selenium_latency='fixed:2.0'):
+        self.clock = clock
+        self.corpus = corpus or PageCorpus()
+        self.latency = parse_latency(latency)
+        self.selenium_latency = parse_latency(selenium_latency)
+        self.rate_403 = rate_403
+        self.rate_429 = rate_429
+        self.rate_limiter = ClientRateLimiter(client_rate, client_burst, clock=clock)
+        self.status = defaultdict(int)
+        self.request_times = []
+
+    def respond(self, url, latency):
+        self.clock.advance(latency())
+        self.request_times.append(self.clock.monotonic())
+
+        if not self.rate_limiter.allow('client'):
+            status, body = 429, b'Too Many Requests'
+        elif self.rate_429 and random.random() < self.rate_429:
+            status, body = 429, b'Too Many Requests'
+        elif self.rate_403 and random.random() < self.rate_403:
+            status, body = 403, b'Forbidden'
+        else:
+            html = self.corpus.get_html(url)
+            status, body = (200, html) if html is not None else (404, b'Not Found')
+
+        self.status[status] += 1
+        return SimulatedResponse(status, body)
+
+
+class SimulatedSession:
+    """requests.Session yerine geçen, yanıtları SimulatedTransport'tan alan oturum"""
+
+    def __init__(self, transport):
+        self.transport = transport
+        self.headers = {}
+        self.max_redirects = 5
+
+    def get(self, url, timeout=None, allow_redirects=True):
+        return self.transport.respond(url, self.transport.latency)
+
+    def close(self):
+        pass
+
+
+class SimulatedDriver:
+    """Selenium fallback yolu için sahte WebDriver (403 enjeksiyonu uygulanmaz)"""
+
+    def __init__(self, transport):
+        self.transport = transport
+        self.page_source = ''
+
+    def get(self, url):
+        self.transport.clock.advance(self.transport.selenium_latency())
+        html = self.transport.corpus.get_html(url) or b''
+        self.page_source = html.decode('utf-8')
+
+    def find_element(self, by, value):
+        return self
+
+    def execute_script(self, script):
+        return None
+
+    def quit(self):
+        pass
+
+
+def install_transport(scraper, transport):
+    scraper.session = SimulatedSession(transport)
+    scraper.driver = SimulatedDriver(transport)
+    return scraper
+
+
+def run(players, latency, rate_403, rate_429, client_rate, client_burst, seed, fetch_plan=True):
+    random.seed(seed)
+    clock = VirtualClock()
+    transport = SimulatedTransport(clock, latency=latency, rate_403=rate_403, rate_429=rate_429,
+                                   client_rate=client_rate, client_burst=client_burst)
+    db = MemoryDatabase()
+
+    scraper = FBRefScraper(clock=clock, db=db)
+    install_transport(scraper.league_scraper, transport)
+    install_transport(scraper.player_scraper, transport)
+    scraper.player_scraper.planner.enabled = fetch_plan
+
+    # Lig sayfasındaki oyuncuları istenen sayıyla sınırla
+    if players:
+        get_league_players = scraper.league_scraper.get_league_players
+        scraper.league_scraper.get_league_players = lambda name: (get_league_players(name) or [])[:players]
+
+    real_start = time.perf_counter()
+    try:
+        summary = scraper.scrape_all_leagues([LEAGUE_NAME], report=False)
+    finally:
+        scraper.cleanup()
+    real_elapsed = time.perf_counter() - real_start
+
+    gaps = [b - a for a, b in zip(transport.request_times, transport.request_times[1:])]
+    sleeps = [seconds for _, seconds in clock.sleeps]
+
+    return {
+        'players_found': summary['total_players'],
+        'players_saved': summary['successful_players'],
+        'requests': sum(transport.status.values()),
+        'requests_per_player': sum(transport.status.values()) / summary['successful_players']
+        if summary['successful_players'] else 0.0,
+        'status': {str(k): v for k, v in sorted(transport.status.items())},
+        'virtual_seconds': clock.monotonic(),
+        'virtual_sleep_seconds': clock.total_slept,
+        'sleep_calls': len(sleeps),
+        'max_sleep_seconds': max(sleeps) if sleeps else 0.0,
+        'request_gap_min_s': min(gaps) if gaps else 0.0,
+        'request_gap_p50_s': percentile(gaps, 50),
+        'virtual_players_per_hour': summary['successful_players'] / clock.monotonic() * 3600
+        if clock.monotonic() else 0.0,
+        'real_seconds': real_elapsed,
+        'speedup': clock.monotonic() / real_elapsed if real_elapsed else 0.0,
+    }
+
+
+def print_report(result):
+    print("=" * 60)
+    print("SANAL ZAMANLI TARAMA SİMÜLASYONU")
+    print("-" * 60)
+    for key, value in result.items():
+        if isinstance(value, float):
+            print(f"{key:<28}{value:>16.2f}")
+        else:
+            print(f"{key:<28}{value!s:>16}")
+    print("=" * 60)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Sanal zamanlı lig taraması simülasyonu")
+    parser.add_argument('--players', type=int, default=50, help="Simüle edilecek oyuncu sayısı (0 = tümü)")
+    parser.add_argument('--latency', default='lognormal:-1.5,0.5', help="Ağ gecikmesi dağılımı")
+    parser.add_argument('--rate-403', type=float, default=0.0)
+    parser.add_argument('--rate-429', type=float, default=0.0)
+    parser.add_argument('--client-rate', type=float, default=0.0)
+    parser.add_argument('--client-burst', type=int, default=1)
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--no-plan', action='store_true', help="Fetch planını kapat (tüm sayfalar çekilir)")
+    parser.add_argument('--output', help="Sonucu JSON olarak kaydet")
+    args = parser.parse_args()
+
+    # Scraper logları ölçümü etkilemesin
+    logging.disable(logging.CRITICAL)
+
+    result = run(args.players, args.latency, args.rate_403, args.rate_429,
+                 args.client_rate, args.client_burst, args.seed, fetch_plan=not args.no_plan)
+    print_report(result)
+
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(result, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
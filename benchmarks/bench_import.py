@@ -0,0 +1,128 @@
+# benchmarks/bench_import.py
+"""Başlangıç (import) süresi ölçümü - `python -X importtime` tabanlı
+
+Her senaryo ayrı bir Python process'inde `-X importtime` ile çalıştırılır;
+interpreter'ın kendi açılışı (site) hariç, senaryonun import ettiği
+modüllerin kümülatif süresi toplanır. Medyan değer bütçeyi aşarsa veya
+senaryoda yüklenmemesi gereken ağır bir modül (selenium, bs4 ...) import
+edilmişse çıkış kodu 1 olur.
+
+Kullanım:
+    python -m benchmarks.bench_import
+    python -m benchmarks.bench_import --repeat 10 --budget-scale 0.5 --top 15
+"""
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+SCRAPER_MODULES = ('selenium', 'webdriver_manager', 'fake_useragent', 'bs4')
+
+# (isim, çalıştırılacak kod, bütçe ms, yüklenmemesi gereken modüller)
+SCENARIOS = [
+    # Kullanım bilgisi, --corpus ve tüm komutların ortak başlangıcı
+    ('main', 'import main', 150,
+     SCRAPER_MODULES + ('requests', 'pymongo', 'scrapers.base_scraper')),
+    # stats / queue / enqueue / indexes: sadece veritabanı
+    ('db-komutları', 'import main, models.database', 500,
+     SCRAPER_MODULES + ('requests', 'scrapers.base_scraper')),
+    # player / league: scraper'lar oluşturulur ama Selenium ve fake_useragent ilk istekte yüklenir
+    ('scraper-komutları', 'import main, models.database, scrapers.league_scraper, scrapers.player_scraper', 800,
+     ('selenium', 'webdriver_manager', 'fake_useragent')),
+]
+
+
+def parse_importtime(stderr):
+    """-X importtime çıktısı -> [(modül, öz us, kümülatif us, seviye), ...]"""
+    rows = []
+    for line in stderr.splitlines():
+        if not line.startswith('import time:') or 'imported package' in line:
+            continue
+        self_us, cumulative_us, name = line[len('import time:'):].split('|', 2)
+        level = (len(name) - len(name.lstrip(' ')) - 1) // 2
+        rows.append((name.strip(), int(self_us), int(cumulative_us), level))
+    return rows
+
+
+def scenario_total(rows):
+    """site'tan sonraki en üst seviye importların kümülatif toplamı (saniye)"""
+    names = [row[0] for row in rows]
+    start = names.index('site') + 1 if 'site' in names else 0
+    return sum(cumulative for _, _, cumulative, level in rows[start:] if level == 0) / 1e6
+
+
+def run_scenario(code):
+    result = subprocess.run([sys.executable, '-X', 'importtime', '-c', code],
+                            cwd=PROJECT_ROOT, capture_output=True, text=True)
+    if result.returncode != 0:
+        raise RuntimeError(f"Senaryo çalıştırılamadı ({code}):\n{result.stderr[-2000:]}")
+    return parse_importtime(result.stderr)
+
+
+def measure_usage(repeat):
+    """`python main.py` (kullanım bilgisi) process'inin duvar saati süresi"""
+    durations = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        subprocess.run([sys.executable, 'main.py'], cwd=PROJECT_ROOT, capture_output=True)
+        durations.append(time.perf_counter() - start)
+    return statistics.median(durations)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Import süresi ölçümü ve bütçe kontrolü")
+    parser.add_argument('--repeat', type=int, default=5, help="Senaryo başına tekrar (medyan alınır)")
+    parser.add_argument('--budget-scale', type=float, default=1.0, help="Tüm bütçeleri bu katsayıyla çarp")
+    parser.add_argument('--top', type=int, default=10, help="En yavaş modül sayısı (öz süreye göre)")
+    args = parser.parse_args()
+
+    # .pyc dosyaları oluşsun; ilk derleme ölçüme girmesin
+    for _, code, _, _ in SCENARIOS:
+        run_scenario(code)
+
+    failed = False
+    print("=" * 78)
+    print(f"{'senaryo':<20}{'medyan ms':>11}{'en iyi ms':>11}{'bütçe ms':>10}  durum")
+    print("-" * 78)
+
+    slowest = {}
+    for name, code, budget_ms, forbidden in SCENARIOS:
+        totals = []
+        loaded = set()
+        for _ in range(args.repeat):
+            rows = run_scenario(code)
+            totals.append(scenario_total(rows))
+            loaded.update(row[0] for row in rows)
+            slowest = {row[0]: row[1] for row in rows}
+
+        budget = budget_ms * args.budget_scale
+        median_ms = statistics.median(totals) * 1000
+        leaked = [f for f in forbidden if any(m == f or m.startswith(f + '.') for m in loaded)]
+
+        status = 'OK'
+        if median_ms > budget:
+            status = 'BÜTÇE AŞILDI'
+        if leaked:
+            status = f"YÜKLENMEMELİ: {', '.join(leaked)}"
+        failed = failed or status != 'OK'
+
+        print(f"{name:<20}{median_ms:>11.1f}{min(totals) * 1000:>11.1f}{budget:>10.0f}  {status}")
+
+    print("-" * 78)
+    print(f"`python main.py` (kullanım) toplam süre: {measure_usage(args.repeat) * 1000:.0f} ms")
+
+    if args.top:
+        print(f"\nEn yavaş {args.top} modül (son senaryo, öz süre):")
+        for module, self_us in sorted(slowest.items(), key=lambda item: item[1], reverse=True)[:args.top]:
+            print(f"  {self_us / 1000:>8.1f} ms  {module}")
+    print("=" * 78)
+
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,213 @@
+# benchmarks/bench_indexes.py
+"""Scout sorgu karışımı: eski index'ler ile yönetilen index seti (models/indexes.py)
+
+Geçici bir MongoDB koleksiyonuna sentetik oyuncular (varsayılan 100k) yazılır;
+pozisyon, kontrat bitişi ve lig dakikaları her oyuncu için rastgele verilir.
+Aynı sorgu karışımı iki index setiyle çalıştırılır:
+
+    - eski: fbrefId (unique), name, team, league, updatedAt
+    - yönetilen: PLAYER_INDEXES (compound, covered ve partial index'ler)
+
+Her sorgu için explain() planı (aşamalar ve kullanılan index), incelenen
+key/doküman sayısı ve gecikme p50/p95 raporlanır. Sorgular DatabaseManager
+metotlarının (search_players, list_players, expiring_contracts) ürettiği
+sorgularla aynı biçimdedir.
+
+Kullanım:
+    python -m benchmarks.bench_indexes
+    python -m benchmarks.bench_indexes --players 20000 --lean --repeat 50
+"""
+import argparse
+import logging
+import random
+import sys
+import time
+from datetime import datetime
+
+from pymongo import ASCENDING, DESCENDING, MongoClient
+
+from benchmarks.synthetic_players import corpus_templates, make_player
+from config.leagues import TOP5_LEAGUES
+from config.settings import Settings
+from models.indexes import LIST_VIEW_PROJECTION, query_fields, sync_indexes
+from monitoring.instrumentation import percentile
+
+COLLECTION = 'bench_indexes_players'
+
+LEGACY_INDEXES = [
+    {"keys": [("fbrefId", ASCENDING)], "options": {"unique": True}},
+    {"keys": [("name", ASCENDING)], "options": {}},
+    {"keys": [("team", ASCENDING)], "options": {}},
+    {"keys": [("league", ASCENDING)], "options": {}},
+    {"keys": [("updatedAt", ASCENDING)], "options": {}},
+]
+
+POSITIONS = ['GK', 'DF (CB)', 'DF (FB)', 'MF (DM)', 'MF (CM)', 'MF (AM)', 'FW (AM-WM)', 'FW (CF)']
+MONTHS = ['June 30', 'January 31', 'December 31']
+
+
+def scout_player(index, rng, templates, lean):
+    doc = make_player(index, rng, templates)
+    doc['detailedPosition'] = rng.choice(POSITIONS)
+    doc['contractEnd'] = f"{rng.choice(MONTHS)}, {rng.randint(2025, 2030)}" if rng.random() < 0.85 else ''
+    doc['leagueStats'] = {'matches': rng.randint(0, 38), 'minutes': rng.randint(0, 3420)}
+    doc.update(query_fields(doc))
+    if lean:
+        doc.pop('seasonStats', None)
+        doc.pop('scoutingReport', None)
+    return doc
+
+
+def populate(collection, players, seed, lean):
+    rng = random.Random(seed)
+    templates = corpus_templates()
+    batch = []
+    for index in range(players):
+        batch.append(scout_player(index, rng, templates, lean))
+        if len(batch) >= 1000:
+            collection.insert_many(batch, ordered=False)
+            batch = []
+    if batch:
+        collection.insert_many(batch, ordered=False)
+
+
+def query_mix(sample):
+    """(isim, find argümanları) - sample: koleksiyondan alınmış gerçek değerler"""
+    league = sample['league']
+    return [
+        ("lig + pozisyon + yaş, dakika sıralı", dict(
+            filter={"league": league, "positionGroup": "CM", "age": {"$gte": 21, "$lte": 25}},
+            projection=LIST_VIEW_PROJECTION, sort=[("leagueStats.minutes", DESCENDING)], limit=50)),
+        ("top5 + pozisyon + yaş, dakika sıralı", dict(
+            filter={"league": {"$in": list(TOP5_LEAGUES)}, "positionGroup": "FW", "age": {"$lte": 23}},
+            projection=LIST_VIEW_PROJECTION, sort=[("leagueStats.minutes", DESCENDING)], limit=50)),
+        ("lig listesi, dakika sıralı", dict(
+            filter={"league": league}, projection=LIST_VIEW_PROJECTION,
+            sort=[("leagueStats.minutes", DESCENDING)], limit=50)),
+        ("lig listesi, 3. sayfa", dict(
+            filter={"league": league}, projection=LIST_VIEW_PROJECTION,
+            sort=[("leagueStats.minutes", DESCENDING)], skip=100, limit=50)),
+        ("kontrat < 2026-01-01", dict(
+            filter={"contractExpiresAt": {"$type": "date", "$lt": datetime(2026, 1, 1)}},
+            projection=dict(LIST_VIEW_PROJECTION, contractExpiresAt=1),
+            sort=[("contractExpiresAt", ASCENDING)], limit=200)),
+        ("kontrat < 2026-07-01 + lig", dict(
+            filter={"contractExpiresAt": {"$type": "date", "$lt": datetime(2026, 7, 1)}, "league": league},
+            projection=dict(LIST_VIEW_PROJECTION, contractExpiresAt=1),
+            sort=[("contractExpiresAt", ASCENDING)])),
+        ("takım kadrosu", dict(
+            filter={"team": sample['team']}, projection=LIST_VIEW_PROJECTION, sort=[("fullName", ASCENDING)])),
+        ("isimle arama", dict(filter={"fullName": sample['fullName']}, projection=LIST_VIEW_PROJECTION)),
+        ("fbrefId ile oyuncu", dict(filter={"fbrefId": sample['fbrefId']})),
+    ]
+
+
+def _stages(plan):
+    """Kazanan plan ağacı -> 'LIMIT > PROJECTION_COVERED > IXSCAN(index)'"""
+    stages = []
+    while plan:
+        stage = plan.get('stage', '?')
+        if plan.get('indexName'):
+            stage = f"{stage}({plan['indexName']})"
+        stages.append(stage)
+        children = plan.get('inputStages')
+        if children:
+            stages.append(f"[{' | '.join(_stages(child) for child in children)}]")
+            break
+        plan = plan.get('inputStage')
+    return ' > '.join(stages)
+
+
+def explain(collection, kwargs):
+    cursor = collection.find(**kwargs)
+    result = cursor.explain()
+    planner = result.get('queryPlanner', {})
+    winning = planner.get('winningPlan', {})
+    winning = winning.get('queryPlan', winning)  # SBE motoru planı bir seviye içeride döndürür
+    stats = result.get('executionStats', {})
+    return {
+        'plan': _stages(winning),
+        'keys': stats.get('totalKeysExamined', 0),
+        'docs': stats.get('totalDocsExamined', 0),
+        'returned': stats.get('nReturned', 0),
+    }
+
+
+def measure(collection, queries, repeat):
+    rows = []
+    for name, kwargs in queries:
+        latencies = []
+        for _ in range(repeat):
+            start = time.perf_counter()
+            list(collection.find(**kwargs))
+            latencies.append(time.perf_counter() - start)
+        row = explain(collection, kwargs)
+        row.update(name=name, p50=percentile(latencies, 50), p95=percentile(latencies, 95))
+        rows.append(row)
+    return rows
+
+
+def print_phase(title, rows):
+    print("-" * 100)
+    print(title)
+    print(f"{'sorgu':<38}{'p50 ms':>9}{'p95 ms':>9}{'key':>9}{'doküman':>9}{'dönen':>7}")
+    for row in rows:
+        print(f"{row['name']:<38}{row['p50'] * 1000:>9.2f}{row['p95'] * 1000:>9.2f}"
+              f"{row['keys']:>9}{row['docs']:>9}{row['returned']:>7}")
+        print(f"    {row['plan']}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Scout sorgu karışımı: eski ve yönetilen index setleri")
+    parser.add_argument('--players', type=int, default=100000)
+    parser.add_argument('--repeat', type=int, default=20)
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--lean', action='store_true', help="seasonStats/scoutingReport olmadan yaz (hızlı kurulum)")
+    parser.add_argument('--keep', action='store_true', help="Koleksiyonu sonunda silme")
+    args = parser.parse_args()
+
+    logging.disable(logging.INFO)
+    client = MongoClient(Settings.MONGODB_URI, serverSelectionTimeoutMS=5000)
+    try:
+        client.admin.command('ping')
+    except Exception as e:
+        print(f"MongoDB'ye bağlanılamadı: {e}")
+        sys.exit(1)
+
+    collection = client[Settings.MONGODB_DB_NAME][COLLECTION]
+    collection.drop()
+    try:
+        start = time.perf_counter()
+        populate(collection, args.players, args.seed, args.lean)
+        populate_s = time.perf_counter() - start
+        sample = collection.find_one({"team": {"$exists": True}}, skip=args.players // 2)
+        queries = query_mix(sample)
+
+        sync_indexes(collection, LEGACY_INDEXES, drop_unmanaged=True)
+        legacy = measure(collection, queries, args.repeat)
+
+        start = time.perf_counter()
+        sync_indexes(collection, drop_unmanaged=True)
+        build_s = time.perf_counter() - start
+        managed = measure(collection, queries, args.repeat)
+        index_mb = client[Settings.MONGODB_DB_NAME].command('collStats', COLLECTION)['totalIndexSize'] / 1024 / 1024
+
+        print("=" * 100)
+        print(f"SCOUT SORGU KARIŞIMI ({args.players} oyuncu{', lean' if args.lean else ''}; "
+              f"yazma {populate_s:.1f}s, yönetilen index kurulumu {build_s:.1f}s, index boyutu {index_mb:.1f} MB)")
+        print_phase("eski index'ler", legacy)
+        print_phase("yönetilen index seti", managed)
+        print("-" * 100)
+        print(f"{'sorgu':<38}{'p50 hızlanma':>14}{'doküman (eski -> yeni)':>26}")
+        for old, new in zip(legacy, managed):
+            speedup = old['p50'] / new['p50'] if new['p50'] else 0.0
+            print(f"{old['name']:<38}{speedup:>13.1f}x{old['docs']:>14} -> {new['docs']:<9}")
+        print("=" * 100)
+    finally:
+        if not args.keep:
+            collection.drop()
+        client.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,191 @@
+# benchmarks/bench_player_record.py
+"""Oyuncu koleksiyonu bellek temsilleri: dict listesi vs PlayerRecord
+
+Koleksiyonun tamamı (veya sentetik oyuncular) iki temsile yüklenir:
+
+    dict      : Mongo'dan okunduğu haliyle dokümanlar
+    record    : PlayerRecord (__slots__ + şema konumlu float tamponları)
+
+Her temsil için tracemalloc ile tutulan bellek ve yükleme süresi, ardından
+aynı analiz işlerinin süreleri ölçülür (record temsilinde bir kez kurulan
+NumPy matrisi üzerinden de). Dönüşümün kayıpsız olduğu (to_dict == doküman)
+kontrol edilir.
+
+Kullanım:
+    python -m benchmarks.bench_player_record
+    python -m benchmarks.bench_player_record --players 20000 --repeat 5
+    python -m benchmarks.bench_player_record --source mongo
+"""
+import argparse
+import gc
+import pickle
+import statistics
+import sys
+import time
+import tracemalloc
+
+from benchmarks.synthetic_players import corpus_templates, iter_players
+from models.player_record import PlayerRecord, StatSchema, stat_matrix
+
+MIN_MINUTES = 900
+
+
+def document_source(source, players, seed):
+    """Her çağrıda baştan okunan doküman iterator'ı üreten fonksiyon
+
+    Sentetik oyuncular bir kez üretilip serileştirilir; okuma (pickle.loads)
+    Mongo cursor'ının BSON çözmesine benzer ve üretim maliyeti ölçüme girmez.
+    """
+    if source == 'mongo':
+        from models.database import DatabaseManager
+        collection = DatabaseManager().collection
+        return lambda: collection.find({}, limit=players or 0)
+
+    corpus_templates()
+    raw = [pickle.dumps(doc) for doc in iter_players(players, seed)]
+    return lambda: map(pickle.loads, raw)
+
+
+def measure_load(build):
+    """(sonuç, tutulan bayt, saniye)
+
+    Süre tracemalloc kapalıyken ölçülür (ek yükü vardır); bellek ikinci bir
+    yüklemede sadece kalıcı olarak tutulan kısım olarak ölçülür.
+    """
+    start = time.perf_counter()
+    result = build()
+    elapsed = time.perf_counter() - start
+    del result
+
+    gc.collect()
+    tracemalloc.start()
+    result = build()
+    gc.collect()
+    retained, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return result, retained, elapsed
+
+
+def best_of(repeat, func):
+    durations = []
+    value = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        value = func()
+        durations.append(time.perf_counter() - start)
+    return min(durations), statistics.median(durations), value
+
+
+# --- Analiz işleri (her temsil için aynı sonuç) ---
+
+def goals_per90_dicts(docs):
+    total = count = 0
+    for doc in docs:
+        stats = doc.get('seasonStats') or {}
+        minutes = stats.get('minutesPlayed')
+        if isinstance(minutes, (int, float)) and minutes >= MIN_MINUTES:
+            total += (stats.get('goals') or 0) / minutes * 90
+            count += 1
+    return total / count if count else 0.0
+
+
+def goals_per90_records(records):
+    total = count = 0
+    for record in records:
+        minutes = record.season_stat('minutesPlayed')
+        if isinstance(minutes, (int, float)) and minutes >= MIN_MINUTES:
+            total += (record.season_stat('goals') or 0) / minutes * 90
+            count += 1
+    return total / count if count else 0.0
+
+
+def goals_per90_numpy(matrix, names):
+    import numpy as np
+
+    minutes = matrix[:, names.index('minutesPlayed')]
+    goals = np.nan_to_num(matrix[:, names.index('goals')])
+    mask = minutes >= MIN_MINUTES
+    return float((goals[mask] / minutes[mask] * 90).mean()) if mask.any() else 0.0
+
+
+def percentile_mean_dicts(docs):
+    sums = {}
+    for doc in docs:
+        for name, entry in (doc.get('scoutingReport') or {}).items():
+            value = entry.get('percentile') if isinstance(entry, dict) else None
+            if isinstance(value, (int, float)):
+                total, count = sums.get(name, (0, 0))
+                sums[name] = (total + value, count + 1)
+    return {name: total / count for name, (total, count) in sums.items()}
+
+
+def percentile_mean_numpy(records):
+    import numpy as np
+
+    _, matrix, names = stat_matrix(records, 'percentile')
+    counts = (~np.isnan(matrix)).sum(axis=0)
+    totals = np.nansum(matrix, axis=0)
+    return {name: float(totals[i] / counts[i]) for i, name in enumerate(names) if counts[i]}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Oyuncu temsilleri bellek ve iterasyon ölçümü")
+    parser.add_argument('--source', choices=('synthetic', 'mongo'), default='synthetic')
+    parser.add_argument('--players', type=int, default=10000, help="Oyuncu sayısı (mongo için 0 = tümü)")
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('--seed', type=int, default=42)
+    args = parser.parse_args()
+
+    read_documents = document_source(args.source, args.players, args.seed)
+
+    docs, dict_bytes, dict_seconds = measure_load(lambda: list(read_documents()))
+    if not docs:
+        print("Ölçülecek oyuncu yok")
+        sys.exit(1)
+
+    # Kayıtlar akış halinde dönüştürülür; dict listesi hiç oluşmaz
+    season_schema, scouting_schema = StatSchema(), StatSchema()
+    records, record_bytes, record_seconds = measure_load(lambda: [
+        PlayerRecord.from_dict(doc, season_schema, scouting_schema) for doc in read_documents()
+    ])
+    _, season_matrix, season_names = stat_matrix(records)
+
+    lossless = all(record.to_dict() == doc for record, doc in zip(records, docs))
+
+    jobs = [
+        ('goals/90 (dict)', lambda: goals_per90_dicts(docs)),
+        ('goals/90 (record)', lambda: goals_per90_records(records)),
+        ('goals/90 (numpy)', lambda: goals_per90_numpy(season_matrix, season_names)),
+        ('stat_matrix (record)', lambda: stat_matrix(records)),
+        ('percentile ort. (dict)', lambda: percentile_mean_dicts(docs)),
+        ('percentile ort. (numpy)', lambda: percentile_mean_numpy(records)),
+        ('to_dict (record)', lambda: [record.to_dict() for record in records]),
+    ]
+
+    print("=" * 66)
+    print(f"OYUNCU TEMSİLLERİ ({len(docs)} oyuncu, kaynak: {args.source})")
+    print("-" * 66)
+    print(f"{'temsil':<24}{'bellek MB':>12}{'bayt/oyuncu':>14}{'yükleme s':>12}")
+    for name, retained, seconds in (('dict', dict_bytes, dict_seconds), ('record', record_bytes, record_seconds)):
+        print(f"{name:<24}{retained / 1024 / 1024:>12.1f}{retained / len(docs):>14.0f}{seconds:>12.2f}")
+    print(f"bellek oranı (dict/record): {dict_bytes / record_bytes:.1f}x   "
+          f"şema: {len(season_schema)} sezon + {len(scouting_schema)} scouting stat")
+    print(f"kayıpsız dönüşüm: {'OK' if lossless else 'HATA'}")
+    print("-" * 66)
+    print(f"{'iş':<28}{'en iyi ms':>12}{'medyan ms':>12}")
+    results = {}
+    for name, func in jobs:
+        best, median, results[name] = best_of(args.repeat, func)
+        print(f"{name:<28}{best * 1000:>12.1f}{median * 1000:>12.1f}")
+    print("=" * 66)
+
+    # Temsiller aynı sonucu vermeli
+    consistent = abs(results['goals/90 (dict)'] - results['goals/90 (numpy)']) < 1e-9 and \
+        results['goals/90 (dict)'] == results['goals/90 (record)']
+    if not lossless or not consistent:
+        print("UYARI: temsiller arasında fark var")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
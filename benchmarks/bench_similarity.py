@@ -0,0 +1,127 @@
+# benchmarks/bench_similarity.py
+"""Benzer oyuncu indeksi: sorgu gecikmesi, küme budaması ve toplu hesap
+
+Sentetik oyunculara (corpus şablonları tek pozisyonda olduğu için) rastgele
+pozisyon atanır ve SimilarityIndex kurulur. Ölçülenler:
+
+    - İndeks kurma süresi (brute force ve k-means kümeli)
+    - Tek oyuncu sorgusu gecikmesi (p50 / p95 / p99), filtreli ve filtresiz
+    - Kümeli sorguda taranan küme sayısına (probe) göre recall@k
+      (brute force sonuçlarına göre)
+    - Tüm oyuncular için toplu k-NN (neighbours_all) süresi
+
+Kullanım:
+    python -m benchmarks.bench_similarity
+    python -m benchmarks.bench_similarity --players 20000 --queries 500 --probes 2,4,8
+"""
+import argparse
+import logging
+import random
+import statistics
+import time
+
+from benchmarks.synthetic_players import iter_players
+from analytics.similarity import SimilarityIndex
+
+# Pozisyon -> ağırlık (kadrolardaki yaklaşık dağılım)
+POSITIONS = {
+    'GK': 2, 'DF (CB)': 4, 'DF (FB)': 4, 'MF (DM)': 2, 'MF': 3, 'MF (AM-WM)': 3, 'FW': 3,
+}
+
+
+def make_players(count, seed):
+    rng = random.Random(seed)
+    positions, weights = list(POSITIONS), list(POSITIONS.values())
+    players = []
+    for player in iter_players(count, seed):
+        player['detailedPosition'] = rng.choices(positions, weights)[0]
+        players.append(player)
+    return players
+
+
+def latencies(index, query_ids, k, **options):
+    durations = []
+    results = {}
+    for fbref_id in query_ids:
+        start = time.perf_counter()
+        results[fbref_id] = index.query(fbref_id, k, **options)
+        durations.append(time.perf_counter() - start)
+    durations.sort()
+
+    def percentile(p):
+        return durations[min(len(durations) - 1, int(len(durations) * p))] * 1000
+
+    return {'p50': statistics.median(durations) * 1000, 'p95': percentile(0.95), 'p99': percentile(0.99)}, results
+
+
+def recall(expected, actual):
+    hits = total = 0
+    for fbref_id, entries in expected.items():
+        truth = {entry['fbrefId'] for entry in entries}
+        hits += len(truth & {entry['fbrefId'] for entry in actual[fbref_id]})
+        total += len(truth)
+    return hits / total if total else 1.0
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benzer oyuncu indeksi sorgu gecikmesi ölçümü")
+    parser.add_argument('--players', type=int, default=50000)
+    parser.add_argument('--queries', type=int, default=300)
+    parser.add_argument('--k', type=int, default=10)
+    parser.add_argument('--probes', default='2,4,8,16', help="Kümeli sorguda denenecek probe değerleri")
+    parser.add_argument('--seed', type=int, default=42)
+    args = parser.parse_args()
+
+    logging.disable(logging.INFO)
+    start = time.perf_counter()
+    players = make_players(args.players, args.seed)
+    generate_s = time.perf_counter() - start
+
+    start = time.perf_counter()
+    brute = SimilarityIndex(clusters=0).build(players)
+    brute_build_s = time.perf_counter() - start
+
+    start = time.perf_counter()
+    clustered = SimilarityIndex(clusters=-1).build(players)
+    clustered_build_s = time.perf_counter() - start
+    del players
+
+    rng = random.Random(args.seed)
+    query_ids = rng.sample(brute.ids, min(args.queries, len(brute.ids)))
+    league_filter = {'league': ['Premier League', 'La Liga', 'Serie A'], 'max_age': 25}
+
+    rows = []
+    brute_stats, truth = latencies(brute, query_ids, args.k)
+    rows.append(('brute force', brute_stats, 1.0))
+    filtered_stats, filtered_truth = latencies(brute, query_ids, args.k, **league_filter)
+    rows.append(('brute force + filtre', filtered_stats, 1.0))
+
+    for probe in [int(value) for value in args.probes.split(',') if value.strip()]:
+        stats, results = latencies(clustered, query_ids, args.k, probe=probe)
+        rows.append((f"küme, probe={probe}", stats, recall(truth, results)))
+    stats, results = latencies(clustered, query_ids, args.k, probe=int(args.probes.split(',')[-1]),
+                               **league_filter)
+    rows.append((f"küme + filtre, probe={args.probes.split(',')[-1]}", stats, recall(filtered_truth, results)))
+
+    start = time.perf_counter()
+    neighbours = brute.neighbours_all(args.k)
+    batch_s = time.perf_counter() - start
+
+    groups = ', '.join(f"{group} {len(gi.rows)}" for group, gi in brute.groups.items())
+    print("=" * 72)
+    print(f"BENZER OYUNCU İNDEKSİ ({len(brute)} oyuncu, k={args.k}, {len(query_ids)} sorgu)")
+    print(f"gruplar: {groups}")
+    print(f"üretim {generate_s:.1f}s, kurma: brute {brute_build_s:.1f}s, kümeli {clustered_build_s:.1f}s "
+          f"({sum(len(gi.centroids) for gi in clustered.groups.values() if gi.centroids is not None)} küme)")
+    print("-" * 72)
+    print(f"{'sorgu':<30}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}{'recall@k':>12}")
+    for name, stats, rate in rows:
+        print(f"{name:<30}{stats['p50']:>10.2f}{stats['p95']:>10.2f}{stats['p99']:>10.2f}{rate:>12.3f}")
+    print("-" * 72)
+    print(f"toplu k-NN (neighbours_all): {len(neighbours)} oyuncu, {batch_s:.1f}s "
+          f"({batch_s / max(1, len(neighbours)) * 1e6:.0f} µs/oyuncu)")
+    print("=" * 72)
+
+
+if __name__ == "__main__":
+    main()
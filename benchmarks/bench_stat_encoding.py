@@ -0,0 +1,131 @@
+# benchmarks/bench_stat_encoding.py
+"""İstatistik saklama biçimleri: dict (isim -> değer) vs schema (packedStats)
+
+Sentetik oyuncular iki biçimde BSON'a çevrilir ve karşılaştırılır:
+
+    - Doküman boyutu (ham ve zlib ile sıkıştırılmış - WiredTiger blok
+      sıkıştırmasının kabaca karşılığı)
+    - BSON encode / decode hızı (ağ ve sürücü maliyeti)
+    - Okuma yolu: BSON decode + StatCodec.decode (get_player'ın yaptığı iş)
+
+--mongo ile iki biçim geçici koleksiyonlara yazılır; collStats boyutları ve
+tam tarama süreleri de ölçülür, ardından koleksiyonlar silinir.
+
+Kullanım:
+    python -m benchmarks.bench_stat_encoding
+    python -m benchmarks.bench_stat_encoding --players 20000 --repeat 5
+    python -m benchmarks.bench_stat_encoding --players 5000 --mongo
+"""
+import argparse
+import statistics
+import sys
+import time
+import zlib
+
+import bson
+
+from benchmarks.synthetic_players import iter_players
+from models.stat_codec import StatCodec
+
+
+def timed(repeat, func):
+    durations = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        durations.append(time.perf_counter() - start)
+    return min(durations), statistics.median(durations)
+
+
+def measure_layout(name, docs, decode, repeat):
+    encoded = [bson.encode(doc) for doc in docs]
+    raw_bytes = sum(len(data) for data in encoded)
+    compressed_bytes = sum(len(zlib.compress(data, 1)) for data in encoded)
+
+    encode_s, _ = timed(repeat, lambda: [bson.encode(doc) for doc in docs])
+    decode_s, _ = timed(repeat, lambda: [bson.decode(data) for data in encoded])
+    read_s, _ = timed(repeat, lambda: [decode(bson.decode(data)) for data in encoded])
+
+    return {
+        'name': name,
+        'avg_bytes': raw_bytes / len(docs),
+        'total_mb': raw_bytes / 1024 / 1024,
+        'compressed_mb': compressed_bytes / 1024 / 1024,
+        'encode_docs_s': len(docs) / encode_s,
+        'decode_docs_s': len(docs) / decode_s,
+        'read_docs_s': len(docs) / read_s,
+    }
+
+
+def measure_mongo(layouts, codec, repeat):
+    """Geçici koleksiyonlara yazıp collStats ve tam tarama süresini ölçer"""
+    from pymongo import MongoClient
+    from config.settings import Settings
+
+    client = MongoClient(Settings.MONGODB_URI, serverSelectionTimeoutMS=5000)
+    db = client[Settings.MONGODB_DB_NAME]
+    results = {}
+    try:
+        for name, docs, decode in layouts:
+            collection = db[f"bench_stat_encoding_{name}"]
+            collection.drop()
+            for start in range(0, len(docs), 1000):
+                collection.insert_many([dict(doc) for doc in docs[start:start + 1000]], ordered=False)
+
+            stats = db.command('collStats', collection.name)
+            scan_s, _ = timed(repeat, lambda: [decode(doc) for doc in collection.find({})])
+            results[name] = {
+                'size_mb': stats['size'] / 1024 / 1024,
+                'storage_mb': stats['storageSize'] / 1024 / 1024,
+                'scan_docs_s': len(docs) / scan_s,
+            }
+            collection.drop()
+    finally:
+        client.close()
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="İstatistik saklama biçimleri boyut ve hız karşılaştırması")
+    parser.add_argument('--players', type=int, default=10000)
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--mongo', action='store_true', help="MongoDB'ye yazıp collStats ve tarama süresini de ölç")
+    args = parser.parse_args()
+
+    docs = list(iter_players(args.players, args.seed))
+    codec = StatCodec()  # Şema sürümleri bellekte
+    packed = [codec.pack_document(doc) for doc in docs]
+
+    lossless = all(codec.decode(bson.decode(bson.encode(p))) == bson.decode(bson.encode(d))
+                   for p, d in zip(packed, docs))
+
+    layouts = [('dict', docs, lambda doc: doc), ('schema', packed, codec.decode)]
+    results = [measure_layout(name, layout_docs, decode, args.repeat) for name, layout_docs, decode in layouts]
+
+    print("=" * 78)
+    print(f"İSTATİSTİK SAKLAMA BİÇİMLERİ ({len(docs)} oyuncu, şema v{codec.version})")
+    print("-" * 78)
+    print(f"{'biçim':<8}{'ort. bayt':>11}{'toplam MB':>11}{'zlib MB':>9}"
+          f"{'encode/s':>12}{'decode/s':>12}{'okuma/s':>12}")
+    for r in results:
+        print(f"{r['name']:<8}{r['avg_bytes']:>11.0f}{r['total_mb']:>11.1f}{r['compressed_mb']:>9.1f}"
+              f"{r['encode_docs_s']:>12.0f}{r['decode_docs_s']:>12.0f}{r['read_docs_s']:>12.0f}")
+    dict_result, schema_result = results
+    print(f"boyut oranı (dict/schema): {dict_result['avg_bytes'] / schema_result['avg_bytes']:.2f}x ham, "
+          f"{dict_result['compressed_mb'] / schema_result['compressed_mb']:.2f}x sıkıştırılmış")
+    print(f"kayıpsız dönüşüm: {'OK' if lossless else 'HATA'}")
+
+    if args.mongo:
+        print("-" * 78)
+        for name, r in measure_mongo(layouts, codec, args.repeat).items():
+            print(f"{name:<8} collStats size {r['size_mb']:.1f} MB, storage {r['storage_mb']:.1f} MB, "
+                  f"tam tarama {r['scan_docs_s']:.0f} doküman/s")
+    print("=" * 78)
+
+    if not lossless:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
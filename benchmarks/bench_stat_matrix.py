@@ -0,0 +1,129 @@
+# benchmarks/bench_stat_matrix.py
+"""Diskteki oyuncu × stat matrisi: yazma, açma, artımlı güncelleme
+
+Sentetik oyuncularla geçici bir dizinde:
+
+    - Tam yazma (StatMatrixWriter.refresh(full=True))
+    - Açma (StatMatrix - memmap, veri okunmaz) ve bir sütunun ortalaması;
+      karşılaştırma için aynı hesabın doküman listesi üzerinde yapılması
+      (Mongo'dan çekme maliyeti hariç)
+    - Artımlı güncelleme: oyuncuların %1'i değişir, %0.5'i yeni
+    - Yeni stat ismi gelince daha geniş sürüme kopyalama
+
+Değerlerin dokümanlarla aynı olduğu (float32 hassasiyetinde) kontrol edilir.
+
+Kullanım:
+    python -m benchmarks.bench_stat_matrix
+    python -m benchmarks.bench_stat_matrix --players 50000
+"""
+import argparse
+import logging
+import random
+import shutil
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+from benchmarks.synthetic_players import make_player, corpus_templates, iter_players
+from analytics.stat_matrix import StatMatrix, StatMatrixWriter
+
+STAT = 'progressive_passes'
+
+
+def timed(func):
+    start = time.perf_counter()
+    value = func()
+    return time.perf_counter() - start, value
+
+
+def mean_from_docs(docs, name):
+    values = [doc['seasonStats'][name] for doc in docs
+              if isinstance((doc.get('seasonStats') or {}).get(name), (int, float))]
+    return sum(values) / len(values) if values else float('nan')
+
+
+def mean_from_matrix(matrix, name):
+    import numpy as np
+
+    return float(np.nanmean(matrix.column(name)))
+
+
+def consistent(matrix, docs):
+    import numpy as np
+
+    for doc in docs:
+        row = matrix.row(doc['fbrefId'])
+        for name, value in doc['seasonStats'].items():
+            if isinstance(value, (int, float)) and not isinstance(value, bool):
+                if row[matrix.column_index[name]] != np.float32(value):
+                    return False
+    return True
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Oyuncu × stat matrisi yazma/okuma ölçümü")
+    parser.add_argument('--players', type=int, default=20000)
+    parser.add_argument('--seed', type=int, default=42)
+    args = parser.parse_args()
+
+    logging.disable(logging.INFO)
+    docs = list(iter_players(args.players, args.seed))
+    path = tempfile.mkdtemp(prefix='stat_matrix_')
+    rows = []
+    try:
+        writer = StatMatrixWriter(path)
+        seconds, _ = timed(lambda: writer.refresh(docs, full=True))
+        rows.append(('tam yazma', seconds, f"{len(docs)} satır"))
+
+        seconds, matrix = timed(lambda: StatMatrix(path))
+        rows.append(('açma (memmap)', seconds, f"{matrix.matrix.shape[0]}×{matrix.matrix.shape[1]}"))
+        seconds, matrix_mean = timed(lambda: mean_from_matrix(matrix, STAT))
+        rows.append((f"{STAT} ort. (matris)", seconds, f"{matrix_mean:.3f}"))
+        seconds, docs_mean = timed(lambda: mean_from_docs(docs, STAT))
+        rows.append((f"{STAT} ort. (dokümanlar)", seconds, f"{docs_mean:.3f}"))
+
+        # Artımlı: %1 değişen, %0.5 yeni oyuncu
+        rng = random.Random(args.seed + 1)
+        templates = corpus_templates()
+        now = datetime.utcnow()
+        changed = rng.sample(docs, max(1, len(docs) // 100))
+        for doc in changed:
+            stats = doc['seasonStats']
+            doc['seasonStats'] = dict(stats, minutesPlayed=(stats.get('minutesPlayed') or 0) + 90)
+            doc['updatedAt'] = now
+        new_docs = [make_player(args.players + i, rng, templates) for i in range(max(1, len(docs) // 200))]
+        docs.extend(new_docs)
+        seconds, (updated, added) = timed(lambda: writer.refresh(changed + new_docs))
+        rows.append(('artımlı güncelleme', seconds, f"{updated} güncellenen, {added} yeni"))
+
+        # Yeni stat ismi: daha geniş sürüm dosyasına kopyalama
+        extra = dict(docs[0], seasonStats=dict(docs[0]['seasonStats'], new_stat=1.5),
+                     updatedAt=now + timedelta(seconds=1))
+        docs[0] = extra
+        seconds, _ = timed(lambda: writer.refresh([extra]))
+        rows.append(('yeni sütun (kopyalama)', seconds, f"sürüm {writer.load_state()[0]['version']}"))
+
+        reopened = StatMatrix(path)
+        ok = consistent(reopened, docs) and len(reopened) == len(docs)
+        old_view_ok = matrix.get(docs[1]['fbrefId'], STAT) == reopened.get(docs[1]['fbrefId'], STAT)
+
+        print("=" * 72)
+        print(f"OYUNCU × STAT MATRİSİ ({args.players} oyuncu, {path})")
+        print("-" * 72)
+        print(f"{'işlem':<38}{'ms':>10}   sonuç")
+        for name, seconds, note in rows:
+            print(f"{name:<38}{seconds * 1000:>10.1f}   {note}")
+        print("-" * 72)
+        print(f"dokümanlarla tutarlı: {'OK' if ok else 'HATA'}, "
+              f"eski açık matris okunabiliyor: {'OK' if old_view_ok else 'HATA'}")
+        print("=" * 72)
+    finally:
+        shutil.rmtree(path, ignore_errors=True)
+
+    if not ok or not old_view_ok:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,184 @@
+# benchmarks/bench_storage.py
+"""Depolama backend'leri karşılaştırması: aynı iş yükü SQLite ve MongoDB üzerinde
+
+Sentetik oyuncularla:
+
+    - Toplu upsert (bulk_upsert_players)
+    - Tekli upsert (insert_player) ve alan güncelleme (update_player_fields)
+    - Toplu alan güncelleme (bulk_update_fields)
+    - fbrefId ile okuma (get_player) - gecikme p50/p99
+    - Tam tarama ve artımlı tarama (iter_players, updated_since)
+    - Lig filtresi (get_all_players), gruplama (count_by, get_team_leagues)
+
+SQLite geçici bir dosyaya yazılır; MongoDB (--mongo) geçici bir koleksiyona
+yazılır ve sonunda silinir. İstatistik geçmişi (sadece MongoDB'de var)
+karşılaştırma eşit olsun diye kapatılır. Okunan dokümanların yazılanlarla
+aynı olduğu kontrol edilir.
+
+Kullanım:
+    python -m benchmarks.bench_storage
+    python -m benchmarks.bench_storage --players 50000 --mongo
+"""
+import argparse
+import logging
+import os
+import random
+import shutil
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+from benchmarks.synthetic_players import make_players
+from config.settings import Settings
+from monitoring.instrumentation import percentile
+
+MONGO_COLLECTION = 'bench_storage_players'
+
+
+def timed(func):
+    start = time.perf_counter()
+    value = func()
+    return time.perf_counter() - start, value
+
+
+def without_id(doc):
+    return {key: value for key, value in doc.items() if key not in ('_id', 'modifiedAt')} if doc else doc
+
+
+def run_workload(db, docs, ops, seed):
+    """İş yükünü çalıştırır: [(işlem, saniye, adet)], gecikmeler, tutarlılık"""
+    rng = random.Random(seed)
+    rows = []
+
+    seconds, written = timed(lambda: db.bulk_upsert_players(docs))
+    rows.append(('toplu upsert', seconds, written))
+
+    sample = rng.sample(docs, min(ops, len(docs)))
+    since = datetime.utcnow()  # Bundan sonra değişen oyuncular artımlı taramada bulunmalı
+    for doc in sample:
+        doc['updatedAt'] = doc['updatedAt'] + timedelta(days=400)
+        doc['seasonStats'] = dict(doc['seasonStats'], minutesPlayed=(doc['seasonStats'].get('minutesPlayed') or 0) + 90)
+    seconds, _ = timed(lambda: [db.insert_player(doc) for doc in sample])
+    rows.append(('tekli upsert', seconds, len(sample)))
+
+    league_stats = {doc['fbrefId']: {'matches': rng.randint(0, 38), 'minutes': rng.randint(0, 3420)} for doc in sample}
+    seconds, _ = timed(lambda: [db.update_player_fields(fbref_id, {'leagueStats': stats})
+                                for fbref_id, stats in league_stats.items()])
+    rows.append(('alan güncelleme', seconds, len(league_stats)))
+    for doc in sample:
+        doc['leagueStats'] = league_stats[doc['fbrefId']]
+
+    bulk = {doc['fbrefId']: {'computedScoutingReport': {'rank': rng.random()}}
+            for doc in docs[:len(docs) // 4]}
+    seconds, modified = timed(lambda: db.bulk_update_fields(bulk))
+    rows.append(('toplu alan güncelleme', seconds, modified))
+    for doc in docs[:len(docs) // 4]:
+        doc.update(bulk[doc['fbrefId']])
+
+    latencies = []
+    reads = rng.sample(docs, min(ops, len(docs)))
+    start = time.perf_counter()
+    consistent = True
+    for doc in reads:
+        read_start = time.perf_counter()
+        stored = db.get_player(doc['fbrefId'])
+        latencies.append(time.perf_counter() - read_start)
+        consistent = consistent and without_id(stored) == doc
+    rows.append(('get_player', time.perf_counter() - start, len(reads)))
+
+    seconds, count = timed(lambda: sum(1 for _ in db.iter_players(fields=['fbrefId', 'seasonStats'])))
+    rows.append(('tam tarama (seasonStats)', seconds, count))
+    consistent = consistent and count == len(docs)
+
+    changed = {doc['fbrefId'] for doc in sample} | set(bulk)
+    seconds, count = timed(lambda: sum(1 for _ in db.iter_players(updated_since=since, fields=['fbrefId'])))
+    rows.append(('artımlı tarama (modifiedAt)', seconds, count))
+    consistent = consistent and count == len(changed)
+
+    league = docs[0]['league']
+    seconds, players = timed(lambda: db.get_all_players(league, fields=['fbrefId', 'fullName', 'age']))
+    rows.append((f"lig filtresi ({league})", seconds, len(players)))
+    consistent = consistent and len(players) == sum(1 for doc in docs if doc['league'] == league)
+
+    seconds, counts = timed(lambda: db.count_by('league'))
+    rows.append(('count_by(league)', seconds, len(counts)))
+    consistent = consistent and sum(counts.values()) == len(docs)
+
+    seconds, teams = timed(db.get_team_leagues)
+    rows.append(('get_team_leagues', seconds, len(teams)))
+    return rows, latencies, consistent
+
+
+def print_report(name, rows, latencies, consistent):
+    print("-" * 72)
+    print(f"{name}")
+    print(f"{'işlem':<32}{'ms':>10}{'adet':>10}{'adet/s':>14}")
+    for operation, seconds, count in rows:
+        rate = count / seconds if seconds else 0.0
+        print(f"{operation:<32}{seconds * 1000:>10.1f}{count:>10}{rate:>14.0f}")
+    print(f"get_player gecikme: p50 {percentile(latencies, 50) * 1000:.3f} ms, "
+          f"p99 {percentile(latencies, 99) * 1000:.3f} ms")
+    print(f"yazılan/okunan tutarlı: {'OK' if consistent else 'HATA'}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="SQLite ve MongoDB depolama backend'leri karşılaştırması")
+    parser.add_argument('--players', type=int, default=20000)
+    parser.add_argument('--ops', type=int, default=1000, help="Tekli işlem sayısı (upsert, güncelleme, okuma)")
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--mongo', action='store_true', help="Aynı iş yükünü MongoDB'de de çalıştır")
+    args = parser.parse_args()
+
+    logging.disable(logging.INFO)
+    Settings.STAT_HISTORY_ENABLED = False
+    base_docs = make_players(args.players, args.seed)
+
+    print("=" * 72)
+    print(f"DEPOLAMA BACKEND'LERİ ({args.players} oyuncu, {args.ops} tekli işlem)")
+    ok = True
+
+    from models.sqlite_database import SQLiteDatabaseManager
+
+    directory = tempfile.mkdtemp(prefix='bench_storage_')
+    try:
+        db = SQLiteDatabaseManager(os.path.join(directory, 'players.db'))
+        rows, latencies, consistent = run_workload(db, [dict(doc) for doc in base_docs], args.ops, args.seed)
+        db.close()
+        size_mb = sum(os.path.getsize(os.path.join(directory, name)) for name in os.listdir(directory)) / 1024 / 1024
+        print_report(f"sqlite ({size_mb:.1f} MB)", rows, latencies, consistent)
+        ok = ok and consistent
+    finally:
+        shutil.rmtree(directory, ignore_errors=True)
+
+    if args.mongo:
+        from pymongo import MongoClient
+        from models.database import DatabaseManager
+
+        client = MongoClient(Settings.MONGODB_URI, serverSelectionTimeoutMS=5000)
+        try:
+            client.admin.command('ping')
+        except Exception as e:
+            print(f"MongoDB'ye bağlanılamadı, atlanıyor: {e}")
+        else:
+            db = DatabaseManager(collection=MONGO_COLLECTION)
+            db.collection.drop()
+            try:
+                rows, latencies, consistent = run_workload(db, [dict(doc) for doc in base_docs],
+                                                           args.ops, args.seed)
+                size_mb = db.db.command('collStats', MONGO_COLLECTION)['size'] / 1024 / 1024
+                print_report(f"mongo ({size_mb:.1f} MB)", rows, latencies, consistent)
+                ok = ok and consistent
+            finally:
+                db.collection.drop()
+                db.close()
+        finally:
+            client.close()
+    print("=" * 72)
+
+    if not ok:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
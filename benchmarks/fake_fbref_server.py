@@ -0,0 +1,245 @@
+# benchmarks/fake_fbref_server.py
+"""Yük ve dayanıklılık testleri için yerel sahte FBref sunucusu
+
+Kaydedilmiş corpus sayfalarını gerçek URL düzeninde sunar (/en/comps/...,
+/en/players/<id>/..., /scout/365_m1/..., /en/squads/...). Gecikme dağılımı,
+403/429 enjeksiyon oranları ve istemci başına hız sınırı ayarlanabilir.
+
+Kullanım:
+    python -m benchmarks.fake_fbref_server --port 8765 --latency lognormal:-2.5,0.6 --rate-429 0.02
+    FBREF_BASE_URL=http://127.0.0.1:8765 python main.py all
+
+Sunucu istatistikleri: GET /__stats, sıfırlama: GET /__reset
+"""
+import argparse
+import json
+import logging
+import random
+import threading
+import time
+from collections import defaultdict
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from scrapers.page_corpus import PageCorpus
+from scrapers.clock import SystemClock
+
+
+def parse_latency(spec):
+    """Gecikme dağılımı tanımını saniye üreten fonksiyona çevirir
+
+    Desteklenen biçimler: "fixed:0.05", "uniform:0.02,0.2", "lognormal:mu,sigma",
+    "exponential:ortalama". Boş veya "none" gecikme eklemez.
+    """
+    if not spec or spec == 'none':
+        return lambda: 0.0
+
+    kind, _, params = spec.partition(':')
+    values = [float(v) for v in params.split(',')] if params else []
+
+    if kind == 'fixed':
+        return lambda: values[0]
+    if kind == 'uniform':
+        return lambda: random.uniform(values[0], values[1])
+    if kind == 'lognormal':
+        return lambda: random.lognormvariate(values[0], values[1])
+    if kind == 'exponential':
+        return lambda: random.expovariate(1.0 / values[0])
+
+    raise ValueError(f"Bilinmeyen gecikme dağılımı: {spec}")
+
+
+class ClientRateLimiter:
+    """İstemci başına token bucket - limit aşılınca 429 döndürmek için"""
+
+    def __init__(self, rate, burst, clock=None):
+        self.rate = rate
+        self.burst = burst
+        self.clock = clock or SystemClock()
+        self._buckets = {}
+        self._lock = threading.Lock()
+
+    def allow(self, client_key):
+        if not self.rate:
+            return True
+
+        with self._lock:
+            now = self.clock.monotonic()
+            tokens, updated_at = self._buckets.get(client_key, (float(self.burst), now))
+            tokens = min(self.burst, tokens + (now - updated_at) * self.rate)
+
+            if tokens >= 1.0:
+                self._buckets[client_key] = (tokens - 1.0, now)
+                return True
+
+            self._buckets[client_key] = (tokens, now)
+            return False
+
+
+class FakeFBrefServer:
+    """Arka plan thread'inde çalışan sahte FBref sunucusu"""
+
+    def __init__(self, host='127.0.0.1', port=0, latency=None, rate_403=0.0, rate_429=0.0,
+                 client_rate=0.0, client_burst=1, client_key='ip', retry_after=1, corpus=None):
+        self.corpus = corpus or PageCorpus()
+        self.latency = parse_latency(latency)
+        self.rate_403 = rate_403
+        self.rate_429 = rate_429
+        self.client_key = client_key
+        self.retry_after = retry_after
+        self.rate_limiter = ClientRateLimiter(client_rate, client_burst)
+
+        self._stats_lock = threading.Lock()
+        self.reset_stats()
+
+        self.httpd = ThreadingHTTPServer((host, port), self._make_handler())
+        self.httpd.daemon_threads = True
+        self._thread = None
+
+    @property
+    def base_url(self):
+        host, port = self.httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def reset_stats(self):
+        with self._stats_lock:
+            self.stats = {
+                'requests': 0,
+                'status': defaultdict(int),
+                'clients': defaultdict(int),
+                'bytes': 0,
+                'started_at': time.time(),
+            }
+
+    def get_stats(self):
+        with self._stats_lock:
+            elapsed = time.time() - self.stats['started_at']
+            return {
+                'requests': self.stats['requests'],
+                'status': dict(self.stats['status']),
+                'clients': dict(self.stats['clients']),
+                'bytes': self.stats['bytes'],
+                'elapsed': elapsed,
+                'requests_per_second': self.stats['requests'] / elapsed if elapsed else 0.0,
+            }
+
+    def _record(self, client, status, size):
+        with self._stats_lock:
+            self.stats['requests'] += 1
+            self.stats['status'][str(status)] += 1
+            self.stats['clients'][client] += 1
+            self.stats['bytes'] += size
+
+    def _make_handler(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = 'HTTP/1.1'
+
+            def log_message(self, format, *args):
+                logging.debug("%s - %s" % (self.address_string(), format % args))
+
+            def _send(self, status, body, content_type='text/html; charset=utf-8', headers=None):
+                self.send_response(status)
+                self.send_header('Content-Type', content_type)
+                self.send_header('Content-Length', str(len(body)))
+                for name, value in (headers or {}).items():
+                    self.send_header(name, value)
+                self.end_headers()
+                self.wfile.write(body)
+
+            def do_GET(self):
+                if self.path.startswith('/__stats'):
+                    self._send(200, json.dumps(server.get_stats()).encode(), 'application/json')
+                    return
+                if self.path.startswith('/__reset'):
+                    server.reset_stats()
+                    self._send(200, b'{}', 'application/json')
+                    return
+
+                if server.client_key == 'connection':
+                    client = f"{self.client_address[0]}:{self.client_address[1]}"
+                else:
+                    client = self.client_address[0]
+
+                delay = server.latency()
+                if delay > 0:
+                    time.sleep(delay)
+
+                if not server.rate_limiter.allow(client):
+                    status, body, headers = 429, b'Too Many Requests', {'Retry-After': str(server.retry_after)}
+                elif server.rate_429 and random.random() < server.rate_429:
+                    status, body, headers = 429, b'Too Many Requests', {'Retry-After': str(server.retry_after)}
+                elif server.rate_403 and random.random() < server.rate_403:
+                    status, body, headers = 403, b'Forbidden', {}
+                else:
+                    html = server.corpus.get_html(self.path)
+                    if html is None:
+                        status, body, headers = 404, b'Not Found', {}
+                    else:
+                        status, body, headers = 200, html, {}
+
+                server._record(client, status, len(body))
+                self._send(status, body, headers=headers)
+
+        return Handler
+
+    def start(self):
+        """Sunucuyu arka planda başlatır"""
+        self._thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+        if self._thread:
+            self._thread.join()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.stop()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Sahte FBref sunucusu")
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8765)
+    parser.add_argument('--latency', default='none',
+                        help="fixed:S | uniform:MIN,MAX | lognormal:MU,SIGMA | exponential:ORT")
+    parser.add_argument('--rate-403', type=float, default=0.0, help="403 döndürme olasılığı (0-1)")
+    parser.add_argument('--rate-429', type=float, default=0.0, help="429 döndürme olasılığı (0-1)")
+    parser.add_argument('--client-rate', type=float, default=0.0, help="İstemci başına saniyedeki istek sınırı")
+    parser.add_argument('--client-burst', type=int, default=1)
+    parser.add_argument('--client-key', choices=['ip', 'connection'], default='ip',
+                        help="Hız sınırı anahtarı: IP adresi veya TCP bağlantısı")
+    parser.add_argument('--retry-after', type=int, default=1)
+    parser.add_argument('--seed', type=int, help="Rastgelelik için tohum değeri")
+    args = parser.parse_args()
+
+    if args.seed is not None:
+        random.seed(args.seed)
+
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+
+    server = FakeFBrefServer(
+        host=args.host, port=args.port, latency=args.latency,
+        rate_403=args.rate_403, rate_429=args.rate_429,
+        client_rate=args.client_rate, client_burst=args.client_burst,
+        client_key=args.client_key, retry_after=args.retry_after
+    )
+    logging.info(f"Sahte FBref sunucusu çalışıyor: {server.base_url}")
+    logging.info(f"Scraper'ı yönlendirmek için: FBREF_BASE_URL={server.base_url}")
+
+    try:
+        server.httpd.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        logging.info(f"İstatistikler: {json.dumps(server.get_stats())}")
+        server.httpd.server_close()
+
+
+if __name__ == "__main__":
+    main()
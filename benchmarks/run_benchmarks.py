@@ -0,0 +1,212 @@
+# benchmarks/run_benchmarks.py
+"""Kaydedilmiş FBref sayfaları üzerinde çevrimdışı performans ölçümü
+
+Kullanım:
+    python -m benchmarks.run_benchmarks
+    python -m benchmarks.run_benchmarks --iterations 10 --output data/bench/run.json
+    python -m benchmarks.run_benchmarks --save-baseline data/bench/baseline.json
+    python -m benchmarks.run_benchmarks --baseline data/bench/baseline.json --tolerance 0.15
+"""
+import argparse
+import json
+import logging
+import os
+import resource
+import sys
+import time
+
+from scrapers.page_corpus import PageCorpus
+from monitoring.instrumentation import percentile
+from scrapers.league_scraper import LeagueScraper
+from scrapers.player_scraper import PlayerScraper
+from scrapers.utils import ScrapingUtils
+
+LEAGUE_NAME = 'Premier League'
+
+UTILS_SAMPLES = {
+    'clean_text': ['  Mohamed   Salah\n ', 'Vin&iacute;cius J&uacute;nior', 'Kylian Mbappé ', ''],
+    'extract_stat_value': ['1,234', '45.6%', '-0.3', '—', '12'],
+    'parse_age': ['32-150', '(age 24)', 'Age: 19', '1998'],
+    'parse_contract_date': ['30 June 2027', 'June 30, 2026', '2025-06-30', 'June 2028'],
+    'extract_fbref_id': ['https://fbref.com/en/players/e342ad68/Mohamed-Salah'],
+    'smart_contract_extraction': ['He signed a new deal until June 2027 with the club. Born 1992.'],
+}
+
+
+def peak_rss_mb():
+    """Process'in şimdiye kadarki en yüksek RSS değeri (MB)"""
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux KB, macOS byte döndürür
+    return peak / (1024 * 1024) if sys.platform == 'darwin' else peak / 1024
+
+
+def summarize(name, latencies, items_per_call=1):
+    """Gecikme listesinden throughput ve percentile özetini çıkarır"""
+    total = sum(latencies)
+    return {
+        'name': name,
+        'calls': len(latencies),
+        'throughput': (len(latencies) * items_per_call) / total if total else 0.0,
+        'p50_ms': percentile(latencies, 50) * 1000,
+        'p95_ms': percentile(latencies, 95) * 1000,
+        'p99_ms': percentile(latencies, 99) * 1000,
+        'peak_rss_mb': peak_rss_mb(),
+    }
+
+
+def bench_league_players(corpus, iterations):
+    scraper = corpus.install(LeagueScraper())
+    latencies = []
+    players = []
+
+    try:
+        for _ in range(iterations):
+            start = time.perf_counter()
+            players = scraper.get_league_players(LEAGUE_NAME)
+            latencies.append(time.perf_counter() - start)
+    finally:
+        scraper.close()
+
+    result = summarize('league.get_league_players', latencies)
+    result['items'] = len(players)
+    return result, players
+
+
+def bench_player_details(corpus, iterations, league_players):
+    scraper = corpus.install(PlayerScraper())
+    basic_by_id = {p['fbref_id']: p for p in league_players}
+    latencies = []
+    requests_before = corpus.requests
+
+    try:
+        for _ in range(iterations):
+            for player_url in corpus.player_urls():
+                basic_info = basic_by_id.get(ScrapingUtils.extract_fbref_id(player_url))
+                start = time.perf_counter()
+                scraper.scrape_player_details(player_url, basic_info)
+                latencies.append(time.perf_counter() - start)
+    finally:
+        scraper.close()
+
+    result = summarize('player.scrape_player_details', latencies)
+    result['pages_per_player'] = (corpus.requests - requests_before) / len(latencies) if latencies else 0.0
+    return result
+
+
+def bench_utils(iterations):
+    results = []
+    batch = 1000
+
+    for func_name, samples in UTILS_SAMPLES.items():
+        func = getattr(ScrapingUtils, func_name)
+        latencies = []
+
+        for _ in range(iterations):
+            start = time.perf_counter()
+            for _ in range(batch // len(samples)):
+                for sample in samples:
+                    func(sample)
+            calls = (batch // len(samples)) * len(samples)
+            latencies.append((time.perf_counter() - start) / calls)
+
+        # Her örnek bir çağrının ortalama süresi
+        results.append(summarize(f'utils.{func_name}', latencies))
+
+    return results
+
+
+def run(iterations):
+    corpus = PageCorpus()
+    results = []
+
+    league_result, league_players = bench_league_players(corpus, iterations)
+    results.append(league_result)
+    results.append(bench_player_details(corpus, iterations, league_players))
+    results.extend(bench_utils(iterations))
+
+    return {
+        'createdAt': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        'python': sys.version.split()[0],
+        'iterations': iterations,
+        'results': {r['name']: r for r in results},
+    }
+
+
+def compare(current, baseline, tolerance):
+    """Baseline'a göre gerilemeleri bulur (p50 yavaşlaması veya throughput düşüşü)"""
+    regressions = []
+
+    for name, result in current['results'].items():
+        base = baseline['results'].get(name)
+        if not base:
+            continue
+
+        if base['p50_ms'] and result['p50_ms'] > base['p50_ms'] * (1 + tolerance):
+            regressions.append(f"{name}: p50 {base['p50_ms']:.3f}ms -> {result['p50_ms']:.3f}ms")
+        if base['throughput'] and result['throughput'] < base['throughput'] * (1 - tolerance):
+            regressions.append(f"{name}: throughput {base['throughput']:.1f}/s -> {result['throughput']:.1f}/s")
+
+    return regressions
+
+
+def print_report(report, baseline=None):
+    print("=" * 96)
+    print(f"{'benchmark':<38}{'calls':>7}{'throughput/s':>14}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}"
+          f"{'RSS MB':>8}")
+    print("-" * 96)
+    for name, r in report['results'].items():
+        line = (f"{name:<38}{r['calls']:>7}{r['throughput']:>14.1f}{r['p50_ms']:>10.3f}{r['p95_ms']:>10.3f}"
+                f"{r['p99_ms']:>10.3f}{r['peak_rss_mb']:>8.0f}")
+        if baseline and name in baseline['results'] and baseline['results'][name]['p50_ms']:
+            change = r['p50_ms'] / baseline['results'][name]['p50_ms'] - 1
+            line += f"  ({change:+.0%} p50)"
+        print(line)
+    print("=" * 96)
+
+
+def write_json(path, data):
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(data, f, indent=2)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="FBref scraper çevrimdışı benchmark")
+    parser.add_argument('--iterations', type=int, default=5)
+    parser.add_argument('--output', help="Sonuçları JSON olarak kaydet")
+    parser.add_argument('--save-baseline', help="Sonuçları baseline olarak kaydet")
+    parser.add_argument('--baseline', help="Karşılaştırılacak baseline JSON")
+    parser.add_argument('--tolerance', type=float, default=0.15, help="İzin verilen gerileme oranı")
+    args = parser.parse_args()
+
+    # Scraper logları ölçümü etkilemesin
+    logging.disable(logging.CRITICAL)
+
+    report = run(args.iterations)
+    baseline = None
+    if args.baseline:
+        with open(args.baseline, encoding='utf-8') as f:
+            baseline = json.load(f)
+
+    print_report(report, baseline)
+
+    if args.output:
+        write_json(args.output, report)
+    if args.save_baseline:
+        write_json(args.save_baseline, report)
+        print(f"Baseline kaydedildi: {args.save_baseline}")
+
+    if baseline:
+        regressions = compare(report, baseline, args.tolerance)
+        if regressions:
+            print("GERİLEME TESPİT EDİLDİ:")
+            for regression in regressions:
+                print(f"  {regression}")
+            sys.exit(1)
+        print(f"Baseline'a göre gerileme yok (tolerans {args.tolerance:.0%})")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,88 @@
+# benchmarks/synthetic_players.py
+"""Depolama/bellek ölçümleri için gerçekçi sentetik oyuncu dokümanları
+
+Corpus'taki oyuncu sayfaları PlayerScraper ile bir kez işlenir ve çıkan
+dokümanlar şablon olarak kullanılır; her sentetik oyuncu bir şablonun
+sayısal değerleri oynatılmış, kendi fbrefId'si olan kopyasıdır. Her doküman
+(Mongo'dan okunan gibi) kendi anahtar string'lerine sahiptir.
+"""
+import json
+import logging
+import random
+from datetime import datetime, timedelta
+
+from config.leagues import LEAGUES
+
+_templates = None
+
+
+def corpus_templates():
+    """Corpus oyuncu sayfalarından üretilmiş dokümanlar (process başına bir kez)"""
+    global _templates
+    if _templates is None:
+        from scrapers.page_corpus import PageCorpus
+        from scrapers.player_scraper import PlayerScraper
+
+        logging.disable(logging.CRITICAL)
+        corpus = PageCorpus()
+        scraper = corpus.install(PlayerScraper())
+        try:
+            templates = [scraper.scrape_player_details(url) for url in corpus.player_urls()]
+        finally:
+            scraper.close()
+            logging.disable(logging.NOTSET)
+        _templates = [json.dumps(t, default=str) for t in templates if t]
+        if not _templates:
+            raise RuntimeError("Corpus'tan oyuncu şablonu üretilemedi")
+    return _templates
+
+
+def _perturb(value, rng):
+    if isinstance(value, bool) or value is None:
+        return value
+    if isinstance(value, int):
+        return max(0, int(value * rng.uniform(0.5, 1.5) + rng.randint(0, 3)))
+    if isinstance(value, float):
+        return round(value * rng.uniform(0.5, 1.5), 2)
+    return value
+
+
+def make_player(index, rng, templates=None):
+    templates = templates or corpus_templates()
+    doc = json.loads(rng.choice(templates))
+
+    doc['fbrefId'] = f"{rng.getrandbits(32):08x}"
+    doc['fullName'] = f"{doc.get('fullName') or 'Player'} {index}"
+    doc['league'] = rng.choice(list(LEAGUES))
+    doc['team'] = f"{doc['league']} Team {rng.randint(1, 20)}"
+    doc['age'] = rng.randint(16, 38)
+
+    doc['seasonStats'] = {k: _perturb(v, rng) for k, v in (doc.get('seasonStats') or {}).items()}
+    report = {}
+    for name, entry in (doc.get('scoutingReport') or {}).items():
+        if isinstance(entry, dict):
+            entry = {k: _perturb(v, rng) for k, v in entry.items()}
+            if isinstance(entry.get('percentile'), (int, float)):
+                entry['percentile'] = min(99, entry['percentile'])
+        report[name] = entry
+    doc['scoutingReport'] = report
+
+    updated = datetime(2025, 1, 1) + timedelta(minutes=rng.randint(0, 365 * 24 * 60))
+    doc['createdAt'] = updated - timedelta(days=rng.randint(0, 400))
+    doc['updatedAt'] = updated
+    return doc
+
+
+def make_players(count, seed=42):
+    """count adet sentetik oyuncu dokümanı (aynı seed -> aynı çıktı)"""
+    rng = random.Random(seed)
+    templates = corpus_templates()
+    return [make_player(i, rng, templates) for i in range(count)]
+
+
+def iter_players(count, seed=42):
+    """make_players'ın bellekte liste tutmayan hali"""
+    rng = random.Random(seed)
+    templates = corpus_templates()
+    for i in range(count):
+        yield make_player(i, rng, templates)
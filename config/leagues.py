@@ -1,42 +1,46 @@
+from config.settings import Settings
+
+_BASE_URL = Settings.FBREF_BASE_URL.rstrip('/')
+
 LEAGUES = {
     # İngiltere
-    'Premier League': 'https://fbref.com/en/comps/9/stats/Premier-League-Stats',
-    'Championship': 'https://fbref.com/en/comps/10/stats/Championship-Stats',
-    'League One': 'https://fbref.com/en/comps/15/stats/League-One-Stats',
-    'League Two': 'https://fbref.com/en/comps/16/stats/League-Two-Stats',
+    'Premier League': f'{_BASE_URL}/en/comps/9/stats/Premier-League-Stats',
+    'Championship': f'{_BASE_URL}/en/comps/10/stats/Championship-Stats',
+    'League One': f'{_BASE_URL}/en/comps/15/stats/League-One-Stats',
+    'League Two': f'{_BASE_URL}/en/comps/16/stats/League-Two-Stats',
 
     # İtalya
-    'Serie A': 'https://fbref.com/en/comps/11/stats/Serie-A-Stats',
-    'Serie B': 'https://fbref.com/en/comps/18/stats/Serie-B-Stats',
+    'Serie A': f'{_BASE_URL}/en/comps/11/stats/Serie-A-Stats',
+    'Serie B': f'{_BASE_URL}/en/comps/18/stats/Serie-B-Stats',
 
     # İspanya
-    'La Liga': 'https://fbref.com/en/comps/12/stats/La-Liga-Stats',
-    'La Liga 2': 'https://fbref.com/en/comps/17/stats/La-Liga-2-Stats',
+    'La Liga': f'{_BASE_URL}/en/comps/12/stats/La-Liga-Stats',
+    'La Liga 2': f'{_BASE_URL}/en/comps/17/stats/La-Liga-2-Stats',
 
     # Almanya
-    'Bundesliga': 'https://fbref.com/en/comps/20/stats/Bundesliga-Stats',
-    '2. Bundesliga': 'https://fbref.com/en/comps/33/stats/2-Bundesliga-Stats',
-    '3. Liga': 'https://fbref.com/en/comps/59/stats/3-Liga-Stats',
+    'Bundesliga': f'{_BASE_URL}/en/comps/20/stats/Bundesliga-Stats',
+    '2. Bundesliga': f'{_BASE_URL}/en/comps/33/stats/2-Bundesliga-Stats',
+    '3. Liga': f'{_BASE_URL}/en/comps/59/stats/3-Liga-Stats',
 
     # Fransa
-    'Ligue 1': 'https://fbref.com/en/comps/13/stats/Ligue-1-Stats',
-    'Ligue 2': 'https://fbref.com/en/comps/60/stats/Ligue-2-Stats',
+    'Ligue 1': f'{_BASE_URL}/en/comps/13/stats/Ligue-1-Stats',
+    'Ligue 2': f'{_BASE_URL}/en/comps/60/stats/Ligue-2-Stats',
 
     # Hollanda
-    'Eredivisie': 'https://fbref.com/en/comps/23/stats/Eredivisie-Stats',
-    'Eerste Divisie': 'https://fbref.com/en/comps/36/stats/Eerste-Divisie-Stats',
+    'Eredivisie': f'{_BASE_URL}/en/comps/23/stats/Eredivisie-Stats',
+    'Eerste Divisie': f'{_BASE_URL}/en/comps/36/stats/Eerste-Divisie-Stats',
 
     # Portekiz
-    'Liga Portugal Betclic': 'https://fbref.com/en/comps/32/stats/Liga-Portugal-Betclic-Stats',
-    'Liga Portugal 2': 'https://fbref.com/en/comps/63/stats/Liga-Portugal-2-Stats',
+    'Liga Portugal Betclic': f'{_BASE_URL}/en/comps/32/stats/Liga-Portugal-Betclic-Stats',
+    'Liga Portugal 2': f'{_BASE_URL}/en/comps/63/stats/Liga-Portugal-2-Stats',
 
     # Türkiye
-    'Trendyol Süper Lig': 'https://fbref.com/en/comps/26/stats/Super-Lig-Stats',
-    'Trendyol 1. Lig': 'https://fbref.com/en/comps/64/stats/1-Lig-Stats',
+    'Trendyol Süper Lig': f'{_BASE_URL}/en/comps/26/stats/Super-Lig-Stats',
+    'Trendyol 1. Lig': f'{_BASE_URL}/en/comps/64/stats/1-Lig-Stats',
 
     # Diğer ligler...
-    'MLS': 'https://fbref.com/en/comps/22/stats/Major-League-Soccer-Stats',
-    'Saudi Pro League': 'https://fbref.com/en/comps/70/stats/Saudi-Pro-League-Stats',
+    'MLS': f'{_BASE_URL}/en/comps/22/stats/Major-League-Soccer-Stats',
+    'Saudi Pro League': f'{_BASE_URL}/en/comps/70/stats/Saudi-Pro-League-Stats',
 }
 
 LEAGUE_COUNTRIES = {
@@ -49,4 +53,32 @@ LEAGUE_COUNTRIES = {
     'Eredivisie': 'Netherlands',
     'Trendyol Süper Lig': 'Turkey',
     # Diğer lig-ülke eşleşmeleri...
-}
\ No newline at end of file
+}
+
+# Lig seviyeleri (1 = en üst seviye) - güncelleme önceliği için
+LEAGUE_TIERS = {
+    'Premier League': 1,
+    'La Liga': 1,
+    'Serie A': 1,
+    'Bundesliga': 1,
+    'Ligue 1': 1,
+    'Eredivisie': 2,
+    'Liga Portugal Betclic': 2,
+    'Trendyol Süper Lig': 2,
+    'Championship': 2,
+    'MLS': 2,
+    'Saudi Pro League': 2,
+    'Serie B': 3,
+    'La Liga 2': 3,
+    '2. Bundesliga': 3,
+    'Ligue 2': 3,
+    'Eerste Divisie': 3,
+    'Liga Portugal 2': 3,
+    'Trendyol 1. Lig': 3,
+    'League One': 3,
+    'League Two': 4,
+    '3. Liga': 4,
+}
+
+# "Big 5" ligleri - FBRef scouting raporlarındaki varsayılan karşılaştırma grubu
+TOP5_LEAGUES = ('Premier League', 'La Liga', 'Serie A', 'Bundesliga', 'Ligue 1')
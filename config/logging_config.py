@@ -0,0 +1,46 @@
+# config/logging_config.py
+import logging
+import os
+
+
+def setup_logging():
+    """Gelişmiş logging konfigürasyonu"""
+    try:
+        # Log dizinini oluştur
+        log_dir = 'data/logs'
+        os.makedirs(log_dir, exist_ok=True)
+
+        # Log formatı
+        log_format = '%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+
+        # Handlers
+        handlers = [
+            logging.StreamHandler(),  # Console output
+        ]
+
+        # File handler (sadece dizin varsa)
+        log_file = os.path.join(log_dir, 'scraper.log')
+        try:
+            file_handler = logging.FileHandler(log_file, encoding='utf-8')
+            file_handler.setFormatter(logging.Formatter(log_format))
+            handlers.append(file_handler)
+        except Exception as e:
+            print(f"Warning: Could not create log file: {e}")
+
+        # Configure logging
+        logging.basicConfig(
+            level=logging.INFO,
+            format=log_format,
+            handlers=handlers,
+            force=True  # Override existing configuration
+        )
+
+        # Set specific loggers to WARNING to reduce noise
+        logging.getLogger('urllib3').setLevel(logging.WARNING)
+        logging.getLogger('selenium').setLevel(logging.WARNING)
+        logging.getLogger('webdriver_manager').setLevel(logging.WARNING)
+
+    except Exception as e:
+        print(f"Logging setup failed: {e}")
+        # Fallback to basic console logging
+        logging.basicConfig(level=logging.INFO, format='%(levelname)s - %(message)s')
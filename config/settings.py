@@ -5,11 +5,59 @@ load_dotenv()
 
 
 class Settings:
+    # Oyuncu deposu: mongo | sqlite (gömülü, sunucu gerektirmez - models/storage.py)
+    STORAGE_BACKEND = os.getenv('STORAGE_BACKEND', 'mongo').lower()
+    SQLITE_PATH = os.getenv('SQLITE_PATH', 'data/scout.db')
+    SQLITE_BUSY_TIMEOUT = float(os.getenv('SQLITE_BUSY_TIMEOUT', 30))  # Başka process yazarken bekleme (sn)
+
     # MongoDB ayarları
     MONGODB_URI = os.getenv('MONGODB_URI', 'mongodb://localhost:27017/')
     MONGODB_DB_NAME = os.getenv('MONGODB_DB_NAME', 'ScoutDatabase')
     MONGODB_COLLECTION = os.getenv('MONGODB_COLLECTION', 'players')
 
+    MONGODB_REFRESH_COLLECTION = os.getenv('MONGODB_REFRESH_COLLECTION', 'refresh_backlog')
+    MONGODB_JOBS_COLLECTION = os.getenv('MONGODB_JOBS_COLLECTION', 'crawl_jobs')
+    MONGODB_RATE_LIMIT_COLLECTION = os.getenv('MONGODB_RATE_LIMIT_COLLECTION', 'rate_limits')
+    MONGODB_STAT_SCHEMA_COLLECTION = os.getenv('MONGODB_STAT_SCHEMA_COLLECTION', 'stat_schemas')
+    MONGODB_STAT_HISTORY_COLLECTION = os.getenv('MONGODB_STAT_HISTORY_COLLECTION', 'stat_history')
+
+    # İstatistiklerin saklanma biçimi: dict (isim -> değer) | schema (şema sürümü + konumsal diziler)
+    STATS_ENCODING = os.getenv('STATS_ENCODING', 'dict').lower()
+
+    # seasonStats geçmişi (models/stat_history.py): her kayıtta değişen stat'lar oyuncu/sezon kovasına eklenir
+    STAT_HISTORY_ENABLED = os.getenv('STAT_HISTORY_ENABLED', 'true').lower() == 'true'
+    SNAPSHOT_MAX_DELTAS = int(os.getenv('SNAPSHOT_MAX_DELTAS', 400))  # Aşılınca aynı sezon için yeni kova açılır
+    SEASON_START_MONTH = int(os.getenv('SEASON_START_MONTH', 7))  # Temmuz: 2025-07 -> '2025-2026'
+
+    # Scouting raporu kaynağı: fbref (scouting sayfası) | local (seasonStats'tan hesaplanır, sayfa çekilmez)
+    SCOUTING_SOURCE = os.getenv('SCOUTING_SOURCE', 'fbref').lower()
+
+    # Yerel percentile hesabı (analytics/percentiles.py)
+    PERCENTILE_MIN_MINUTES = int(os.getenv('PERCENTILE_MIN_MINUTES', 450))  # Altındakiler hesaplanmaz/havuza girmez
+    PERCENTILE_PEER_SET = os.getenv('PERCENTILE_PEER_SET', 'league').lower()  # league | top5
+    PERCENTILE_MIN_PEERS = int(os.getenv('PERCENTILE_MIN_PEERS', 5))  # Daha küçük havuzda sadece per90 yazılır
+    PERCENTILE_FIELD = os.getenv('PERCENTILE_FIELD',
+                                 'scoutingReport' if SCOUTING_SOURCE == 'local' else 'computedScoutingReport')
+    PERCENTILES_AFTER_SCRAPE = os.getenv('PERCENTILES_AFTER_SCRAPE', 'false').lower() == 'true'
+
+    # Benzer oyuncular kaynağı: fbref (oyuncu sayfasındaki blok) | local (analytics/similarity.py)
+    SIMILAR_PLAYERS_SOURCE = os.getenv('SIMILAR_PLAYERS_SOURCE', 'fbref').lower()
+    SIMILARITY_FIELD = os.getenv('SIMILARITY_FIELD',
+                                 'similarPlayers' if SIMILAR_PLAYERS_SOURCE == 'local' else 'localSimilarPlayers')
+    SIMILARITY_NEIGHBOURS = int(os.getenv('SIMILARITY_NEIGHBOURS', 10))
+    SIMILARITY_MIN_MINUTES = int(os.getenv('SIMILARITY_MIN_MINUTES', 450))
+    SIMILARITY_NORMALIZATION = os.getenv('SIMILARITY_NORMALIZATION', 'zscore').lower()  # zscore | percentile
+    SIMILARITY_CLUSTERS = int(os.getenv('SIMILARITY_CLUSTERS', 0))  # 0 = brute force, -1 = karekök(grup boyutu)
+    SIMILARITY_PROBE = int(os.getenv('SIMILARITY_PROBE', 8))  # Sorguda taranan en yakın küme sayısı
+
+    # Analiz için diskteki oyuncu × stat matrisi (analytics/stat_matrix.py)
+    STAT_MATRIX_DIR = os.getenv('STAT_MATRIX_DIR', 'data/matrix')
+
+    # Parquet aktarımı (analytics/parquet_export.py, pyarrow gerekir)
+    PARQUET_EXPORT_DIR = os.getenv('PARQUET_EXPORT_DIR', 'data/export')
+    PARQUET_BATCH_SIZE = int(os.getenv('PARQUET_BATCH_SIZE', 2000))  # Cursor'dan okunup bir row group olarak yazılır
+    PARQUET_COMPRESSION = os.getenv('PARQUET_COMPRESSION', 'zstd')
+
     # FBRef ayarları
     FBREF_BASE_URL = os.getenv('FBREF_BASE_URL', 'https://fbref.com')
 
@@ -52,6 +100,58 @@ class Settings:
     MAX_CONSECUTIVE_ERRORS = int(os.getenv('MAX_CONSECUTIVE_ERRORS', 5))
     EXPONENTIAL_BACKOFF = os.getenv('EXPONENTIAL_BACKOFF', 'true').lower() == 'true'
 
+    # Güncelleme planlayıcısı (0 = limitsiz)
+    REFRESH_TIME_BUDGET = float(os.getenv('REFRESH_TIME_BUDGET', 0))  # saniye
+    REFRESH_REQUEST_BUDGET = int(os.getenv('REFRESH_REQUEST_BUDGET', 0))  # HTTP istek sayısı
+    REFRESH_STALE_DAYS = int(os.getenv('REFRESH_STALE_DAYS', 14))
+    REFRESH_CONTRACT_DAYS = int(os.getenv('REFRESH_CONTRACT_DAYS', 180))
+
+    # Oyuncu başına fetch planı (sadece eksik/eski verinin sayfaları çekilir)
+    FETCH_PLAN_ENABLED = os.getenv('FETCH_PLAN_ENABLED', 'true').lower() == 'true'
+    SCOUTING_MIN_MINUTES = int(os.getenv('SCOUTING_MIN_MINUTES', 90))  # Altında scouting raporu yok sayılır
+    SCOUTING_STALE_DAYS = int(os.getenv('SCOUTING_STALE_DAYS', 7))  # Daha yeni kayıtlı rapor yeniden kullanılır
+    NEGATIVE_CACHE_TTL = int(os.getenv('NEGATIVE_CACHE_TTL', 3 * 24 * 3600))  # 404 dönen URL'ler (saniye)
+    NEGATIVE_CACHE_FILE = os.getenv('NEGATIVE_CACHE_FILE', 'data/cache/not_found.json')  # Boş = sadece bellekte
+
+    # Lig bazında toplu doğrulama (kayıtlar parça parça doğrulanıp kaydedilir)
+    BATCH_VALIDATION = os.getenv('BATCH_VALIDATION', 'true').lower() == 'true'
+    VALIDATION_BATCH_SIZE = int(os.getenv('VALIDATION_BATCH_SIZE', 50))  # 0 = lig sonunda tek seferde
+
+    # Dağıtık crawl (iş kuyruğu) ayarları
+    JOB_LEASE_SECONDS = int(os.getenv('JOB_LEASE_SECONDS', 300))
+    JOB_MAX_ATTEMPTS = int(os.getenv('JOB_MAX_ATTEMPTS', 3))
+    WORKER_POLL_INTERVAL = float(os.getenv('WORKER_POLL_INTERVAL', 10.0))
+    GLOBAL_RATE_LIMIT = float(os.getenv('GLOBAL_RATE_LIMIT', 0.5))  # Tüm worker'lar için saniyedeki istek
+    RATE_LIMIT_BURST = int(os.getenv('RATE_LIMIT_BURST', 1))
+
+    # Aşama süresi ölçümü (instrumentation)
+    INSTRUMENTATION_ENABLED = os.getenv('INSTRUMENTATION_ENABLED', 'false').lower() == 'true'
+    INSTRUMENTATION_FILE = os.getenv('INSTRUMENTATION_FILE', '')  # Boş değilse JSON olarak yazılır
+
+    # Trace span'leri (OpenTelemetry uyumlu JSON-lines)
+    TRACING_ENABLED = os.getenv('TRACING_ENABLED', 'false').lower() == 'true'
+    TRACE_FILE = os.getenv('TRACE_FILE', 'data/traces/traces.jsonl')
+
+    # Profilleme (--profile)
+    PROFILE_DIR = os.getenv('PROFILE_DIR', 'data/profiles')
+    PROFILE_SAMPLE_INTERVAL = float(os.getenv('PROFILE_SAMPLE_INTERVAL', 0.005))  # saniye
+    PROFILE_TOP = int(os.getenv('PROFILE_TOP', 30))
+
+    # Bellek bekçisi (0 = kapalı)
+    MEMORY_REPORT_EVERY = int(os.getenv('MEMORY_REPORT_EVERY', 0))  # Her N oyuncuda tracemalloc raporu
+    MEMORY_TOP_SITES = int(os.getenv('MEMORY_TOP_SITES', 10))
+    MEMORY_TRACE_FRAMES = int(os.getenv('MEMORY_TRACE_FRAMES', 1))
+    MEMORY_RSS_LIMIT_MB = int(os.getenv('MEMORY_RSS_LIMIT_MB', 0))
+    MEMORY_LIMIT_ACTION = os.getenv('MEMORY_LIMIT_ACTION', 'pause')  # pause | abort
+    MEMORY_PAUSE_SECONDS = float(os.getenv('MEMORY_PAUSE_SECONDS', 60.0))
+    MEMORY_MAX_PAUSES = int(os.getenv('MEMORY_MAX_PAUSES', 5))
+
+    # Prometheus metrikleri (0 / boş = kapalı)
+    METRICS_PORT = int(os.getenv('METRICS_PORT', 0))
+    METRICS_HOST = os.getenv('METRICS_HOST', '127.0.0.1')
+    METRICS_TEXTFILE = os.getenv('METRICS_TEXTFILE', '')  # örn. /var/lib/node_exporter/fbref.prom
+    METRICS_TEXTFILE_INTERVAL = float(os.getenv('METRICS_TEXTFILE_INTERVAL', 15.0))
+
     # Logging
     LOG_LEVEL = os.getenv('LOG_LEVEL', 'INFO')
     LOG_TO_FILE = os.getenv('LOG_TO_FILE', 'true').lower() == 'true'
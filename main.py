@@ -2,38 +2,66 @@
 import logging
 import sys
 import os
-import time
+import socket
 from datetime import datetime
 
-# Proje modüllerini import et
-from models.database import DatabaseManager
-from scrapers.league_scraper import LeagueScraper
-from scrapers.player_scraper import PlayerScraper
-from scrapers.utils import setup_logging
-from config.leagues import LEAGUES
+# Proje modüllerini import et (pymongo ve scraper modülleri - requests, bs4,
+# selenium - ilk kullanımda yüklenir; stats/queue gibi komutlar hızlı başlar)
+from scrapers.clock import get_clock
+from config.leagues import LEAGUES, TOP5_LEAGUES
+from config.logging_config import setup_logging
+from config.settings import Settings
+from monitoring import metrics
+from monitoring.instrumentation import instrumentation
+from monitoring.memory import MemoryLimitExceeded, MemoryWatchdog
+from monitoring.tracing import tracer
 
 
 class FBRefScraper:
-    def __init__(self):
+    def __init__(self, clock=None, db=None):
         # Logging'i başlat
         setup_logging()
         self.logger = logging.getLogger(__name__)
 
-        # Scraper'ları başlat
-        self.league_scraper = LeagueScraper()
-        self.player_scraper = PlayerScraper()
+        # Tüm beklemeler bu saat üzerinden (testlerde sanal saat verilebilir)
+        self.clock = clock or get_clock()
+
+        # Scraper'lar ilk kullanımda oluşturulur
+        self._league_scraper = None
+        self._player_scraper = None
+
+        # Uzun çalıştırmalarda bellek raporu ve RSS tavanı
+        self.memory = MemoryWatchdog(clock=self.clock).start()
 
         # Veritabanını başlat
         try:
-            self.db = DatabaseManager()
+            if db is None:
+                from models.storage import get_database
+                db = get_database()
+            self.db = db
             self.logger.info("Veritabanı bağlantısı başarılı")
         except Exception as e:
             self.logger.error(f"Veritabanı bağlantı hatası: {e}")
             sys.exit(1)
 
-    def scrape_all_leagues(self, league_list=None):
+    @property
+    def league_scraper(self):
+        if self._league_scraper is None:
+            from scrapers.league_scraper import LeagueScraper
+            self._league_scraper = LeagueScraper(clock=self.clock)
+        return self._league_scraper
+
+    @property
+    def player_scraper(self):
+        if self._player_scraper is None:
+            from scrapers.player_scraper import PlayerScraper
+            self._player_scraper = PlayerScraper(clock=self.clock)
+        return self._player_scraper
+
+    def scrape_all_leagues(self, league_list=None, report=True):
         """Tüm ligleri scrape eder"""
         start_time = datetime.now()
+        start_clock = self.clock.monotonic()
         self.logger.info("Tüm ligler için scraping başlatılıyor...")
 
         if league_list is None:
@@ -41,87 +69,279 @@ class FBRefScraper:
 
         total_players = 0
         successful_players = 0
+        start_requests = self.request_count()
+        validations = []
 
-        for league_name in league_list:
-            try:
-                self.logger.info(f"Lig scraping başlıyor: {league_name}")
-
-                # Ligdeki oyuncuları al
-                league_players = self.league_scraper.get_league_players(league_name)
-
-                if not league_players:
-                    self.logger.warning(f"Lig için oyuncu bulunamadı: {league_name}")
-                    continue
-
-                self.logger.info(f"{league_name}: {len(league_players)} oyuncu bulundu")
-                total_players += len(league_players)
-
-                # Her oyuncu için detaylı scraping
-                for i, basic_player in enumerate(league_players, 1):
+        with tracer.span('run', leagues=len(league_list)):
+            for league_name in league_list:
+                with tracer.span('league', league=league_name):
                     try:
-                        player_url = basic_player['player_url']
-                        fbref_id = basic_player['fbref_id']
+                        self.logger.info(f"Lig scraping başlıyor: {league_name}")
+
+                        # Ligdeki oyuncuları al
+                        league_players = self.league_scraper.get_league_players(league_name)
 
-                        # Veritabanında zaten varsa atla
-                        existing_player = self.db.get_player(fbref_id)
-                        if existing_player:
-                            self.logger.info(f"Oyuncu zaten mevcut, atlanıyor: {basic_player['name']}")
+                        if not league_players:
+                            self.logger.warning(f"Lig için oyuncu bulunamadı: {league_name}")
                             continue
 
-                        self.logger.info(
-                            f"Oyuncu detayları çekiliyor ({i}/{len(league_players)}): {basic_player['name']}")
-
-                        # Detaylı oyuncu bilgilerini çek
-                        detailed_player = self.player_scraper.scrape_player_details(
-                            player_url,
-                            basic_player
-                        )
-
-                        if detailed_player:
-                            # Veritabanına kaydet
-                            result = self.db.insert_player(detailed_player)
-                            if result:
-                                successful_players += 1
-                                self.logger.info(f"Oyuncu kaydedildi: {detailed_player['fullName']}")
-                            else:
-                                self.logger.error(f"Oyuncu kaydedilemedi: {detailed_player['fullName']}")
-                        else:
-                            self.logger.error(f"Oyuncu detayları çekilemedi: {basic_player['name']}")
-
-                        # Her 10 oyuncuda bir progress raporu
-                        if i % 10 == 0:
-                            elapsed = datetime.now() - start_time
-                            self.logger.info(
-                                f"Progress: {successful_players}/{total_players} oyuncu başarılı - Geçen süre: {elapsed}")
-
-                        # Rate limiting
-                        time.sleep(3)
+                        self.logger.info(f"{league_name}: {len(league_players)} oyuncu bulundu")
+                        total_players += len(league_players)
+
+                        # Toplu doğrulama: kayıtlar parça parça doğrulanıp kaydedilir
+                        validator = self.create_validator(league_name, league_players)
+                        pending = []
+
+                        # Her oyuncu için detaylı scraping
+                        try:
+                            for i, basic_player in enumerate(league_players, 1):
+                                with tracer.span('player', fbrefId=basic_player.get('fbref_id'),
+                                                 player=basic_player.get('name')):
+                                    try:
+                                        player_url = basic_player['player_url']
+                                        fbref_id = basic_player['fbref_id']
+
+                                        # Veritabanında zaten varsa atla
+                                        existing_player = self.db.get_player(fbref_id)
+                                        if existing_player:
+                                            self.logger.info(f"Oyuncu zaten mevcut, atlanıyor: {basic_player['name']}")
+                                            metrics.PLAYERS.labels(result='skipped').inc()
+                                            continue
+
+                                        self.logger.info(
+                                            f"Oyuncu detayları çekiliyor ({i}/{len(league_players)}): {basic_player['name']}")
+
+                                        # Detaylı oyuncu bilgilerini çek
+                                        detailed_player = self.player_scraper.scrape_player_details(
+                                            player_url,
+                                            basic_player,
+                                            validate=validator is None
+                                        )
+
+                                        if detailed_player and validator:
+                                            pending.append(detailed_player)
+                                            if len(pending) >= Settings.VALIDATION_BATCH_SIZE > 0:
+                                                successful_players += self.save_validated(validator, pending)
+                                        elif detailed_player:
+                                            # Veritabanına kaydet
+                                            if self.save_player(detailed_player):
+                                                successful_players += 1
+                                        else:
+                                            metrics.PLAYERS.labels(result='failed').inc()
+                                            self.logger.error(f"Oyuncu detayları çekilemedi: {basic_player['name']}")
+
+                                        metrics.update_players_per_minute(successful_players, self.clock.monotonic() - start_clock)
+
+                                        # Her 10 oyuncuda bir progress raporu
+                                        if i % 10 == 0:
+                                            elapsed = datetime.now() - start_time
+                                            self.logger.info(
+                                                f"Progress: {successful_players}/{total_players} oyuncu başarılı - Geçen süre: {elapsed}")
+
+                                        # Rate limiting
+                                        self.clock.sleep(3)
+                                        self.memory.check()
+
+                                    except Exception as e:
+                                        self.logger.error(f"Oyuncu scraping hatası ({basic_player.get('name', 'Unknown')}): {e}")
+                                        continue
+                        finally:
+                            # Kesinti (Ctrl+C, bellek tavanı) olsa da scrape edilmiş kayıtlar kaybolmasın
+                            successful_players += self.save_validated(validator, pending) if validator else 0
+
+                        if validator:
+                            validations.append(validator.finish())
+
+                        self.logger.info(f"Lig tamamlandı: {league_name}")
+
+                        # Ligler arası bekleme
+                        self.clock.sleep(10)
 
                     except Exception as e:
-                        self.logger.error(f"Oyuncu scraping hatası ({basic_player.get('name', 'Unknown')}): {e}")
+                        self.logger.error(f"Lig scraping hatası ({league_name}): {e}")
                         continue
 
-                self.logger.info(f"Lig tamamlandı: {league_name}")
+        summary = {
+            'leagues': list(league_list),
+            'total_players': total_players,
+            'successful_players': successful_players,
+            'requests': self.request_count() - start_requests,
+            'rejected_players': sum(v['rejected'] for v in validations),
+            'validation': validations,
+            'total_time': datetime.now() - start_time
+        }
 
-                # Ligler arası bekleme
-                time.sleep(10)
-
-            except Exception as e:
-                self.logger.error(f"Lig scraping hatası ({league_name}): {e}")
-                continue
+        if instrumentation.enabled:
+            summary['instrumentation'] = instrumentation.export_state()
 
         # Sonuç raporu
-        end_time = datetime.now()
-        total_time = end_time - start_time
+        if report:
+            self.log_scrape_summary(summary)
+            if Settings.PERCENTILES_AFTER_SCRAPE:
+                self.compute_percentiles(league_list)
+
+        return summary
+
+    def create_validator(self, league_name, league_players):
+        """Toplu doğrulama açıksa lig için LeagueValidator (kapalıysa None - oyuncu başına doğrulama)"""
+        if not Settings.BATCH_VALIDATION:
+            return None
+        from models.validation import LeagueValidator
+        return LeagueValidator(league_name, league_players)
+
+    def save_player(self, player_data):
+        """Oyuncuyu kaydeder, sonucu metrik ve loga yazar"""
+        if self.db.insert_player(player_data):
+            metrics.PLAYERS.labels(result='saved').inc()
+            self.logger.info(f"Oyuncu kaydedildi: {player_data['fullName']}")
+            return True
+        metrics.PLAYERS.labels(result='failed').inc()
+        self.logger.error(f"Oyuncu kaydedilemedi: {player_data['fullName']}")
+        return False
+
+    def save_validated(self, validator, pending):
+        """Bekleyen kayıtları toplu doğrular ve kabul edilenleri kaydeder - kaydedilen sayısını döndürür"""
+        records = list(pending)
+        pending.clear()
+        if not records:
+            return 0
+
+        try:
+            accepted, _ = validator.validate(records)
+        except Exception as e:
+            # Doğrulama çalışmazsa veri kaybolmasın - oyuncu başına doğrulamaya dön
+            self.logger.error(f"Toplu doğrulama hatası: {e}")
+            accepted = [player_data for player_data in records if self.is_valid_record(player_data)]
+
+        if len(accepted) < len(records):
+            metrics.PLAYERS.labels(result='rejected').inc(len(records) - len(accepted))
+        return sum(1 for player_data in accepted if self.save_player(player_data))
+
+    @staticmethod
+    def is_valid_record(player_data):
+        from models.player import PlayerModel
+        player = PlayerModel()
+        player.data = player_data
+        is_valid, message = player.validate()
+        if not is_valid:
+            logging.error(f"Oyuncu verisi geçersiz: {message}")
+        return is_valid
+
+    def log_scrape_summary(self, summary):
+        """Scraping sonuç raporunu yazdırır"""
+        total_players = summary['total_players']
+        successful_players = summary['successful_players']
+        success_rate = (successful_players / total_players) * 100 if total_players else 0.0
+        requests = summary.get('requests', 0)
 
         self.logger.info("=" * 50)
         self.logger.info("SCRAPING TAMAMLANDI")
-        self.logger.info(f"Toplam süre: {total_time}")
+        self.logger.info(f"Toplam süre: {summary['total_time']}")
         self.logger.info(f"Toplam oyuncu bulundu: {total_players}")
         self.logger.info(f"Başarıyla kaydedilen: {successful_players}")
-        self.logger.info(f"Başarı oranı: {(successful_players / total_players) * 100:.1f}%")
+        self.logger.info(f"Başarı oranı: {success_rate:.1f}%")
+        if summary.get('rejected_players'):
+            self.logger.info(f"Doğrulamada reddedilen: {summary['rejected_players']}")
+        if summary.get('failed_leagues'):
+            self.logger.info(f"Başarısız ligler (process öldü): {', '.join(summary['failed_leagues'])}")
+        if successful_players:
+            self.logger.info(f"İstek sayısı: {requests} ({requests / successful_players:.2f} / kaydedilen oyuncu)")
         self.logger.info("=" * 50)
 
+        # Aşama süreleri raporu
+        if instrumentation.enabled:
+            instrumentation.log_report()
+            if Settings.INSTRUMENTATION_FILE:
+                instrumentation.dump_json(Settings.INSTRUMENTATION_FILE)
+
+    def scrape_all_leagues_parallel(self, processes, league_list=None):
+        """Ligleri birden fazla process'e bölerek scrape eder (ortak istek hızı ile)"""
+        start_time = datetime.now()
+
+        if league_list is None:
+            league_list = list(LEAGUES.keys())
+
+        processes = max(1, min(processes, len(league_list)))
+        shards = [league_list[i::processes] for i in range(processes)]
+
+        # pymongo fork-safe olmadığı için her process temiz başlatılır
+        import multiprocessing
+        from scrapers.rate_limiter import SharedTokenBucket
+
+        context = multiprocessing.get_context('spawn')
+        rate_limiter = SharedTokenBucket(context=context)
+        result_queue = context.Queue()
+
+        workers = []
+        for index, shard in enumerate(shards):
+            worker = context.Process(target=run_league_shard, args=(shard, rate_limiter, result_queue, index))
+            worker.start()
+            workers.append(worker)
+            self.logger.info(f"Process başlatıldı (pid {worker.pid}): {', '.join(shard)}")
+
+        # Sonuçları topla (process'ler kuyruk boşaltılmadan join edilmemeli).
+        # Sonuç yazmadan ölen process'in ligleri başarısız sayılır, beklemeye devam edilmez.
+        import queue
+
+        results = {}
+        while len(results) < len(workers):
+            try:
+                shard_summary = result_queue.get(timeout=5)
+                results[shard_summary.get('shard')] = shard_summary
+                continue
+            except queue.Empty:
+                pass
+            except Exception as e:
+                self.logger.error(f"Process sonucu alınamadı: {e}")
+
+            dead = [index for index, worker in enumerate(workers)
+                    if index not in results and not worker.is_alive()]
+            if not dead:
+                continue
+            # Ölen process'in son yazdığı sonuç kuyrukta olabilir
+            try:
+                while True:
+                    shard_summary = result_queue.get(timeout=1)
+                    results[shard_summary.get('shard')] = shard_summary
+            except queue.Empty:
+                pass
+            for index in dead:
+                if index not in results:
+                    self.logger.error(f"Process sonuç yazmadan sonlandı (pid {workers[index].pid}, "
+                                      f"kod {workers[index].exitcode}): {', '.join(shards[index])}")
+                    results[index] = {'shard': index, 'leagues': shards[index], 'failed_leagues': shards[index],
+                                      'total_players': 0, 'successful_players': 0}
+        summaries = [results[index] for index in sorted(results)]
+
+        for worker in workers:
+            worker.join()
+            if worker.exitcode != 0:
+                self.logger.error(f"Process hatayla sonlandı (pid {worker.pid}, kod {worker.exitcode})")
+
+        # Alt process'lerin aşama ölçümlerini birleştir
+        for shard_summary in summaries:
+            instrumentation.merge_state(shard_summary.get('instrumentation'))
+
+        summary = {
+            'leagues': [league for s in summaries for league in s['leagues']],
+            'total_players': sum(s['total_players'] for s in summaries),
+            'successful_players': sum(s['successful_players'] for s in summaries),
+            'requests': sum(s.get('requests', 0) for s in summaries),
+            'rejected_players': sum(s.get('rejected_players', 0) for s in summaries),
+            'failed_leagues': [league for s in summaries for league in s.get('failed_leagues', [])],
+            'validation': [v for s in summaries for v in s.get('validation', [])],
+            'total_time': datetime.now() - start_time
+        }
+
+        self.log_scrape_summary(summary)
+        if Settings.PERCENTILES_AFTER_SCRAPE:
+            self.compute_percentiles(league_list)
+        return summary
+
+    def request_count(self):
+        """Oluşturulmuş scraper'ların yaptığı toplam HTTP/Selenium isteği"""
+        return sum(scraper.request_count for scraper in (self._league_scraper, self._player_scraper) if scraper)
+
     def scrape_single_league(self, league_name):
         """Tek bir ligi scrape eder"""
         if league_name not in LEAGUES:
@@ -159,6 +379,9 @@ class FBRefScraper:
                 'position': ''
             }
 
+            # Kayıtlı takım -> lig eşleşmeleri: lig biliniyorsa takım sayfası çekilmez
+            self.player_scraper.planner.load_team_leagues(self.db.get_team_leagues())
+
             # Detaylı oyuncu bilgilerini çek
             detailed_player = self.player_scraper.scrape_player_details(
                 player_url,
@@ -193,56 +416,373 @@ class FBRefScraper:
             self.logger.error(f"Tek oyuncu scraping hatası: {e}")
             return None
 
-    def update_existing_players(self):
-        """Mevcut oyuncuları günceller"""
+    def update_existing_players(self, time_budget=None, request_budget=None):
+        """Mevcut oyuncuları güncellik önceliğine göre, bütçe dahilinde günceller"""
         try:
             self.logger.info("Mevcut oyuncular güncelleniyor...")
 
             all_players = self.db.get_all_players()
-            self.logger.info(f"Güncellenecek oyuncu sayısı: {len(all_players)}")
+            backlog_ids = self.db.get_refresh_backlog()
+            self.logger.info(
+                f"Güncellenecek oyuncu sayısı: {len(all_players)} (önceki çalıştırmadan kalan: {len(backlog_ids)})")
+
+            from scrapers.scheduler import RefreshScheduler
+
+            scheduler = RefreshScheduler(
+                time_budget=time_budget,
+                request_budget=request_budget,
+                request_counter=lambda: self.player_scraper.request_count,
+                clock=self.clock
+            )
+            scheduler.add_players(all_players, backlog_ids)
+
+            try:
+                scheduler.run(self.refresh_player)
+            finally:
+                # Yetişilemeyenleri bir sonraki çalıştırma için sakla (bellek sınırında durulsa da)
+                remaining = scheduler.remaining()
+                self.db.save_refresh_backlog(remaining)
+
+            self.logger.info(f"Güncelleme tamamlandı. {len(remaining)} oyuncu sonraki çalıştırmaya kaldı.")
+
+        except Exception as e:
+            self.logger.error(f"Toplu güncelleme hatası: {e}")
+
+    def refresh_player(self, player):
+        """Kayıtlı tek bir oyuncunun detaylarını yeniden çeker ve kaydeder"""
+        fbref_id = player['fbrefId']
+        player_url = f"{Settings.FBREF_BASE_URL}/en/players/{fbref_id}/"
+
+        with tracer.span('player', fbrefId=fbref_id, player=player.get('fullName')):
+            # Güncel verileri çek (kayıtlı doküman fetch planına verilir)
+            updated_data = self.player_scraper.scrape_player_details(player_url, stored=player)
 
-            updated_count = 0
+            if updated_data:
+                result = self.db.insert_player(updated_data)  # upsert
+                self.memory.check()
+                if result:
+                    self.logger.info(f"Güncellendi: {updated_data['fullName']}")
+                    return True
+
+        return False
+
+    def refresh_fields(self, groups, league_list=None, limit=None):
+        """Kayıtlı oyuncuların sadece verilen alan gruplarını günceller (kısmi $set)"""
+        start_time = datetime.now()
+        self.logger.info(f"Alan güncellemesi başlatılıyor: {', '.join(groups)}")
+
+        players = []
+        for league_name in league_list or [None]:
+            players.extend(self.db.get_all_players(league_name))
+        if limit:
+            players = players[:limit]
+
+        updated_count = 0
+        failed_count = 0
+
+        for i, player in enumerate(players, 1):
+            fbref_id = player['fbrefId']
+            with tracer.span('player', fbrefId=fbref_id, player=player.get('fullName')):
+                try:
+                    fields = self.player_scraper.scrape_player_fields(fbref_id, groups, stored=player)
+
+                    if fields and self.db.update_player_fields(fbref_id, fields):
+                        updated_count += 1
+                        metrics.PLAYERS.labels(result='saved').inc()
+                        self.logger.info(f"Güncellendi ({i}/{len(players)}): {player.get('fullName')} - "
+                                         f"{', '.join(fields)}")
+                    else:
+                        failed_count += 1
+                        metrics.PLAYERS.labels(result='failed').inc()
+                        self.logger.error(f"Alanlar güncellenemedi: {player.get('fullName')}")
+
+                    # Rate limiting
+                    self.clock.sleep(3)
+                    self.memory.check()
+
+                except Exception as e:
+                    failed_count += 1
+                    self.logger.error(f"Alan güncelleme hatası ({player.get('fullName', fbref_id)}): {e}")
+
+        self.logger.info("=" * 50)
+        self.logger.info("ALAN GÜNCELLEMESİ TAMAMLANDI")
+        self.logger.info(f"Gruplar: {', '.join(groups)}")
+        self.logger.info(f"Toplam süre: {datetime.now() - start_time}")
+        self.logger.info(f"Güncellenen: {updated_count}, başarısız: {failed_count}")
+        if updated_count:
+            requests = self.player_scraper.request_count
+            self.logger.info(f"İstek sayısı: {requests} ({requests / updated_count:.2f} / güncellenen oyuncu)")
+        self.logger.info("=" * 50)
+
+    def update_changed_players(self, league_list=None):
+        """Lig tablosundaki maç/dakika değişimlerine göre sadece değişen ve yeni oyuncuları günceller"""
+        start_time = datetime.now()
+        self.logger.info("Delta güncelleme başlatılıyor...")
+
+        if league_list is None:
+            league_list = list(LEAGUES.keys())
+
+        total_players = 0
+        new_players = 0
+        changed_players = 0
+        unchanged_players = 0
+        updated_count = 0
+        rejected_count = 0
+
+        for league_name in league_list:
+            try:
+                league_players = self.league_scraper.get_league_players(league_name)
+
+                if not league_players:
+                    self.logger.warning(f"Lig için oyuncu bulunamadı: {league_name}")
+                    continue
+
+                total_players += len(league_players)
+
+                # Önce değişenleri belirle - detay sayfası sadece bunlar için çekilecek
+                to_scrape = []
+                for basic_player in league_players:
+                    stored_player = self.db.get_player(basic_player['fbref_id'])
+
+                    if not stored_player:
+                        new_players += 1
+                        to_scrape.append((basic_player, None))
+                    elif self.has_league_stats_changed(basic_player, stored_player):
+                        changed_players += 1
+                        to_scrape.append((basic_player, stored_player))
+                    else:
+                        unchanged_players += 1
+
+                self.logger.info(
+                    f"{league_name}: {len(league_players)} oyuncu, {len(to_scrape)} tanesi güncellenecek")
+
+                validator = self.create_validator(league_name, league_players)
+                pending = []
 
-            for player in all_players:
                 try:
-                    fbref_id = player['fbref_id']
-                    player_url = f"https://fbref.com/en/players/{fbref_id}/"
+                    for i, (basic_player, stored_player) in enumerate(to_scrape, 1):
+                        with tracer.span('player', fbrefId=basic_player.get('fbref_id'),
+                                         player=basic_player.get('name')):
+                            try:
+                                self.logger.info(
+                                    f"Oyuncu güncelleniyor ({i}/{len(to_scrape)}): {basic_player['name']}")
+
+                                detailed_player = self.player_scraper.scrape_player_details(
+                                    basic_player['player_url'],
+                                    basic_player,
+                                    stored_player,
+                                    validate=validator is None
+                                )
+
+                                if detailed_player and validator:
+                                    pending.append(detailed_player)
+                                    if len(pending) >= Settings.VALIDATION_BATCH_SIZE > 0:
+                                        updated_count += self.save_validated(validator, pending)
+                                elif detailed_player:
+                                    result = self.db.insert_player(detailed_player)
+                                    if result:
+                                        updated_count += 1
+                                        self.logger.info(f"Güncellendi: {detailed_player['fullName']}")
+                                else:
+                                    self.logger.error(f"Oyuncu detayları çekilemedi: {basic_player['name']}")
+
+                                # Rate limiting
+                                self.clock.sleep(3)
+                                self.memory.check()
+
+                            except Exception as e:
+                                self.logger.error(f"Oyuncu güncelleme hatası ({basic_player.get('name', 'Unknown')}): {e}")
+                                continue
+                finally:
+                    # Kesinti (Ctrl+C, bellek tavanı) olsa da scrape edilmiş kayıtlar kaybolmasın
+                    updated_count += self.save_validated(validator, pending) if validator else 0
+
+                if validator:
+                    rejected_count += validator.finish()['rejected']
+
+                self.logger.info(f"Lig tamamlandı: {league_name}")
+
+                # Ligler arası bekleme
+                self.clock.sleep(10)
+
+            except Exception as e:
+                self.logger.error(f"Lig güncelleme hatası ({league_name}): {e}")
+                continue
+
+        # Sonuç raporu
+        total_time = datetime.now() - start_time
+
+        self.logger.info("=" * 50)
+        self.logger.info("DELTA GÜNCELLEME TAMAMLANDI")
+        self.logger.info(f"Toplam süre: {total_time}")
+        self.logger.info(f"Lig tablolarındaki oyuncu: {total_players}")
+        self.logger.info(f"Yeni oyuncu: {new_players}")
+        self.logger.info(f"Değişen oyuncu: {changed_players}")
+        self.logger.info(f"Değişmeyen (atlanan) oyuncu: {unchanged_players}")
+        self.logger.info(f"Başarıyla güncellenen: {updated_count}")
+        if rejected_count:
+            self.logger.info(f"Doğrulamada reddedilen: {rejected_count}")
+        self.logger.info("=" * 50)
+
+        if Settings.PERCENTILES_AFTER_SCRAPE and (new_players or changed_players):
+            self.compute_percentiles(league_list)
+
+    def has_league_stats_changed(self, basic_player, stored_player):
+        """Lig tablosundaki maç/dakika sayıları kayıtlı değerlerden farklı mı kontrol eder"""
+        basic_stats = basic_player.get('basic_stats', {})
+        stored_stats = stored_player.get('leagueStats')
+
+        if not stored_stats:
+            # Eski kayıtlar: sezon istatistikleriyle karşılaştır, eşitse referansı kaydet ve atla
+            season_stats = stored_player.get('seasonStats', {})
+            if (season_stats.get('gamesPlayed') == basic_stats.get('matches') and
+                    season_stats.get('minutesPlayed') == basic_stats.get('minutes')):
+                self.db.update_player_fields(basic_player['fbref_id'], {'leagueStats': basic_stats})
+                return False
+            return True
+
+        for stat_name in ('matches', 'starts', 'minutes'):
+            if stored_stats.get(stat_name, 0) != basic_stats.get(stat_name, 0):
+                return True
+
+        return False
+
+    def enqueue_crawl(self, league_list=None):
+        """Koordinatör: lig işlerini ortak kuyruğa ekler (oyuncu işlerini worker'lar ekler)"""
+        if league_list is None:
+            league_list = list(LEAGUES.keys())
+
+        queue = self.db.get_job_queue()
+        queue.ensure_indexes()
 
-                    self.logger.info(f"Güncelleniyor: {player['fullName']}")
+        # Her crawl turu kendi key'leriyle eklenir, böylece tamamlanmış eski işler engel olmaz
+        run_id = datetime.utcnow().strftime('%Y%m%d%H%M%S')
+        added = 0
 
-                    # Güncel verileri çek
-                    updated_data = self.player_scraper.scrape_player_details(player_url)
+        for league_name in league_list:
+            if league_name not in LEAGUES:
+                self.logger.error(f"Bilinmeyen lig: {league_name}")
+                continue
+
+            if queue.enqueue("league", {"league": league_name, "runId": run_id},
+                             key=f"{run_id}:league:{league_name}", priority=10):
+                added += 1
+
+        self.logger.info(f"Crawl turu {run_id}: {added} lig işi kuyruğa eklendi")
+        return run_id
+
+    def run_worker(self, worker_id=None, exit_when_idle=False):
+        """Worker: kuyruktan iş alır, lease'i yeniler ve işler"""
+        from models.job_queue import LeaseHeartbeat
+        from scrapers.rate_limiter import MongoRateLimiter
+
+        worker_id = worker_id or f"{socket.gethostname()}-{os.getpid()}"
+        queue = self.db.get_job_queue()
+
+        # Tüm worker'lar ortak istek hızını paylaşır
+        rate_limiter = MongoRateLimiter(self.db.db[Settings.MONGODB_RATE_LIMIT_COLLECTION], clock=self.clock)
+        self.league_scraper.rate_limiter = rate_limiter
+        self.player_scraper.rate_limiter = rate_limiter
+
+        self.logger.info(f"Worker başlatıldı: {worker_id}")
+        processed = 0
+
+        try:
+            while True:
+                job = queue.claim(worker_id)
+
+                if not job or processed % 10 == 0:
+                    metrics.update_queue_depth(queue.collection.name, queue.get_status_counts())
+
+                if not job:
+                    if exit_when_idle:
+                        break
+                    self.clock.sleep(Settings.WORKER_POLL_INTERVAL)
+                    continue
+
+                try:
+                    with LeaseHeartbeat(queue, job, worker_id) as heartbeat:
+                        result = self.process_job(queue, job)
 
-                    if updated_data:
-                        result = self.db.insert_player(updated_data)  # upsert
-                        if result:
-                            updated_count += 1
-                            self.logger.info(f"Güncellendi: {updated_data['fullName']}")
+                    if heartbeat.lost:
+                        self.logger.warning(f"Lease kaybedildiği için sonuç işaretlenmedi: {job['key']}")
+                    else:
+                        queue.complete(job, worker_id, result)
+                        processed += 1
+                        if job["type"] == "player":
+                            metrics.PLAYERS.labels(result='saved').inc()
 
-                    time.sleep(2)  # Rate limiting
+                    self.memory.check()
 
                 except Exception as e:
-                    self.logger.error(f"Oyuncu güncelleme hatası: {e}")
+                    self.logger.error(f"İş hatası ({job['key']}): {e}")
+                    queue.fail(job, worker_id, e)
+                    if job["type"] == "player":
+                        metrics.PLAYERS.labels(result='failed').inc()
+
+        finally:
+            # Yarıda kalan işleri diğer worker'lar için serbest bırak
+            released = queue.release_worker(worker_id)
+            self.logger.info(f"Worker durdu: {worker_id} - {processed} iş tamamlandı, {released} iş bırakıldı")
+
+    def process_job(self, queue, job):
+        """Tek bir kuyruk işini çalıştırır"""
+        payload = job["payload"]
+
+        if job["type"] == "league":
+            with tracer.span('league', league=payload["league"]):
+                league_players = self.league_scraper.get_league_players(payload["league"])
+            if not league_players:
+                raise RuntimeError(f"Lig için oyuncu bulunamadı: {payload['league']}")
+
+            added = 0
+            for basic_player in league_players:
+                # Veritabanında zaten varsa iş oluşturma
+                if self.db.get_player(basic_player['fbref_id']):
                     continue
 
-            self.logger.info(f"Güncelleme tamamlandı. {updated_count} oyuncu güncellendi.")
+                if queue.enqueue("player", {"player": basic_player, "runId": payload["runId"]},
+                                 key=f"{payload['runId']}:player:{basic_player['fbref_id']}"):
+                    added += 1
 
-        except Exception as e:
-            self.logger.error(f"Toplu güncelleme hatası: {e}")
+            self.logger.info(f"{payload['league']}: {added} oyuncu işi kuyruğa eklendi")
+            return {"players": len(league_players), "enqueued": added}
+
+        if job["type"] == "player":
+            basic_player = payload["player"]
+            with tracer.span('player', fbrefId=basic_player['fbref_id'], player=basic_player.get('name')):
+                detailed_player = self.player_scraper.scrape_player_details(basic_player['player_url'], basic_player)
+                if not detailed_player:
+                    raise RuntimeError(f"Oyuncu detayları çekilemedi: {basic_player['name']}")
+
+                if not self.db.insert_player(detailed_player):
+                    raise RuntimeError(f"Oyuncu kaydedilemedi: {detailed_player['fullName']}")
+
+            self.logger.info(f"Oyuncu kaydedildi: {detailed_player['fullName']}")
+            return {"fbrefId": detailed_player['fbrefId']}
+
+        raise ValueError(f"Bilinmeyen iş tipi: {job['type']}")
+
+    def show_queue_status(self):
+        """İş kuyruğunun durumunu gösterir"""
+        counts = self.db.get_job_queue().get_status_counts()
+
+        print("=" * 50)
+        print("İŞ KUYRUĞU DURUMU")
+        print("=" * 50)
+        for status, count in counts.items():
+            print(f"  {status}: {count}")
+        print("=" * 50)
 
     def get_database_stats(self):
         """Veritabanı istatistiklerini gösterir"""
         try:
-            all_players = self.db.get_all_players()
-
-            # Genel istatistikler
-            total_players = len(all_players)
-
-            # Lig bazında sayılar
+            # Lig bazında sayılar (dokümanlar okunmadan, veritabanında gruplanır)
             league_counts = {}
-            for player in all_players:
-                league = player.get('league', 'Unknown')
-                league_counts[league] = league_counts.get(league, 0) + 1
+            for league, count in self.db.count_by('league').items():
+                league = league or 'Unknown'
+                league_counts[league] = league_counts.get(league, 0) + count
+            total_players = sum(league_counts.values())
 
             # Rapor
             print("=" * 50)
@@ -257,12 +797,224 @@ class FBRefScraper:
         except Exception as e:
             self.logger.error(f"İstatistik alma hatası: {e}")
 
+    def ensure_indexes(self, drop_unmanaged=False, backfill=True):
+        """Oyuncu (yönetilen sorgu index'leri) ve iş kuyruğu index'lerini oluşturur (idempotent)"""
+        try:
+            if self.db.backend != 'mongo':
+                self.db.ensure_indexes(force=True)
+                self.logger.info("Index'ler hazır")
+                return
+            start = datetime.now()
+            report = self.db.sync_indexes(drop_unmanaged=drop_unmanaged, backfill=backfill)
+            self.db.get_job_queue().ensure_indexes()
+            duration = (datetime.now() - start).total_seconds()
+            self.logger.info(f"Index'ler hazır ({duration:.1f}s): {len(report['created'])} yeni, "
+                             f"{len(report['rebuilt'])} yeniden oluşturulan, {len(report['unchanged'])} değişmeyen, "
+                             f"{report['backfilled']} dokümana sorgu alanı eklendi")
+            for name in report['created'] + report['rebuilt']:
+                self.logger.info(f"  + {name}")
+            for name in report['dropped']:
+                self.logger.info(f"  - {name}")
+            kept = [name for name in report['unmanaged'] if name not in report['dropped']]
+            if kept:
+                self.logger.warning(f"Tanımda olmayan index'ler (silmek için --drop-unmanaged): {', '.join(kept)}")
+        except Exception as e:
+            self.logger.error(f"Index oluşturma hatası: {e}")
+
+    def search_players(self, league=None, position_group=None, min_age=None, max_age=None,
+                       contract_before=None, limit=50):
+        """Scout araması (lig, pozisyon grubu, yaş, kontrat bitişi) - dakikaya göre sıralı yazdırır"""
+        try:
+            players = self.db.search_players(league, position_group, min_age, max_age, contract_before, limit)
+            print("=" * 72)
+            print(f"OYUNCU ARAMASI ({len(players)} sonuç)")
+            print("-" * 72)
+            for player in players:
+                minutes = (player.get('leagueStats') or {}).get('minutes')
+                print(f"{player.get('fullName', ''):<28} {player.get('team', ''):<24} "
+                      f"{player.get('positionGroup') or '-':<4}{player.get('age', ''):>4}{minutes or 0:>7}")
+            print("=" * 72)
+            return players
+        except Exception as e:
+            self.logger.error(f"Oyuncu arama hatası: {e}")
+            return []
+
+    def migrate_stats(self, encoding=None, batch_size=500, limit=None):
+        """Kayıtlı oyuncuların istatistik biçimini çevirir (dict <-> schema)"""
+        encoding = encoding or Settings.STATS_ENCODING
+        try:
+            start = datetime.now()
+            migrated = self.db.migrate_stats_encoding(encoding, batch_size=batch_size, limit=limit)
+            duration = (datetime.now() - start).total_seconds()
+            self.logger.info(f"İstatistik biçimi dönüşümü ({encoding}) tamamlandı: {migrated} doküman, "
+                             f"{duration:.1f}s")
+            if encoding != Settings.STATS_ENCODING:
+                self.logger.warning(f"STATS_ENCODING={Settings.STATS_ENCODING}; yeni yazımlar "
+                                    f"{encoding} biçiminde olmayacak")
+            return migrated
+        except Exception as e:
+            self.logger.error(f"İstatistik biçimi dönüşüm hatası: {e}")
+            return 0
+
+    def compute_percentiles(self, league_list=None, peer_set=None, min_minutes=None):
+        """Kayıtlı seasonStats'tan per-90 ve percentile'ları hesaplayıp PERCENTILE_FIELD'a yazar"""
+        from analytics.percentiles import PercentileEngine
+
+        try:
+            start = datetime.now()
+            engine = PercentileEngine(min_minutes=min_minutes, peer_set=peer_set)
+            league_list = list(league_list or LEAGUES.keys())
+
+            # top5: hangi lig hesaplanırsa hesaplansın karşılaştırma havuzu Big 5
+            read_leagues = set(league_list) | (set(TOP5_LEAGUES) if engine.peer_set == 'top5' else set())
+            players = self.db.get_all_players(
+                league=sorted(read_leagues),
+                fields=['fbrefId', 'league', 'detailedPosition', 'seasonStats'],
+            )
+
+            targets = {player['fbrefId'] for player in players if player.get('league') in league_list}
+            updates = {fbref_id: fields for fbref_id, fields in engine.updates(players).items()
+                       if fbref_id in targets}
+            written = self.db.bulk_update_fields(updates)
+
+            duration = (datetime.now() - start).total_seconds()
+            self.logger.info(f"Percentile hesabı tamamlandı: {len(players)} oyuncu okundu, {len(updates)} rapor "
+                             f"({written} değişen doküman), {duration:.1f}s")
+            return len(updates)
+        except Exception as e:
+            self.logger.error(f"Percentile hesaplama hatası: {e}")
+            return 0
+
+    def build_similarity_index(self, **options):
+        """Kayıtlı oyunculardan benzerlik indeksi (options: SimilarityIndex parametreleri)"""
+        from analytics.similarity import SimilarityIndex
+
+        players = self.db.get_all_players(fields=['fbrefId', 'fullName', 'league', 'team', 'age', 'contractEnd',
+                                                  'detailedPosition', 'seasonStats'])
+        return SimilarityIndex(**options).build(players)
+
+    def compute_similar_players(self, k=None, **filters):
+        """Tüm oyuncuların benzerlerini toplu hesaplayıp SIMILARITY_FIELD'a yazar"""
+        try:
+            start = datetime.now()
+            index = self.build_similarity_index()
+            neighbours = index.neighbours_all(k, **filters)
+            written = self.db.bulk_update_fields({
+                fbref_id: {Settings.SIMILARITY_FIELD: entries} for fbref_id, entries in neighbours.items()
+            })
+            duration = (datetime.now() - start).total_seconds()
+            self.logger.info(f"Benzer oyuncu hesabı tamamlandı: {len(neighbours)} oyuncu "
+                             f"({written} değişen doküman, alan: {Settings.SIMILARITY_FIELD}), {duration:.1f}s")
+            return len(neighbours)
+        except Exception as e:
+            self.logger.error(f"Benzer oyuncu hesaplama hatası: {e}")
+            return 0
+
+    def find_similar_players(self, fbref_id, k=None, **filters):
+        """Tek oyuncu için anlık benzer oyuncu sorgusu (sonuçları yazdırır)"""
+        try:
+            index = self.build_similarity_index()
+            if fbref_id not in index:
+                print(f"Oyuncu indekste yok (bulunamadı veya dakikası az): {fbref_id}")
+                return []
+            results = index.query(fbref_id, k, **filters)
+            print("=" * 60)
+            print(f"BENZER OYUNCULAR: {fbref_id}")
+            print("-" * 60)
+            for entry in results:
+                row = index.index[entry['fbrefId']]
+                print(f"{entry['similarity']:>7.3f}  {entry['name']:<28} {index.leagues[row]}")
+            print("=" * 60)
+            return results
+        except Exception as e:
+            self.logger.error(f"Benzer oyuncu sorgu hatası: {e}")
+            return []
+
+    def show_stat_history(self, fbref_id, stat=None, start=None, end=None, at=None):
+        """Oyuncunun seasonStats geçmişini yazdırır (at: o tarihteki hal, stat: tek stat'ın değişimi)"""
+        try:
+            print("=" * 60)
+            if at is not None:
+                stats = self.db.get_stats_at(fbref_id, at)
+                print(f"İSTATİSTİKLER: {fbref_id} ({at:%Y-%m-%d})")
+                print("-" * 60)
+                if stats is None:
+                    print("Bu tarihten önce kayıt yok")
+                for name, value in sorted((stats or {}).items()):
+                    if stat is None or name == stat:
+                        print(f"{name:<40} {value}")
+            else:
+                snapshots = self.db.get_stat_history(fbref_id, start, end)
+                print(f"İSTATİSTİK GEÇMİŞİ: {fbref_id} ({len(snapshots)} anlık görüntü)")
+                print("-" * 60)
+                previous = {}
+                for moment, stats in snapshots:
+                    if stat is not None:
+                        if not previous or previous.get(stat) != stats.get(stat):
+                            print(f"{moment:%Y-%m-%d %H:%M}  {stat} = {stats.get(stat)}")
+                    else:
+                        changed = sum(1 for name, value in stats.items() if previous.get(name) != value)
+                        print(f"{moment:%Y-%m-%d %H:%M}  {changed} stat değişti "
+                              f"(dakika: {stats.get('minutesPlayed')})")
+                    previous = stats
+            print("=" * 60)
+        except Exception as e:
+            self.logger.error(f"İstatistik geçmişi okuma hatası: {e}")
+
+    def export_stat_matrix(self, full=False):
+        """Oyuncu × stat matrisini diske yazar (full=False: sadece son güncellemeden beri değişenler)"""
+        from analytics.stat_matrix import StatMatrixWriter
+
+        try:
+            start = datetime.now()
+            writer = StatMatrixWriter()
+            since = None if full else writer.watermark
+            players = self.db.iter_players(updated_since=since, fields=['fbrefId', 'seasonStats', 'updatedAt', 'modifiedAt'])
+            updated, added = writer.refresh(players, full=full)
+            duration = (datetime.now() - start).total_seconds()
+            mode = 'tam' if full or since is None else f'{since} sonrası'
+            self.logger.info(f"Stat matrisi ({writer.path}, {mode}): {updated} güncellenen, {added} yeni satır, "
+                             f"{duration:.1f}s")
+            return updated + added
+        except Exception as e:
+            self.logger.error(f"Stat matrisi yazma hatası: {e}")
+            return 0
+
+    def export_parquet(self, incremental=False, path=None):
+        """Oyuncuları bölümlenmiş Parquet dosyalarına aktarır (incremental: son aktarımdan beri değişenler)"""
+        try:
+            from analytics.parquet_export import EXPORT_FIELDS, ParquetExporter
+
+            start = datetime.now()
+            exporter = ParquetExporter(path)
+            since = exporter.watermark if incremental else None
+            if incremental and since is None:
+                self.logger.info("Önceki Parquet aktarımı yok, tüm oyuncular aktarılıyor")
+            players = self.db.iter_players(updated_since=since, fields=EXPORT_FIELDS,
+                                           batch_size=exporter.batch_size, inclusive=False)
+            counts = exporter.export(players, mode='incremental' if since else 'full')
+
+            duration = (datetime.now() - start).total_seconds()
+            rows = ', '.join(f"{table} {count}" for table, count in counts.items())
+            self.logger.info(f"Parquet aktarımı tamamlandı ({exporter.path}, {exporter.snapshot_date}): "
+                             f"{rows} satır, {len(exporter.files)} dosya, {duration:.1f}s")
+            return counts
+        except ImportError as e:
+            self.logger.error(f"Parquet aktarımı için pyarrow gerekli (pip install -r requirements.txt): {e}")
+            return None
+        except Exception as e:
+            self.logger.error(f"Parquet aktarım hatası: {e}")
+            return None
+
     def cleanup(self):
         """Kaynakları temizler"""
         try:
-            self.league_scraper.close()
-            self.player_scraper.close()
+            for scraper in (self._league_scraper, self._player_scraper):
+                if scraper:
+                    scraper.close()
+                    scraper.negative_cache.save(self.clock.time())
             self.db.close()
+            self.memory.stop()
             self.logger.info("Kaynaklar temizlendi")
         except Exception as e:
             self.logger.error(f"Temizleme hatası: {e}")
@@ -271,16 +1023,51 @@ class FBRefScraper:
 def main():
     """Ana fonksiyon"""
     scraper = None
+    profiler = None
 
     try:
-        scraper = FBRefScraper()
+        if len(sys.argv) < 2:
+            # Kullanım bilgisi için veritabanına bağlanmaya gerek yok
+            print_usage()
+            return
+
+        if "--instrument" in sys.argv:
+            # Aşama sürelerini ölç (spawn edilen process'lere ortam değişkeniyle geçer)
+            os.environ['INSTRUMENTATION_ENABLED'] = 'true'
+            Settings.INSTRUMENTATION_ENABLED = True
+            instrumentation.enabled = True
+
+        if "--trace" in sys.argv:
+            # Trace span'lerini TRACE_FILE dosyasına yaz
+            os.environ['TRACING_ENABLED'] = 'true'
+            Settings.TRACING_ENABLED = True
+            tracer.enabled = True
+
+        # Prometheus metrikleri (HTTP portu ve/veya textfile)
+        metrics.start_exporters(port=get_option("--metrics-port", int))
+
+        if "--corpus" in sys.argv:
+            # Ağ yerine kayıtlı sayfalar (profilleme ve tekrarlanabilir ölçümler için)
+            scraper = create_corpus_scraper(get_option("--corpus-players", int, 0))
+        else:
+            scraper = FBRefScraper()
+
+        if "--profile" in sys.argv:
+            from monitoring.profiling import Profiler
+            command_label = sys.argv[1].lower() if len(sys.argv) > 1 and not sys.argv[1].startswith('--') else 'run'
+            profiler = Profiler(get_option("--profile-mode", str, 'deterministic'), label=command_label).start()
 
         if len(sys.argv) > 1:
             command = sys.argv[1].lower()
 
             if command == "all":
-                # Tüm ligleri scrape et
-                scraper.scrape_all_leagues()
+                processes = get_option("--processes", int, 1)
+                if processes > 1:
+                    # Ligleri process'lere bölerek scrape et
+                    scraper.scrape_all_leagues_parallel(processes)
+                else:
+                    # Tüm ligleri scrape et
+                    scraper.scrape_all_leagues()
 
             elif command == "league" and len(sys.argv) > 2:
                 # Belirli bir ligi scrape et
@@ -293,13 +1080,100 @@ def main():
                 scraper.scrape_single_player(player_url)
 
             elif command == "update":
-                # Mevcut oyuncuları güncelle
-                scraper.update_existing_players()
+                if len(sys.argv) > 2 and sys.argv[2] == "--changed":
+                    # Sadece lig tablosunda maç/dakikası değişen ve yeni oyuncuları güncelle
+                    scraper.update_changed_players(get_arguments(3) or None)
+                else:
+                    # Mevcut oyuncuları öncelik sırasıyla güncelle
+                    time_budget = get_option("--time-budget", float)
+                    request_budget = get_option("--request-budget", int)
+                    scraper.update_existing_players(time_budget, request_budget)
+
+            elif command == "refresh" and len(sys.argv) > 2:
+                # Sadece verilen alan gruplarını güncelle: refresh contract,scouting [lig ...]
+                from scrapers.player_scraper import PlayerScraper
+
+                groups = [group.strip() for group in sys.argv[2].split(',') if group.strip()]
+                unknown = [group for group in groups if group not in PlayerScraper.FIELD_GROUPS]
+                if unknown or not groups:
+                    print(f"Geçersiz alan grubu: {', '.join(unknown)}")
+                    print(f"Geçerli gruplar: {', '.join(PlayerScraper.FIELD_GROUPS)}")
+                else:
+                    scraper.refresh_fields(groups, get_arguments(3) or None, get_option("--limit", int))
+
+            elif command == "enqueue":
+                # Koordinatör: lig işlerini ortak kuyruğa ekle
+                scraper.enqueue_crawl(get_arguments(2) or None)
+
+            elif command == "worker":
+                # Worker: kuyruktan iş al ve işle
+                scraper.run_worker(get_option("--id"), "--exit-when-idle" in sys.argv)
+
+            elif command == "queue":
+                # İş kuyruğu durumu
+                scraper.show_queue_status()
 
             elif command == "stats":
                 # Veritabanı istatistikleri
                 scraper.get_database_stats()
 
+            elif command == "indexes":
+                # Yönetilen sorgu index'lerini kur (yazmalar sadece fbrefId index'ini kontrol eder)
+                scraper.ensure_indexes("--drop-unmanaged" in sys.argv, "--no-backfill" not in sys.argv)
+
+            elif command == "search":
+                # Scout araması: search [--league 'Lig1,Lig2'] [--position FW] [--min-age N] [--max-age N]
+                #                       [--contract-before YYYY-AA-GG] [--limit N]
+                league = get_option("--league")
+                contract_before = get_option("--contract-before", lambda value: datetime.strptime(value, '%Y-%m-%d'))
+                scraper.search_players([name.strip() for name in league.split(',')] if league else None,
+                                       get_option("--position", str.upper), get_option("--min-age", int),
+                                       get_option("--max-age", int), contract_before, get_option("--limit", int, 50))
+
+            elif command == "migrate-stats":
+                # İstatistik biçimini çevir (varsayılan: STATS_ENCODING)
+                encoding = sys.argv[2].lower() if len(sys.argv) > 2 and not sys.argv[2].startswith('--') else None
+                if encoding not in (None, 'dict', 'schema'):
+                    print(f"Bilinmeyen istatistik biçimi: {encoding} (dict, schema)")
+                else:
+                    scraper.migrate_stats(encoding, get_option("--batch", int, 500), get_option("--limit", int))
+
+            elif command == "percentiles":
+                # Kayıtlı istatistiklerden scouting raporu: percentiles [lig ...] [--peers top5]
+                scraper.compute_percentiles(get_arguments(2) or None, get_option("--peers"),
+                                            get_option("--min-minutes", int))
+
+            elif command == "similar":
+                # Benzer oyuncular: similar (hepsini hesapla) | similar <fbrefId> (sorgu)
+                league = get_option("--league")
+                filters = {
+                    'league': [name.strip() for name in league.split(',')] if league else None,
+                    'min_age': get_option("--min-age", int),
+                    'max_age': get_option("--max-age", int),
+                    'contract_until': get_option("--contract-until", int),
+                }
+                filters = {key: value for key, value in filters.items() if value is not None}
+                if len(sys.argv) > 2 and not sys.argv[2].startswith('--'):
+                    scraper.find_similar_players(sys.argv[2], get_option("--k", int), **filters)
+                else:
+                    scraper.compute_similar_players(get_option("--k", int), **filters)
+
+            elif command == "history" and len(sys.argv) > 2:
+                # seasonStats geçmişi: history <fbrefId> [--stat AD] [--from TARİH] [--to TARİH] [--at TARİH]
+                def end_of_day(value):
+                    return datetime.strptime(value, '%Y-%m-%d').replace(hour=23, minute=59, second=59)
+                scraper.show_stat_history(sys.argv[2], get_option("--stat"),
+                                          get_option("--from", lambda value: datetime.strptime(value, '%Y-%m-%d')),
+                                          get_option("--to", end_of_day), get_option("--at", end_of_day))
+
+            elif command == "matrix":
+                # Analiz için oyuncu × stat matrisi (varsayılan: artımlı)
+                scraper.export_stat_matrix(full="--full" in sys.argv)
+
+            elif command == "export":
+                # Parquet aktarımı: export [--incremental] [--dir YOL]
+                scraper.export_parquet("--incremental" in sys.argv, get_option("--dir"))
+
             elif command == "test":
                 # Test modunda sadece birkaç oyuncu
                 test_leagues = ["Premier League", "La Liga"]
@@ -315,12 +1189,113 @@ def main():
     except KeyboardInterrupt:
         print("\nScraping durduruldu...")
 
+    except MemoryLimitExceeded as e:
+        logging.error(f"Bellek tavanı aşıldı, çalıştırma durduruldu: {e}")
+
     except Exception as e:
         logging.error(f"Ana program hatası: {e}")
 
     finally:
+        if profiler:
+            profiler.stop()
+            profiler.write_artifacts()
+        if scraper:
+            scraper.cleanup()
+        tracer.flush()
+        metrics.stop_exporters()
+
+
+def create_corpus_scraper(players_per_league=0):
+    """Kayıtlı sayfa corpus'u, sanal saat ve bellek içi veritabanı ile çalışan scraper
+
+    Ağ, bekleme ve MongoDB devre dışı kaldığı için sadece parse/çıkarma
+    maliyeti ölçülür ve çalıştırmalar tekrarlanabilir olur.
+    """
+    from models.memory_database import MemoryDatabase
+    from scrapers.page_corpus import PageCorpus
+    from scrapers.clock import VirtualClock
+
+    scraper = FBRefScraper(clock=VirtualClock(), db=MemoryDatabase())
+    corpus = PageCorpus()
+    corpus.install(scraper.league_scraper)
+    corpus.install(scraper.player_scraper)
+
+    if players_per_league:
+        get_league_players = scraper.league_scraper.get_league_players
+        scraper.league_scraper.get_league_players = \
+            lambda league_name: (get_league_players(league_name) or [])[:players_per_league]
+
+    logging.info(f"Corpus modu: {corpus.corpus_dir}")
+    return scraper
+
+
+def run_league_shard(league_list, rate_limiter, result_queue, shard_index=0):
+    """Alt process: kendi scraper'ı ve oturumu ile verilen ligleri scrape eder"""
+    scraper = None
+    summary = {'leagues': list(league_list), 'total_players': 0, 'successful_players': 0}
+
+    try:
+        if "--instrument" in sys.argv:
+            # Aşama sürelerini ölç (spawn edilen process'lere ortam değişkeniyle geçer)
+            os.environ['INSTRUMENTATION_ENABLED'] = 'true'
+            Settings.INSTRUMENTATION_ENABLED = True
+            instrumentation.enabled = True
+
+        if Settings.TRACING_ENABLED:
+            # Her process kendi trace dosyasına yazar
+            base, ext = os.path.splitext(Settings.TRACE_FILE)
+            tracer.enabled = True
+            tracer.path = f"{base}.shard{shard_index}{ext}"
+
+        # Her process kendi metrik dosyasını yazar (HTTP portu ana process'te kalır)
+        if Settings.METRICS_TEXTFILE:
+            metrics.registry.const_labels['shard'] = str(shard_index)
+            base, ext = os.path.splitext(Settings.METRICS_TEXTFILE)
+            metrics.start_exporters(port=0, textfile=f"{base}.shard{shard_index}{ext}")
+
+        scraper = FBRefScraper()
+        scraper.league_scraper.rate_limiter = rate_limiter
+        scraper.player_scraper.rate_limiter = rate_limiter
+        summary = scraper.scrape_all_leagues(league_list, report=False)
+
+    except KeyboardInterrupt:
+        pass
+
+    except Exception as e:
+        logging.error(f"Process scraping hatası: {e}")
+
+    finally:
+        summary['shard'] = shard_index
+        result_queue.put(summary)
         if scraper:
             scraper.cleanup()
+        tracer.flush()
+        metrics.stop_exporters()
+
+
+def get_arguments(start):
+    """sys.argv[start:] içindeki konumsal argümanlar (ligler) - ilk '--' opsiyonunda durur
+
+    Opsiyonlar (--instrument, --metrics-port N, ...) ve değerleri lig sayılmaz.
+    """
+    arguments = []
+    for arg in sys.argv[start:]:
+        if arg.startswith('--'):
+            break  # Ligler opsiyonlardan önce gelir
+        arguments.append(arg)
+    return arguments
+
+
+def get_option(name, cast=str, default=None):
+    """Komut satırından '--isim değer' şeklindeki opsiyonu okur"""
+    if name in sys.argv:
+        index = sys.argv.index(name)
+        if index + 1 < len(sys.argv):
+            try:
+                return cast(sys.argv[index + 1])
+            except ValueError:
+                print(f"Geçersiz değer: {name} {sys.argv[index + 1]}")
+    return default
 
 
 def print_usage():
@@ -329,13 +1304,53 @@ def print_usage():
     print("=" * 30)
     print("Kullanım:")
     print("  python main.py all                    # Tüm ligleri scrape et")
+    print("  python main.py all --processes 4      # Ligleri 4 process'e bölerek scrape et")
     print("  python main.py league 'Premier League' # Belirli ligi scrape et")
     print("  python main.py player <URL>           # Belirli oyuncuyu scrape et")
-    print("  python main.py update                 # Mevcut oyuncuları güncelle")
+    print("  python main.py update                 # Mevcut oyuncuları öncelik sırasıyla güncelle")
+    print("         [--time-budget SN] [--request-budget N]")
+    print("  python main.py update --changed [lig]  # Sadece değişen/yeni oyuncuları güncelle")
+    print("  python main.py refresh GRUP[,GRUP] [lig ...] [--limit N]  # Sadece verilen alan gruplarını güncelle")
+    print("         (gruplar: bio, contract, season_stats, scouting, similar, transfers)")
+    print("  python main.py enqueue [lig ...]      # Dağıtık crawl için lig işlerini kuyruğa ekle")
+    print("  python main.py worker [--id AD] [--exit-when-idle]  # Kuyruktan iş alan worker")
+    print("  python main.py queue                  # İş kuyruğu durumu")
     print("  python main.py stats                  # Veritabanı istatistikleri")
+    print("  python main.py indexes [--drop-unmanaged] [--no-backfill]  # Sorgu index'lerini kur")
+    print("         (models/indexes.py; eski dokümanlara positionGroup/contractExpiresAt eklenir)")
+    print("  python main.py search [--league 'Lig1,Lig2'] [--position GK|CB|FB|DM|CM|AM|FW]")
+    print("         [--min-age N] [--max-age N] [--contract-before YYYY-AA-GG] [--limit N]  # Oyuncu ara")
+    print("  python main.py migrate-stats [schema|dict] [--batch N] [--limit N]  # İstatistik saklama biçimini çevir")
+    print("         (varsayılan: STATS_ENCODING; schema = şema sürümü + konumsal diziler)")
+    print("  python main.py percentiles [lig ...] [--peers league|top5] [--min-minutes N]  # Scouting raporunu")
+    print("         kayıtlı istatistiklerden hesapla (per-90 + pozisyon grubu percentile'ları)")
+    print("         (PERCENTILE_FIELD alanına yazılır; SCOUTING_SOURCE=local ile scouting sayfası çekilmez)")
+    print("  python main.py similar [fbrefId] [--k N]  # Benzer oyuncuları hesapla (ID ile: sadece sorgula)")
+    print("         [--league 'Lig1,Lig2'] [--min-age N] [--max-age N] [--contract-until YIL]")
+    print("  python main.py history <fbrefId> [--stat AD] [--from YYYY-AA-GG] [--to YYYY-AA-GG]")
+    print("         [--at YYYY-AA-GG]              # seasonStats geçmişi (stat_history koleksiyonu)")
+    print("  python main.py matrix [--full]        # Oyuncu × stat matrisini STAT_MATRIX_DIR'a yaz")
+    print("         (memmap ile okunur: analytics.stat_matrix.StatMatrix; varsayılan artımlı)")
+    print("  python main.py export [--incremental] [--dir YOL]  # Parquet'e aktar (lig ve tarih bölümlü;")
+    print("         players, transfers, similar_players tabloları - PARQUET_EXPORT_DIR)")
     print("  python main.py test                   # Test modu")
+    print("\nOpsiyonlar:")
+    print("  --instrument                          # Aşama sürelerini ölç ve sonunda raporla")
+    print("                                        # (INSTRUMENTATION_FILE ile JSON olarak kaydedilir)")
+    print("  --trace                               # Trace span'lerini TRACE_FILE'a yaz")
+    print("                                        # (rapor: python -m monitoring.tracing)")
+    print("  --profile                             # Çalıştırmayı profille (PROFILE_DIR altına .prof,")
+    print("                                        # collapsed stack ve hotspot özeti yazılır)")
+    print("  --profile-mode sampling               # Sadece örnekleyici (varsayılan: deterministic)")
+    print("  --corpus [--corpus-players N]         # Ağ yerine kayıtlı sayfaları ve bellek içi DB'yi kullan")
+    print("  --metrics-port PORT                   # Prometheus metriklerini http://127.0.0.1:PORT/metrics adresinde sun")
+    print("                                        # (METRICS_TEXTFILE ile periyodik olarak dosyaya da yazılır)")
     print("\nÖrnekler:")
     print("  python main.py league 'Trendyol Süper Lig'")
+    print("  python main.py update --changed 'Premier League' 'La Liga'")
+    print("  python main.py update --time-budget 3600 --request-budget 500")
+    print("  python main.py refresh contract 'Premier League' --limit 500")
+    print("  python main.py league 'Premier League' --corpus --corpus-players 50 --profile")
     print("  python main.py player 'https://fbref.com/en/players/e342ad68/Mohamed-Salah'")
 
 
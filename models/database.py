@@ -1,43 +1,395 @@
-from pymongo import MongoClient
+from pymongo import ASCENDING, DESCENDING, MongoClient
 from config.settings import Settings
+from config.leagues import LEAGUES
+from monitoring import metrics
+from monitoring.tracing import tracer
+from models.indexes import LIST_VIEW_PROJECTION, query_fields
+from models.storage import MODIFIED_FIELD, PlayerStore, change_paths
 import logging
+from datetime import datetime
 
 
-class DatabaseManager:
-    def __init__(self):
-        self.client = MongoClient(Settings.MONGODB_URI)
-        self.db = self.client[Settings.MONGODB_DB_NAME]
-        self.collection = self.db[Settings.MONGODB_COLLECTION]
+class DatabaseManager(PlayerStore):
+    backend = 'mongo'
+
+    # Process içinde index'leri kontrol edilmiş koleksiyonlar (uri, db, koleksiyon)
+    _indexed_collections = set()
+
+    def __init__(self, uri=None, db_name=None, collection=None):
+        # MongoClient bağlantıyı arka planda kurar; index'ler ilk yazmada
+        # (veya `main.py indexes` ile) oluşturulur, başlangıçta sunucuya gidilmez
+        self.uri = uri or Settings.MONGODB_URI
+        self.client = MongoClient(self.uri)
+        self.db = self.client[db_name or Settings.MONGODB_DB_NAME]
+        self.collection = self.db[collection or Settings.MONGODB_COLLECTION]
+        self._stat_codec = None
+        self._stat_history = None
+
+    @property
+    def stat_codec(self):
+        """Paketli istatistik dönüştürücüsü (şema sürümleri ilk kullanımda okunur)"""
+        if self._stat_codec is None:
+            from models.stat_codec import StatCodec
+            self._stat_codec = StatCodec(self.db[Settings.MONGODB_STAT_SCHEMA_COLLECTION])
+        return self._stat_codec
+
+    @property
+    def stat_history(self):
+        """seasonStats geçmişi (oyuncu/sezon kovaları)"""
+        if self._stat_history is None:
+            from models.stat_history import StatHistory
+            self._stat_history = StatHistory(self.db[Settings.MONGODB_STAT_HISTORY_COLLECTION])
+        return self._stat_history
+
+    def _record_history(self, fbref_id, fields):
+        """Yazılan seasonStats'ı geçmişe ekler - hata oyuncu kaydını etkilemez"""
+        if not Settings.STAT_HISTORY_ENABLED or not isinstance(fields.get('seasonStats'), dict):
+            return
+        try:
+            with tracer.span('db_write', operation='stat_history', fbrefId=fbref_id), \
+                    metrics.DB_WRITE_SECONDS.labels(operation='stat_history').time():
+                self.stat_history.record(fbref_id, fields['seasonStats'], at=fields.get('updatedAt'))
+        except Exception as e:
+            logging.error(f"İstatistik geçmişi hatası: {e}")
+
+    def _build_update(self, fields):
+        """$set alanları -> update dokümanı (STATS_ENCODING=schema ise istatistikler paketlenir)
+
+        Index'li sorgu alanları (positionGroup, contractExpiresAt) kaynak alanlarıyla
+        birlikte, artımlı okuma filigranı (modifiedAt) her yazımda yazılır.
+        """
+        fields = dict(fields, **query_fields(fields))
+        fields.setdefault(MODIFIED_FIELD, datetime.utcnow())
+        if 'seasonStats' not in fields and 'scoutingReport' not in fields:
+            return {"$set": fields}
+        return self.stat_codec.build_update(fields, pack=Settings.STATS_ENCODING == 'schema')
+
+    def _partial_update(self, fields):
+        """Kısmi yazım için (filtre koşulu, update dokümanı)
+
+        Alanları zaten aynı olan dokümanlar eşleşmez: yazılmaz, modifiedAt'leri
+        değişmez. Hesaplama zamanları (computedAt) karşılaştırılmaz.
+        """
+        update = self._build_update(fields)
+        changed = [{'.'.join(path): {"$ne": value}} for path, value in change_paths(update["$set"])]
+        changed += [{key: {"$exists": True}} for key in update.get("$unset", {})]
+        return ({"$or": changed} if changed else {}), update
+
+    @staticmethod
+    def _projection(fields):
+        """Okunacak alanlar -> projection (istatistik alanlarının paketli karşılıkları dahil)"""
+        if not fields:
+            return None
+        projection = list(fields)
+        if "seasonStats" in fields:
+            projection.append("packedStats.season")
+        if "scoutingReport" in fields:
+            projection.append("packedStats.scouting")
+        return projection
+
+    def _decode(self, doc):
+        if doc and 'packedStats' in doc:
+            return self.stat_codec.decode(doc)
+        return doc
+
+    def ensure_indexes(self, force=False):
+        """Yazma için gereken index'leri oluşturur (process başına bir kez)
+
+        Sadece upsert anahtarı (fbrefId, unique) kontrol edilir; sorgu index'leri
+        `sync_indexes` ile (`python main.py indexes`) kurulur.
+        """
+        key = (self.uri, self.db.name, self.collection.name)
+        if key in self._indexed_collections and not force:
+            return False
 
-        # Index oluştur
         self.collection.create_index("fbrefId", unique=True)
-        self.collection.create_index("name")
-        self.collection.create_index("team")
-        self.collection.create_index("league")
+        if Settings.STAT_HISTORY_ENABLED:
+            self.stat_history.ensure_indexes()
+        self._indexed_collections.add(key)
+        return True
+
+    def sync_indexes(self, drop_unmanaged=False, backfill=True):
+        """Yönetilen index setini kurar (models/indexes.py) - rapor sözlüğünü döndürür
+
+        backfill: türetilmiş sorgu alanları eksik olan eski dokümanlar önce tamamlanır.
+        """
+        from models.indexes import backfill_query_fields, sync_indexes
+
+        report = {'backfilled': backfill_query_fields(self.collection) if backfill else 0}
+        report.update(sync_indexes(self.collection, drop_unmanaged=drop_unmanaged))
+        self.ensure_indexes(force=True)
+        return report
 
     def insert_player(self, player_data):
         """Oyuncu verisini ekle veya güncelle"""
         try:
-            result = self.collection.update_one(
-                {"fbrefId": player_data["fbrefId"]},
-                {"$set": player_data},
-                upsert=True
-            )
+            self.ensure_indexes()
+            with tracer.span('db_write', operation='upsert', fbrefId=player_data["fbrefId"]), \
+                    metrics.DB_WRITE_SECONDS.labels(operation='upsert').time():
+                result = self.collection.update_one(
+                    {"fbrefId": player_data["fbrefId"]},
+                    self._build_update(player_data),
+                    upsert=True
+                )
+            self._record_history(player_data["fbrefId"], player_data)
             return result
         except Exception as e:
             logging.error(f"Veritabanı hatası: {e}")
             return None
 
+    def bulk_upsert_players(self, players, batch_size=1000):
+        """Oyuncuları batch_size'lık bulk_write'larla ekler/günceller - yazılan oyuncu sayısını döndürür"""
+        written = 0
+        batch = []
+        try:
+            self.ensure_indexes()
+            for player in players:
+                batch.append(player)
+                if len(batch) >= batch_size:
+                    written += self._upsert_batch(batch)
+                    batch = []
+            if batch:
+                written += self._upsert_batch(batch)
+        except Exception as e:
+            logging.error(f"Veritabanı hatası: {e}")
+        return written
+
+    def _upsert_batch(self, players):
+        from pymongo import UpdateOne
+
+        operations = [UpdateOne({"fbrefId": player["fbrefId"]}, self._build_update(player), upsert=True)
+                      for player in players]
+        with tracer.span('db_write', operation='bulk_upsert', count=len(operations)), \
+                metrics.DB_WRITE_SECONDS.labels(operation='bulk_upsert').time():
+            result = self.collection.bulk_write(operations, ordered=False)
+        for player in players:
+            self._record_history(player["fbrefId"], player)
+        return result.matched_count + result.upserted_count
+
+    def update_player_fields(self, fbref_id, fields):
+        """Oyuncunun sadece verilen alanlarını güncelle - oyuncu yoksa False"""
+        try:
+            with tracer.span('db_write', operation='update_fields', fbrefId=fbref_id), \
+                    metrics.DB_WRITE_SECONDS.labels(operation='update_fields').time():
+                result = None
+                if fields:  # Boş güncelleme yazılmaz (modifiedAt da ilerlemez)
+                    changed, update = self._partial_update(fields)
+                    result = self.collection.update_one(dict(changed, fbrefId=fbref_id), update)
+            # Alanları zaten aynıysa doküman eşleşmez ama oyuncu vardır
+            found = bool(result and result.matched_count) or self.collection.count_documents({"fbrefId": fbref_id}, limit=1) > 0
+            if found:
+                self._record_history(fbref_id, fields)
+            return found
+        except Exception as e:
+            logging.error(f"Veritabanı hatası: {e}")
+            return None
+
     def get_player(self, fbref_id):
         """Oyuncu verisini getir"""
-        return self.collection.find_one({"fbrefId": fbref_id})
+        return self._decode(self.collection.find_one({"fbrefId": fbref_id}))
 
-    def get_all_players(self, league=None):
-        """Tüm oyuncuları getir"""
-        filter_dict = {}
+    def get_stats_at(self, fbref_id, moment):
+        """Oyuncunun verilen tarihteki seasonStats'ı (geçmişten) - kayıt yoksa None"""
+        try:
+            return self.stat_history.stats_at(fbref_id, moment)
+        except Exception as e:
+            logging.error(f"Veritabanı hatası: {e}")
+            return None
+
+    def get_stat_history(self, fbref_id, start=None, end=None):
+        """Oyuncunun [start, end] aralığındaki seasonStats anlık görüntüleri: [(zaman, stat'lar)]"""
+        try:
+            return self.stat_history.history(fbref_id, start, end)
+        except Exception as e:
+            logging.error(f"Veritabanı hatası: {e}")
+            return []
+
+    def search_players(self, league=None, position_group=None, min_age=None, max_age=None,
+                       contract_before=None, limit=50, fields=None):
+        """Scout araması: lig + pozisyon grubu + yaş aralığı (+ kontrat bitişi), dakikaya göre sıralı
+
+        fields verilmezse liste görünümü alanları döner ve sorgu index'ten karşılanır (covered).
+        """
+        query = {}
+        if isinstance(league, (list, tuple, set)):
+            query["league"] = {"$in": list(league)}
+        elif league:
+            query["league"] = league
+        if position_group:
+            query["positionGroup"] = position_group
+        if min_age is not None or max_age is not None:
+            query["age"] = {}
+            if min_age is not None:
+                query["age"]["$gte"] = min_age
+            if max_age is not None:
+                query["age"]["$lte"] = max_age
+        if contract_before is not None:
+            query["contractExpiresAt"] = {"$type": "date", "$lt": contract_before}
+
+        cursor = self.collection.find(query, projection=self._list_projection(fields),
+                                      sort=[("leagueStats.minutes", DESCENDING)], limit=limit)
+        return [self._decode(doc) for doc in cursor]
+
+    def list_players(self, league, limit=50, skip=0):
+        """Ligin oyuncu listesi, dakikaya göre sıralı (covered - doküman okunmaz)"""
+        cursor = self.collection.find({"league": league}, projection=LIST_VIEW_PROJECTION,
+                                      sort=[("leagueStats.minutes", DESCENDING)], skip=skip, limit=limit)
+        return list(cursor)
+
+    def expiring_contracts(self, before, league=None, limit=0):
+        """Kontratı verilen tarihten önce bitenler, bitiş tarihine göre sıralı (partial index)"""
+        query = {"contractExpiresAt": {"$type": "date", "$lt": before}}
         if league:
+            query["league"] = league
+        projection = self._list_projection(None)
+        projection["contractExpiresAt"] = 1
+        return list(self.collection.find(query, projection=projection,
+                                         sort=[("contractExpiresAt", ASCENDING)], limit=limit))
+
+    def _list_projection(self, fields):
+        if fields:
+            return self._projection(fields)
+        return dict(LIST_VIEW_PROJECTION)
+
+    def get_all_players(self, league=None, fields=None):
+        """Tüm oyuncuları getir
+
+        league: tek lig adı veya lig listesi. fields: sadece bu alanlar okunur
+        (istatistik alanları istenirse paketli karşılıkları da okunur).
+        """
+        filter_dict = {}
+        if isinstance(league, (list, tuple, set)):
+            filter_dict["league"] = {"$in": list(league)}
+        elif league:
             filter_dict["league"] = league
-        return list(self.collection.find(filter_dict))
+
+        projection = self._projection(fields)
+        return [self._decode(doc) for doc in self.collection.find(filter_dict, projection=projection)]
+
+    def iter_players(self, updated_since=None, fields=None, batch_size=1000, inclusive=True):
+        """Oyuncuları cursor üzerinden tek tek döndürür
+
+        updated_since: sadece modifiedAt >= (inclusive=False ise >) olanlar. modifiedAt'i
+        olmayan eski dokümanlarda updatedAt'e bakılır.
+        """
+        filter_dict = {}
+        if updated_since is not None:
+            condition = {"$gte" if inclusive else "$gt": updated_since}
+            filter_dict["$or"] = [{MODIFIED_FIELD: condition},
+                                  {MODIFIED_FIELD: {"$exists": False}, "updatedAt": condition}]
+
+        projection = self._projection(fields)
+        for doc in self.collection.find(filter_dict, projection=projection, batch_size=batch_size):
+            yield self._decode(doc)
+
+    def bulk_update_fields(self, updates, batch_size=1000):
+        """{fbrefId: {alan: değer}} güncellemelerini toplu yazar - değişen doküman sayısını döndürür"""
+        from pymongo import UpdateOne
+
+        modified = 0
+        try:
+            operations = []
+            for fbref_id, fields in updates.items():
+                if not fields:
+                    continue
+                changed, update = self._partial_update(fields)
+                operations.append(UpdateOne(dict(changed, fbrefId=fbref_id), update))
+            for start in range(0, len(operations), batch_size):
+                batch = operations[start:start + batch_size]
+                with tracer.span('db_write', operation='bulk_update', count=len(batch)), \
+                        metrics.DB_WRITE_SECONDS.labels(operation='bulk_update').time():
+                    result = self.collection.bulk_write(batch, ordered=False)
+                modified += result.modified_count
+        except Exception as e:
+            logging.error(f"Veritabanı hatası: {e}")
+        return modified
+
+    def migrate_stats_encoding(self, encoding, batch_size=500, limit=None):
+        """Mevcut dokümanların istatistiklerini verilen biçime çevirir (kaldığı yerden devam eder)
+
+        encoding: 'schema' (paketle) veya 'dict' (paketi aç). Dönüştürülen doküman sayısını döndürür.
+        """
+        from pymongo import UpdateOne
+
+        if encoding == 'schema':
+            query = {"$or": [{"seasonStats": {"$exists": True}}, {"scoutingReport": {"$exists": True}}]}
+            projection = ["seasonStats", "scoutingReport"]
+        elif encoding == 'dict':
+            query = {"packedStats": {"$exists": True}}
+            projection = ["packedStats", "fbrefId"]
+        else:
+            raise ValueError(f"Bilinmeyen istatistik biçimi: {encoding} (dict, schema)")
+
+        migrated = 0
+        batch = []
+        cursor = self.collection.find(query, projection=projection, batch_size=batch_size, limit=limit or 0)
+        for doc in cursor:
+            doc_id = doc.pop("_id")
+            if encoding == 'schema':
+                if not doc:
+                    continue
+                update = self.stat_codec.build_update(doc, pack=True)
+            else:
+                decoded = self.stat_codec.decode(doc)
+                if "packedStats" in decoded:
+                    continue  # Çözülemedi (hata loglandı) - paket silinmesin
+                decoded.pop("fbrefId", None)
+                update = {"$set": decoded, "$unset": {"packedStats": ""}}
+            batch.append(UpdateOne({"_id": doc_id}, update))
+
+            if len(batch) >= batch_size:
+                migrated += self.collection.bulk_write(batch, ordered=False).modified_count
+                batch = []
+                logging.info(f"İstatistik biçimi dönüşümü ({encoding}): {migrated} doküman")
+
+        if batch:
+            migrated += self.collection.bulk_write(batch, ordered=False).modified_count
+        return migrated
+
+    def count_by(self, field, league=None):
+        """Alan değerine göre oyuncu sayıları: {değer: sayı}"""
+        pipeline = [{"$group": {"_id": f"${field}", "count": {"$sum": 1}}}]
+        if league:
+            pipeline.insert(0, {"$match": {"league": league}})
+        return {doc["_id"]: doc["count"] for doc in self.collection.aggregate(pipeline)}
+
+    def get_team_leagues(self):
+        """Takım -> lig eşleşmeleri (fetch planı takım sayfasına gitmeden ligi bilsin)"""
+        try:
+            pipeline = [
+                {"$match": {"league": {"$in": list(LEAGUES)}}},
+                {"$group": {"_id": "$team", "league": {"$first": "$league"}}},
+            ]
+            return {doc["_id"]: doc["league"] for doc in self.collection.aggregate(pipeline) if doc["_id"]}
+        except Exception as e:
+            logging.error(f"Veritabanı hatası: {e}")
+            return {}
+
+    def get_refresh_backlog(self, name="update"):
+        """Önceki çalıştırmada yetişilemeyen oyuncu ID'lerini getir"""
+        try:
+            doc = self.db[Settings.MONGODB_REFRESH_COLLECTION].find_one({"_id": name})
+            return doc.get("fbrefIds", []) if doc else []
+        except Exception as e:
+            logging.error(f"Veritabanı hatası: {e}")
+            return []
+
+    def save_refresh_backlog(self, fbref_ids, name="update"):
+        """Yetişilemeyen oyuncu ID'lerini bir sonraki çalıştırma için kaydet"""
+        try:
+            return self.db[Settings.MONGODB_REFRESH_COLLECTION].update_one(
+                {"_id": name},
+                {"$set": {"fbrefIds": list(fbref_ids), "savedAt": datetime.utcnow()}},
+                upsert=True
+            )
+        except Exception as e:
+            logging.error(f"Veritabanı hatası: {e}")
+            return None
+
+    def get_job_queue(self):
+        """Dağıtık crawl için iş kuyruğunu döndür"""
+        from models.job_queue import JobQueue
+        return JobQueue(self.db[Settings.MONGODB_JOBS_COLLECTION])
 
     def close(self):
         """Veritabanı bağlantısını kapat"""
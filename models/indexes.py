@@ -0,0 +1,150 @@
+# models/indexes.py
+"""Oyuncu koleksiyonunun yönetilen index seti
+
+Index'ler scout sorgularından tasarlandı; alan sırası eşitlik -> sıralama ->
+aralık kuralına uyar:
+
+    - Lig + pozisyon grubu + yaş aralığı, dakikaya göre sıralı (search_players)
+    - Lig listesi, dakikaya göre sıralı (list_players) - covered: doküman okunmaz
+    - Belirli tarihten önce biten kontratlar (expiring_contracts) - partial:
+      kontrat tarihi bilinmeyen oyuncular index'e girmez (sorgu da aynı
+      {"$type": "date"} koşulunu içermeli ki index seçilebilsin)
+    - Takım kadrosu, isimle arama, artımlı aktarım (modifiedAt; eski dokümanlarda updatedAt)
+
+Sorgulanan iki alan dokümanda hazır değildir ve yazarken türetilir
+(query_fields): positionGroup (detailedPosition'dan) ve contractExpiresAt
+('June 30, 2027' -> datetime). `python main.py indexes` eksik index'leri kurar,
+tanımı değişenleri yeniden oluşturur ve eski dokümanlara türetilmiş alanları
+ekler; normal çalıştırmalarda sadece fbrefId index'i kontrol edilir.
+"""
+import logging
+from pymongo import ASCENDING, DESCENDING, IndexModel, UpdateOne
+
+# Liste görünümlerinde okunan alanlar (covered index'lerde hepsi index'te)
+LIST_VIEW_FIELDS = ['fbrefId', 'fullName', 'team', 'league', 'positionGroup', 'age', 'leagueStats.minutes']
+LIST_VIEW_PROJECTION = dict({field: 1 for field in LIST_VIEW_FIELDS}, _id=0)
+
+PLAYER_INDEXES = [
+    {
+        "keys": [("fbrefId", ASCENDING)],
+        "options": {"unique": True},
+        "query": "upsert anahtarı, get_player",
+    },
+    {
+        "keys": [("league", ASCENDING), ("positionGroup", ASCENDING), ("leagueStats.minutes", DESCENDING),
+                 ("age", ASCENDING), ("fullName", ASCENDING), ("team", ASCENDING), ("fbrefId", ASCENDING)],
+        "options": {},
+        "query": "lig + pozisyon + yaş aralığı, dakikaya göre sıralı (covered)",
+    },
+    {
+        "keys": [("league", ASCENDING), ("leagueStats.minutes", DESCENDING), ("positionGroup", ASCENDING),
+                 ("age", ASCENDING), ("fullName", ASCENDING), ("team", ASCENDING), ("fbrefId", ASCENDING)],
+        "options": {},
+        "query": "lig listesi, dakikaya göre sıralı (covered)",
+    },
+    {
+        "keys": [("contractExpiresAt", ASCENDING), ("league", ASCENDING)],
+        "options": {"partialFilterExpression": {"contractExpiresAt": {"$type": "date"}}},
+        "query": "tarihten önce biten kontratlar (partial)",
+    },
+    {
+        "keys": [("team", ASCENDING), ("fullName", ASCENDING)],
+        "options": {},
+        "query": "takım kadrosu",
+    },
+    {
+        "keys": [("fullName", ASCENDING)],
+        "options": {},
+        "query": "isimle arama",
+    },
+    {
+        "keys": [("modifiedAt", ASCENDING)],
+        "options": {},
+        "query": "artımlı aktarım (iter_players updated_since)",
+    },
+    {
+        "keys": [("updatedAt", ASCENDING)],
+        "options": {},
+        "query": "artımlı aktarım, modifiedAt'i olmayan eski dokümanlar",
+    },
+]
+
+# Karşılaştırılan index seçenekleri (farklıysa index yeniden oluşturulur)
+_COMPARED_OPTIONS = ('unique', 'partialFilterExpression', 'sparse')
+
+
+def query_fields(fields):
+    """Yazılan alanlardan türetilen sorgu alanları: positionGroup, contractExpiresAt"""
+    derived = {}
+    if 'detailedPosition' in fields:
+        from analytics.percentiles import position_group
+        derived['positionGroup'] = position_group(fields['detailedPosition'])
+    if 'contractEnd' in fields:
+        from scrapers.utils import ScrapingUtils
+        derived['contractExpiresAt'] = ScrapingUtils.parse_contract_end_date(fields['contractEnd'])
+    return derived
+
+
+def _key(keys):
+    return tuple((field, int(direction)) for field, direction in keys)
+
+
+def _options(info):
+    return {name: info[name] for name in _COMPARED_OPTIONS if info.get(name)}
+
+
+def sync_indexes(collection, specs=None, drop_unmanaged=False):
+    """Koleksiyonun index'lerini tanımlı sete getirir
+
+    {'created', 'rebuilt', 'unchanged', 'unmanaged', 'dropped'} index isimleri listelerini döndürür.
+    Tanımda olmayan index'ler drop_unmanaged=True ise silinir.
+    """
+    specs = specs or PLAYER_INDEXES
+    report = {'created': [], 'rebuilt': [], 'unchanged': [], 'unmanaged': [], 'dropped': []}
+    existing = {_key(info['key']): (name, info) for name, info in collection.index_information().items()
+                if name != '_id_'}
+
+    to_create = []
+    for spec in specs:
+        key = _key(spec['keys'])
+        model = IndexModel(spec['keys'], **spec['options'])
+        current = existing.pop(key, None)
+        if current is None:
+            to_create.append(model)
+            report['created'].append(model.document['name'])
+        elif _options(current[1]) != _options(spec['options']):
+            logging.info(f"Index tanımı değişmiş, yeniden oluşturuluyor: {current[0]}")
+            collection.drop_index(current[0])
+            to_create.append(model)
+            report['rebuilt'].append(model.document['name'])
+        else:
+            report['unchanged'].append(current[0])
+
+    if to_create:
+        collection.create_indexes(to_create)
+
+    for name, _ in existing.values():
+        report['unmanaged'].append(name)
+        if drop_unmanaged:
+            collection.drop_index(name)
+            report['dropped'].append(name)
+    return report
+
+
+def backfill_query_fields(collection, batch_size=1000):
+    """Türetilmiş alanları eksik olan dokümanlara ekler - güncellenen doküman sayısını döndürür"""
+    query = {"$or": [
+        {"detailedPosition": {"$exists": True}, "positionGroup": {"$exists": False}},
+        {"contractEnd": {"$exists": True}, "contractExpiresAt": {"$exists": False}},
+    ]}
+    updated = 0
+    batch = []
+    for doc in collection.find(query, projection=["detailedPosition", "contractEnd"], batch_size=batch_size):
+        doc_id = doc.pop("_id")
+        batch.append(UpdateOne({"_id": doc_id}, {"$set": query_fields(doc)}))
+        if len(batch) >= batch_size:
+            updated += collection.bulk_write(batch, ordered=False).modified_count
+            batch = []
+    if batch:
+        updated += collection.bulk_write(batch, ordered=False).modified_count
+    return updated
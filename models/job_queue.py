@@ -0,0 +1,177 @@
+import logging
+import threading
+from datetime import datetime, timedelta
+from pymongo import ASCENDING, DESCENDING, ReturnDocument
+from config.settings import Settings
+
+
+class JobQueue:
+    """MongoDB koleksiyonu üzerinde lease/heartbeat mantığıyla çalışan iş kuyruğu"""
+
+    PENDING = "pending"
+    LEASED = "leased"
+    DONE = "done"
+    FAILED = "failed"
+
+    def __init__(self, collection, lease_seconds=None, max_attempts=None):
+        self.collection = collection
+        self.lease_seconds = lease_seconds or Settings.JOB_LEASE_SECONDS
+        self.max_attempts = max_attempts or Settings.JOB_MAX_ATTEMPTS
+
+    def ensure_indexes(self):
+        """Kuyruk indexlerini oluştur"""
+        self.collection.create_index("key", unique=True)
+        self.collection.create_index([("status", ASCENDING), ("priority", DESCENDING), ("createdAt", ASCENDING)])
+        self.collection.create_index([("status", ASCENDING), ("leaseUntil", ASCENDING)])
+        self.collection.create_index("owner")
+
+    def enqueue(self, job_type, payload, key, priority=0):
+        """İşi kuyruğa ekle - aynı key ile tekrar eklenirse yok sayılır"""
+        try:
+            now = datetime.utcnow()
+            result = self.collection.update_one(
+                {"key": key},
+                {"$setOnInsert": {
+                    "key": key,
+                    "type": job_type,
+                    "payload": payload,
+                    "priority": priority,
+                    "status": self.PENDING,
+                    "attempts": 0,
+                    "owner": None,
+                    "leaseUntil": None,
+                    "createdAt": now,
+                    "updatedAt": now
+                }},
+                upsert=True
+            )
+            return result.upserted_id is not None
+        except Exception as e:
+            logging.error(f"İş kuyruğa eklenemedi ({key}): {e}")
+            return False
+
+    def claim(self, worker_id, job_types=None):
+        """Bekleyen veya lease süresi dolmuş bir işi atomik olarak al"""
+        while True:
+            now = datetime.utcnow()
+            query = {"$or": [
+                {"status": self.PENDING},
+                {"status": self.LEASED, "leaseUntil": {"$lt": now}}
+            ]}
+            if job_types:
+                query["type"] = {"$in": list(job_types)}
+
+            job = self.collection.find_one_and_update(
+                query,
+                {
+                    "$set": {
+                        "status": self.LEASED,
+                        "owner": worker_id,
+                        "leaseUntil": now + timedelta(seconds=self.lease_seconds),
+                        "heartbeatAt": now,
+                        "updatedAt": now
+                    },
+                    "$inc": {"attempts": 1}
+                },
+                sort=[("priority", DESCENDING), ("createdAt", ASCENDING)],
+                return_document=ReturnDocument.AFTER
+            )
+
+            if not job:
+                return None
+
+            # Çok kez denenmiş (örn. worker'ı sürekli çökerten) işleri kalıcı olarak başarısız say
+            if job["attempts"] > self.max_attempts:
+                self.collection.update_one(
+                    {"_id": job["_id"], "owner": worker_id},
+                    {"$set": {"status": self.FAILED, "owner": None, "leaseUntil": None,
+                              "error": "Maksimum deneme sayısı aşıldı", "updatedAt": now}}
+                )
+                logging.warning(f"İş maksimum deneme sayısını aştı: {job['key']}")
+                continue
+
+            return job
+
+    def heartbeat(self, job, worker_id):
+        """Lease süresini uzat - lease başka worker'a geçtiyse False döner"""
+        now = datetime.utcnow()
+        result = self.collection.update_one(
+            {"_id": job["_id"], "owner": worker_id, "status": self.LEASED},
+            {"$set": {
+                "leaseUntil": now + timedelta(seconds=self.lease_seconds),
+                "heartbeatAt": now
+            }}
+        )
+        # matched: aynı milisaniyedeki heartbeat leaseUntil'i değiştirmese de lease bizde
+        return result.matched_count == 1
+
+    def complete(self, job, worker_id, result=None):
+        """İşi tamamlandı olarak işaretle"""
+        update = {"status": self.DONE, "owner": None, "leaseUntil": None, "updatedAt": datetime.utcnow()}
+        if result is not None:
+            update["result"] = result
+        self.collection.update_one({"_id": job["_id"], "owner": worker_id}, {"$set": update})
+
+    def fail(self, job, worker_id, error):
+        """İşi başarısız olarak işaretle - deneme hakkı varsa tekrar kuyruğa al"""
+        status = self.FAILED if job.get("attempts", 0) >= self.max_attempts else self.PENDING
+        self.collection.update_one(
+            {"_id": job["_id"], "owner": worker_id},
+            {"$set": {"status": status, "owner": None, "leaseUntil": None,
+                      "error": str(error), "updatedAt": datetime.utcnow()}}
+        )
+
+    def release(self, job, worker_id):
+        """İşi tamamlamadan bırak (deneme hakkı harcanmaz)"""
+        self.collection.update_one(
+            {"_id": job["_id"], "owner": worker_id, "status": self.LEASED},
+            {"$set": {"status": self.PENDING, "owner": None, "leaseUntil": None, "updatedAt": datetime.utcnow()},
+             "$inc": {"attempts": -1}}
+        )
+
+    def release_worker(self, worker_id):
+        """Worker'ın elindeki tüm işleri bırak (kapanış/çökme durumunda)"""
+        result = self.collection.update_many(
+            {"owner": worker_id, "status": self.LEASED},
+            {"$set": {"status": self.PENDING, "owner": None, "leaseUntil": None, "updatedAt": datetime.utcnow()},
+             "$inc": {"attempts": -1}}
+        )
+        return result.modified_count
+
+    def get_status_counts(self):
+        """Durum bazında iş sayıları"""
+        counts = {self.PENDING: 0, self.LEASED: 0, self.DONE: 0, self.FAILED: 0}
+        for row in self.collection.aggregate([{"$group": {"_id": "$status", "count": {"$sum": 1}}}]):
+            counts[row["_id"]] = row["count"]
+        return counts
+
+
+class LeaseHeartbeat:
+    """İş işlenirken arka planda lease'i yenileyen thread"""
+
+    def __init__(self, queue, job, worker_id, interval=None):
+        self.queue = queue
+        self.job = job
+        self.worker_id = worker_id
+        self.interval = interval or max(queue.lease_seconds / 3, 1)
+        self.lost = False
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            try:
+                if not self.queue.heartbeat(self.job, self.worker_id):
+                    self.lost = True
+                    logging.warning(f"İş lease'i kaybedildi: {self.job['key']}")
+                    return
+            except Exception as e:
+                logging.error(f"Heartbeat hatası ({self.job['key']}): {e}")
+
+    def __enter__(self):
+        self._thread.start()
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self._stop.set()
+        self._thread.join()
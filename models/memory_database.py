@@ -0,0 +1,34 @@
+# models/memory_database.py
+"""Bellek içi oyuncu deposu - corpus modu ve crawl simülasyonu için
+
+Ağ ve MongoDB olmadan yapılan çalıştırmalarda (python main.py ... --corpus,
+benchmarks.bench_crawl) kaydedilen oyuncular process belleğinde tutulur.
+"""
+import time
+
+from models.storage import PlayerStore
+
+
+class MemoryDatabase(PlayerStore):
+    """Bellek içi oyuncu deposu (PlayerStore arayüzünün scraping için gereken alt kümesi)"""
+
+    backend = 'memory'
+
+    def __init__(self):
+        self.players = {}
+        self.insert_latencies = []
+
+    def ensure_indexes(self, force=False):
+        pass
+
+    def get_player(self, fbref_id):
+        return self.players.get(fbref_id)
+
+    def insert_player(self, player_data):
+        start = time.perf_counter()
+        self.players[player_data['fbrefId']] = player_data
+        self.insert_latencies.append(time.perf_counter() - start)
+        return True
+
+    def get_team_leagues(self):
+        return {p['team']: p['league'] for p in self.players.values() if p.get('team') and p.get('league')}
@@ -1,6 +1,16 @@
+import logging
+import re
 from datetime import datetime
 from typing import List, Dict, Optional
 
+# Doğrulama kuralları (toplu doğrulama da aynılarını kullanır - models/validation.py)
+CRITICAL_FIELDS = ("fbrefId", "fullName")  # Boşsa kayıt reddedilir
+IMPORTANT_FIELDS = ("team", "league")  # Boşsa uyarı
+FBREF_ID_REGEX = r'[a-f0-9]{8}'  # FBRef ID 8 karakterli hexadecimal string
+FBREF_ID_PATTERN = re.compile(rf'^{FBREF_ID_REGEX}$')
+MIN_AGE = 15
+MAX_AGE = 50
+
 
 class PlayerModel:
     def __init__(self):
@@ -74,6 +84,16 @@ class PlayerModel:
         """Benzer oyuncuları ayarla"""
         self.data["similarPlayers"] = similar_players or []
 
+    def set_league_stats(self, basic_stats):
+        """Lig tablosundan gelen temel istatistikleri ayarla (delta güncelleme için)"""
+        self.data["leagueStats"] = {
+            "matches": basic_stats.get("matches", 0),
+            "starts": basic_stats.get("starts", 0),
+            "minutes": basic_stats.get("minutes", 0),
+            "goals": basic_stats.get("goals", 0),
+            "assists": basic_stats.get("assists", 0)
+        }
+
     def set_transfer_history(self, transfers):
         """Transfer geçmişini ayarla"""
         self.data["transferHistory"] = transfers or []
@@ -87,20 +107,17 @@ class PlayerModel:
         return self.data
 
     def validate(self):
-        """Gelişmiş veri doğrulaması"""
+        """Gelişmiş veri doğrulaması (bir ligin kayıtları için toplu hali: models/validation.py)"""
         # Kritik alanlar - bu alanlar mutlaka dolu olmalı
-        critical_fields = ["fbrefId", "fullName"]
-
-        for field in critical_fields:
+        for field in CRITICAL_FIELDS:
             value = self.data.get(field)
             if not value or (isinstance(value, str) and value.strip() == ""):
                 return False, f"Kritik alan eksik veya boş: {field}"
 
         # Opsiyonel ama önemli alanlar - uyarı ver ama başarısız sayma
-        important_fields = ["team", "league"]
         warnings = []
 
-        for field in important_fields:
+        for field in IMPORTANT_FIELDS:
             value = self.data.get(field)
             if not value or (isinstance(value, str) and value.strip() == ""):
                 warnings.append(f"Önemli alan eksik: {field}")
@@ -112,12 +129,11 @@ class PlayerModel:
 
         # Yaş kontrolü
         age = self.data.get("age", 0)
-        if age and (age < 15 or age > 50):
+        if age and (age < MIN_AGE or age > MAX_AGE):
             warnings.append(f"Şüpheli yaş değeri: {age}")
 
         # Uyarıları logla ama başarılı olarak döndür
         if warnings:
-            import logging
             for warning in warnings:
                 logging.warning(f"Validation warning: {warning}")
 
@@ -125,10 +141,7 @@ class PlayerModel:
 
     def _is_valid_fbref_id(self, fbref_id):
         """FBRef ID formatını kontrol eder"""
-        import re
-        # FBRef ID 8 karakterli hexadecimal string olmalı
-        pattern = r'^[a-f0-9]{8}$'
-        return bool(re.match(pattern, fbref_id))
+        return bool(FBREF_ID_PATTERN.match(fbref_id))
 
     def get_summary(self):
         """Oyuncu özetini döndürür"""
@@ -0,0 +1,344 @@
+# models/player_record.py
+"""Bellek dostu, tipli oyuncu kaydı (toplu işler ve analiz için)
+
+PlayerModel / Mongo dokümanı her oyuncu için ayrı dict'ler ve stat isimleri
+taşır. PlayerRecord ise `__slots__` kullanır ve sayısal istatistikleri tüm
+kayıtların paylaştığı bir stat isim şeması (StatSchema) üzerinden sabit
+konumlu `array('d')` tamponlarında tutar:
+
+    seasonStats    -> season_values (+ değer türleri)
+    scoutingReport -> scouting_per90 / scouting_percentile (+ değer türleri)
+
+Mongo doküman biçimine kayıpsız dönüşüm vardır (from_dict / to_dict): int,
+float, bool ve None ayrı bir tür baytında saklanır; sayısal olmayan değerler
+ve tanınmayan alanlar yan sözlüklerde tutulur. NumPy görünümleri için
+season_array() / stat_matrix() kullanılır.
+"""
+from array import array
+
+# Değer türleri (tür baytı)
+ABSENT = 0
+FLOAT = 1
+INT = 2
+NONE = 3
+TRUE = 4
+FALSE = 5
+OTHER = 6  # Sayısal değil - extras sözlüğünde
+NO_KEY = 7  # scouting girişinde per90 anahtarı yok (giriş var)
+
+NAN = float('nan')
+MAX_EXACT_INT = 2 ** 53  # float64'te kayıpsız tutulabilen en büyük tamsayı
+
+SCOUTING_KEYS = ('per90', 'percentile')
+
+# (slot, doküman alanı) - doküman alanları PlayerModel ile aynı
+FIELDS = (
+    ('fbref_id', 'fbrefId'),
+    ('first_name', 'firstName'),
+    ('last_name', 'lastName'),
+    ('full_name', 'fullName'),
+    ('age', 'age'),
+    ('contract_end', 'contractEnd'),
+    ('preferred_foot', 'preferredFoot'),
+    ('team', 'team'),
+    ('league', 'league'),
+    ('country', 'country'),
+    ('height', 'height'),
+    ('weight', 'weight'),
+    ('detailed_position', 'detailedPosition'),
+    ('photo', 'photo'),
+    ('similar_players', 'similarPlayers'),
+    ('transfer_history', 'transferHistory'),
+    ('league_stats', 'leagueStats'),
+    ('created_at', 'createdAt'),
+    ('updated_at', 'updatedAt'),
+    ('scouting_updated_at', 'scoutingUpdatedAt'),
+)
+
+_FIELD_KEYS = frozenset(key for _, key in FIELDS) | {'seasonStats', 'scoutingReport'}
+
+
+class _Missing:
+    """Dokümanda olmayan alan (None'dan ayırt etmek için)"""
+    __slots__ = ()
+
+    def __repr__(self):
+        return 'MISSING'
+
+
+MISSING = _Missing()
+
+
+class StatSchema:
+    """Stat ismi -> sütun numarası; sadece sona ekleme yapılır, numaralar değişmez"""
+
+    def __init__(self, names=()):
+        self.names = []
+        self.index = {}
+        for name in names:
+            self.slot(name)
+
+    def slot(self, name):
+        index = self.index.get(name)
+        if index is None:
+            index = self.index[name] = len(self.names)
+            self.names.append(name)
+        return index
+
+    def __len__(self):
+        return len(self.names)
+
+    def __contains__(self, name):
+        return name in self.index
+
+
+# Varsayılan olarak tüm kayıtlar aynı şemaları paylaşır
+SEASON_SCHEMA = StatSchema()
+SCOUTING_SCHEMA = StatSchema()
+
+
+def encode_value(value):
+    """Değer -> (tür, float) - sayısal değilse (OTHER, nan)"""
+    if value is None:
+        return NONE, NAN
+    if value is True:
+        return TRUE, 1.0
+    if value is False:
+        return FALSE, 0.0
+    if isinstance(value, float):
+        return FLOAT, value
+    if isinstance(value, int) and -MAX_EXACT_INT <= value <= MAX_EXACT_INT:
+        return INT, float(value)
+    return OTHER, NAN
+
+
+def decode_value(kind, number):
+    if kind == FLOAT:
+        return number
+    if kind == INT:
+        return int(number)
+    if kind == TRUE:
+        return True
+    if kind == FALSE:
+        return False
+    return None
+
+
+def _dense(width):
+    return array('d', [NAN]) * width, bytearray(width)
+
+
+class PlayerRecord:
+    """__slots__ tabanlı oyuncu kaydı - istatistikler şema konumlu float tamponlarında"""
+
+    __slots__ = tuple(slot for slot, _ in FIELDS) + (
+        'season_schema', 'season_values', 'season_kinds', 'season_extras',
+        'scouting_schema', 'scouting_per90', 'scouting_percentile', 'scouting_kinds', 'scouting_extras',
+        'extra',
+    )
+
+    @classmethod
+    def from_dict(cls, doc, season_schema=None, scouting_schema=None):
+        """Mongo dokümanından (veya PlayerModel.to_dict()) kayıt oluşturur"""
+        record = cls.__new__(cls)
+        for slot, key in FIELDS:
+            setattr(record, slot, doc.get(key, MISSING))
+
+        extra = {key: value for key, value in doc.items() if key not in _FIELD_KEYS}
+        record.extra = extra or None
+
+        record.season_schema = SEASON_SCHEMA if season_schema is None else season_schema
+        record._set_season_stats(doc.get('seasonStats', MISSING))
+
+        record.scouting_schema = SCOUTING_SCHEMA if scouting_schema is None else scouting_schema
+        record._set_scouting_report(doc.get('scoutingReport', MISSING))
+        return record
+
+    def _set_season_stats(self, stats):
+        self.season_extras = None
+        if stats is MISSING or not isinstance(stats, dict):
+            # Dict değilse (veya yoksa) olduğu gibi saklanır
+            self.season_values = self.season_kinds = None
+            if stats is not MISSING:
+                self.season_extras = {None: stats}
+            return
+
+        schema = self.season_schema
+        slots = [(schema.slot(name), value) for name, value in stats.items()]
+        values, kinds = _dense(max((index for index, _ in slots), default=-1) + 1)
+
+        for (index, value), name in zip(slots, stats):
+            kind, number = encode_value(value)
+            kinds[index] = kind
+            values[index] = number
+            if kind == OTHER:
+                if self.season_extras is None:
+                    self.season_extras = {}
+                self.season_extras[name] = value
+
+        self.season_values = values
+        self.season_kinds = bytes(kinds)
+
+    def _set_scouting_report(self, report):
+        self.scouting_extras = None
+        if report is MISSING or not isinstance(report, dict):
+            self.scouting_per90 = self.scouting_percentile = self.scouting_kinds = None
+            if report is not MISSING:
+                self.scouting_extras = {None: report}
+            return
+
+        schema = self.scouting_schema
+        slots = [(schema.slot(name), entry) for name, entry in report.items()]
+        width = max((index for index, _ in slots), default=-1) + 1
+        per90, per90_kinds = _dense(width)
+        percentile, percentile_kinds = _dense(width)
+
+        for (index, entry), name in zip(slots, report):
+            encoded = None
+            # Beklenen biçim: {'per90': sayı, 'percentile': sayı} (anahtarlardan biri eksik olabilir)
+            if isinstance(entry, dict) and entry and entry.keys() <= set(SCOUTING_KEYS):
+                encoded = [encode_value(entry[key]) if key in entry else (ABSENT, NAN) for key in SCOUTING_KEYS]
+                if any(kind == OTHER for kind, _ in encoded):
+                    encoded = None
+
+            if encoded is None:
+                per90_kinds[index] = OTHER
+                if self.scouting_extras is None:
+                    self.scouting_extras = {}
+                self.scouting_extras[name] = entry
+                continue
+
+            (per90_kind, per90[index]), (percentile_kind, percentile[index]) = encoded
+            # per90 türü ABSENT olursa giriş hiç yokmuş gibi okunur
+            per90_kinds[index] = per90_kind if per90_kind != ABSENT else NO_KEY
+            percentile_kinds[index] = percentile_kind
+
+        self.scouting_per90 = per90
+        self.scouting_percentile = percentile
+        self.scouting_kinds = bytes(per90_kinds) + bytes(percentile_kinds)
+
+    # --- Mongo biçimine dönüş ---
+
+    def season_stats(self):
+        """seasonStats dict'i (şemadaki isim nesneleri paylaşılır)"""
+        if self.season_kinds is None:
+            return (self.season_extras or {}).get(None, MISSING)
+
+        names = self.season_schema.names
+        extras = self.season_extras
+        values = self.season_values
+        stats = {}
+        for index, kind in enumerate(self.season_kinds):
+            if kind == ABSENT:
+                continue
+            name = names[index]
+            stats[name] = extras[name] if kind == OTHER else decode_value(kind, values[index])
+        return stats
+
+    def scouting_report(self):
+        """scoutingReport dict'i"""
+        if self.scouting_kinds is None:
+            return (self.scouting_extras or {}).get(None, MISSING)
+
+        names = self.scouting_schema.names
+        width = len(self.scouting_per90)
+        per90_kinds = self.scouting_kinds[:width]
+        percentile_kinds = self.scouting_kinds[width:]
+        report = {}
+        for index, per90_kind in enumerate(per90_kinds):
+            if per90_kind == ABSENT:
+                continue
+            name = names[index]
+            if per90_kind == OTHER:
+                report[name] = self.scouting_extras[name]
+                continue
+
+            entry = {}
+            if per90_kind != NO_KEY:
+                entry['per90'] = decode_value(per90_kind, self.scouting_per90[index])
+            if percentile_kinds[index] != ABSENT:
+                entry['percentile'] = decode_value(percentile_kinds[index], self.scouting_percentile[index])
+            report[name] = entry
+        return report
+
+    def to_dict(self):
+        """Mongo doküman biçimi - from_dict'e verilen dokümana eşit"""
+        doc = dict(self.extra) if self.extra else {}
+        for slot, key in FIELDS:
+            value = getattr(self, slot)
+            if value is not MISSING:
+                doc[key] = value
+
+        season_stats = self.season_stats()
+        if season_stats is not MISSING:
+            doc['seasonStats'] = season_stats
+        scouting_report = self.scouting_report()
+        if scouting_report is not MISSING:
+            doc['scoutingReport'] = scouting_report
+        return doc
+
+    # --- Erişim ---
+
+    def season_stat(self, name, default=None):
+        index = self.season_schema.index.get(name)
+        if index is None or self.season_kinds is None or index >= len(self.season_kinds):
+            return default
+        kind = self.season_kinds[index]
+        if kind == ABSENT:
+            return default
+        if kind == OTHER:
+            return self.season_extras[name]
+        return decode_value(kind, self.season_values[index])
+
+    def season_array(self, width=None):
+        """Sezon istatistikleri NumPy dizisi olarak (eksik/sayısal olmayan = NaN, şema genişliğinde)"""
+        return _padded(self.season_values, width or len(self.season_schema))
+
+    def scouting_arrays(self, width=None):
+        """(per90, percentile) NumPy dizileri (eksik = NaN, şema genişliğinde)"""
+        width = width or len(self.scouting_schema)
+        return _padded(self.scouting_per90, width), _padded(self.scouting_percentile, width)
+
+    def __repr__(self):
+        name = self.full_name if self.full_name is not MISSING else '?'
+        return f"PlayerRecord({self.fbref_id!r}, {name!r})"
+
+
+def _padded(values, width):
+    import numpy as np
+
+    out = np.full(width, np.nan)
+    if values:
+        buffer = np.frombuffer(values, dtype=np.float64)[:width]
+        out[:len(buffer)] = buffer
+    return out
+
+
+def stat_matrix(records, field='season'):
+    """Kayıtlar -> (fbrefId listesi, oyuncu × stat float64 matrisi, stat isimleri)
+
+    field: 'season', 'per90' veya 'percentile'. Tüm kayıtların aynı şemayı
+    paylaştığı varsayılır; eksik değerler NaN'dır.
+    """
+    import numpy as np
+
+    records = list(records)
+    if not records:
+        return [], np.empty((0, 0)), []
+
+    if field == 'season':
+        schema = records[0].season_schema
+        buffers = [record.season_values for record in records]
+    elif field in SCOUTING_KEYS:
+        schema = records[0].scouting_schema
+        attribute = 'scouting_per90' if field == 'per90' else 'scouting_percentile'
+        buffers = [getattr(record, attribute) for record in records]
+    else:
+        raise ValueError(f"Bilinmeyen alan: {field} (season, per90, percentile)")
+
+    matrix = np.full((len(records), len(schema)), np.nan)
+    for row, values in enumerate(buffers):
+        if values:
+            matrix[row, :len(values)] = np.frombuffer(values, dtype=np.float64)
+
+    return [record.fbref_id for record in records], matrix, list(schema.names)
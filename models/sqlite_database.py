@@ -0,0 +1,392 @@
+# models/sqlite_database.py
+"""Gömülü SQLite oyuncu deposu (STORAGE_BACKEND=sqlite)
+
+Her oyuncu tek satırdır: doküman JSON olarak `doc` sütununda, filtrelenen
+alanlar ayrıca index'li sütunlarda tutulur:
+
+    fbrefId (PRIMARY KEY), league, team, position (detailedPosition), age, updatedAt, modifiedAt
+
+Tarihler JSON'da {"$date": "..."} olarak saklanır ve okurken datetime'a
+çevrilir. Upsert'ler MongoDB'deki $set gibi çalışır (verilmeyen alanlar
+korunur); okuma-birleştirme-yazma tek bir BEGIN IMMEDIATE transaction'ında
+yapıldığından aynı dosyayı kullanan process'ler birbirinin yazısını ezmez.
+"""
+import json
+import logging
+import os
+import sqlite3
+import threading
+from contextlib import contextmanager
+from datetime import date, datetime
+
+from config.leagues import LEAGUES
+from config.settings import Settings
+from models.storage import MODIFIED_FIELD, PlayerStore, change_paths
+from monitoring import metrics
+from monitoring.tracing import tracer
+
+# Doküman alanı -> index'li sütun
+COLUMNS = {
+    'fbrefId': 'fbrefId',
+    'league': 'league',
+    'team': 'team',
+    'detailedPosition': 'position',
+    'age': 'age',
+    'updatedAt': 'updatedAt',
+    'modifiedAt': 'modifiedAt',
+}
+
+DATE_KEY = '$date'
+TIMESTAMP_FORMAT = '%Y-%m-%dT%H:%M:%S.%f'  # Sabit genişlik: sütunda string karşılaştırması sıralı olur
+MAX_VARIABLES = 900  # IN (...) başına parametre
+
+
+def _encode_default(value):
+    if isinstance(value, datetime):
+        return {DATE_KEY: value.strftime(TIMESTAMP_FORMAT)}
+    if isinstance(value, date):
+        return {DATE_KEY: value.strftime('%Y-%m-%d')}
+    raise TypeError(f"JSON'a çevrilemeyen değer: {type(value).__name__}")
+
+
+def _decode_hook(obj):
+    if DATE_KEY in obj and len(obj) == 1:
+        return datetime.fromisoformat(obj[DATE_KEY])
+    return obj
+
+
+def dumps(doc):
+    return json.dumps(doc, default=_encode_default, separators=(',', ':'))
+
+
+def loads(text):
+    return json.loads(text, object_hook=_decode_hook)
+
+
+def _timestamp(value):
+    return value.strftime(TIMESTAMP_FORMAT) if isinstance(value, datetime) else None
+
+
+def _age(value):
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return None
+
+
+def _column_value(field, value):
+    """Doküman alanı -> index'li sütundaki değeri"""
+    if field == 'age':
+        return _age(value)
+    if field in ('updatedAt', 'modifiedAt'):
+        return _timestamp(value)
+    return value
+
+
+def _document_sql(fields):
+    """Okunacak alanlar -> (SELECT ifadesi, parametreler)
+
+    Projection'da alanlar SQLite'ta çıkarılır (json_extract); Python'da tüm
+    doküman yerine sadece istenen alanlar çözülür. Dokümanda olmayan alan None döner.
+    """
+    if not fields:
+        return "doc", []
+    params = []
+    for field in fields:
+        params.extend((field, f'$."{field}"'))
+    return f"json_object({', '.join(['?, json_extract(doc, ?)'] * len(fields))})", params
+
+
+class SQLiteDatabaseManager(PlayerStore):
+    backend = 'sqlite'
+
+    def __init__(self, path=None):
+        self.path = path or Settings.SQLITE_PATH
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        # isolation_level=None: transaction'lar açıkça yönetilir
+        self.conn = sqlite3.connect(self.path, timeout=Settings.SQLITE_BUSY_TIMEOUT,
+                                    isolation_level=None, check_same_thread=False)
+        self.conn.execute("PRAGMA journal_mode=WAL")  # Okuyucular yazanı beklemez
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self._lock = threading.RLock()
+        self.ensure_indexes()
+
+    def ensure_indexes(self, force=False):
+        """Tabloları ve index'leri oluşturur (idempotent)"""
+        with self._lock:
+            self.conn.executescript("""
+                CREATE TABLE IF NOT EXISTS players (
+                    fbrefId TEXT PRIMARY KEY,
+                    league TEXT,
+                    team TEXT,
+                    position TEXT,
+                    age INTEGER,
+                    updatedAt TEXT,
+                    doc TEXT NOT NULL,
+                    modifiedAt TEXT
+                );
+                CREATE INDEX IF NOT EXISTS players_league ON players (league);
+                CREATE INDEX IF NOT EXISTS players_team ON players (team);
+                CREATE INDEX IF NOT EXISTS players_position ON players (position);
+                CREATE INDEX IF NOT EXISTS players_age ON players (age);
+                CREATE INDEX IF NOT EXISTS players_updated_at ON players (updatedAt);
+
+                CREATE TABLE IF NOT EXISTS refresh_backlog (
+                    name TEXT PRIMARY KEY,
+                    fbrefIds TEXT NOT NULL,
+                    savedAt TEXT
+                );
+            """)
+            columns = {row[1] for row in self.conn.execute("PRAGMA table_info(players)")}
+            if 'modifiedAt' not in columns:
+                # Eski dosyalar: artımlı okuma filigranı sütunu eklenir (başlangıç değeri updatedAt)
+                self.conn.execute("ALTER TABLE players ADD COLUMN modifiedAt TEXT")
+                self.conn.execute("UPDATE players SET modifiedAt = updatedAt")
+            self.conn.execute("CREATE INDEX IF NOT EXISTS players_modified_at ON players (modifiedAt)")
+        return True
+
+    @contextmanager
+    def _transaction(self):
+        with self._lock:
+            self.conn.execute("BEGIN IMMEDIATE")
+            try:
+                yield self.conn
+            except BaseException:
+                self.conn.execute("ROLLBACK")
+                raise
+            self.conn.execute("COMMIT")
+
+    def _load_docs(self, conn, fbref_ids):
+        docs = {}
+        for start in range(0, len(fbref_ids), MAX_VARIABLES):
+            chunk = fbref_ids[start:start + MAX_VARIABLES]
+            placeholders = ','.join('?' * len(chunk))
+            for fbref_id, text in conn.execute(
+                    f"SELECT fbrefId, doc FROM players WHERE fbrefId IN ({placeholders})", chunk):
+                docs[fbref_id] = loads(text)
+        return docs
+
+    def _merge(self, items):
+        """[(fbrefId, alanlar)] -> mevcut dokümanlarla Python'da birleştirip yazar (upsert)
+
+        Yazılan oyuncu sayısını döndürür; değişmeyen satırlar yazılmaz.
+        """
+        with self._transaction() as conn:
+            current = self._load_docs(conn, list({fbref_id for fbref_id, _ in items}))
+            changed = {}
+            now = datetime.utcnow()
+            for fbref_id, fields in items:
+                existing = current.get(fbref_id)
+                merged = dict(existing or {'fbrefId': fbref_id})
+                merged.update(fields)
+                if merged != existing:
+                    if MODIFIED_FIELD not in fields:
+                        merged[MODIFIED_FIELD] = now
+                    current[fbref_id] = changed[fbref_id] = merged
+
+            conn.executemany(
+                "INSERT INTO players (fbrefId, league, team, position, age, updatedAt, modifiedAt, doc) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?) "
+                "ON CONFLICT (fbrefId) DO UPDATE SET league = excluded.league, team = excluded.team, "
+                "position = excluded.position, age = excluded.age, updatedAt = excluded.updatedAt, "
+                "modifiedAt = excluded.modifiedAt, doc = excluded.doc",
+                [(fbref_id, doc.get('league'), doc.get('team'), doc.get('detailedPosition'),
+                  _column_value('age', doc.get('age')), _column_value('updatedAt', doc.get('updatedAt')),
+                  _column_value(MODIFIED_FIELD, doc.get(MODIFIED_FIELD)), dumps(doc))
+                 for fbref_id, doc in changed.items()]
+            )
+        return len(items)
+
+    def _set_fields(self, items):
+        """[(fbrefId, alanlar)] -> sadece var olan oyuncularda alanları json_set ile yazar
+
+        Doküman Python'a okunmaz; sadece verilen alanlar JSON'a çevrilir. Alanları
+        zaten aynı olan satırlar yazılmaz (hesaplama zamanları karşılaştırılmaz);
+        yazılan satırlarda modifiedAt de güncellenir. Değişen oyuncu sayısını döndürür.
+        """
+        modified = 0
+        now = datetime.utcnow()
+        prepared = []
+        for fbref_id, fields in items:
+            if not fields:
+                continue
+            fields = dict(fields)
+            fields.setdefault(MODIFIED_FIELD, now)
+            compare = change_paths(fields)
+            # Aynı alan ve karşılaştırma yollarına sahip ardışık güncellemeler tek executemany ile yazılır
+            prepared.append(((tuple(fields), tuple(path for path, _ in compare)), fbref_id, fields, compare))
+
+        with self._transaction() as conn:
+            start = 0
+            while start < len(prepared):
+                (keys, compared), end = prepared[start][0], start + 1
+                while end < len(prepared) and prepared[end][0] == (keys, compared):
+                    end += 1
+
+                columns = [key for key in keys if key in COLUMNS and key != 'fbrefId']
+                assignments = ''.join(f", {COLUMNS[key]} = ?" for key in columns)
+                values = ', '.join(['?, json(?)'] * len(keys))
+                changed = ' OR '.join(
+                    ["json_type(doc, ?) IS NULL OR json_quote(json_extract(doc, ?)) IS NOT json(?)"] * len(compared))
+                sql = (f"UPDATE players SET doc = json_set(doc, {values}){assignments} "
+                       f"WHERE fbrefId = ? AND ({changed or '1'})")
+
+                params = []
+                for _, fbref_id, fields, compare in prepared[start:end]:
+                    row = []
+                    for key in keys:
+                        row.extend((f'$."{key}"', dumps(fields[key])))
+                    row.extend(_column_value(key, fields[key]) for key in columns)
+                    row.append(fbref_id)
+                    for path, value in compare:
+                        json_path = '$' + ''.join(f'."{name}"' for name in path)
+                        row.extend((json_path, json_path, dumps(value)))
+                    params.append(row)
+                modified += conn.executemany(sql, params).rowcount
+                start = end
+        return modified
+
+    def insert_player(self, player_data):
+        """Oyuncu verisini ekle veya güncelle"""
+        try:
+            with tracer.span('db_write', operation='upsert', fbrefId=player_data["fbrefId"]), \
+                    metrics.DB_WRITE_SECONDS.labels(operation='upsert').time():
+                self._merge([(player_data["fbrefId"], player_data)])
+            return True
+        except Exception as e:
+            logging.error(f"Veritabanı hatası: {e}")
+            return None
+
+    def bulk_upsert_players(self, players, batch_size=1000):
+        """Oyuncuları batch_size'lık transaction'larla ekler/günceller - yazılan oyuncu sayısını döndürür"""
+        written = 0
+        batch = []
+        try:
+            for player in players:
+                batch.append((player["fbrefId"], player))
+                if len(batch) >= batch_size:
+                    written += self._upsert_batch(batch)
+                    batch = []
+            if batch:
+                written += self._upsert_batch(batch)
+        except Exception as e:
+            logging.error(f"Veritabanı hatası: {e}")
+        return written
+
+    def _upsert_batch(self, batch):
+        with tracer.span('db_write', operation='bulk_upsert', count=len(batch)), \
+                metrics.DB_WRITE_SECONDS.labels(operation='bulk_upsert').time():
+            return self._merge(batch)
+
+    def update_player_fields(self, fbref_id, fields):
+        """Oyuncunun sadece verilen alanlarını güncelle - oyuncu yoksa False"""
+        try:
+            with tracer.span('db_write', operation='update_fields', fbrefId=fbref_id), \
+                    metrics.DB_WRITE_SECONDS.labels(operation='update_fields').time():
+                if self._set_fields([(fbref_id, fields)]):
+                    return True
+            # Alanları zaten aynıysa satır yazılmaz ama oyuncu vardır
+            return self.conn.execute("SELECT 1 FROM players WHERE fbrefId = ?", (fbref_id,)).fetchone() is not None
+        except Exception as e:
+            logging.error(f"Veritabanı hatası: {e}")
+            return None
+
+    def bulk_update_fields(self, updates, batch_size=1000):
+        """{fbrefId: {alan: değer}} güncellemelerini toplu yazar - değişen doküman sayısını döndürür"""
+        modified = 0
+        try:
+            items = list(updates.items())
+            for start in range(0, len(items), batch_size):
+                batch = items[start:start + batch_size]
+                with tracer.span('db_write', operation='bulk_update', count=len(batch)), \
+                        metrics.DB_WRITE_SECONDS.labels(operation='bulk_update').time():
+                    modified += self._set_fields(batch)
+        except Exception as e:
+            logging.error(f"Veritabanı hatası: {e}")
+        return modified
+
+    def get_player(self, fbref_id):
+        """Oyuncu verisini getir"""
+        row = self.conn.execute("SELECT doc FROM players WHERE fbrefId = ?", (fbref_id,)).fetchone()
+        return loads(row[0]) if row else None
+
+    def get_all_players(self, league=None, fields=None):
+        """Tüm oyuncuları getir (league: lig adı veya listesi, fields: sadece bu alanlar)"""
+        expression, params = _document_sql(fields)
+        select = f"SELECT {expression} FROM players"
+        if isinstance(league, (list, tuple, set)):
+            league = list(league)
+            rows = self.conn.execute(f"{select} WHERE league IN ({','.join('?' * len(league))})", params + league)
+        elif league:
+            rows = self.conn.execute(f"{select} WHERE league = ?", params + [league])
+        else:
+            rows = self.conn.execute(select, params)
+        return [loads(text) for text, in rows]
+
+    def iter_players(self, updated_since=None, fields=None, batch_size=1000, inclusive=True):
+        """Oyuncuları batch_size'lık parçalar halinde okuyup tek tek döndürür"""
+        expression, params = _document_sql(fields)
+        select = f"SELECT {expression} FROM players"
+        if updated_since is not None:
+            operator = '>=' if inclusive else '>'
+            cursor = self.conn.execute(f"{select} WHERE modifiedAt {operator} ?",
+                                       params + [_timestamp(updated_since)])
+        else:
+            cursor = self.conn.execute(select, params)
+        while True:
+            rows = cursor.fetchmany(batch_size)
+            if not rows:
+                break
+            for text, in rows:
+                yield loads(text)
+
+    def count_by(self, field, league=None):
+        """Alan değerine göre oyuncu sayıları (index'li sütunlarda index'ten, diğerlerinde JSON'dan)"""
+        column = COLUMNS.get(field)
+        expression = column if column else "json_extract(doc, ?)"
+        params = [] if column else [f'$."{field}"']
+        where = ""
+        if league:
+            where = "WHERE league = ?"
+            params.append(league)
+        rows = self.conn.execute(f"SELECT {expression}, COUNT(*) FROM players {where} GROUP BY 1", params)
+        return {value: count for value, count in rows}
+
+    def get_team_leagues(self):
+        """Takım -> lig eşleşmeleri (fetch planı takım sayfasına gitmeden ligi bilsin)"""
+        try:
+            leagues = list(LEAGUES)
+            rows = self.conn.execute(
+                f"SELECT team, MIN(league) FROM players WHERE league IN ({','.join('?' * len(leagues))}) "
+                "AND team IS NOT NULL AND team != '' GROUP BY team", leagues)
+            return dict(rows.fetchall())
+        except Exception as e:
+            logging.error(f"Veritabanı hatası: {e}")
+            return {}
+
+    def get_refresh_backlog(self, name="update"):
+        """Önceki çalıştırmada yetişilemeyen oyuncu ID'lerini getir"""
+        try:
+            row = self.conn.execute("SELECT fbrefIds FROM refresh_backlog WHERE name = ?", (name,)).fetchone()
+            return json.loads(row[0]) if row else []
+        except Exception as e:
+            logging.error(f"Veritabanı hatası: {e}")
+            return []
+
+    def save_refresh_backlog(self, fbref_ids, name="update"):
+        """Yetişilemeyen oyuncu ID'lerini bir sonraki çalıştırma için kaydet"""
+        try:
+            with self._transaction() as conn:
+                conn.execute("INSERT OR REPLACE INTO refresh_backlog (name, fbrefIds, savedAt) VALUES (?, ?, ?)",
+                             (name, json.dumps(list(fbref_ids)), _timestamp(datetime.utcnow())))
+            return True
+        except Exception as e:
+            logging.error(f"Veritabanı hatası: {e}")
+            return None
+
+    def close(self):
+        """Veritabanı bağlantısını kapat"""
+        self.conn.close()
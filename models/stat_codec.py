@@ -0,0 +1,247 @@
+# models/stat_codec.py
+"""İstatistiklerin şema sözlüğü ile konumsal dizi olarak saklanması
+
+Her oyuncu dokümanı aynı birkaç yüz stat ismini seasonStats ve
+scoutingReport içinde tekrar eder. Paketli biçimde isimler sürümlü bir şema
+dokümanında bir kez tutulur, oyuncu dokümanında sadece değerler kalır:
+
+    packedStats: {
+        season:   {v: 3, values: [...], nulls: [i, ...]},
+        scouting: {v: 3, per90: [...], percentile: [...],
+                   nulls: {per90: [...], percentile: [...]}, raw: {isim: giriş}}
+    }
+
+Dizide null olan konum stat'ın dokümanda olmadığını gösterir; değeri gerçekten
+None olan stat'lar `nulls` listesinde tutulur. {per90, percentile} biçimine
+uymayan scouting girişleri `raw` içinde olduğu gibi saklanır. Şemalar sadece
+sona ekleme ile büyür ve her sürüm ayrı bir doküman olarak yazılır; eski
+sürümle paketlenmiş dokümanlar her zaman çözülebilir.
+"""
+import logging
+import threading
+from datetime import datetime
+from models.player_record import SCOUTING_KEYS, StatSchema
+
+PACKED_FIELD = 'packedStats'
+SEASON_FIELD = 'seasonStats'
+SCOUTING_FIELD = 'scoutingReport'
+
+# Doküman alanı -> packedStats altındaki parça
+PARTS = {SEASON_FIELD: 'season', SCOUTING_FIELD: 'scouting'}
+
+
+class StatCodec:
+    """seasonStats / scoutingReport <-> packedStats dönüşümü (şema sürümleri koleksiyonda)"""
+
+    def __init__(self, collection=None):
+        self.collection = collection  # None = şemalar sadece bellekte (ölçümler için)
+        self.versions = {}  # sürüm -> {'season': [isimler], 'scouting': [isimler]}
+        self.version = 0
+        self.schemas = {part: StatSchema() for part in PARTS.values()}
+        self._loaded = False
+        self._lock = threading.Lock()
+
+    # --- Şema sürümleri ---
+
+    def _load_locked(self):
+        if self._loaded or self.collection is None:
+            self._loaded = True
+            return
+        latest = self.collection.find_one(sort=[('_id', -1)])
+        if latest:
+            self._use_version(latest)
+        self._loaded = True
+
+    def _use_version(self, doc):
+        version = doc['_id']
+        self.versions[version] = {part: list(doc.get(part, [])) for part in PARTS.values()}
+        if version > self.version:
+            self.version = version
+            self.schemas = {part: StatSchema(names) for part, names in self.versions[version].items()}
+
+    def get_version(self, version):
+        """Sürümün isim listeleri - bellekte yoksa koleksiyondan okunur"""
+        names = self.versions.get(version)
+        if names is None and self.collection is not None:
+            doc = self.collection.find_one({'_id': version})
+            if doc:
+                with self._lock:
+                    self._use_version(doc)
+                names = self.versions.get(version)
+        if names is None:
+            raise KeyError(f"Stat şeması bulunamadı: v{version}")
+        return names
+
+    def ensure_names(self, part, names):
+        """İsimlerin hepsini içeren şema sürümü - gerekirse yeni sürüm yazılır"""
+        with self._lock:
+            self._load_locked()
+            while True:
+                missing = [name for name in dict.fromkeys(names) if name not in self.schemas[part]]
+                if not missing and self.version:
+                    return self.version
+
+                version = self.version + 1
+                doc = {part_name: list(schema.names) for part_name, schema in self.schemas.items()}
+                doc[part].extend(missing)
+                doc['_id'] = version
+
+                if self.collection is not None:
+                    from pymongo.errors import DuplicateKeyError
+                    try:
+                        self.collection.insert_one(dict(doc, createdAt=datetime.utcnow()))
+                        logging.info(f"Yeni stat şeması: v{version} (+{len(missing)} {part} stat)")
+                    except DuplicateKeyError:
+                        # Başka bir process aynı sürümü yazdı - onu alıp tekrar dene
+                        self._loaded = False
+                        self._load_locked()
+                        continue
+                self._use_version(doc)
+
+    # --- Paketleme ---
+
+    def pack_season(self, stats):
+        if not isinstance(stats, dict):
+            return {'raw': stats}
+        version = self.ensure_names('season', stats)
+        index = self.schemas['season'].index
+        values = [None] * (max((index[name] for name in stats), default=-1) + 1)
+        nulls = []
+        for name, value in stats.items():
+            values[index[name]] = value
+            if value is None:
+                nulls.append(index[name])
+
+        packed = {'v': version, 'values': values}
+        if nulls:
+            packed['nulls'] = nulls
+        return packed
+
+    def pack_scouting(self, report):
+        if not isinstance(report, dict):
+            return {'raw': report}
+
+        raw = {}
+        entries = {}
+        for name, entry in report.items():
+            if isinstance(entry, dict) and entry and entry.keys() <= set(SCOUTING_KEYS):
+                entries[name] = entry
+            else:
+                raw[name] = entry
+
+        version = self.ensure_names('scouting', entries)
+        index = self.schemas['scouting'].index
+        width = max((index[name] for name in entries), default=-1) + 1
+        packed = {'v': version}
+        nulls = {}
+        for key in SCOUTING_KEYS:
+            values = [None] * width
+            for name, entry in entries.items():
+                if key in entry:
+                    values[index[name]] = entry[key]
+                    if entry[key] is None:
+                        nulls.setdefault(key, []).append(index[name])
+            packed[key] = values
+        if nulls:
+            packed['nulls'] = nulls
+        if raw:
+            packed['raw'] = raw
+        return packed
+
+    def pack_document(self, doc):
+        """Dokümanın paketli kopyası (seasonStats / scoutingReport -> packedStats)"""
+        packed = {key: value for key, value in doc.items() if key not in PARTS}
+        parts = {}
+        if SEASON_FIELD in doc:
+            parts['season'] = self.pack_season(doc[SEASON_FIELD])
+        if SCOUTING_FIELD in doc:
+            parts['scouting'] = self.pack_scouting(doc[SCOUTING_FIELD])
+        if parts:
+            packed[PACKED_FIELD] = parts
+        return packed
+
+    def build_update(self, fields, pack=True):
+        """$set alanlarından update dokümanı
+
+        pack=True ise istatistik alanları packedStats.* olarak yazılır ve eski
+        biçimdekiler silinir; pack=False ise tersi (iki biçim bir arada kalmaz).
+        """
+        set_fields = {}
+        unset_fields = {}
+        for key, value in fields.items():
+            part = PARTS.get(key)
+            if part is None:
+                set_fields[key] = value
+            elif pack:
+                packer = self.pack_season if part == 'season' else self.pack_scouting
+                set_fields[f"{PACKED_FIELD}.{part}"] = packer(value)
+                unset_fields[key] = ""
+            else:
+                set_fields[key] = value
+                unset_fields[f"{PACKED_FIELD}.{part}"] = ""
+
+        update = {"$set": set_fields}
+        if unset_fields:
+            update["$unset"] = unset_fields
+        return update
+
+    # --- Çözme ---
+
+    def unpack_season(self, packed):
+        if 'raw' in packed:
+            return packed['raw']
+        names = self.get_version(packed['v'])['season']
+        if 'nulls' not in packed:
+            return {name: value for name, value in zip(names, packed['values']) if value is not None}
+        nulls = set(packed['nulls'])
+        return {
+            names[i]: value
+            for i, value in enumerate(packed['values'])
+            if value is not None or i in nulls
+        }
+
+    def unpack_scouting(self, packed):
+        if 'v' not in packed:
+            return packed.get('raw')
+        names = self.get_version(packed['v'])['scouting']
+        per90_values = packed.get('per90', [])
+        percentile_values = packed.get('percentile', [])
+
+        report = {}
+        if 'nulls' not in packed and len(per90_values) == len(percentile_values):
+            # Yaygın durum: gerçek None değer yok
+            for name, per90, percentile in zip(names, per90_values, percentile_values):
+                if per90 is not None:
+                    report[name] = {'per90': per90, 'percentile': percentile} if percentile is not None \
+                        else {'per90': per90}
+                elif percentile is not None:
+                    report[name] = {'percentile': percentile}
+        else:
+            nulls = {key: set(indexes) for key, indexes in packed.get('nulls', {}).items()}
+            columns = [(key, packed.get(key, []), nulls.get(key, ())) for key in SCOUTING_KEYS]
+            for i in range(max(len(per90_values), len(percentile_values))):
+                entry = {
+                    key: values[i]
+                    for key, values, key_nulls in columns
+                    if i < len(values) and (values[i] is not None or i in key_nulls)
+                }
+                if entry:
+                    report[names[i]] = entry
+
+        report.update(packed.get('raw', {}))
+        return report
+
+    def decode(self, doc):
+        """Paketli dokümanı yerinde eski biçime çevirir (paketli değilse dokunmaz)"""
+        if not doc or PACKED_FIELD not in doc:
+            return doc
+        try:
+            parts = doc[PACKED_FIELD]
+            if 'season' in parts:
+                doc[SEASON_FIELD] = self.unpack_season(parts['season'])
+            if 'scouting' in parts:
+                doc[SCOUTING_FIELD] = self.unpack_scouting(parts['scouting'])
+            del doc[PACKED_FIELD]
+        except Exception as e:
+            logging.error(f"Paketli istatistikler çözülemedi ({doc.get('fbrefId')}): {e}")
+        return doc
@@ -0,0 +1,189 @@
+# models/stat_history.py
+"""Sezon istatistiklerinin geçmişi (oyuncu ve sezon başına kovalanmış delta'lar)
+
+insert_player seasonStats'ı yerinde ezer. Her kayıtta değişen stat'lar
+oyuncunun o sezonki kova dokümanına eklenir:
+
+    {
+        fbrefId, season: '2025-2026', seq: 0,
+        startAt, endAt,                 # kovadaki ilk/son anlık görüntü
+        base: {...},                    # ilk anlık görüntünün tamamı
+        deltas: [{at, set: {...}, unset: [...]}, ...],
+        deltaCount, latest: {...}       # sonraki delta'yı hesaplamak için son hal
+    }
+
+Değişiklik yoksa yazma yapılmaz. Bir kovadaki delta sayısı sınırı aşınca aynı
+sezon için son halden başlayan yeni bir kova (seq + 1) açılır. Bir tarihteki
+istatistikler (fbrefId, startAt) index'i ile tek kova okunarak base + delta'lar
+sırayla uygulanarak bulunur; başka oyuncuların dokümanlarına dokunulmaz.
+"""
+import logging
+from datetime import datetime
+from pymongo import ASCENDING, DESCENDING
+from pymongo.errors import DuplicateKeyError
+from config.settings import Settings
+
+MAX_RETRIES = 3
+
+
+def season_for(moment, start_month=None):
+    """Tarihin ait olduğu sezon: Temmuz 2025 - Haziran 2026 -> '2025-2026'"""
+    start_month = start_month or Settings.SEASON_START_MONTH
+    year = moment.year if moment.month >= start_month else moment.year - 1
+    return f"{year}-{year + 1}"
+
+
+def stat_delta(previous, current):
+    """(değişen/yeni stat'lar, silinen stat isimleri)"""
+    changed = {name: value for name, value in current.items()
+               if name not in previous or previous[name] != value}
+    removed = [name for name in previous if name not in current]
+    return changed, removed
+
+
+def replay(bucket, until=None):
+    """Kovadaki anlık görüntüleri sırayla üretir: (zaman, stat'lar) - until'den sonrası hariç"""
+    stats = dict(bucket.get('base') or {})
+    if until is not None and bucket['startAt'] > until:
+        return
+    yield bucket['startAt'], dict(stats)
+    for delta in bucket.get('deltas', []):
+        if until is not None and delta['at'] > until:
+            return
+        stats.update(delta.get('set') or {})
+        for name in delta.get('unset') or ():
+            stats.pop(name, None)
+        yield delta['at'], dict(stats)
+
+
+class StatHistory:
+    """seasonStats geçmişini kovalanmış anlık görüntüler olarak tutar"""
+
+    def __init__(self, collection, max_deltas=None):
+        self.collection = collection
+        self.max_deltas = max_deltas or Settings.SNAPSHOT_MAX_DELTAS
+
+    def ensure_indexes(self):
+        self.collection.create_index([("fbrefId", ASCENDING), ("season", ASCENDING), ("seq", ASCENDING)],
+                                     unique=True)
+        self.collection.create_index([("fbrefId", ASCENDING), ("startAt", DESCENDING)])
+
+    # --- Yazma ---
+
+    def record(self, fbref_id, stats, at=None):
+        """Anlık görüntüyü ekler - yazma yapıldıysa True (değişiklik yoksa False)"""
+        if not fbref_id or not isinstance(stats, dict):
+            return False
+        at = at if isinstance(at, datetime) else datetime.utcnow()
+        season = season_for(at)
+
+        for _ in range(MAX_RETRIES):
+            bucket = self.collection.find_one(
+                {"fbrefId": fbref_id, "season": season},
+                projection=["seq", "latest", "deltaCount", "endAt"],
+                sort=[("seq", DESCENDING)],
+            )
+            try:
+                if bucket is None:
+                    self._insert_bucket(fbref_id, season, 0, stats, at)
+                    return True
+
+                changed, removed = stat_delta(bucket.get('latest') or {}, stats)
+                if not changed and not removed:
+                    return False
+
+                if bucket.get('deltaCount', 0) >= self.max_deltas:
+                    self._insert_bucket(fbref_id, season, bucket['seq'] + 1, stats, at)
+                    return True
+
+                delta = {"at": at, "set": changed}
+                if removed:
+                    delta["unset"] = removed
+                # deltaCount koşulu: araya başka bir yazma girdiyse tekrar okunur
+                result = self.collection.update_one(
+                    {"_id": bucket["_id"], "deltaCount": bucket.get('deltaCount', 0)},
+                    {
+                        "$push": {"deltas": delta},
+                        "$set": {"latest": stats, "endAt": max(at, bucket.get('endAt') or at)},
+                        "$inc": {"deltaCount": 1},
+                    },
+                )
+                if result.modified_count:
+                    return True
+            except DuplicateKeyError:
+                continue  # Aynı kovayı başka bir process açtı
+        logging.warning(f"İstatistik geçmişi yazılamadı (eşzamanlı güncelleme): {fbref_id}")
+        return False
+
+    def _insert_bucket(self, fbref_id, season, seq, stats, at):
+        self.collection.insert_one({
+            "fbrefId": fbref_id,
+            "season": season,
+            "seq": seq,
+            "startAt": at,
+            "endAt": at,
+            "base": stats,
+            "deltas": [],
+            "deltaCount": 0,
+            "latest": stats,
+        })
+
+    # --- Okuma ---
+
+    def stats_at(self, fbref_id, moment):
+        """Oyuncunun verilen andaki istatistikleri - o tarihten önce kayıt yoksa None"""
+        bucket = self.collection.find_one(
+            {"fbrefId": fbref_id, "startAt": {"$lte": moment}},
+            projection={"latest": 0},
+            sort=[("startAt", DESCENDING)],
+        )
+        if bucket is None:
+            return None
+        state = None
+        for _, stats in replay(bucket, until=moment):
+            state = stats
+        return state
+
+    def history(self, fbref_id, start=None, end=None):
+        """[start, end] aralığındaki anlık görüntüler: [(zaman, stat'lar)]
+
+        İlk eleman start anında geçerli olan haldir (zamanı kendi kayıt zamanı).
+        """
+        query = {"fbrefId": fbref_id}
+        if end is not None:
+            query["startAt"] = {"$lte": end}
+        if start is not None:
+            query["endAt"] = {"$gte": start}
+
+        snapshots = []
+        previous = self.stats_at(fbref_id, start) if start is not None else None
+        cursor = self.collection.find(query, projection={"latest": 0}, sort=[("startAt", ASCENDING)])
+        for bucket in cursor:
+            for at, stats in replay(bucket, until=end):
+                if start is not None and at < start:
+                    continue
+                snapshots.append((at, stats))
+
+        if previous is not None and (not snapshots or snapshots[0][0] > start):
+            first_at = self._snapshot_time(fbref_id, start)
+            snapshots.insert(0, (first_at, previous))
+        return snapshots
+
+    def _snapshot_time(self, fbref_id, moment):
+        """moment anında geçerli anlık görüntünün kayıt zamanı"""
+        bucket = self.collection.find_one(
+            {"fbrefId": fbref_id, "startAt": {"$lte": moment}},
+            projection={"startAt": 1, "deltas.at": 1},
+            sort=[("startAt", DESCENDING)],
+        )
+        times = [bucket['startAt']] + [delta['at'] for delta in bucket.get('deltas', []) if delta['at'] <= moment]
+        return max(times)
+
+    def series(self, fbref_id, name, start=None, end=None):
+        """Tek bir stat'ın değiştiği noktalar: [(zaman, değer)]"""
+        points = []
+        for at, stats in self.history(fbref_id, start, end):
+            value = stats.get(name)
+            if not points or points[-1][1] != value:
+                points.append((at, value))
+        return points
@@ -0,0 +1,135 @@
+# models/storage.py
+"""Oyuncu deposu arayüzü ve backend seçimi
+
+STORAGE_BACKEND=mongo (varsayılan) -> DatabaseManager (models/database.py)
+STORAGE_BACKEND=sqlite             -> SQLiteDatabaseManager (models/sqlite_database.py),
+                                      sunucu gerektirmez, SQLITE_PATH dosyasında tutulur
+
+İki backend de aynı oyuncu işlemlerini sunar: upsert (tekli/toplu), alan
+güncelleme (tekli/toplu), okuma, cursor ile gezinme ve gruplama. İş kuyruğu,
+istatistik geçmişi, istatistik biçimi dönüşümü ve index'li scout sorguları
+(models/indexes.py) sadece MongoDB'dedir.
+"""
+from config.settings import Settings
+
+# Artımlı okuma filigranı: doküman her değiştiğinde yazılır. updatedAt sadece scrape
+# zamanıdır (yenileme önceliği ve scouting tazeliği ona bakar), hesaplanan alanların
+# (percentile, benzer oyuncular) yazımı onu değiştirmez.
+MODIFIED_FIELD = 'modifiedAt'
+
+# Alt dokümanlarda her hesaplamada değişen zaman anahtarları (ör. {alan}Meta.computedAt)
+VOLATILE_KEYS = ('computedAt',)
+
+
+def change_paths(fields):
+    """Kısmi yazımda değişiklik kontrolü yapılacak ((alan, [alt anahtar]), değer) çiftleri
+
+    modifiedAt ve hesaplama zamanları karşılaştırılmaz: sadece onlar farklıysa
+    doküman yazılmaz (filigran da ilerlemez).
+    """
+    paths = []
+    for key, value in fields.items():
+        if key == MODIFIED_FIELD:
+            continue
+        if isinstance(value, dict) and any(name in value for name in VOLATILE_KEYS):
+            paths.extend(((key, name), item) for name, item in value.items() if name not in VOLATILE_KEYS)
+        else:
+            paths.append(((key,), value))
+    return paths
+
+
+class PlayerStore:
+    """Oyuncu deposu arayüzü - backend'ler bu metotları sağlar"""
+
+    backend = None
+
+    def ensure_indexes(self, force=False):
+        """Index'leri oluşturur (process başına bir kez, force ile tekrar)"""
+        raise NotImplementedError
+
+    def insert_player(self, player_data):
+        """Oyuncu verisini ekle veya güncelle (verilmeyen alanlar korunur)"""
+        raise NotImplementedError
+
+    def bulk_upsert_players(self, players, batch_size=1000):
+        """Oyuncuları toplu ekler/günceller - yazılan oyuncu sayısını döndürür"""
+        return sum(1 for player in players if self.insert_player(player))
+
+    def update_player_fields(self, fbref_id, fields):
+        """Oyuncunun sadece verilen alanlarını güncelle - oyuncu varsa True (yoksa eklenmez)
+
+        Değer değişirse modifiedAt da güncellenir; updatedAt'e dokunulmaz.
+        """
+        raise NotImplementedError
+
+    def bulk_update_fields(self, updates, batch_size=1000):
+        """{fbrefId: {alan: değer}} güncellemelerini toplu yazar - değişen doküman sayısını döndürür"""
+        raise NotImplementedError
+
+    def get_player(self, fbref_id):
+        """Oyuncu verisini getir"""
+        raise NotImplementedError
+
+    def get_all_players(self, league=None, fields=None):
+        """Tüm oyuncuları getir (league: lig adı veya listesi, fields: okunacak alanlar)"""
+        raise NotImplementedError
+
+    def iter_players(self, updated_since=None, fields=None, batch_size=1000, inclusive=True):
+        """Oyuncuları tek tek döndürür (updated_since: sadece o zamandan beri değişenler - modifiedAt)"""
+        raise NotImplementedError
+
+    def count_by(self, field, league=None):
+        """Alan değerine göre oyuncu sayıları: {değer: sayı}"""
+        raise NotImplementedError
+
+    def get_team_leagues(self):
+        """Takım -> lig eşleşmeleri"""
+        raise NotImplementedError
+
+    def get_refresh_backlog(self, name="update"):
+        raise NotImplementedError
+
+    def save_refresh_backlog(self, fbref_ids, name="update"):
+        raise NotImplementedError
+
+    # --- Sadece MongoDB ---
+
+    def _unsupported(self, feature):
+        raise NotImplementedError(f"{feature} {self.backend} backend'inde desteklenmiyor (STORAGE_BACKEND=mongo)")
+
+    def get_job_queue(self):
+        self._unsupported("Dağıtık crawl iş kuyruğu")
+
+    def migrate_stats_encoding(self, encoding, batch_size=500, limit=None):
+        self._unsupported("İstatistik biçimi dönüşümü")
+
+    def search_players(self, league=None, position_group=None, min_age=None, max_age=None,
+                       contract_before=None, limit=50, fields=None):
+        self._unsupported("Index'li oyuncu araması")
+
+    def list_players(self, league, limit=50, skip=0):
+        self._unsupported("Index'li oyuncu listesi")
+
+    def expiring_contracts(self, before, league=None, limit=0):
+        self._unsupported("Index'li kontrat sorgusu")
+
+    def get_stats_at(self, fbref_id, moment):
+        self._unsupported("İstatistik geçmişi")
+
+    def get_stat_history(self, fbref_id, start=None, end=None):
+        self._unsupported("İstatistik geçmişi")
+
+    def close(self):
+        pass
+
+
+def get_database(backend=None):
+    """Ayarlardaki (veya verilen) backend için oyuncu deposu"""
+    backend = (backend or Settings.STORAGE_BACKEND).lower()
+    if backend == 'mongo':
+        from models.database import DatabaseManager
+        return DatabaseManager()
+    if backend == 'sqlite':
+        from models.sqlite_database import SQLiteDatabaseManager
+        return SQLiteDatabaseManager()
+    raise ValueError(f"Bilinmeyen depolama backend'i: {backend} (mongo, sqlite)")
@@ -0,0 +1,167 @@
+# models/validation.py
+"""Lig bazında toplu oyuncu doğrulaması (pandas ile vektörel)
+
+PlayerModel.validate oyuncu başına çalışır ve her uyarıyı ayrı loglar. Bu
+modül bir ligin scrape edilen kayıtlarını parçalar halinde DataFrame
+üzerinde tek seferde doğrular:
+
+    Reddedilir: kritik alan eksik, geçersiz fbrefId formatı, tekrar eden ID
+    Uyarı:      takım/lig eksik, şüpheli yaş, başka lig, lig tablosundaki
+                takımdan farklı takım
+
+Lig sonunda (finish) takım başına oyuncu sayıları lig tablosuyla
+karşılaştırılır ve reddedilen ID'lerle birlikte tek bir özet loglanır.
+"""
+import logging
+from models.player import CRITICAL_FIELDS, FBREF_ID_REGEX, IMPORTANT_FIELDS, MAX_AGE, MIN_AGE
+
+COLUMNS = ('fbrefId', 'fullName', 'team', 'league', 'age')
+TEXT_COLUMNS = ('fbrefId', 'fullName', 'team', 'league')
+
+# PlayerModel.set_basic_info'nun boş değer yerine yazdıkları
+PLACEHOLDERS = {'team': 'Unknown Team', 'league': 'Unknown League'}
+
+REJECT_CHECKS = tuple(f'missing_{field}' for field in CRITICAL_FIELDS) + ('invalid_fbref_id', 'duplicate_id')
+
+MAX_LOGGED_IDS = 20
+
+
+class LeagueValidator:
+    """Bir ligin kayıtlarını toplu doğrular; reddedilenleri ve uyarıları lig boyunca biriktirir"""
+
+    def __init__(self, league=None, league_players=None):
+        self.league = league
+        self.league_players = league_players or []
+        self.total = 0
+        self.accepted = 0
+        self.rejected = {}  # fbrefId -> [neden]
+        self.warnings = {}  # kontrol -> [fbrefId]
+        self._seen_ids = set()
+        self._teams = []  # Kabul edilen kayıtların (fbrefId, takım) çiftleri
+        self._table_teams = None
+
+    def table_teams(self):
+        """Lig tablosundaki fbrefId -> takım (ilk görülen)"""
+        if self._table_teams is None:
+            self._table_teams = {}
+            for player in self.league_players:
+                if player.get('fbref_id') and player.get('team'):
+                    self._table_teams.setdefault(player['fbref_id'], player['team'])
+        return self._table_teams
+
+    def validate(self, records):
+        """Kayıtları doğrular -> (kabul edilen kayıtlar, {fbrefId: [neden]})"""
+        import pandas as pd
+
+        records = [record for record in records if record]
+        if not records:
+            return [], {}
+
+        frame = pd.DataFrame([[record.get(column) for column in COLUMNS] for record in records],
+                             columns=list(COLUMNS))
+        text = {column: frame[column].fillna('').astype(str).str.strip() for column in TEXT_COLUMNS}
+        fbref_ids = text['fbrefId']
+        has_id = fbref_ids != ''
+
+        checks = pd.DataFrame(index=frame.index)
+        for field in CRITICAL_FIELDS:
+            checks[f'missing_{field}'] = text[field] == ''
+        checks['invalid_fbref_id'] = has_id & ~fbref_ids.str.fullmatch(FBREF_ID_REGEX)
+        checks['duplicate_id'] = has_id & (fbref_ids.duplicated() | fbref_ids.isin(self._seen_ids))
+
+        for field in IMPORTANT_FIELDS:
+            checks[f'missing_{field}'] = text[field].isin(('', PLACEHOLDERS.get(field, '')))
+        age = pd.to_numeric(frame['age'], errors='coerce')
+        checks['suspicious_age'] = (age > 0) & ((age < MIN_AGE) | (age > MAX_AGE))
+        if self.league:
+            checks['other_league'] = (text['league'] != self.league) & ~checks['missing_league']
+        table_team = fbref_ids.map(self.table_teams())
+        checks['team_mismatch'] = table_team.notna() & ~checks['missing_team'] & (text['team'] != table_team)
+
+        rejected_mask = checks[list(REJECT_CHECKS)].any(axis=1)
+        accepted_mask = ~rejected_mask
+
+        # Reddedilenler (az sayıda) satır satır nedenleriyle
+        rejected = {}
+        for index, row in checks.loc[rejected_mask, list(REJECT_CHECKS)].iterrows():
+            key = fbref_ids[index] or f"<{text['fullName'][index] or f'kayıt {self.total + index}'}>"
+            rejected.setdefault(key, []).extend(check for check in REJECT_CHECKS if row[check])
+
+        # Uyarılar sadece kabul edilen kayıtlar için
+        warning_checks = [check for check in checks.columns if check not in REJECT_CHECKS]
+        for check in warning_checks:
+            flagged = fbref_ids[checks[check] & accepted_mask]
+            if len(flagged):
+                self.warnings.setdefault(check, []).extend(flagged.tolist())
+
+        accepted_ids = fbref_ids[accepted_mask]
+        self._seen_ids.update(accepted_ids)
+        self._teams.extend(zip(accepted_ids, text['team'][accepted_mask]))
+
+        for key, reasons in rejected.items():
+            self.rejected.setdefault(key, []).extend(reasons)
+        self.total += len(records)
+        self.accepted += int(accepted_mask.sum())
+
+        return [record for record, ok in zip(records, accepted_mask) if ok], rejected
+
+    def team_count_mismatches(self):
+        """Lig tablosu ve kabul edilen kayıtlar arasında oyuncu sayısı tutmayan takımlar
+
+        Sadece doğrulanan oyuncular karşılaştırılır (atlanan/mevcut oyuncular
+        sayıyı bozmasın): {takım: (tablodaki, scrape edilen)}
+        """
+        import pandas as pd
+
+        if not self._teams or not self.table_teams():
+            return {}
+
+        scraped = pd.DataFrame(self._teams, columns=['fbrefId', 'team'])
+        table = pd.Series(self.table_teams(), name='team')
+        table = table[table.index.isin(scraped['fbrefId'])]
+
+        counts = pd.concat([table.value_counts().rename('table'),
+                            scraped['team'].value_counts().rename('scraped')], axis=1).fillna(0).astype(int)
+        mismatched = counts[counts['table'] != counts['scraped']]
+        return {team: (int(row['table']), int(row['scraped'])) for team, row in mismatched.iterrows()}
+
+    def finish(self):
+        """Lig sonu: takım sayısı kontrolü ve tek özet (dict olarak da döner)"""
+        summary = {
+            'league': self.league,
+            'total': self.total,
+            'accepted': self.accepted,
+            'rejected': len(self.rejected),
+            'rejected_ids': sorted(self.rejected),
+            'rejected_reasons': self._count(reason for reasons in self.rejected.values() for reason in reasons),
+            'warnings': {check: len(ids) for check, ids in sorted(self.warnings.items())},
+            'team_count_mismatches': self.team_count_mismatches(),
+        }
+        self.log_summary(summary)
+        return summary
+
+    @staticmethod
+    def _count(values):
+        counts = {}
+        for value in values:
+            counts[value] = counts.get(value, 0) + 1
+        return dict(sorted(counts.items()))
+
+    @staticmethod
+    def log_summary(summary):
+        league = summary['league'] or 'kayıtlar'
+        warnings = ', '.join(f"{check}: {count}" for check, count in summary['warnings'].items()) or 'yok'
+        logging.info(f"Doğrulama ({league}): {summary['total']} kayıt, {summary['accepted']} kabul, "
+                     f"{summary['rejected']} red - uyarılar: {warnings}")
+
+        if summary['rejected']:
+            ids = summary['rejected_ids']
+            more = f" (+{len(ids) - MAX_LOGGED_IDS})" if len(ids) > MAX_LOGGED_IDS else ""
+            reasons = ', '.join(f"{reason}: {count}" for reason, count in summary['rejected_reasons'].items())
+            logging.warning(f"Reddedilen kayıtlar ({league}) [{reasons}]: "
+                            f"{', '.join(ids[:MAX_LOGGED_IDS])}{more}")
+
+        if summary['team_count_mismatches']:
+            teams = ', '.join(f"{team} {table}/{scraped}"
+                              for team, (table, scraped) in summary['team_count_mismatches'].items())
+            logging.warning(f"Lig tablosuyla tutmayan takım sayıları ({league}, tablo/scrape): {teams}")
@@ -0,0 +1,214 @@
+# monitoring/instrumentation.py
+import json
+import logging
+import os
+import time
+from collections import defaultdict
+from config.settings import Settings
+
+
+def percentile(values, pct):
+    """Sıralı olmayan listeden lineer interpolasyonla percentile hesaplar"""
+    if not values:
+        return 0.0
+
+    ordered = sorted(values)
+    if len(ordered) == 1:
+        return float(ordered[0])
+
+    rank = (len(ordered) - 1) * pct / 100.0
+    lower = int(rank)
+    upper = min(lower + 1, len(ordered) - 1)
+    return float(ordered[lower] + (ordered[upper] - ordered[lower]) * (rank - lower))
+
+
+class _NullScope:
+    """Instrumentation kapalıyken kullanılan, hiçbir şey yapmayan context manager"""
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        return False
+
+
+_NULL_SCOPE = _NullScope()
+
+
+class _StageScope:
+    __slots__ = ('instrumentation', 'name', 'wall_start', 'cpu_start')
+
+    def __init__(self, instrumentation, name):
+        self.instrumentation = instrumentation
+        self.name = name
+
+    def __enter__(self):
+        self.wall_start = time.perf_counter()
+        self.cpu_start = time.thread_time()
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.instrumentation.record(
+            self.name,
+            time.perf_counter() - self.wall_start,
+            time.thread_time() - self.cpu_start
+        )
+        return False
+
+
+class _PlayerScope:
+    __slots__ = ('instrumentation', 'player_id', 'stage')
+
+    def __init__(self, instrumentation, player_id):
+        self.instrumentation = instrumentation
+        self.player_id = player_id
+        self.stage = _StageScope(instrumentation, 'player_total')
+
+    def __enter__(self):
+        self.instrumentation.begin_player(self.player_id)
+        self.stage.__enter__()
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.stage.__exit__(exc_type, exc_val, exc_tb)
+        self.instrumentation.end_player()
+        return False
+
+
+class Instrumentation:
+    """Oyuncu başına aşama (stage) süreleri ve sayaçlar
+
+    Her aşama için duvar saati ve CPU süresi ölçülür. Bir oyuncu kapsamı
+    (player) açıkken aşama süreleri oyuncu bazında toplanır ve oyuncu
+    bittiğinde tek bir örnek olarak kaydedilir; böylece p50/p95/p99
+    değerleri "oyuncu başına" dağılımı gösterir. Kapalıyken stage() ve
+    player() ortak bir boş context manager döndürür.
+    """
+
+    def __init__(self, enabled=False):
+        self.enabled = enabled
+        self.reset()
+
+    def reset(self):
+        """Toplanan tüm verileri sıfırla"""
+        self.samples = defaultdict(list)  # stage -> [(wall, cpu), ...]
+        self.counters = defaultdict(int)
+        self.players = 0
+        self._current_player = None
+
+    def stage(self, name):
+        """Bir aşamanın süresini ölçen context manager"""
+        if not self.enabled:
+            return _NULL_SCOPE
+        return _StageScope(self, name)
+
+    def player(self, player_id):
+        """Oyuncu kapsamı - içindeki aşamalar bu oyuncuya yazılır"""
+        if not self.enabled:
+            return _NULL_SCOPE
+        return _PlayerScope(self, player_id)
+
+    def count(self, name, amount=1):
+        """Sayaç artır (istek, retry, fallback vb.)"""
+        if self.enabled:
+            self.counters[name] += amount
+
+    def record(self, name, wall, cpu):
+        """Aşama süresini kaydet"""
+        if self._current_player is not None:
+            totals = self._current_player.setdefault(name, [0.0, 0.0])
+            totals[0] += wall
+            totals[1] += cpu
+        else:
+            self.samples[name].append((wall, cpu))
+
+    def begin_player(self, player_id):
+        self._current_player = {}
+
+    def end_player(self):
+        if self._current_player is None:
+            return
+
+        player_totals = self._current_player
+        self._current_player = None
+        self.players += 1
+
+        for name, (wall, cpu) in player_totals.items():
+            self.samples[name].append((wall, cpu))
+
+    def summary(self):
+        """Aşama bazında p50/p95/p99 ve toplamları döndürür"""
+        stages = {}
+        for name, values in self.samples.items():
+            walls = [v[0] for v in values]
+            cpus = [v[1] for v in values]
+            stages[name] = {
+                'count': len(values),
+                'wall_total': sum(walls),
+                'wall_p50': percentile(walls, 50),
+                'wall_p95': percentile(walls, 95),
+                'wall_p99': percentile(walls, 99),
+                'cpu_total': sum(cpus),
+                'cpu_p50': percentile(cpus, 50),
+                'cpu_p95': percentile(cpus, 95),
+                'cpu_p99': percentile(cpus, 99),
+            }
+
+        return {
+            'players': self.players,
+            'stages': stages,
+            'counters': dict(self.counters)
+        }
+
+    def export_state(self):
+        """Ham veriyi (process'ler arası birleştirme için) döndürür"""
+        return {
+            'players': self.players,
+            'samples': {name: list(values) for name, values in self.samples.items()},
+            'counters': dict(self.counters)
+        }
+
+    def merge_state(self, state):
+        """Başka bir process'in ham verisini ekler"""
+        if not state:
+            return
+        self.players += state.get('players', 0)
+        for name, values in state.get('samples', {}).items():
+            self.samples[name].extend(tuple(v) for v in values)
+        for name, value in state.get('counters', {}).items():
+            self.counters[name] += value
+
+    def log_report(self):
+        """Aşama süreleri raporunu loglar"""
+        summary = self.summary()
+
+        logging.info("=" * 50)
+        logging.info(f"AŞAMA SÜRELERİ ({summary['players']} oyuncu, oyuncu başına saniye)")
+        logging.info(f"{'aşama':<28}{'adet':>7}{'p50':>9}{'p95':>9}{'p99':>9}{'cpu p50':>9}{'toplam':>10}")
+        for name, stats in sorted(summary['stages'].items(), key=lambda item: -item[1]['wall_total']):
+            logging.info(
+                f"{name:<28}{stats['count']:>7}{stats['wall_p50']:>9.3f}{stats['wall_p95']:>9.3f}"
+                f"{stats['wall_p99']:>9.3f}{stats['cpu_p50']:>9.3f}{stats['wall_total']:>10.1f}")
+        if summary['counters']:
+            logging.info("Sayaçlar: " + ", ".join(f"{k}={v}" for k, v in sorted(summary['counters'].items())))
+        logging.info("=" * 50)
+
+    def dump_json(self, path):
+        """Özeti JSON dosyasına yazar"""
+        try:
+            directory = os.path.dirname(path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            with open(path, 'w', encoding='utf-8') as f:
+                json.dump(self.summary(), f, indent=2)
+            logging.info(f"Aşama süreleri kaydedildi: {path}")
+        except Exception as e:
+            logging.error(f"Instrumentation JSON yazma hatası: {e}")
+
+
+# Process genelinde tek instance
+instrumentation = Instrumentation(enabled=Settings.INSTRUMENTATION_ENABLED)
+
+
+def get_instrumentation():
+    return instrumentation
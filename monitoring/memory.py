@@ -0,0 +1,148 @@
+# monitoring/memory.py
+"""Uzun çalıştırmalar için bellek bekçisi
+
+Her N oyuncuda bir tracemalloc ile en çok bellek ayıran satırları ve bir
+önceki rapora göre en çok büyüyenleri loglar. RSS ayarlanan tavanı aşarsa
+önce gc çalıştırılır; hâlâ aşılıyorsa ayara göre beklenir (pause) veya
+çalıştırma durdurulur (abort).
+"""
+import gc
+import logging
+import os
+import tracemalloc
+from config.settings import Settings
+from scrapers.clock import get_clock
+
+
+class MemoryLimitExceeded(BaseException):
+    """RSS tavanı aşıldı ve bekleme ile düşmedi
+
+    KeyboardInterrupt gibi BaseException'dan türer; böylece oyuncu/lig
+    döngülerindeki `except Exception` blokları çalıştırmayı durdurmayı yutmaz.
+    """
+
+
+def current_rss_mb():
+    """Process'in şu anki RSS değeri (MB) - /proc yoksa en yüksek değer"""
+    try:
+        with open('/proc/self/statm') as f:
+            resident_pages = int(f.read().split()[1])
+        return resident_pages * os.sysconf('SC_PAGE_SIZE') / (1024 * 1024)
+    except (OSError, ValueError, IndexError, AttributeError):
+        pass
+
+    try:
+        import resource
+        import sys
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return peak / (1024 * 1024) if sys.platform == 'darwin' else peak / 1024
+    except ImportError:
+        return 0.0
+
+
+class MemoryWatchdog:
+    """Oyuncu başına çağrılır: periyodik tracemalloc raporu ve RSS tavanı kontrolü"""
+
+    ACTIONS = ('pause', 'abort')
+
+    def __init__(self, report_every=None, rss_limit_mb=None, action=None, top=None,
+                 pause_seconds=None, max_pauses=None, clock=None):
+        self.report_every = Settings.MEMORY_REPORT_EVERY if report_every is None else report_every
+        self.rss_limit_mb = Settings.MEMORY_RSS_LIMIT_MB if rss_limit_mb is None else rss_limit_mb
+        self.action = action or Settings.MEMORY_LIMIT_ACTION
+        self.top = top or Settings.MEMORY_TOP_SITES
+        self.pause_seconds = Settings.MEMORY_PAUSE_SECONDS if pause_seconds is None else pause_seconds
+        self.max_pauses = Settings.MEMORY_MAX_PAUSES if max_pauses is None else max_pauses
+        self.clock = clock or get_clock()
+        self.players = 0
+        self._previous_snapshot = None
+        self._started_tracemalloc = False
+
+        if self.action not in self.ACTIONS:
+            raise ValueError(f"Bilinmeyen bellek aksiyonu: {self.action} ({', '.join(self.ACTIONS)})")
+
+    @property
+    def enabled(self):
+        return bool(self.report_every or self.rss_limit_mb)
+
+    def start(self):
+        """tracemalloc'u başlat (sadece periyodik rapor açıksa - ek yükü vardır)"""
+        if self.report_every and not tracemalloc.is_tracing():
+            tracemalloc.start(Settings.MEMORY_TRACE_FRAMES)
+            self._started_tracemalloc = True
+        return self
+
+    def stop(self):
+        if self._started_tracemalloc:
+            tracemalloc.stop()
+            self._started_tracemalloc = False
+        self._previous_snapshot = None
+
+    def check(self):
+        """Bir oyuncu işlendikten sonra çağrılır"""
+        if not self.enabled:
+            return
+
+        self.players += 1
+
+        if self.report_every and self.players % self.report_every == 0:
+            self.log_allocations()
+
+        if self.rss_limit_mb:
+            self.enforce_limit()
+
+    def log_allocations(self):
+        """En çok bellek ayıran satırları ve son rapordan beri büyüyenleri loglar"""
+        if not tracemalloc.is_tracing():
+            self.start()
+            return
+
+        # Toplanabilir çöp rapora sızıntı gibi yansımasın
+        gc.collect()
+        snapshot = tracemalloc.take_snapshot().filter_traces((
+            tracemalloc.Filter(False, tracemalloc.__file__),
+            tracemalloc.Filter(False, '<frozen importlib._bootstrap>'),
+        ))
+        current, peak = tracemalloc.get_traced_memory()
+
+        logging.info(f"Bellek ({self.players} oyuncu): RSS {current_rss_mb():.0f} MB, "
+                     f"izlenen {current / 1024 / 1024:.1f} MB (tepe {peak / 1024 / 1024:.1f} MB)")
+
+        for stat in snapshot.statistics('lineno')[:self.top]:
+            frame = stat.traceback[0]
+            logging.info(f"  {stat.size / 1024:>10.1f} KB {stat.count:>8} blok  {frame.filename}:{frame.lineno}")
+
+        if self._previous_snapshot is not None:
+            growth = [s for s in snapshot.compare_to(self._previous_snapshot, 'lineno') if s.size_diff > 0]
+            if growth:
+                logging.info("  Son rapordan beri en çok büyüyenler:")
+                for stat in growth[:self.top]:
+                    frame = stat.traceback[0]
+                    logging.info(f"  {stat.size_diff / 1024:>+10.1f} KB {stat.count_diff:>+8} blok  "
+                                 f"{frame.filename}:{frame.lineno}")
+
+        self._previous_snapshot = snapshot
+
+    def enforce_limit(self):
+        """RSS tavanı aşıldıysa gc, ardından bekleme veya durdurma"""
+        rss = current_rss_mb()
+        if rss <= self.rss_limit_mb:
+            return
+
+        gc.collect()
+        rss = current_rss_mb()
+        if rss <= self.rss_limit_mb:
+            return
+
+        if self.action == 'pause':
+            for attempt in range(1, self.max_pauses + 1):
+                logging.warning(f"RSS tavanı aşıldı ({rss:.0f} MB > {self.rss_limit_mb} MB), "
+                                f"{self.pause_seconds:.0f}s bekleniyor ({attempt}/{self.max_pauses})")
+                self.clock.sleep(self.pause_seconds)
+                gc.collect()
+                rss = current_rss_mb()
+                if rss <= self.rss_limit_mb:
+                    logging.info(f"RSS tavanın altına indi: {rss:.0f} MB")
+                    return
+
+        raise MemoryLimitExceeded(f"RSS {rss:.0f} MB, tavan {self.rss_limit_mb} MB")
@@ -0,0 +1,378 @@
+# monitoring/metrics.py
+"""Crawl metrikleri - Prometheus text formatında dışa aktarım
+
+Sayaçlar (counter), anlık değerler (gauge) ve histogramlar etiketlerle
+tutulur. Metrikler yerel bir HTTP portundan (/metrics) sunulabilir ve/veya
+belirli aralıklarla bir textfile'a (node_exporter textfile collector için)
+atomik olarak yazılabilir.
+"""
+import logging
+import os
+import threading
+import time
+from config.settings import Settings
+
+CONTENT_TYPE = 'text/plain; version=0.0.4; charset=utf-8'
+
+DEFAULT_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+
+def _escape(value):
+    return str(value).replace('\\', '\\\\').replace('\n', '\\n').replace('"', '\\"')
+
+
+def _format_labels(labels):
+    if not labels:
+        return ''
+    return '{' + ','.join(f'{name}="{_escape(value)}"' for name, value in labels) + '}'
+
+
+def _format_value(value):
+    if value == float('inf'):
+        return '+Inf'
+    if float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
+
+
+class _Timer:
+    __slots__ = ('child', 'start')
+
+    def __init__(self, child):
+        self.child = child
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.child.observe(time.perf_counter() - self.start)
+        return False
+
+
+class _Child:
+    """Belirli etiket değerlerine bağlı metrik"""
+    __slots__ = ('metric', 'key')
+
+    def __init__(self, metric, key):
+        self.metric = metric
+        self.key = key
+
+    def inc(self, amount=1):
+        self.metric._inc(self.key, amount)
+
+    def dec(self, amount=1):
+        self.metric._inc(self.key, -amount)
+
+    def set(self, value):
+        self.metric._set(self.key, value)
+
+    def observe(self, value):
+        self.metric._observe(self.key, value)
+
+    def time(self):
+        return _Timer(self)
+
+
+class Metric:
+    """Etiketli metrik tabanı - değerler etiket demeti (tuple) ile tutulur"""
+
+    type_name = 'untyped'
+
+    def __init__(self, name, documentation, labelnames=()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._values = {}
+        self._lock = threading.Lock()
+
+    def labels(self, *values, **kwargs):
+        if kwargs:
+            values = tuple(kwargs.get(name, '') for name in self.labelnames)
+        if len(values) != len(self.labelnames):
+            raise ValueError(f"{self.name}: beklenen etiketler {self.labelnames}")
+        return _Child(self, tuple(str(value) for value in values))
+
+    # Etiketsiz kullanım
+    def inc(self, amount=1):
+        self._inc((), amount)
+
+    def dec(self, amount=1):
+        self._inc((), -amount)
+
+    def set(self, value):
+        self._set((), value)
+
+    def observe(self, value):
+        self._observe((), value)
+
+    def time(self):
+        return _Timer(_Child(self, ()))
+
+    def _inc(self, key, amount):
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+    def _set(self, key, value):
+        raise TypeError(f"{self.type_name} metriğine set() uygulanamaz: {self.name}")
+
+    def _observe(self, key, value):
+        raise TypeError(f"{self.type_name} metriğine observe() uygulanamaz: {self.name}")
+
+    def reset(self):
+        with self._lock:
+            self._values.clear()
+
+    def samples(self, const_labels=()):
+        """(örnek adı, etiketler, değer) listesi"""
+        with self._lock:
+            items = sorted(self._values.items())
+        return [(self.name, const_labels + tuple(zip(self.labelnames, key)), value) for key, value in items]
+
+    def render(self, const_labels=()):
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.type_name}"]
+        for name, labels, value in self.samples(const_labels):
+            lines.append(f"{name}{_format_labels(labels)} {_format_value(value)}")
+        return lines
+
+
+class Counter(Metric):
+    type_name = 'counter'
+
+    def _inc(self, key, amount):
+        if amount < 0:
+            raise ValueError(f"Sayaç azaltılamaz: {self.name}")
+        super()._inc(key, amount)
+
+
+class Gauge(Metric):
+    type_name = 'gauge'
+
+    def _set(self, key, value):
+        with self._lock:
+            self._values[key] = float(value)
+
+
+class Histogram(Metric):
+    type_name = 'histogram'
+
+    def __init__(self, name, documentation, labelnames=(), buckets=DEFAULT_BUCKETS):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets)) + (float('inf'),)
+
+    def _inc(self, key, amount):
+        raise TypeError(f"Histogram metriğine inc() uygulanamaz: {self.name}")
+
+    def _observe(self, key, value):
+        with self._lock:
+            state = self._values.get(key)
+            if state is None:
+                state = self._values[key] = [[0] * len(self.buckets), 0.0, 0]
+
+            for i, bound in enumerate(self.buckets):
+                if value <= bound:
+                    state[0][i] += 1
+                    break
+            state[1] += value
+            state[2] += 1
+
+    def samples(self, const_labels=()):
+        with self._lock:
+            items = sorted((key, ([*state[0]], state[1], state[2])) for key, state in self._values.items())
+
+        result = []
+        for key, (bucket_counts, total, count) in items:
+            labels = const_labels + tuple(zip(self.labelnames, key))
+            cumulative = 0
+            for bound, bucket_count in zip(self.buckets, bucket_counts):
+                cumulative += bucket_count
+                result.append((f"{self.name}_bucket", labels + (('le', _format_value(bound)),), cumulative))
+            result.append((f"{self.name}_sum", labels, total))
+            result.append((f"{self.name}_count", labels, count))
+        return result
+
+
+class MetricsRegistry:
+    """Metriklerin kaydı ve Prometheus text çıktısı"""
+
+    def __init__(self, const_labels=None):
+        self.const_labels = dict(const_labels or {})
+        self._metrics = {}
+        self._lock = threading.Lock()
+
+    def _register(self, metric):
+        with self._lock:
+            existing = self._metrics.get(metric.name)
+            if existing:
+                return existing
+            self._metrics[metric.name] = metric
+            return metric
+
+    def counter(self, name, documentation, labelnames=()):
+        return self._register(Counter(name, documentation, labelnames))
+
+    def gauge(self, name, documentation, labelnames=()):
+        return self._register(Gauge(name, documentation, labelnames))
+
+    def histogram(self, name, documentation, labelnames=(), buckets=DEFAULT_BUCKETS):
+        return self._register(Histogram(name, documentation, labelnames, buckets))
+
+    def get(self, name):
+        return self._metrics.get(name)
+
+    def reset(self):
+        for metric in list(self._metrics.values()):
+            metric.reset()
+
+    def render(self):
+        """Tüm metrikler, Prometheus text exposition formatında"""
+        const_labels = tuple(sorted(self.const_labels.items()))
+        lines = []
+        for metric in list(self._metrics.values()):
+            lines.extend(metric.render(const_labels))
+        return '\n'.join(lines) + '\n'
+
+
+class MetricsHTTPServer:
+    """Metrikleri /metrics adresinden sunan arka plan HTTP sunucusu"""
+
+    def __init__(self, registry, port, host='127.0.0.1'):
+        from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer  # Sadece port açılırsa gerekli
+
+        self.registry = registry
+
+        class Handler(BaseHTTPRequestHandler):
+            def log_message(self, format, *args):
+                logging.debug("metrics %s - %s" % (self.address_string(), format % args))
+
+            def do_GET(self):
+                if self.path.split('?')[0] not in ('/', '/metrics'):
+                    self.send_error(404)
+                    return
+                body = registry.render().encode('utf-8')
+                self.send_response(200)
+                self.send_header('Content-Type', CONTENT_TYPE)
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+        self.httpd = ThreadingHTTPServer((host, port), Handler)
+        self.httpd.daemon_threads = True
+        self._thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+
+    @property
+    def port(self):
+        return self.httpd.server_address[1]
+
+    def start(self):
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+
+class TextfileExporter:
+    """Metrikleri belirli aralıklarla dosyaya yazar (geçici dosya + atomik rename)"""
+
+    def __init__(self, registry, path, interval=None):
+        self.registry = registry
+        self.path = path
+        self.interval = interval or Settings.METRICS_TEXTFILE_INTERVAL
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+
+    def write(self):
+        try:
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            tmp_path = f"{self.path}.{os.getpid()}.tmp"
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                f.write(self.registry.render())
+            os.replace(tmp_path, self.path)
+        except Exception as e:
+            logging.error(f"Metrik dosyası yazılamadı ({self.path}): {e}")
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            self.write()
+
+    def start(self):
+        self.write()
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._stop.set()
+        self._thread.join(timeout=self.interval)
+        self.write()
+
+
+registry = MetricsRegistry()
+
+REQUESTS = registry.counter(
+    'fbref_requests_total', 'Sayfa istekleri (backend ve HTTP durumuna göre)', ['backend', 'status'])
+FETCH_SECONDS = registry.histogram(
+    'fbref_fetch_seconds', 'Sayfa indirme süresi (saniye)', ['backend'])
+RETRIES = registry.counter(
+    'fbref_retries_total', 'get_page tekrar denemeleri')
+PLAYERS = registry.counter(
+    'fbref_players_total', 'İşlenen oyuncular (saved, failed, skipped, rejected)', ['result'])
+PLAYERS_PER_MINUTE = registry.gauge(
+    'fbref_players_per_minute', 'Çalışma başından beri dakikada kaydedilen oyuncu')
+DB_WRITE_SECONDS = registry.histogram(
+    'fbref_db_write_seconds', 'Veritabanı yazma süresi (saniye)', ['operation'],
+    buckets=(0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0))
+QUEUE_DEPTH = registry.gauge(
+    'fbref_queue_depth', 'Kuyruktaki iş sayısı', ['queue', 'status'])
+
+
+def record_request(backend, status, seconds=None):
+    """Tek bir sayfa isteğini kaydet"""
+    REQUESTS.labels(backend=backend, status=status).inc()
+    if seconds is not None:
+        FETCH_SECONDS.labels(backend=backend).observe(seconds)
+
+
+def update_players_per_minute(saved, elapsed_seconds):
+    """Çalışma başından beri dakikadaki kayıt hızını güncelle"""
+    if elapsed_seconds > 0:
+        PLAYERS_PER_MINUTE.set(saved / (elapsed_seconds / 60.0))
+
+
+def update_queue_depth(queue_name, counts):
+    """Kuyruk durum sayılarını gauge'lara yaz"""
+    for status, count in counts.items():
+        QUEUE_DEPTH.labels(queue=queue_name, status=status).set(count)
+
+
+_exporters = []
+
+
+def start_exporters(port=None, textfile=None):
+    """Ayarlara göre HTTP ve/veya textfile dışa aktarımını başlat"""
+    port = Settings.METRICS_PORT if port is None else port
+    textfile = Settings.METRICS_TEXTFILE if textfile is None else textfile
+
+    if port:
+        try:
+            server = MetricsHTTPServer(registry, port, Settings.METRICS_HOST).start()
+            _exporters.append(server)
+            logging.info(f"Metrikler yayında: http://{Settings.METRICS_HOST}:{server.port}/metrics")
+        except OSError as e:
+            logging.error(f"Metrik sunucusu başlatılamadı (port {port}): {e}")
+
+    if textfile:
+        _exporters.append(TextfileExporter(registry, textfile).start())
+        logging.info(f"Metrikler dosyaya yazılıyor: {textfile}")
+
+
+def stop_exporters():
+    """Çalışan dışa aktarımları durdur (textfile son kez yazılır)"""
+    while _exporters:
+        try:
+            _exporters.pop().stop()
+        except Exception as e:
+            logging.error(f"Metrik dışa aktarımı durdurulamadı: {e}")
@@ -0,0 +1,228 @@
+# monitoring/profiling.py
+"""Crawl çalıştırmalarını profilleme (--profile)
+
+İki mod vardır:
+    deterministic: cProfile + örnekleyici (cProfile .prof + collapsed stack + hotspot özeti)
+    sampling:      sadece örnekleyici - düşük ek yük (collapsed stack + hotspot özeti)
+
+Örnekleyici ana thread'in çağrı yığınını belirli aralıklarla okur ve
+flamegraph.pl / speedscope ile açılabilen collapsed-stack dosyası üretir.
+Hotspot özeti sadece projenin kendi fonksiyonlarını listeler.
+"""
+import cProfile
+import json
+import logging
+import os
+import pstats
+import sys
+import threading
+import time
+from collections import defaultdict
+from config.settings import Settings
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def is_project_file(filename):
+    """Dosya projenin kendi kodu mu (kütüphaneler hariç)"""
+    if not filename.endswith('.py'):
+        return False  # Builtin'ler ('~') ve donmuş modüller ('<frozen ...>')
+    path = os.path.abspath(filename)
+    return (path.startswith(PROJECT_ROOT + os.sep)
+            and 'site-packages' not in path
+            and os.sep + 'benchmarks' + os.sep not in path)
+
+
+def frame_label(code):
+    """Collapsed-stack ve raporlar için fonksiyon etiketi"""
+    filename = code.co_filename
+    if is_project_file(filename):
+        filename = os.path.relpath(filename, PROJECT_ROOT)
+    else:
+        filename = os.path.basename(filename)
+    return f"{filename}:{code.co_name}"
+
+
+class StackSampler:
+    """Hedef thread'in yığınını belirli aralıklarla örnekler"""
+
+    def __init__(self, thread_id=None, interval=None):
+        self.thread_id = thread_id or threading.main_thread().ident
+        self.interval = interval or Settings.PROFILE_SAMPLE_INTERVAL
+        self.stacks = defaultdict(int)  # "a;b;c" -> örnek sayısı
+        self.project_labels = set()
+        self.samples = 0
+        self._labels = {}
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+
+    def _label(self, code):
+        label = self._labels.get(code)
+        if label is None:
+            label = self._labels[code] = frame_label(code)
+            if is_project_file(code.co_filename):
+                self.project_labels.add(label)
+        return label
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            frame = sys._current_frames().get(self.thread_id)
+            stack = []
+            while frame is not None:
+                stack.append(self._label(frame.f_code))
+                frame = frame.f_back
+            if stack:
+                self.stacks[';'.join(reversed(stack))] += 1
+                self.samples += 1
+
+    def start(self):
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        self._thread.join()
+
+    def write_collapsed(self, path):
+        with open(path, 'w', encoding='utf-8') as f:
+            for stack, count in sorted(self.stacks.items(), key=lambda item: item[1], reverse=True):
+                f.write(f"{stack} {count}\n")
+
+    def hotspots(self, top):
+        """Projeye ait fonksiyonlar için öz (self) ve kapsayıcı (inclusive) örnek payları"""
+        own = defaultdict(int)
+        inclusive = defaultdict(int)
+
+        for stack, count in self.stacks.items():
+            frames = stack.split(';')
+            # Öz süre: yığındaki en içteki proje fonksiyonuna yazılır (kütüphane çağrıları dahil)
+            for label in reversed(frames):
+                if label in self.project_labels:
+                    own[label] += count
+                    break
+            for label in set(frames):
+                if label in self.project_labels:
+                    inclusive[label] += count
+
+        total = self.samples or 1
+        rows = [{
+            'function': label,
+            'self_pct': own[label] / total * 100,
+            'inclusive_pct': inclusive[label] / total * 100,
+            'samples': own[label],
+        } for label in inclusive]
+        rows.sort(key=lambda row: (row['self_pct'], row['inclusive_pct']), reverse=True)
+        return rows[:top]
+
+
+class Profiler:
+    """Bir çalıştırmayı profiller ve çıktıları tek dizine yazar"""
+
+    MODES = ('deterministic', 'sampling')
+
+    def __init__(self, mode='deterministic', label='run', output_dir=None, interval=None, top=None):
+        if mode not in self.MODES:
+            raise ValueError(f"Bilinmeyen profil modu: {mode} ({', '.join(self.MODES)})")
+
+        self.mode = mode
+        self.top = top or Settings.PROFILE_TOP
+        timestamp = time.strftime('%Y%m%d-%H%M%S')
+        self.output_dir = os.path.join(output_dir or Settings.PROFILE_DIR, f"{label}-{timestamp}")
+        self.sampler = StackSampler(interval=interval)
+        self.profile = cProfile.Profile() if mode == 'deterministic' else None
+        self.wall_time = 0.0
+        self._start = None
+
+    def start(self):
+        self._start = time.perf_counter()
+        self.sampler.start()
+        if self.profile:
+            self.profile.enable()
+        return self
+
+    def stop(self):
+        if self.profile:
+            self.profile.disable()
+        self.sampler.stop()
+        self.wall_time = time.perf_counter() - self._start
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.stop()
+        self.write_artifacts()
+        return False
+
+    def cprofile_hotspots(self):
+        """cProfile istatistiklerinden projeye ait en pahalı fonksiyonlar"""
+        stats = pstats.Stats(self.profile)
+        rows = []
+        for (filename, line, name), (_, calls, tottime, cumtime, _) in stats.stats.items():
+            if not is_project_file(filename):
+                continue
+            rows.append({
+                'function': f"{os.path.relpath(filename, PROJECT_ROOT)}:{name}",
+                'line': line,
+                'calls': calls,
+                'tottime': tottime,
+                'cumtime': cumtime,
+                'per_call_ms': tottime / calls * 1000 if calls else 0.0,
+            })
+        rows.sort(key=lambda row: row['tottime'], reverse=True)
+        return rows[:self.top]
+
+    def write_artifacts(self):
+        """profile.prof, stacks.collapsed, hotspots.txt ve hotspots.json dosyalarını yazar"""
+        try:
+            os.makedirs(self.output_dir, exist_ok=True)
+            self.sampler.write_collapsed(os.path.join(self.output_dir, 'stacks.collapsed'))
+
+            summary = {
+                'mode': self.mode,
+                'wall_time': self.wall_time,
+                'samples': self.sampler.samples,
+                'sample_interval': self.sampler.interval,
+                'sampled': self.sampler.hotspots(self.top),
+            }
+
+            if self.profile:
+                self.profile.dump_stats(os.path.join(self.output_dir, 'profile.prof'))
+                summary['deterministic'] = self.cprofile_hotspots()
+
+            with open(os.path.join(self.output_dir, 'hotspots.json'), 'w', encoding='utf-8') as f:
+                json.dump(summary, f, indent=2)
+
+            report = self.format_report(summary)
+            with open(os.path.join(self.output_dir, 'hotspots.txt'), 'w', encoding='utf-8') as f:
+                f.write(report)
+
+            print(report)
+            logging.info(f"Profil çıktıları kaydedildi: {self.output_dir}")
+
+        except Exception as e:
+            logging.error(f"Profil çıktıları yazılamadı: {e}")
+
+        return self.output_dir
+
+    def format_report(self, summary):
+        lines = [
+            "=" * 96,
+            f"PROFİL ({summary['mode']}) - {summary['wall_time']:.1f}s, {summary['samples']} örnek",
+            "=" * 96,
+        ]
+
+        if summary.get('deterministic'):
+            lines.append(f"{'fonksiyon (cProfile)':<58}{'çağrı':>9}{'öz s':>10}{'toplam s':>10}{'ms/çağrı':>9}")
+            lines.append("-" * 96)
+            for row in summary['deterministic']:
+                lines.append(f"{row['function'][:57]:<58}{row['calls']:>9}{row['tottime']:>10.3f}"
+                             f"{row['cumtime']:>10.3f}{row['per_call_ms']:>9.3f}")
+            lines.append("")
+
+        lines.append(f"{'fonksiyon (örnekleme)':<70}{'öz %':>12}{'kapsayıcı %':>14}")
+        lines.append("-" * 96)
+        for row in summary['sampled']:
+            lines.append(f"{row['function'][:69]:<70}{row['self_pct']:>12.1f}{row['inclusive_pct']:>14.1f}")
+        lines.append("=" * 96)
+
+        return '\n'.join(lines) + '\n'
@@ -0,0 +1,334 @@
+# monitoring/tracing.py
+"""İç içe trace span'leri (run → league → player → get_page → attempt → fetch/parse → extract_* → db_write)
+
+Span'ler OpenTelemetry (OTLP JSON) span biçiminde, satır başına bir span
+olacak şekilde JSON-lines dosyasına yazılır. Aktif span contextvars ile
+takip edilir; tracing kapalıyken span() ortak bir boş span döndürür.
+
+Rapor:
+    python -m monitoring.tracing data/traces/traces.jsonl --unit player --top 10
+"""
+import argparse
+import atexit
+import contextvars
+import json
+import logging
+import os
+import secrets
+import threading
+import time
+from collections import defaultdict
+from config.settings import Settings
+from monitoring.instrumentation import _NULL_SCOPE
+
+STATUS_UNSET = 'STATUS_CODE_UNSET'
+STATUS_OK = 'STATUS_CODE_OK'
+STATUS_ERROR = 'STATUS_CODE_ERROR'
+
+_current_span = contextvars.ContextVar('current_span', default=None)
+
+
+def _attribute_value(value):
+    """Python değerini OTLP AnyValue biçimine çevirir"""
+    if isinstance(value, bool):
+        return {'boolValue': value}
+    if isinstance(value, int):
+        return {'intValue': str(value)}
+    if isinstance(value, float):
+        return {'doubleValue': value}
+    return {'stringValue': str(value)}
+
+
+def _plain_value(value):
+    """OTLP AnyValue'yu tekrar Python değerine çevirir"""
+    if 'intValue' in value:
+        return int(value['intValue'])
+    for key in ('boolValue', 'doubleValue', 'stringValue'):
+        if key in value:
+            return value[key]
+    return None
+
+
+class _NullSpan:
+    """Tracing kapalıyken veya aktif span yokken kullanılan boş span"""
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        return False
+
+    def set_attribute(self, key, value):
+        pass
+
+    def set_attributes(self, attributes):
+        pass
+
+    def set_status(self, code, message=None):
+        pass
+
+
+_NULL_SPAN = _NullSpan()
+
+
+class Span:
+    __slots__ = ('tracer', 'name', 'trace_id', 'span_id', 'parent_id', 'attributes',
+                 'status', 'status_message', 'start_ns', '_start_perf', '_token')
+
+    def __init__(self, tracer, name, attributes):
+        self.tracer = tracer
+        self.name = name
+        self.attributes = attributes
+        self.status = STATUS_UNSET
+        self.status_message = None
+
+    def set_attribute(self, key, value):
+        if value is not None:
+            self.attributes[key] = value
+
+    def set_attributes(self, attributes):
+        for key, value in attributes.items():
+            self.set_attribute(key, value)
+
+    def set_status(self, code, message=None):
+        self.status = code
+        self.status_message = message
+
+    def __enter__(self):
+        parent = _current_span.get()
+        if parent is None:
+            self.trace_id = secrets.token_hex(16)
+            self.parent_id = ''
+        else:
+            self.trace_id = parent.trace_id
+            self.parent_id = parent.span_id
+        self.span_id = secrets.token_hex(8)
+        self.start_ns = time.time_ns()
+        self._start_perf = time.perf_counter_ns()
+        self._token = _current_span.set(self)
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        duration = time.perf_counter_ns() - self._start_perf
+        _current_span.reset(self._token)
+
+        if exc_type is not None:
+            self.set_status(STATUS_ERROR, f"{exc_type.__name__}: {exc_val}")
+
+        self.tracer.export(self, duration)
+        return False
+
+    def to_dict(self, duration_ns):
+        record = {
+            'traceId': self.trace_id,
+            'spanId': self.span_id,
+            'parentSpanId': self.parent_id,
+            'name': self.name,
+            'kind': 'SPAN_KIND_INTERNAL',
+            'startTimeUnixNano': str(self.start_ns),
+            'endTimeUnixNano': str(self.start_ns + duration_ns),
+            'attributes': [{'key': key, 'value': _attribute_value(value)} for key, value in self.attributes.items()],
+            'status': {'code': self.status},
+        }
+        if self.status_message:
+            record['status']['message'] = self.status_message
+        return record
+
+
+class _JoinedScope:
+    """Instrumentation aşaması ile trace span'ini birlikte açıp kapatır"""
+    __slots__ = ('stage', 'span')
+
+    def __init__(self, stage, span):
+        self.stage = stage
+        self.span = span
+
+    def __enter__(self):
+        self.stage.__enter__()
+        return self.span.__enter__()
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.span.__exit__(exc_type, exc_val, exc_tb)
+        self.stage.__exit__(exc_type, exc_val, exc_tb)
+        return False
+
+
+class Tracer:
+    """Span üretir ve JSON-lines dosyasına tamponlu olarak yazar"""
+
+    FLUSH_EVERY = 200
+
+    def __init__(self, enabled=False, path=None):
+        self.enabled = enabled
+        self.path = path or Settings.TRACE_FILE
+        self._buffer = []
+        self._lock = threading.Lock()
+
+    def span(self, name, **attributes):
+        """Aktif span'in altında yeni bir span açan context manager"""
+        if not self.enabled:
+            return _NULL_SPAN
+        return Span(self, name, attributes)
+
+    def current_span(self):
+        """Aktif span (yoksa boş span)"""
+        return _current_span.get() or _NULL_SPAN
+
+    def export(self, span, duration_ns):
+        line = json.dumps(span.to_dict(duration_ns), ensure_ascii=False)
+        with self._lock:
+            self._buffer.append(line)
+            if len(self._buffer) >= self.FLUSH_EVERY:
+                self._flush_locked()
+
+    def flush(self):
+        with self._lock:
+            self._flush_locked()
+
+    def _flush_locked(self):
+        if not self._buffer:
+            return
+        try:
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            with open(self.path, 'a', encoding='utf-8') as f:
+                f.write('\n'.join(self._buffer) + '\n')
+        except Exception as e:
+            logging.error(f"Trace dosyası yazılamadı ({self.path}): {e}")
+        self._buffer = []
+
+
+tracer = Tracer(Settings.TRACING_ENABLED)
+atexit.register(tracer.flush)
+
+
+def get_tracer():
+    return tracer
+
+
+def join_scopes(stage, span):
+    """Aşama ölçümü ve span'i tek context manager olarak döndürür (with ... as span)"""
+    if stage is _NULL_SCOPE:
+        return span
+    return _JoinedScope(stage, span)
+
+
+# --- Rapor ---
+
+def load_spans(paths):
+    """JSON-lines dosyalarından span'leri okur"""
+    spans = []
+    for path in paths:
+        with open(path, encoding='utf-8') as f:
+            for line in f:
+                line = line.strip()
+                if not line:
+                    continue
+                record = json.loads(line)
+                start = int(record['startTimeUnixNano'])
+                end = int(record['endTimeUnixNano'])
+                spans.append({
+                    'traceId': record['traceId'],
+                    'spanId': record['spanId'],
+                    'parentSpanId': record.get('parentSpanId', ''),
+                    'name': record['name'],
+                    'start': start,
+                    'end': end,
+                    'duration': (end - start) / 1e9,
+                    'attributes': {a['key']: _plain_value(a['value']) for a in record.get('attributes', [])},
+                    'status': record.get('status', {}).get('code', STATUS_UNSET),
+                })
+    return spans
+
+
+def build_children(spans):
+    children = defaultdict(list)
+    for span in spans:
+        if span['parentSpanId']:
+            children[(span['traceId'], span['parentSpanId'])].append(span)
+    return children
+
+
+def critical_path(span, children, prefix=''):
+    """Span'in bitişini belirleyen zincir - [(yol, öz süre saniye), ...]
+
+    Sondan başa doğru, imleçten önce biten en geç çocuk seçilir; çocuklar
+    arasındaki boşluklar ve ilk çocuktan önceki süre span'in öz süresidir.
+    """
+    path = f"{prefix} > {span['name']}" if prefix else span['name']
+    kids = sorted(children.get((span['traceId'], span['spanId']), []), key=lambda s: s['end'], reverse=True)
+
+    cursor = span['end']
+    self_ns = 0
+    chosen = []
+    for child in kids:
+        if child['end'] > cursor or child['start'] < span['start']:
+            continue  # Seçilen çocukla çakışıyor
+        self_ns += cursor - child['end']
+        chosen.append(child)
+        cursor = child['start']
+    self_ns += max(cursor - span['start'], 0)
+
+    result = [(path, self_ns / 1e9)]
+    for child in reversed(chosen):
+        result.extend(critical_path(child, children, path))
+    return result
+
+
+def describe(span):
+    attributes = span['attributes']
+    label = attributes.get('player') or attributes.get('league') or attributes.get('fbrefId') or attributes.get('url') or ''
+    return f"{span['name']} {label}".strip()
+
+
+def print_report(spans, unit='player', top=10, depth=8):
+    children = build_children(spans)
+    units = [s for s in spans if s['name'] == unit]
+    if not units:
+        print(f"'{unit}' isimli span bulunamadı")
+        return
+
+    units.sort(key=lambda s: s['duration'], reverse=True)
+    durations = sorted(s['duration'] for s in units)
+
+    print("=" * 90)
+    print(f"{len(units)} '{unit}' span'i - medyan {durations[len(durations) // 2]:.2f}s, en uzun {durations[-1]:.2f}s")
+    print("=" * 90)
+
+    totals = defaultdict(float)
+    for span in units:
+        for path, seconds in critical_path(span, children):
+            totals[path] += seconds
+
+    for span in units[:top]:
+        print(f"\n{describe(span)} - {span['duration']:.2f}s [{span['status']}]")
+        for path, seconds in critical_path(span, children):
+            if seconds < 0.0005 or path.count(' > ') >= depth:
+                continue
+            share = seconds / span['duration'] * 100 if span['duration'] else 0.0
+            print(f"  {seconds:>8.2f}s {share:>5.1f}%  {path}")
+
+    grand_total = sum(s['duration'] for s in units)
+    print("\n" + "=" * 90)
+    print(f"Kritik yol dağılımı (tüm '{unit}' span'leri)")
+    print("-" * 90)
+    for path, seconds in sorted(totals.items(), key=lambda item: item[1], reverse=True)[:15]:
+        share = seconds / grand_total * 100 if grand_total else 0.0
+        print(f"  {seconds:>10.2f}s {share:>5.1f}%  {path}")
+    print("=" * 90)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Trace dosyalarından en yavaş span'ler ve kritik yol raporu")
+    parser.add_argument('files', nargs='*', default=[Settings.TRACE_FILE])
+    parser.add_argument('--unit', default='player', help="Raporlanacak span ismi (örn. player, league, run)")
+    parser.add_argument('--top', type=int, default=10)
+    parser.add_argument('--depth', type=int, default=8, help="Gösterilecek en fazla iç içe seviye")
+    args = parser.parse_args()
+
+    print_report(load_spans(args.files), args.unit, args.top, args.depth)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,29 +1,32 @@
+# Selenium, webdriver_manager, fake_useragent ve BeautifulSoup ilk kullanımda
+# import edilir; sadece veritabanı kullanan komutlar bu maliyeti ödemez.
 import requests
-from bs4 import BeautifulSoup
-import time
 import logging
 import random
-from fake_useragent import UserAgent
-from selenium import webdriver
-from selenium.webdriver.chrome.options import Options
-from webdriver_manager.chrome import ChromeDriverManager
-from selenium.webdriver.chrome.service import Service
-from selenium.webdriver.common.by import By
-from selenium.webdriver.support.ui import WebDriverWait
-from selenium.webdriver.support import expected_conditions as EC
+import time
 from config.settings import Settings
+from monitoring import metrics
+from monitoring.instrumentation import get_instrumentation
+from monitoring.tracing import STATUS_ERROR, join_scopes, tracer
+from .clock import get_clock
+from .fetch_plan import get_negative_cache
 
 
 class BaseScraper:
-    def __init__(self, use_selenium=False):
+    def __init__(self, use_selenium=False, clock=None):
         self.session = requests.Session()
-        self.ua = UserAgent()
+        self._ua = None
         self.use_selenium = use_selenium
         self.driver = None
+        self.request_count = 0  # Toplam HTTP/Selenium istek sayısı
+        self.rate_limiter = None  # Ortak hız sınırı (acquire() metodu olan nesne)
+        self.instrumentation = get_instrumentation()
+        self.clock = clock or get_clock()  # Tüm beklemeler bu saat üzerinden yapılır
+        self.negative_cache = get_negative_cache()  # Yakın zamanda 404 dönen URL'ler
 
         # Enhanced headers to avoid detection
         self.session.headers.update({
-            'User-Agent': self.ua.chrome,
+            'User-Agent': Settings.HEADERS['User-Agent'],  # İlk istekte rastgele UA ile değişir
             'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/avif,image/webp,image/apng,*/*;q=0.8,application/signed-exchange;v=b3;q=0.7',
             'Accept-Language': 'en-US,en;q=0.9',
             'Accept-Encoding': 'gzip, deflate, br',
@@ -43,8 +46,21 @@ class BaseScraper:
         if use_selenium:
             self.setup_selenium()
 
+    @property
+    def ua(self):
+        """fake_useragent ilk istekte yüklenir (veri dosyasını okumak başlangıcı yavaşlatır)"""
+        if self._ua is None:
+            from fake_useragent import UserAgent
+            self._ua = UserAgent()
+        return self._ua
+
     def setup_selenium(self):
         """Enhanced Selenium WebDriver setup with anti-detection"""
+        from selenium import webdriver
+        from selenium.webdriver.chrome.options import Options
+        from selenium.webdriver.chrome.service import Service
+        from webdriver_manager.chrome import ChromeDriverManager
+
         chrome_options = Options()
 
         # Basic options
@@ -90,28 +106,48 @@ class BaseScraper:
 
     def get_page(self, url, use_selenium=None, max_retries=3):
         """Enhanced page fetching with retry logic"""
-        for attempt in range(max_retries):
-            try:
-                if use_selenium or (use_selenium is None and self.use_selenium):
-                    result = self.get_page_selenium(url)
-                else:
-                    result = self.get_page_requests(url)
-
-                if result:
-                    return result
-
-                # If failed, wait before retry
-                if attempt < max_retries - 1:
-                    wait_time = random.uniform(5, 10) * (attempt + 1)
-                    logging.warning(f"Attempt {attempt + 1} failed, waiting {wait_time:.1f}s before retry")
-                    time.sleep(wait_time)
-
-            except Exception as e:
-                logging.error(f"Attempt {attempt + 1} failed: {e}")
-                if attempt < max_retries - 1:
-                    time.sleep(random.uniform(3, 7))
+        if self.negative_cache.is_cached(url, self.clock.time()):
+            logging.info(f"Yakın zamanda 404 döndü, istenmiyor: {url}")
+            self.instrumentation.count('negative_cache_hits')
+            return None
 
-        return None
+        with tracer.span('get_page', url=url) as page_span:
+            for attempt in range(max_retries):
+                try:
+                    with tracer.span('attempt', attempt=attempt + 1):
+                        if use_selenium or (use_selenium is None and self.use_selenium):
+                            result = self.get_page_selenium(url)
+                        else:
+                            result = self.get_page_requests(url)
+
+                    if result:
+                        page_span.set_attribute('attempts', attempt + 1)
+                        return result
+
+                    # 404 kalıcıdır, tekrar denemenin anlamı yok
+                    if self.negative_cache.is_cached(url, self.clock.time()):
+                        page_span.set_attribute('attempts', attempt + 1)
+                        page_span.set_status(STATUS_ERROR, 'HTTP 404')
+                        return None
+
+                    # If failed, wait before retry
+                    if attempt < max_retries - 1:
+                        wait_time = random.uniform(5, 10) * (attempt + 1)
+                        logging.warning(f"Attempt {attempt + 1} failed, waiting {wait_time:.1f}s before retry")
+                        self.instrumentation.count('retries')
+                        metrics.RETRIES.inc()
+                        self.sleep(wait_time)
+
+                except Exception as e:
+                    logging.error(f"Attempt {attempt + 1} failed: {e}")
+                    if attempt < max_retries - 1:
+                        self.instrumentation.count('retries')
+                        metrics.RETRIES.inc()
+                        self.sleep(random.uniform(3, 7))
+
+            page_span.set_attribute('attempts', max_retries)
+            page_span.set_status(STATUS_ERROR, 'Sayfa alınamadı')
+            return None
 
     def get_page_requests(self, url):
         """Enhanced requests with better error handling"""
@@ -120,34 +156,59 @@ class BaseScraper:
             self.session.headers['User-Agent'] = self.ua.chrome
 
             # Add referer for better legitimacy
-            if 'fbref.com' in url:
-                self.session.headers['Referer'] = 'https://fbref.com/'
+            if url.startswith(Settings.FBREF_BASE_URL):
+                self.session.headers['Referer'] = Settings.FBREF_BASE_URL.rstrip('/') + '/'
 
             # Random delay before request
-            time.sleep(random.uniform(2, 5))
-
-            response = self.session.get(
-                url,
-                timeout=Settings.REQUEST_TIMEOUT,
-                allow_redirects=True
-            )
+            self.sleep(random.uniform(2, 5))
+
+            if self.rate_limiter:
+                with self.stage('rate_limit_wait'):
+                    self.rate_limiter.acquire()
+
+            self.request_count += 1
+            self.instrumentation.count('requests')
+            fetch_start = time.perf_counter()
+            with self.stage('fetch', url=url, backend='requests') as span:
+                try:
+                    response = self.session.get(
+                        url,
+                        timeout=Settings.REQUEST_TIMEOUT,
+                        allow_redirects=True
+                    )
+                except requests.exceptions.RequestException:
+                    metrics.record_request('requests', 'error', time.perf_counter() - fetch_start)
+                    raise
+                span.set_attributes({'http.status_code': response.status_code, 'bytes': len(response.content)})
+            metrics.record_request('requests', str(response.status_code), time.perf_counter() - fetch_start)
 
             # Check for different error codes
             if response.status_code == 403:
                 logging.warning(f"403 Forbidden - trying Selenium for: {url}")
+                self.instrumentation.count('http_403')
+                self.instrumentation.count('selenium_fallbacks')
                 return self.get_page_selenium(url) if not self.use_selenium else None
             elif response.status_code == 429:
                 logging.warning(f"Rate limited - waiting longer")
-                time.sleep(random.uniform(10, 20))
+                self.instrumentation.count('http_429')
+                self.sleep(random.uniform(10, 20))
+                return None
+            elif response.status_code == 404:
+                logging.warning(f"404 Not Found: {url}")
+                self.instrumentation.count('http_404')
+                self.negative_cache.add(url, self.clock.time())
                 return None
             elif response.status_code != 200:
                 logging.error(f"HTTP {response.status_code} for: {url}")
                 return None
 
-            return BeautifulSoup(response.content, 'html.parser')
+            with self.stage('parse', bytes=len(response.content)):
+                from bs4 import BeautifulSoup
+                return BeautifulSoup(response.content, 'html.parser')
 
         except requests.exceptions.RequestException as e:
             logging.error(f"Request error for {url}: {e}")
+            tracer.current_span().set_status(STATUS_ERROR, str(e))
             return None
 
     def get_page_selenium(self, url):
@@ -158,31 +219,67 @@ class BaseScraper:
                 if not self.driver:
                     return None
 
-            # Navigate to page
-            self.driver.get(url)
+            from bs4 import BeautifulSoup
+            from selenium.webdriver.common.by import By
+            from selenium.webdriver.support import expected_conditions as EC
+            from selenium.webdriver.support.ui import WebDriverWait
 
-            # Wait for page to load
-            try:
-                WebDriverWait(self.driver, 10).until(
-                    EC.presence_of_element_located((By.TAG_NAME, "body"))
-                )
-            except:
-                pass  # Continue even if wait fails
+            # Navigate to page
+            if self.rate_limiter:
+                with self.stage('rate_limit_wait'):
+                    self.rate_limiter.acquire()
+
+            self.request_count += 1
+            self.instrumentation.count('requests_selenium')
+            fetch_start = time.perf_counter()
+            with self.stage('selenium', url=url, backend='selenium') as span:
+                self.driver.get(url)
+
+                # Wait for page to load
+                try:
+                    WebDriverWait(self.driver, 10).until(
+                        EC.presence_of_element_located((By.TAG_NAME, "body"))
+                    )
+                except:
+                    pass  # Continue even if wait fails
+                span.set_attribute('bytes', len(self.driver.page_source))
+            metrics.record_request('selenium', 'ok', time.perf_counter() - fetch_start)
 
             # Random delay to mimic human behavior
-            time.sleep(random.uniform(3, 7))
+            self.sleep(random.uniform(3, 7))
 
             # Scroll to simulate reading
             self.driver.execute_script("window.scrollTo(0, document.body.scrollHeight/2);")
-            time.sleep(random.uniform(1, 3))
+            self.sleep(random.uniform(1, 3))
             self.driver.execute_script("window.scrollTo(0, 0);")
 
-            return BeautifulSoup(self.driver.page_source, 'html.parser')
+            with self.stage('parse'):
+                return BeautifulSoup(self.driver.page_source, 'html.parser')
 
         except Exception as e:
             logging.error(f"Selenium error for {url}: {e}")
+            metrics.record_request('selenium', 'error')
+            tracer.current_span().set_status(STATUS_ERROR, str(e))
             return None
 
+    def release_soup(self, soup):
+        """Çıkarma bittikten sonra parse ağacını parçalar (GC'yi beklemeden bellek iade edilir)"""
+        if soup is None:
+            return
+        try:
+            soup.decompose()
+        except Exception as e:
+            logging.debug(f"Parse ağacı serbest bırakılamadı: {e}")
+
+    def stage(self, name, **attributes):
+        """Aşama süresini ölçer ve aynı isimle trace span'i açar"""
+        return join_scopes(self.instrumentation.stage(name), tracer.span(name, **attributes))
+
+    def sleep(self, seconds):
+        """Rate limiting beklemesi (instrumentation ile ölçülür)"""
+        with self.stage('sleep', seconds=round(seconds, 3)):
+            self.clock.sleep(seconds)
+
     def close(self):
         """Clean up resources"""
         try:
@@ -0,0 +1,70 @@
+# scrapers/clock.py
+import threading
+import time
+
+
+class SystemClock:
+    """Gerçek zaman - varsayılan saat ve bekleme"""
+
+    def time(self):
+        return time.time()
+
+    def monotonic(self):
+        return time.monotonic()
+
+    def sleep(self, seconds):
+        if seconds > 0:
+            time.sleep(seconds)
+
+
+class VirtualClock:
+    """Sanal zaman - sleep() beklemeden saati ileri alır (test ve benchmark için)
+
+    Tüm beklemeler `sleeps` listesinde (monotonic zaman, süre) olarak tutulur,
+    böylece rate limiting ve backoff kararları sonradan kontrol edilebilir.
+    """
+
+    def __init__(self, start=0.0, wall_start=None):
+        self._now = float(start)
+        self._wall_start = time.time() if wall_start is None else wall_start
+        self._lock = threading.Lock()
+        self.sleeps = []
+
+    def time(self):
+        with self._lock:
+            return self._wall_start + self._now
+
+    def monotonic(self):
+        with self._lock:
+            return self._now
+
+    def sleep(self, seconds):
+        with self._lock:
+            self.sleeps.append((self._now, seconds))
+            if seconds > 0:
+                self._now += seconds
+
+    def advance(self, seconds):
+        """Beklemeden zamanı ilerlet (örn. simüle edilen ağ gecikmesi)"""
+        with self._lock:
+            if seconds > 0:
+                self._now += seconds
+
+    @property
+    def total_slept(self):
+        with self._lock:
+            return sum(max(seconds, 0) for _, seconds in self.sleeps)
+
+
+_default_clock = SystemClock()
+
+
+def get_clock():
+    """Process genelindeki varsayılan saat"""
+    return _default_clock
+
+
+def set_clock(clock):
+    """Varsayılan saati değiştirir (sonradan oluşturulan scraper'lar kullanır)"""
+    global _default_clock
+    _default_clock = clock
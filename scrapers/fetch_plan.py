@@ -0,0 +1,232 @@
+# scrapers/fetch_plan.py
+"""Oyuncu başına hangi sayfaların çekileceğine karar veren planlayıcı
+
+Eldeki veriden (lig tablosu basic_stats, kayıtlı doküman ve güncelliği,
+bilinen takım → lig eşleşmeleri) yola çıkarak sadece verisi eksik veya eski
+olan sayfalar plana alınır:
+
+    player:   oyuncu sayfası - her zaman
+    scouting: dakikası eşiğin altındaysa veya kayıtlı rapor yeniyse atlanır
+    team:     lig biliniyorsa takım sayfalarına gidilmez
+
+Yakın zamanda 404 dönen URL'ler negatif önbellekte tutulur (NegativeCache)
+ve süre dolana kadar tekrar istenmez.
+"""
+import json
+import logging
+import os
+import threading
+from datetime import datetime
+from config.settings import Settings
+from config.leagues import LEAGUES
+
+PLAYER_PAGE = 'player'
+SCOUTING_PAGE = 'scouting'
+TEAM_PAGE = 'team'
+
+
+class NegativeCache:
+    """Yakın zamanda 404 dönen URL'ler (url -> geçerlilik sonu, epoch saniye)"""
+
+    def __init__(self, ttl=None, path=None):
+        self.ttl = Settings.NEGATIVE_CACHE_TTL if ttl is None else ttl
+        self.path = Settings.NEGATIVE_CACHE_FILE if path is None else path
+        self._entries = None  # İlk kullanımda dosyadan yüklenir
+        self._dirty = False
+        self._lock = threading.Lock()
+
+    def _read_file(self):
+        if not self.path or not os.path.exists(self.path):
+            return {}
+        try:
+            with open(self.path, encoding='utf-8') as f:
+                return {url: float(expires) for url, expires in json.load(f).items()}
+        except Exception as e:
+            logging.warning(f"Negatif önbellek okunamadı ({self.path}): {e}")
+            return {}
+
+    def _entries_locked(self):
+        if self._entries is None:
+            self._entries = self._read_file()
+        return self._entries
+
+    def is_cached(self, url, now):
+        if not self.ttl:
+            return False
+        with self._lock:
+            entries = self._entries_locked()
+            expires = entries.get(url)
+            if expires is None:
+                return False
+            if expires <= now:
+                del entries[url]
+                self._dirty = True
+                return False
+            return True
+
+    def add(self, url, now):
+        if not self.ttl:
+            return
+        with self._lock:
+            self._entries_locked()[url] = now + self.ttl
+            self._dirty = True
+
+    def __len__(self):
+        with self._lock:
+            return len(self._entries_locked())
+
+    def save(self, now=None):
+        """Süresi dolmamış kayıtları dosyadaki (diğer process'lerin) kayıtlarla birleştirip yazar"""
+        if not self.path or not self._dirty:
+            return
+        with self._lock:
+            merged = self._read_file()
+            merged.update(self._entries_locked())
+            if now is not None:
+                merged = {url: expires for url, expires in merged.items() if expires > now}
+            try:
+                directory = os.path.dirname(self.path)
+                if directory:
+                    os.makedirs(directory, exist_ok=True)
+                tmp_path = f"{self.path}.{os.getpid()}.tmp"
+                with open(tmp_path, 'w', encoding='utf-8') as f:
+                    json.dump(merged, f)
+                os.replace(tmp_path, self.path)
+                self._entries = merged
+                self._dirty = False
+            except Exception as e:
+                logging.error(f"Negatif önbellek yazılamadı ({self.path}): {e}")
+
+
+_negative_cache = None
+
+
+def get_negative_cache():
+    """Process genelinde paylaşılan negatif önbellek"""
+    global _negative_cache
+    if _negative_cache is None:
+        _negative_cache = NegativeCache()
+    return _negative_cache
+
+
+class FetchPlan:
+    """Tek oyuncu için çekilecek sayfalar ve atlananların nedenleri"""
+
+    def __init__(self):
+        self.pages = {PLAYER_PAGE}
+        self.skipped = {}  # sayfa -> neden
+        self.league = None  # Biliniyorsa takım sayfalarına gidilmez
+        self.team = None  # league kayıttan geldiyse ait olduğu takım (oyuncu başka takıma geçtiyse geçersiz)
+        self.scouting_report = None  # Sayfa çekilmezse korunacak kayıtlı rapor
+        self.scouting_updated_at = None
+
+    def league_for(self, team):
+        """Sayfadan okunan takım için bilinen lig - takım değiştiyse None (transfer)"""
+        if self.league and (not team or not self.team or team == self.team):
+            return self.league
+        return None
+
+    def needs(self, page):
+        return page in self.pages
+
+    def fetch(self, page):
+        self.pages.add(page)
+        self.skipped.pop(page, None)
+
+    def skip(self, page, reason):
+        self.pages.discard(page)
+        self.skipped[page] = reason
+
+    def __repr__(self):
+        skipped = ', '.join(f"{page}:{reason}" for page, reason in sorted(self.skipped.items()))
+        return f"FetchPlan(pages={sorted(self.pages)}, skipped=[{skipped}])"
+
+
+class FetchPlanner:
+    """Eldeki veriye göre oyuncu başına FetchPlan üretir"""
+
+    def __init__(self, enabled=None, scouting_min_minutes=None, scouting_stale_days=None):
+        self.enabled = Settings.FETCH_PLAN_ENABLED if enabled is None else enabled
+        self.scouting_min_minutes = (Settings.SCOUTING_MIN_MINUTES if scouting_min_minutes is None
+                                     else scouting_min_minutes)
+        self.scouting_stale_days = (Settings.SCOUTING_STALE_DAYS if scouting_stale_days is None
+                                    else scouting_stale_days)
+        self.team_leagues = {}  # takım -> lig
+
+    def remember_team(self, team, league):
+        if team and league in LEAGUES and team != 'Unknown Team':
+            self.team_leagues[team] = league
+
+    def load_team_leagues(self, mapping):
+        """Veritabanındaki takım -> lig eşleşmelerini ekler"""
+        for team, league in (mapping or {}).items():
+            self.remember_team(team, league)
+
+    def league_for_team(self, team):
+        return self.team_leagues.get(team) if self.enabled else None
+
+    def plan(self, basic_info=None, stored=None, now=None, team=None):
+        """Oyuncu için FetchPlan (basic_info: lig tablosu satırı, stored: kayıtlı doküman)
+
+        team: sayfadan okunmuş güncel takım (biliniyorsa) - kayıtlı lig sadece takım aynıysa kullanılır.
+        """
+        plan = FetchPlan()
+        plan.fetch(SCOUTING_PAGE)
+        plan.fetch(TEAM_PAGE)
+        basic_info = basic_info or {}
+        stored = stored or {}
+
+        if Settings.SCOUTING_SOURCE == 'local':
+            # Rapor kayıtlı istatistiklerden hesaplanır (percentiles komutu); hesaplanmış rapor korunur
+            plan.skip(SCOUTING_PAGE, 'computed_locally')
+            if stored.get('scoutingReport'):
+                plan.scouting_report = stored['scoutingReport']
+                plan.scouting_updated_at = stored.get('scoutingUpdatedAt') or stored.get('updatedAt')
+        if not self.enabled:
+            return plan
+
+        now = now or datetime.utcnow()
+
+        # Lig: bu çalıştırmadaki lig tablosu güncel kabul edilir. Kayıtlı lig ve takım eşleşmesi
+        # takımıyla birlikte tutulur; sayfadan okunan takım farklıysa (transfer) kullanılmaz.
+        if basic_info.get('league') in LEAGUES:
+            plan.league = basic_info['league']
+            self.remember_team(basic_info.get('team'), plan.league)
+        elif stored.get('league') in LEAGUES and (not team or stored.get('team') == team):
+            plan.league, plan.team = stored['league'], stored.get('team')
+        else:
+            lookup_team = team or stored.get('team')
+            if self.team_leagues.get(lookup_team) in LEAGUES:
+                plan.league, plan.team = self.team_leagues[lookup_team], lookup_team
+        if plan.league:
+            plan.skip(TEAM_PAGE, 'league_known')
+
+        # Scouting: kayıtlı rapor sayfa çekilmese de korunur (upsert $set ile silinmesin)
+        if stored.get('scoutingReport'):
+            plan.scouting_report = stored['scoutingReport']
+            plan.scouting_updated_at = stored.get('scoutingUpdatedAt') or stored.get('updatedAt')
+
+        minutes = self.get_minutes(basic_info, stored)
+        if plan.needs(SCOUTING_PAGE):
+            if minutes is not None and minutes < self.scouting_min_minutes:
+                plan.skip(SCOUTING_PAGE, 'below_minutes')
+            elif plan.scouting_report and isinstance(plan.scouting_updated_at, datetime) and \
+                    (now - plan.scouting_updated_at).days < self.scouting_stale_days:
+                plan.skip(SCOUTING_PAGE, 'fresh')
+
+        return plan
+
+    @staticmethod
+    def get_minutes(basic_info, stored):
+        """Lig tablosundaki (yoksa kayıtlı) dakika - bilinmiyorsa None"""
+        for stats, key in ((basic_info.get('basic_stats'), 'minutes'),
+                           (stored.get('leagueStats'), 'minutes'),
+                           (stored.get('seasonStats'), 'minutesPlayed')):
+            value = (stats or {}).get(key)
+            if value is None or value == '':
+                continue
+            try:
+                return float(value)
+            except (TypeError, ValueError):
+                continue
+        return None
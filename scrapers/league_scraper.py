@@ -7,8 +7,8 @@ import re
 
 
 class LeagueScraper(BaseScraper):
-    def __init__(self):
-        super().__init__(use_selenium=False)
+    def __init__(self, clock=None):
+        super().__init__(use_selenium=False, clock=clock)
         self.utils = ScrapingUtils()
 
     def get_league_players(self, league_name):
@@ -25,6 +25,17 @@ class LeagueScraper(BaseScraper):
             logging.error(f"Lig sayfası getirilemedi: {league_url}")
             return []
 
+        try:
+            players = self.extract_players_from_page(soup, league_name)
+        finally:
+            # Büyük lig tablosunun parse ağacını hemen serbest bırak
+            self.release_soup(soup)
+
+        logging.info(f"{league_name} liginden {len(players)} oyuncu bulundu")
+        return players
+
+    def extract_players_from_page(self, soup, league_name):
+        """Lig istatistik sayfasındaki tablodan oyuncu listesini çıkarır"""
         players = []
 
         # Ana istatistik tablosunu bul
@@ -49,7 +60,6 @@ class LeagueScraper(BaseScraper):
                 logging.error(f"Oyuncu verisi çıkarılırken hata: {e}")
                 continue
 
-        logging.info(f"{league_name} liginden {len(players)} oyuncu bulundu")
         return players
 
     def extract_player_from_row(self, row, league_name):
@@ -134,8 +144,7 @@ class LeagueScraper(BaseScraper):
                 all_players.extend(league_players)
 
                 # Ligler arası bekleme
-                import time
-                time.sleep(5)
+                self.sleep(5)
 
             except Exception as e:
                 logging.error(f"Lig scraping hatası ({league_name}): {e}")
@@ -0,0 +1,80 @@
+# scrapers/page_corpus.py
+import json
+import os
+import re
+from urllib.parse import urlparse
+from bs4 import BeautifulSoup
+
+# Kayıtlı sayfalar benchmark'larla birlikte tutulur
+CORPUS_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'benchmarks', 'corpus')
+
+
+class PageCorpus:
+    """Kaydedilmiş FBref sayfalarını URL yoluna göre sunar (ağ erişimi olmadan)"""
+
+    def __init__(self, corpus_dir=CORPUS_DIR):
+        self.corpus_dir = corpus_dir
+        with open(os.path.join(corpus_dir, 'manifest.json'), encoding='utf-8') as f:
+            manifest = json.load(f)
+
+        self.routes = [
+            (re.compile(route['pattern']), route['file'], route.get('fallback'))
+            for route in manifest['routes']
+        ]
+        self._cache = {}
+        self.requests = 0
+
+    def resolve(self, url):
+        """URL'yi corpus dosya yoluna çevirir, eşleşme yoksa None"""
+        path = urlparse(url).path or url
+
+        for pattern, file_template, fallback in self.routes:
+            match = pattern.search(path)
+            if not match:
+                continue
+
+            file_path = os.path.join(self.corpus_dir, file_template.format(**match.groupdict()))
+            if os.path.exists(file_path):
+                return file_path
+            if fallback:
+                return os.path.join(self.corpus_dir, fallback)
+            return None
+
+        return None
+
+    def get_html(self, url):
+        """Sayfanın ham HTML içeriği (bytes), bulunamazsa None"""
+        file_path = self.resolve(url)
+        if not file_path:
+            return None
+
+        if file_path not in self._cache:
+            with open(file_path, 'rb') as f:
+                self._cache[file_path] = f.read()
+
+        return self._cache[file_path]
+
+    def get_soup(self, url):
+        """BaseScraper.get_page ile aynı şekilde parse edilmiş sayfa"""
+        self.requests += 1
+        html = self.get_html(url)
+        if html is None:
+            return None
+        return BeautifulSoup(html, 'html.parser')
+
+    def install(self, scraper):
+        """Scraper'ın get_page metodunu corpus'tan okuyacak şekilde değiştirir"""
+        def get_page(url, use_selenium=None, max_retries=3):
+            return self.get_soup(url)
+
+        scraper.get_page = get_page
+        return scraper
+
+    def player_urls(self):
+        """Corpus'taki kayıtlı oyuncu sayfalarının URL'leri"""
+        players_dir = os.path.join(self.corpus_dir, 'players')
+        return [
+            f"https://fbref.com/en/players/{name[:-5]}/"
+            for name in sorted(os.listdir(players_dir))
+            if name.endswith('.html')
+        ]
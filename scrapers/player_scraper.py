@@ -1,23 +1,60 @@
 # scrapers/player_scraper.py
 import logging
 from .base_scraper import BaseScraper
+from .fetch_plan import PLAYER_PAGE, SCOUTING_PAGE, FetchPlanner
 from .utils import ScrapingUtils
 from config.settings import Settings
 from config.leagues import LEAGUE_COUNTRIES, LEAGUES
 from models.player import PlayerModel
+from monitoring.tracing import tracer
 import re
+from datetime import datetime
 from urllib.parse import urljoin
 
 
 class PlayerScraper(BaseScraper):
-    def __init__(self):
-        super().__init__(use_selenium=False)
+    # Kısmi güncelleme için alan grupları: grup -> (gereken sayfa, yazılan alanlar)
+    FIELD_GROUPS = {
+        'bio': (PLAYER_PAGE, ('firstName', 'lastName', 'fullName', 'age', 'team', 'league', 'country',
+                              'detailedPosition', 'photo', 'height', 'weight', 'preferredFoot')),
+        'contract': (PLAYER_PAGE, ('contractEnd',)),
+        'season_stats': (PLAYER_PAGE, ('seasonStats',)),
+        'similar': (PLAYER_PAGE, ('similarPlayers',)),
+        'transfers': (PLAYER_PAGE, ('transferHistory',)),
+        'scouting': (SCOUTING_PAGE, ('scoutingReport', 'scoutingUpdatedAt')),
+    }
+    # Grup çıkarılabildiyse dolu olması gereken alan (boş/varsayılansa grup yazılmaz)
+    GROUP_KEY_FIELDS = {
+        'bio': 'fullName',
+        'contract': 'contractEnd',
+        'season_stats': 'seasonStats',
+        'similar': 'similarPlayers',
+        'transfers': 'transferHistory',
+        'scouting': 'scoutingReport',
+    }
+
+    def __init__(self, clock=None):
+        super().__init__(use_selenium=False, clock=clock)
         self.utils = ScrapingUtils()
+        self.planner = FetchPlanner()
 
-    def scrape_player_details(self, player_url, basic_info=None):
-        """Oyuncu detay sayfasından tüm bilgileri çeker"""
+    def scrape_player_details(self, player_url, basic_info=None, stored=None, validate=True):
+        """Oyuncu detay sayfasından tüm bilgileri çeker
+
+        stored: veritabanındaki mevcut doküman (varsa) - fetch planı eksik
+        veya eski olmayan sayfaları tekrar çekmez.
+        validate=False: kayıtlar toplu doğrulanacaksa (LeagueValidator) oyuncu başına doğrulama yapılmaz.
+        """
         logging.info(f"Oyuncu detayları çekiliyor: {player_url}")
 
+        plan = self.planner.plan(basic_info, stored)
+        with self.instrumentation.player(player_url), \
+                tracer.span('scrape_player_details', url=player_url, pages=','.join(sorted(plan.pages))):
+            for page, reason in plan.skipped.items():
+                self.instrumentation.count(f'skipped_{page}_{reason}')
+            return self._scrape_player_details(player_url, basic_info, plan, validate)
+
+    def _scrape_player_details(self, player_url, basic_info, plan, validate=True):
         # PlayerModel oluştur
         player = PlayerModel()
 
@@ -27,33 +64,62 @@ class PlayerScraper(BaseScraper):
             logging.error(f"Oyuncu sayfası getirilemedi: {player_url}")
             return None
 
+        stage = self.stage
+
         try:
             # Temel bilgileri çek
-            self.extract_basic_info(soup, player, player_url, basic_info)
+            with stage('extract_basic_info'):
+                self.extract_basic_info(soup, player, player_url, basic_info, plan)
+            self.planner.remember_team(player.data['team'], player.data['league'])
+
+            # Lig tablosu istatistikleri (delta güncelleme karşılaştırması için)
+            if basic_info and basic_info.get('basic_stats'):
+                player.set_league_stats(basic_info['basic_stats'])
 
             # Fiziksel bilgileri çek
-            self.extract_physical_info(soup, player)
+            with stage('extract_physical_info'):
+                self.extract_physical_info(soup, player)
 
             # Sezon istatistiklerini çek
-            self.extract_season_stats(soup, player)
+            with stage('extract_season_stats'):
+                self.extract_season_stats(soup, player)
 
-            # Benzer oyuncuları çek
-            self.extract_similar_players(soup, player, player_url)
-
-            # Scouting raporunu çek
-            self.extract_scouting_report(player, player_url)
+            # Benzer oyuncuları çek (local: similar komutu hesaplar, kayıtlı liste ezilmesin)
+            if Settings.SIMILAR_PLAYERS_SOURCE == 'local':
+                player.data.pop('similarPlayers', None)
+            else:
+                with stage('extract_similar_players'):
+                    self.extract_similar_players(soup, player, player_url)
+
+            # Scouting raporunu çek (plan dışındaysa kayıtlı rapor korunur)
+            if plan.needs(SCOUTING_PAGE):
+                with stage('extract_scouting_report'):
+                    self.extract_scouting_report(player, player_url)
+                if not player.data['scoutingReport'] and plan.scouting_report:
+                    player.data['scoutingReport'] = plan.scouting_report
+                    player.data['scoutingUpdatedAt'] = plan.scouting_updated_at
+            elif plan.scouting_report:
+                player.data['scoutingReport'] = plan.scouting_report
+                player.data['scoutingUpdatedAt'] = plan.scouting_updated_at
+            elif Settings.SCOUTING_SOURCE == 'local':
+                # Rapor percentiles komutunda hesaplanır; kayıtlı rapor yoksa boş rapor yazılıp
+                # sonradan/eşzamanlı hesaplanan rapor ezilmesin (alan hiç yazılmaz)
+                player.data.pop('scoutingReport', None)
+                player.data.pop('scoutingUpdatedAt', None)
 
             # Transfer geçmişini çek
-            self.extract_transfer_history(soup, player)
+            with stage('extract_transfer_history'):
+                self.extract_transfer_history(soup, player)
 
             # Zaman damgasını güncelle
             player.update_timestamp()
 
             # Doğrulama
-            is_valid, message = player.validate()
-            if not is_valid:
-                logging.error(f"Oyuncu verisi geçersiz: {message}")
-                return None
+            if validate:
+                is_valid, message = player.validate()
+                if not is_valid:
+                    logging.error(f"Oyuncu verisi geçersiz: {message}")
+                    return None
 
             return player.to_dict()
 
@@ -61,7 +127,98 @@ class PlayerScraper(BaseScraper):
             logging.error(f"Oyuncu detay çekme hatası: {e}")
             return None
 
-    def extract_basic_info(self, soup, player, player_url, basic_info=None):
+        finally:
+            # Sonuçta soup referansı kalmadığı için ağaç hemen parçalanabilir
+            self.release_soup(soup)
+
+    def scrape_player_fields(self, fbref_id, groups, stored=None):
+        """Sadece istenen alan gruplarını çeker - kısmi $set için {alan: değer} döndürür
+
+        Sadece grupların gerektirdiği sayfalar çekilir ve sadece ilgili
+        çıkarıcılar çalışır. Çıkarılamayan (boş) gruplar sonuçta yer almaz ki
+        kayıtlı alanlar ezilmesin. Sayfa alınamazsa None döner.
+        """
+        unknown = [group for group in groups if group not in self.FIELD_GROUPS]
+        if unknown:
+            raise ValueError(f"Bilinmeyen alan grubu: {', '.join(unknown)} ({', '.join(self.FIELD_GROUPS)})")
+
+        player_url = f"{Settings.FBREF_BASE_URL}/en/players/{fbref_id}/"
+        pages = {self.FIELD_GROUPS[group][0] for group in groups}
+
+        with self.instrumentation.player(player_url), \
+                tracer.span('scrape_player_fields', url=player_url, groups=','.join(groups)):
+            return self._scrape_player_fields(player_url, groups, pages, stored or {})
+
+    def _scrape_player_fields(self, player_url, groups, pages, stored):
+        player = PlayerModel()
+        soup = None
+
+        try:
+            if PLAYER_PAGE in pages:
+                soup = self.get_page(player_url)
+                if not soup:
+                    logging.error(f"Oyuncu sayfası getirilemedi: {player_url}")
+                    return None
+
+            # Çıkarılamayan (hata veya sadece boş/varsayılan değer) gruplar yazılmaz, kayıtlı alanlar korunur
+            extracted = []
+            for group in self.FIELD_GROUPS:
+                if group not in groups:
+                    continue
+                if group == 'scouting' and 'bio' not in extracted:
+                    # Scouting URL'si için güncel isim (sayfada yoksa kayıtlı isim)
+                    name_elem = soup.find('h1') if soup else None
+                    player.data['fullName'] = (self.utils.clean_text(name_elem.text) if name_elem else '') or \
+                        stored.get('fullName', '')
+                try:
+                    self._extract_group(group, soup, player, player_url, stored)
+                except Exception as e:
+                    logging.warning(f"Alan grubu çıkarılamadı ({group}), kayıtlı alanlar korunur: {player_url} - {e}")
+                    continue
+                value = player.data.get(self.GROUP_KEY_FIELDS[group])
+                if not value or value == 'Unknown Player':
+                    logging.warning(f"Alan grubu boş ({group}), kayıtlı alanlar korunur: {player_url}")
+                    continue
+                extracted.append(group)
+
+            return {field: player.data.get(field) for group in extracted for field in self.FIELD_GROUPS[group][1]}
+
+        except Exception as e:
+            logging.error(f"Kısmi oyuncu güncelleme hatası: {e}")
+            return None
+
+        finally:
+            self.release_soup(soup)
+
+    def _extract_group(self, group, soup, player, player_url, stored):
+        """Tek bir alan grubunun çıkarıcılarını çalıştırır"""
+        stage = self.stage
+        if group == 'bio':
+            # Kayıtlı lig sadece takım değişmediyse kullanılır, transferde lig yeniden bulunur
+            with stage('extract_basic_info'):
+                self.extract_basic_info(soup, player, player_url, plan=self.planner.plan(None, stored))
+            self.planner.remember_team(player.data['team'], player.data['league'])
+            with stage('extract_physical_info'):
+                self.extract_physical_info(soup, player)
+        elif group == 'contract':
+            # bio grubu kontratı zaten çıkarır
+            if not player.data['contractEnd']:
+                with stage('extract_contract_end'):
+                    player.data['contractEnd'] = self.extract_contract_end(soup)
+        elif group == 'season_stats':
+            with stage('extract_season_stats'):
+                self.extract_season_stats(soup, player)
+        elif group == 'similar':
+            with stage('extract_similar_players'):
+                self.extract_similar_players(soup, player, player_url)
+        elif group == 'transfers':
+            with stage('extract_transfer_history'):
+                self.extract_transfer_history(soup, player)
+        elif group == 'scouting':
+            with stage('extract_scouting_report'):
+                self.extract_scouting_report(player, player_url)
+
+    def extract_basic_info(self, soup, player, player_url, basic_info=None, plan=None):
         """Temel bilgileri çeker - Enhanced contract extraction with full dates"""
         try:
             # FBRef ID
@@ -148,11 +305,20 @@ class PlayerScraper(BaseScraper):
                         if not team:
                             team = self.utils.clean_text(team_link.text)
 
+                        # Fetch planı bu takımın ligini biliyorsa takım sayfasına gidilmez
+                        # (kayıtlı takımdan farklıysa oyuncu transfer olmuştur, lig yeniden bulunur)
+                        if plan:
+                            league = plan.league_for(team) or self.planner.league_for_team(team) or ""
+
                         # Lig bilgisini çıkar
-                        league = self.extract_league_from_team_url(team_href, soup)
+                        if not league:
+                            league = self.extract_league_from_team_url(team_href, soup)
                         if league:
                             break
 
+            if not league and plan:
+                league = plan.league_for(team) or self.planner.league_for_team(team) or ""
+
             # Alternatif: Sayfa içindeki diğer linklerden lig bilgisini bul
             if not league:
                 league = self.detect_league_from_page(soup)
@@ -553,6 +719,7 @@ class PlayerScraper(BaseScraper):
 
     def extract_league_from_team_url(self, team_href, soup):
         """Takım URL'sinden lig bilgisini çıkarır"""
+        team_soup = None
         try:
             # URL'de lig bilgisi varsa çıkar
             # Örnek: /en/squads/18bb7c10/2024-2025/Liverpool-Stats
@@ -576,6 +743,8 @@ class PlayerScraper(BaseScraper):
         except Exception as e:
             logging.error(f"Takım URL'sinden lig çıkarma hatası: {e}")
             return None
+        finally:
+            self.release_soup(team_soup)
 
     def detect_league_from_page(self, soup):
         """Sayfa içeriğinden lig bilgisini tespit eder - Enhanced"""
@@ -985,6 +1154,7 @@ class PlayerScraper(BaseScraper):
 
     def extract_scouting_report(self, player, player_url):
         """Scouting raporunu çeker - Sadece geçerli istatistikleri toplar"""
+        soup = None
         try:
             # Scouting report URL'si oluştur
             fbref_id = self.utils.extract_fbref_id(player_url)
@@ -1016,6 +1186,7 @@ class PlayerScraper(BaseScraper):
 
             # PlayerModel'e scouting verilerini set et
             player.data['scoutingReport'] = scouting_data
+            player.data['scoutingUpdatedAt'] = datetime.utcnow()
 
             if scouting_data:
                 logging.info(f"Scouting raporu tamamlandı: {len(scouting_data)} geçerli stat")
@@ -1024,6 +1195,8 @@ class PlayerScraper(BaseScraper):
 
         except Exception as e:
             logging.error(f"Scouting raporu çekme hatası: {e}")
+        finally:
+            self.release_soup(soup)
 
     def is_valid_stat_name(self, stat_name):
                 """İstatistik isminin geçerli olup olmadığını kontrol eder"""
@@ -1526,14 +1699,8 @@ class PlayerScraper(BaseScraper):
     def update_existing_player_contract(self, fbref_id):
         """Mevcut oyuncunun kontrat bilgisini günceller"""
         try:
-            player_url = f"https://fbref.com/en/players/{fbref_id}/"
-            soup = self.get_page(player_url)
-
-            if soup:
-                contract_end = self.extract_contract_end(soup)
-                return contract_end
-
-            return ""
+            fields = self.scrape_player_fields(fbref_id, ['contract'])
+            return fields['contractEnd'] if fields else ""
         except Exception as e:
             logging.error(f"Kontrat güncelleme hatası: {e}")
             return ""
\ No newline at end of file
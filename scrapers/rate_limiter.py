@@ -0,0 +1,83 @@
+# scrapers/rate_limiter.py
+import logging
+import multiprocessing
+from config.settings import Settings
+from .clock import get_clock
+
+
+class MongoRateLimiter:
+    """Birden fazla worker arasında ortak istek hızı sınırı (MongoDB üzerinden)
+
+    Her istek için ortak bir "sonraki boş zaman" değeri compare-and-set ile
+    ileri alınır; böylece tüm makinelerdeki worker'lar toplamda saniyede
+    `rate` istekten fazlasını yapmaz.
+    """
+
+    def __init__(self, collection, key="fbref", rate=None, clock=None):
+        self.collection = collection
+        self.clock = clock or get_clock()
+        self.key = key
+        self.rate = rate or Settings.GLOBAL_RATE_LIMIT
+        self.interval = 1.0 / self.rate
+
+        try:
+            self.collection.update_one({"_id": self.key}, {"$setOnInsert": {"nextAt": 0.0}}, upsert=True)
+        except Exception as e:
+            # Aynı anda başlayan başka bir worker belgeyi oluşturmuş olabilir
+            logging.debug(f"Rate limit belgesi zaten mevcut: {e}")
+
+    def acquire(self):
+        """Ortak bütçeden bir istek hakkı al, gerekirse sırası gelene kadar bekle"""
+        while True:
+            now = self.clock.time()
+            doc = self.collection.find_one({"_id": self.key})
+            next_at = doc.get("nextAt", 0.0) if doc else 0.0
+            slot = max(now, next_at)
+
+            result = self.collection.update_one(
+                {"_id": self.key, "nextAt": next_at},
+                {"$set": {"nextAt": slot + self.interval}}
+            )
+            if result.modified_count == 1:
+                wait_time = slot - now
+                if wait_time > 0:
+                    self.clock.sleep(wait_time)
+                return wait_time
+
+            # Başka bir worker araya girdi, tekrar dene
+
+
+class SharedTokenBucket:
+    """Aynı makinedeki process'ler arasında paylaşılan token bucket (shared memory)
+
+    Token sayısı ve son doldurma zamanı multiprocessing.Value içinde tutulur;
+    process'lere argüman olarak geçirilip ortak hız sınırı uygulanır.
+    """
+
+    def __init__(self, rate=None, capacity=None, context=None, clock=None):
+        context = context or multiprocessing.get_context()
+        self.clock = clock or get_clock()
+        self.rate = rate or Settings.GLOBAL_RATE_LIMIT
+        self.capacity = capacity or Settings.RATE_LIMIT_BURST
+        self._lock = context.Lock()
+        self._tokens = context.Value('d', float(self.capacity), lock=False)
+        self._updated_at = context.Value('d', self.clock.monotonic(), lock=False)
+
+    def acquire(self):
+        """Bir token al, yoksa yeterli token birikene kadar bekle"""
+        waited = 0.0
+        while True:
+            with self._lock:
+                now = self.clock.monotonic()
+                elapsed = max(now - self._updated_at.value, 0.0)
+                self._tokens.value = min(self.capacity, self._tokens.value + elapsed * self.rate)
+                self._updated_at.value = now
+
+                if self._tokens.value >= 1.0:
+                    self._tokens.value -= 1.0
+                    return waited
+
+                wait_time = (1.0 - self._tokens.value) / self.rate
+
+            self.clock.sleep(wait_time)
+            waited += wait_time
@@ -0,0 +1,139 @@
+# scrapers/scheduler.py
+import heapq
+import logging
+from datetime import datetime
+from config.settings import Settings
+from config.leagues import LEAGUE_TIERS
+from monitoring import metrics
+from .clock import get_clock
+from .utils import ScrapingUtils
+
+
+class RefreshScheduler:
+    """Oyuncuları güncellik önceliğine göre sıralayıp bütçe dahilinde günceller"""
+
+    # Öncelik ağırlıkları
+    STALENESS_WEIGHT = 4.0
+    MINUTES_WEIGHT = 2.0
+    TIER_WEIGHT = 1.5
+    CONTRACT_WEIGHT = 2.0
+    BACKLOG_WEIGHT = 1.0
+
+    MAX_STALENESS = 3.0  # STALE_DAYS'in en fazla 3 katı kadar puan ver
+    FULL_SEASON_MINUTES = 3000
+    DEFAULT_TIER = 4
+
+    def __init__(self, time_budget=None, request_budget=None, request_counter=None, delay=None, now=None,
+                 clock=None):
+        self.time_budget = Settings.REFRESH_TIME_BUDGET if time_budget is None else time_budget
+        self.request_budget = Settings.REFRESH_REQUEST_BUDGET if request_budget is None else request_budget
+        self.request_counter = request_counter
+        self.delay = Settings.MIN_DELAY if delay is None else delay
+        self.now = now or datetime.utcnow()
+        self.clock = clock or get_clock()
+        self.queue = []
+        self._counter = 0
+
+    def calculate_priority(self, player, in_backlog=False):
+        """Oyuncu için güncelleme önceliği hesaplar (büyük = önce)"""
+        # Güncellik: updatedAt ne kadar eskiyse o kadar öncelikli
+        updated_at = player.get('updatedAt')
+        if isinstance(updated_at, datetime):
+            age_days = max((self.now - updated_at).total_seconds() / 86400, 0)
+            staleness = min(age_days / max(Settings.REFRESH_STALE_DAYS, 1), self.MAX_STALENESS)
+        else:
+            staleness = self.MAX_STALENESS
+
+        # Oynanan dakika: düzenli oynayan oyuncuların verisi daha hızlı eskir
+        league_stats = player.get('leagueStats') or {}
+        season_stats = player.get('seasonStats') or {}
+        minutes = league_stats.get('minutes') or season_stats.get('minutesPlayed') or 0
+        try:
+            minutes_score = min(float(minutes) / self.FULL_SEASON_MINUTES, 1.0)
+        except (TypeError, ValueError):
+            minutes_score = 0.0
+
+        # Lig seviyesi: üst ligler önce
+        tier = LEAGUE_TIERS.get(player.get('league', ''), self.DEFAULT_TIER)
+        tier_score = (self.DEFAULT_TIER - tier + 1) / self.DEFAULT_TIER
+
+        # Kontrat bitişi yaklaşıyor mu
+        contract_score = 0.0
+        contract_end = ScrapingUtils.parse_contract_end_date(player.get('contractEnd'))
+        if contract_end:
+            days_left = (contract_end - self.now).days
+            if 0 <= days_left <= Settings.REFRESH_CONTRACT_DAYS:
+                contract_score = 1.0
+
+        priority = (self.STALENESS_WEIGHT * staleness +
+                    self.MINUTES_WEIGHT * minutes_score +
+                    self.TIER_WEIGHT * tier_score +
+                    self.CONTRACT_WEIGHT * contract_score)
+
+        if in_backlog:
+            priority += self.BACKLOG_WEIGHT
+
+        return priority
+
+    def add_players(self, players, backlog_ids=None):
+        """Oyuncuları öncelik kuyruğuna ekler"""
+        backlog_ids = set(backlog_ids or [])
+
+        for player in players:
+            fbref_id = player.get('fbrefId')
+            if not fbref_id:
+                continue
+
+            priority = self.calculate_priority(player, fbref_id in backlog_ids)
+            self._counter += 1
+            heapq.heappush(self.queue, (-priority, self._counter, fbref_id, player))
+
+    def run(self, refresh_func):
+        """Kuyruğu bütçe bitene kadar işler, yetişilemeyen oyuncu ID'lerini döndürür"""
+        start = self.clock.monotonic()
+        start_requests = self.request_counter() if self.request_counter else 0
+        processed = 0
+        refreshed = 0
+
+        while self.queue:
+            if self.is_budget_exhausted(start, start_requests):
+                logging.info("Güncelleme bütçesi doldu, kalan oyuncular sonraki çalıştırmaya bırakılıyor")
+                break
+
+            neg_priority, _, fbref_id, player = heapq.heappop(self.queue)
+            processed += 1
+            metrics.QUEUE_DEPTH.labels(queue='refresh', status='pending').set(len(self.queue))
+
+            try:
+                logging.info(
+                    f"Güncelleniyor (öncelik {-neg_priority:.2f}): {player.get('fullName', fbref_id)}")
+                if refresh_func(player):
+                    refreshed += 1
+            except Exception as e:
+                logging.error(f"Oyuncu güncelleme hatası ({fbref_id}): {e}")
+
+            # Rate limiting - son oyuncudan sonra bekleme
+            if self.queue and self.delay:
+                self.clock.sleep(self.delay)
+
+        remaining = self.remaining()
+
+        logging.info(
+            f"Planlayıcı tamamlandı: {processed} işlendi, {refreshed} güncellendi, {len(remaining)} kaldı")
+
+        return remaining
+
+    def remaining(self):
+        """Kuyrukta kalan oyuncu ID'leri (öncelik sırasıyla)"""
+        return [item[2] for item in sorted(self.queue)]
+
+    def is_budget_exhausted(self, start, start_requests):
+        """Zaman veya istek bütçesinin dolup dolmadığını kontrol eder"""
+        if self.time_budget and self.clock.monotonic() - start >= self.time_budget:
+            return True
+
+        if self.request_budget and self.request_counter:
+            if self.request_counter() - start_requests >= self.request_budget:
+                return True
+
+        return False
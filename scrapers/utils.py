@@ -1,7 +1,7 @@
 import re
-import os
 from urllib.parse import urljoin, urlparse
 import logging
+from config.logging_config import setup_logging  # noqa: F401 - eski import yolu
 
 
 class ScrapingUtils:
@@ -111,6 +111,31 @@ class ScrapingUtils:
             logging.error(f"Contract date parsing error: {e}")
             return ""
 
+    @staticmethod
+    def parse_contract_end_date(contract_end):
+        """"June 30, 2027" formatındaki kontrat bitişini datetime'a çevirir"""
+        try:
+            if not contract_end:
+                return None
+
+            from datetime import datetime
+
+            text = str(contract_end).strip()
+            for date_format in ('%B %d, %Y', '%b %d, %Y', '%d %B %Y', '%Y-%m-%d', '%Y'):
+                try:
+                    parsed = datetime.strptime(text, date_format)
+                    if date_format == '%Y':
+                        # Sadece yıl varsa sezon sonu kabul et
+                        parsed = parsed.replace(month=6, day=30)
+                    return parsed
+                except ValueError:
+                    continue
+
+            return None
+        except Exception as e:
+            logging.error(f"Contract end date parsing error: {e}")
+            return None
+
     @staticmethod
     def validate_contract_year(year_text):
         """Kontrat yılının geçerliliğini kontrol eder"""
@@ -457,46 +482,3 @@ class ScrapingUtils:
             return default
         except Exception:
             return default
-
-
-def setup_logging():
-    """Gelişmiş logging konfigürasyonu"""
-    try:
-        # Log dizinini oluştur
-        log_dir = 'data/logs'
-        os.makedirs(log_dir, exist_ok=True)
-
-        # Log formatı
-        log_format = '%(asctime)s - %(name)s - %(levelname)s - %(message)s'
-
-        # Handlers
-        handlers = [
-            logging.StreamHandler(),  # Console output
-        ]
-
-        # File handler (sadece dizin varsa)
-        log_file = os.path.join(log_dir, 'scraper.log')
-        try:
-            file_handler = logging.FileHandler(log_file, encoding='utf-8')
-            file_handler.setFormatter(logging.Formatter(log_format))
-            handlers.append(file_handler)
-        except Exception as e:
-            print(f"Warning: Could not create log file: {e}")
-
-        # Configure logging
-        logging.basicConfig(
-            level=logging.INFO,
-            format=log_format,
-            handlers=handlers,
-            force=True  # Override existing configuration
-        )
-
-        # Set specific loggers to WARNING to reduce noise
-        logging.getLogger('urllib3').setLevel(logging.WARNING)
-        logging.getLogger('selenium').setLevel(logging.WARNING)
-        logging.getLogger('webdriver_manager').setLevel(logging.WARNING)
-
-    except Exception as e:
-        print(f"Logging setup failed: {e}")
-        # Fallback to basic console logging
-        logging.basicConfig(level=logging.INFO, format='%(levelname)s - %(message)s')
\ No newline at end of file
@@ -0,0 +1,77 @@
+# tests/conftest.py
+"""Ortak fixture'lar - testler sunucu gerektirmez
+
+MongoDB yerine mongomock kullanılır, SQLite geçici dizinde açılır.
+"""
+import uuid
+from datetime import datetime
+
+import pytest
+
+from config.settings import Settings
+
+
+def _accept_sort(add_update):
+    """pymongo 4.x UpdateOne bulk'a sort da verir; mongomock bu argümanı tanımıyor"""
+    def wrapper(self, *args, sort=None, **kwargs):
+        return add_update(self, *args, **kwargs)
+    return wrapper
+
+
+@pytest.fixture
+def mongo_db(monkeypatch):
+    """mongomock üzerinde DatabaseManager (her test için ayrı veritabanı)"""
+    mongomock = pytest.importorskip("mongomock")
+    from mongomock.collection import BulkOperationBuilder
+    from models import database
+
+    monkeypatch.setattr(database, 'MongoClient', mongomock.MongoClient)
+    monkeypatch.setattr(BulkOperationBuilder, 'add_update', _accept_sort(BulkOperationBuilder.add_update))
+    db = database.DatabaseManager(db_name=f"test_{uuid.uuid4().hex}")
+    yield db
+    db.client.drop_database(db.db.name)
+    db.close()
+
+
+@pytest.fixture
+def mongo_collection():
+    """Boş mongomock koleksiyonu"""
+    mongomock = pytest.importorskip("mongomock")
+    return mongomock.MongoClient()[f"test_{uuid.uuid4().hex}"]['collection']
+
+
+@pytest.fixture
+def sqlite_db(tmp_path):
+    from models.sqlite_database import SQLiteDatabaseManager
+
+    db = SQLiteDatabaseManager(str(tmp_path / 'players.db'))
+    yield db
+    db.close()
+
+
+@pytest.fixture(params=['mongo', 'sqlite'])
+def store(request):
+    """İki backend için de çalışan PlayerStore"""
+    return request.getfixturevalue(f"{request.param}_db")
+
+
+@pytest.fixture(autouse=True)
+def stats_encoding(monkeypatch):
+    """Ortamdaki ayarlardan bağımsız varsayılan istatistik biçimi"""
+    monkeypatch.setattr(Settings, 'STATS_ENCODING', 'dict')
+
+
+def make_doc(fbref_id, updated_at=None, **fields):
+    """Test oyuncusu dokümanı"""
+    doc = {
+        'fbrefId': fbref_id,
+        'fullName': f"Oyuncu {fbref_id}",
+        'team': 'Arsenal',
+        'league': 'Premier League',
+        'age': 24,
+        'detailedPosition': 'MF (CM)',
+        'seasonStats': {'goals': 1, 'assists': 2, 'minutesPlayed': 900},
+        'updatedAt': updated_at or datetime(2024, 1, 1),
+    }
+    doc.update(fields)
+    return doc
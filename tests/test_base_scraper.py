@@ -0,0 +1,42 @@
+# tests/test_base_scraper.py
+"""Tekrar deneme ve hız sınırı beklemeleri sanal saat üzerinden - gerçek bekleme yok"""
+import time
+from types import SimpleNamespace
+
+import pytest
+
+from scrapers import base_scraper
+from scrapers.base_scraper import BaseScraper
+from scrapers.clock import VirtualClock
+from scrapers.rate_limiter import SharedTokenBucket
+
+
+def test_retry_backoff_advances_virtual_time(monkeypatch):
+    # Rastgele beklemeler alt sınırda sabitlenir: istek öncesi 2s, tekrar 5s * deneme, 429 sonrası 10s
+    monkeypatch.setattr(base_scraper.random, 'uniform', lambda low, high: low)
+    clock = VirtualClock()
+    scraper = BaseScraper(clock=clock)
+    scraper._ua = SimpleNamespace(chrome='test-agent')
+    scraper.rate_limiter = SharedTokenBucket(rate=0.05, capacity=1, clock=clock)  # 20 saniyede bir istek
+
+    responses = iter([(503, b''), (429, b''), (200, b'<html><h1>Oyuncu</h1></html>')])
+    requested_at = []
+
+    def get(url, **kwargs):
+        requested_at.append(clock.monotonic())
+        status, content = next(responses)
+        return SimpleNamespace(status_code=status, content=content)
+
+    monkeypatch.setattr(scraper.session, 'get', get)
+
+    wall_start = time.perf_counter()
+    soup = scraper.get_page('https://fbref.com/en/players/x/')
+    wall = time.perf_counter() - wall_start
+
+    assert soup.find('h1').text == 'Oyuncu'
+    # 2 + 503 sonrası 5 | 2 + hız sınırı 13 + 429 sonrası 10 + tekrar 10 | 2
+    assert requested_at == pytest.approx([2.0, 22.0, 44.0])
+    assert clock.monotonic() == pytest.approx(44.0)
+    assert clock.total_slept == pytest.approx(clock.monotonic())
+    assert (9.0, pytest.approx(13.0)) in clock.sleeps  # token bucket beklemesi de sanal saatte
+    assert wall < 1.0
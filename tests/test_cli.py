@@ -0,0 +1,15 @@
+# tests/test_cli.py
+import sys
+
+import main
+
+
+def test_get_arguments_stops_at_first_option(monkeypatch):
+    monkeypatch.setattr(sys, 'argv', ['main.py', 'update', '--changed', 'Premier League', 'La Liga',
+                                      '--metrics-port', '9100', '--instrument'])
+    assert main.get_arguments(3) == ['Premier League', 'La Liga']
+
+
+def test_get_arguments_without_leagues(monkeypatch):
+    monkeypatch.setattr(sys, 'argv', ['main.py', 'enqueue', '--trace', '--corpus-players', '50'])
+    assert main.get_arguments(2) == []
@@ -0,0 +1,26 @@
+# tests/test_fetch_plan.py
+from scrapers.fetch_plan import TEAM_PAGE, FetchPlanner
+
+
+def test_stored_league_only_for_stored_team():
+    planner = FetchPlanner()
+    plan = planner.plan(None, {'team': 'Arsenal', 'league': 'Premier League'})
+    assert not plan.needs(TEAM_PAGE)
+    assert plan.league_for('Arsenal') == 'Premier League'
+    # Transfer: sayfadaki takım farklı, kayıtlı lig kullanılmaz ve yeni takıma bağlanmaz
+    assert plan.league_for('Barcelona') is None
+    assert 'Barcelona' not in planner.team_leagues
+
+
+def test_parsed_team_uses_known_team_league():
+    planner = FetchPlanner()
+    planner.remember_team('Barcelona', 'La Liga')
+    plan = planner.plan(None, {'team': 'Arsenal', 'league': 'Premier League'}, team='Barcelona')
+    assert plan.league == 'La Liga'
+
+
+def test_league_table_row_is_trusted():
+    planner = FetchPlanner()
+    plan = planner.plan({'team': 'Arsenal', 'league': 'Premier League'}, {'team': 'Chelsea', 'league': 'La Liga'})
+    assert plan.league_for('Arsenal') == 'Premier League'
+    assert planner.team_leagues['Arsenal'] == 'Premier League'
@@ -0,0 +1,92 @@
+# tests/test_job_queue.py
+from datetime import datetime, timedelta
+
+import pytest
+
+from models.job_queue import JobQueue
+
+
+@pytest.fixture
+def queue(mongo_collection):
+    queue = JobQueue(mongo_collection, lease_seconds=60, max_attempts=2)
+    queue.ensure_indexes()
+    return queue
+
+
+def expire_lease(queue, job):
+    queue.collection.update_one({"_id": job["_id"]}, {"$set": {"leaseUntil": datetime.utcnow() - timedelta(seconds=1)}})
+
+
+def test_enqueue_is_idempotent_per_key(queue):
+    assert queue.enqueue("league", {"league": "La Liga"}, key="league:La Liga")
+    assert not queue.enqueue("league", {"league": "La Liga"}, key="league:La Liga")
+    assert queue.get_status_counts()[JobQueue.PENDING] == 1
+
+
+def test_claim_takes_highest_priority_first(queue):
+    queue.enqueue("player", {}, key="low", priority=0)
+    queue.enqueue("player", {}, key="high", priority=5)
+    job = queue.claim("w1")
+    assert job["key"] == "high"
+    assert job["status"] == JobQueue.LEASED and job["owner"] == "w1" and job["attempts"] == 1
+
+
+def test_leased_job_is_not_claimed_twice(queue):
+    queue.enqueue("league", {}, key="only")
+    assert queue.claim("w1")["key"] == "only"
+    assert queue.claim("w2") is None
+
+
+def test_claim_filters_job_types(queue):
+    queue.enqueue("league", {}, key="league")
+    assert queue.claim("w1", job_types=["player"]) is None
+    assert queue.claim("w1", job_types=["league"])["key"] == "league"
+
+
+def test_expired_lease_is_reclaimed_and_old_owner_loses_it(queue):
+    queue.enqueue("league", {}, key="job")
+    first = queue.claim("w1")
+    assert queue.heartbeat(first, "w1")
+
+    expire_lease(queue, first)
+    second = queue.claim("w2")
+    assert second["key"] == "job" and second["owner"] == "w2" and second["attempts"] == 2
+
+    # Eski sahibin heartbeat'i ve tamamlama denemesi etkisiz
+    assert not queue.heartbeat(first, "w1")
+    queue.complete(first, "w1")
+    assert queue.collection.find_one({"key": "job"})["status"] == JobQueue.LEASED
+
+    queue.complete(second, "w2", result={"players": 3})
+    done = queue.collection.find_one({"key": "job"})
+    assert done["status"] == JobQueue.DONE and done["owner"] is None and done["result"] == {"players": 3}
+
+
+def test_job_fails_after_max_attempts(queue):
+    queue.enqueue("league", {}, key="crashy")
+    for _ in range(2):
+        expire_lease(queue, queue.claim("w1"))
+    assert queue.claim("w1") is None
+    job = queue.collection.find_one({"key": "crashy"})
+    assert job["status"] == JobQueue.FAILED
+
+
+def test_fail_requeues_until_attempts_are_used(queue):
+    queue.enqueue("league", {}, key="job")
+    queue.fail(queue.claim("w1"), "w1", "zaman aşımı")
+    assert queue.collection.find_one({"key": "job"})["status"] == JobQueue.PENDING
+    queue.fail(queue.claim("w1"), "w1", "zaman aşımı")
+    job = queue.collection.find_one({"key": "job"})
+    assert job["status"] == JobQueue.FAILED and job["error"] == "zaman aşımı"
+
+
+def test_release_does_not_use_an_attempt(queue):
+    queue.enqueue("league", {}, key="a")
+    queue.enqueue("league", {}, key="b")
+    queue.release(queue.claim("w1"), "w1")
+    assert queue.release_worker("w1") == 0
+
+    queue.claim("w1")
+    queue.claim("w1")
+    assert queue.release_worker("w1") == 2
+    assert all(job["attempts"] == 0 and job["status"] == JobQueue.PENDING for job in queue.collection.find())
@@ -0,0 +1,28 @@
+# tests/test_parquet_export.py
+import pytest
+
+pytest.importorskip("pyarrow")
+
+from analytics.parquet_export import EXPORT_FIELDS, PLAYERS, ParquetExporter, read_table  # noqa: E402
+from tests.conftest import make_doc  # noqa: E402
+
+
+def export(store, path, snapshot_date, incremental=False):
+    exporter = ParquetExporter(str(path), snapshot_date=snapshot_date)
+    since = exporter.watermark if incremental else None
+    players = store.iter_players(updated_since=since, fields=EXPORT_FIELDS, inclusive=False)
+    return exporter.export(players, mode='incremental' if since else 'full')
+
+
+def test_incremental_export_sees_partial_update(store, tmp_path):
+    store.insert_player(make_doc('a'))
+    store.insert_player(make_doc('b'))
+    assert export(store, tmp_path, '2024-01-01')[PLAYERS] == 2
+    assert export(store, tmp_path, '2024-01-02', incremental=True)[PLAYERS] == 0
+
+    store.update_player_fields('a', {'seasonStats': {'goals': 7, 'assists': 2}})
+    assert export(store, tmp_path, '2024-01-03', incremental=True)[PLAYERS] == 1
+
+    table = read_table(PLAYERS, str(tmp_path), snapshot_date='2024-01-03')
+    assert table['fbrefId'].tolist() == ['a']
+    assert table['season__goals'].tolist() == [7.0]
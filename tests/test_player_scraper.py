@@ -0,0 +1,75 @@
+# tests/test_player_scraper.py
+"""Kayıtlı sayfa corpus'u (benchmarks/corpus) üzerinden oyuncu çıkarma - ağ erişimi yok"""
+import pytest
+
+from config.settings import Settings
+from scrapers.clock import VirtualClock
+from scrapers.page_corpus import PageCorpus
+from scrapers.player_scraper import PlayerScraper
+from tests.conftest import make_doc
+
+
+@pytest.fixture
+def scraper():
+    corpus = PageCorpus()
+    scraper = corpus.install(PlayerScraper(clock=VirtualClock()))
+    scraper.player_url = corpus.player_urls()[0]
+    return scraper
+
+
+def test_local_scouting_without_stored_report_does_not_write_report(scraper, monkeypatch):
+    monkeypatch.setattr(Settings, 'SCOUTING_SOURCE', 'local')
+    player = scraper.scrape_player_details(scraper.player_url, validate=False)
+    assert player['fullName']
+    # Yeni oyuncu: boş rapor yazılıp percentiles ile hesaplanan rapor ezilmesin
+    assert 'scoutingReport' not in player and 'scoutingUpdatedAt' not in player
+
+
+def test_local_scouting_keeps_stored_report(scraper, monkeypatch):
+    monkeypatch.setattr(Settings, 'SCOUTING_SOURCE', 'local')
+    report = {'Goals': {'per90': 0.4, 'percentile': 80}}
+    stored = {'fbrefId': 'x', 'scoutingReport': report, 'team': 'Arsenal', 'league': 'Premier League'}
+    player = scraper.scrape_player_details(scraper.player_url, stored=stored, validate=False)
+    assert player['scoutingReport'] == report
+
+
+def test_local_scouting_report_survives_save(scraper, monkeypatch, store):
+    monkeypatch.setattr(Settings, 'SCOUTING_SOURCE', 'local')
+    player = scraper.scrape_player_details(scraper.player_url, validate=False)
+    report = {'Goals': {'per90': 0.4, 'percentile': 80}}
+    store.insert_player({'fbrefId': player['fbrefId'], 'scoutingReport': report})
+
+    store.insert_player(player)
+    assert store.get_player(player['fbrefId'])['scoutingReport'] == report
+
+
+def test_partial_refresh_of_empty_page_keeps_stored_fields(scraper, store):
+    from bs4 import BeautifulSoup
+
+    scraper.get_page = lambda url, use_selenium=None, max_retries=3: BeautifulSoup('<html><body></body></html>',
+                                                                                  'html.parser')
+    stored = make_doc('x', contractEnd='2027-06-30', transferHistory=[{'season': '2023', 'toTeam': 'Arsenal'}],
+                      scoutingReport={'Goals': {'per90': 0.4, 'percentile': 80}})
+    store.insert_player(stored)
+    before = store.get_player('x')
+
+    # Hiçbir grup çıkarılamadı: boş değerler yazılmaz
+    fields = scraper.scrape_player_fields('x', list(PlayerScraper.FIELD_GROUPS), stored=stored)
+    assert fields == {}
+    store.update_player_fields('x', fields)
+    assert store.get_player('x') == before
+
+
+def test_partial_refresh_drops_failed_group(scraper, store, monkeypatch):
+    def broken(soup, player):
+        raise ValueError("bozuk tablo")
+
+    monkeypatch.setattr(scraper, 'extract_season_stats', broken)
+    fbref_id = scraper.player_url.rstrip('/').rsplit('/', 1)[-1]
+    stored = make_doc(fbref_id, fullName='Kayıtlı İsim')
+    store.insert_player(stored)
+
+    fields = scraper.scrape_player_fields(fbref_id, ['bio', 'season_stats'], stored=stored)
+    assert 'seasonStats' not in fields and fields['fullName'] != 'Kayıtlı İsim'
+    store.update_player_fields(fbref_id, fields)
+    assert store.get_player(fbref_id)['seasonStats'] == stored['seasonStats']
@@ -0,0 +1,106 @@
+# tests/test_scheduler.py
+from datetime import datetime, timedelta
+
+import pytest
+
+from analytics.percentiles import PercentileEngine
+from config.settings import Settings
+from monitoring.memory import MemoryLimitExceeded
+from scrapers.scheduler import RefreshScheduler
+from tests.conftest import make_doc
+
+
+def players(count):
+    now = datetime(2024, 1, 1)
+    return [{'fbrefId': f"p{index}", 'updatedAt': now - timedelta(days=index)} for index in range(count)]
+
+
+def test_remaining_kept_when_run_is_interrupted():
+    scheduler = RefreshScheduler(time_budget=0, request_budget=0, delay=0, now=datetime(2024, 1, 2))
+    scheduler.add_players(players(5))
+    refreshed = []
+
+    def refresh(player):
+        refreshed.append(player['fbrefId'])
+        if len(refreshed) == 2:
+            raise MemoryLimitExceeded("sınır")
+        return True
+
+    with pytest.raises(MemoryLimitExceeded):
+        scheduler.run(refresh)
+    remaining = scheduler.remaining()
+    assert len(remaining) == 3
+    assert not set(remaining) & set(refreshed)
+
+
+NOW = datetime(2024, 6, 1)
+
+
+def player(fbref_id='p', days_old=1, **fields):
+    """Öncelik testleri için oyuncu (varsayılan: taze, Premier League, 900 dakika)"""
+    return dict({'fbrefId': fbref_id, 'league': 'Premier League', 'updatedAt': NOW - timedelta(days=days_old),
+                 'seasonStats': {'minutesPlayed': 900}}, **fields)
+
+
+@pytest.fixture
+def scheduler(monkeypatch):
+    monkeypatch.setattr(Settings, 'REFRESH_STALE_DAYS', 14)
+    monkeypatch.setattr(Settings, 'REFRESH_CONTRACT_DAYS', 180)
+    return RefreshScheduler(time_budget=0, request_budget=0, delay=0, now=NOW)
+
+
+def test_stale_player_ranks_above_fresh(scheduler):
+    assert scheduler.calculate_priority(player(days_old=30)) > scheduler.calculate_priority(player(days_old=1))
+    # Tarihi bilinmeyen oyuncu en eski kabul edilir
+    assert scheduler.calculate_priority(player(updatedAt=None)) >= scheduler.calculate_priority(player(days_old=60))
+
+
+def test_backlog_player_ranks_above_equal_player(scheduler):
+    assert scheduler.calculate_priority(player(), in_backlog=True) > scheduler.calculate_priority(player())
+
+
+def test_expiring_contract_gets_boost(scheduler):
+    expiring = player(contractEnd=(NOW + timedelta(days=60)).strftime('%Y-%m-%d'))
+    long_term = player(contractEnd='2029-06-30')
+    expired = player(contractEnd=(NOW - timedelta(days=10)).strftime('%Y-%m-%d'))
+    assert scheduler.calculate_priority(expiring) > scheduler.calculate_priority(long_term)
+    assert scheduler.calculate_priority(long_term) == scheduler.calculate_priority(expired) == \
+        scheduler.calculate_priority(player())
+
+
+def test_minutes_and_league_tier_raise_priority(scheduler):
+    regular = player(seasonStats={'minutesPlayed': 2700})
+    assert scheduler.calculate_priority(regular) > scheduler.calculate_priority(player())
+    # Lig tablosu dakikası varsa o kullanılır
+    assert scheduler.calculate_priority(player(leagueStats={'minutes': 2700})) == scheduler.calculate_priority(regular)
+    assert scheduler.calculate_priority(player()) > scheduler.calculate_priority(player(league='Championship'))
+    assert scheduler.calculate_priority(player(league='Championship')) > \
+        scheduler.calculate_priority(player(league='Bilinmeyen Lig'))
+
+
+def test_queue_follows_priority(scheduler):
+    scheduler.add_players([player('fresh'), player('stale', days_old=30), player('backlog')], backlog_ids=['backlog'])
+    refreshed = []
+    scheduler.run(lambda item: refreshed.append(item['fbrefId']) or True)
+    assert refreshed == ['stale', 'backlog', 'fresh']
+
+
+def test_percentiles_do_not_change_refresh_priority(store):
+    docs = [make_doc(f"p{index}", updated_at=datetime(2024, 1, 1) - timedelta(days=index * 10),
+                     seasonStats={'goals': index, 'assists': 1, 'minutesPlayed': 900 + index * 100})
+            for index in range(5)]
+    store.bulk_upsert_players(docs)
+    scheduler = RefreshScheduler(time_budget=0, request_budget=0, delay=0, now=datetime(2024, 2, 1))
+
+    def priorities():
+        return {player['fbrefId']: scheduler.calculate_priority(player) for player in store.get_all_players()}
+
+    before = priorities()
+    # FBRefScraper.compute_percentiles adımı
+    engine = PercentileEngine(min_minutes=0, min_peers=1)
+    players = store.get_all_players(fields=['fbrefId', 'league', 'detailedPosition', 'seasonStats'])
+    assert store.bulk_update_fields(engine.updates(players, field='scoutingReport')) == len(docs)
+
+    assert priorities() == before
+    assert all(player['updatedAt'] == doc['updatedAt'] for player, doc in
+               zip(sorted(store.get_all_players(), key=lambda player: player['fbrefId']), docs))
@@ -0,0 +1,73 @@
+# tests/test_stat_codec.py
+from models.stat_codec import PACKED_FIELD, StatCodec
+
+SEASON = {'goals': 5, 'assists': 0, 'xg': 4.2, 'cards': None}
+SCOUTING = {
+    'Goals': {'per90': 0.5, 'percentile': 88},
+    'Assists': {'per90': 0.1},
+    'Tackles': {'percentile': None},
+    'Note': 'yorum',
+    'Odd': {'per90': 1.0, 'extra': True},
+}
+
+
+def test_season_round_trip_keeps_none_values():
+    codec = StatCodec()
+    packed = codec.pack_season(SEASON)
+    assert codec.unpack_season(packed) == SEASON
+    assert 'goals' not in str(packed)
+
+
+def test_scouting_round_trip_keeps_raw_entries():
+    codec = StatCodec()
+    packed = codec.pack_scouting(SCOUTING)
+    assert set(packed['raw']) == {'Note', 'Odd'}
+    assert codec.unpack_scouting(packed) == SCOUTING
+
+
+def test_non_dict_values_are_kept_raw():
+    codec = StatCodec()
+    assert codec.unpack_season(codec.pack_season(['x'])) == ['x']
+    assert codec.unpack_scouting(codec.pack_scouting(None)) is None
+
+
+def test_document_round_trip():
+    codec = StatCodec()
+    doc = {'fbrefId': 'a', 'seasonStats': dict(SEASON), 'scoutingReport': dict(SCOUTING)}
+    packed = codec.pack_document(doc)
+    assert 'seasonStats' not in packed and PACKED_FIELD in packed
+    assert codec.decode(packed) == doc
+
+
+def test_schema_grows_and_old_versions_still_decode(mongo_collection):
+    codec = StatCodec(mongo_collection)
+    old = codec.pack_season({'goals': 1})
+    new = codec.pack_season({'goals': 2, 'shots': 7})
+    assert new['v'] > old['v']
+
+    # Şemalar koleksiyonda: yeni bir process iki sürümü de çözer
+    other = StatCodec(mongo_collection)
+    assert other.unpack_season(old) == {'goals': 1}
+    assert other.unpack_season(new) == {'goals': 2, 'shots': 7}
+
+
+def test_build_update_switches_format():
+    codec = StatCodec()
+    packed = codec.build_update({'seasonStats': SEASON, 'team': 'Arsenal'}, pack=True)
+    assert packed['$set']['team'] == 'Arsenal'
+    assert f'{PACKED_FIELD}.season' in packed['$set'] and packed['$unset'] == {'seasonStats': ''}
+
+    plain = codec.build_update({'seasonStats': SEASON}, pack=False)
+    assert plain == {'$set': {'seasonStats': SEASON}, '$unset': {f'{PACKED_FIELD}.season': ''}}
+
+
+def test_database_round_trip_with_schema_encoding(mongo_db, monkeypatch):
+    from config.settings import Settings
+
+    monkeypatch.setattr(Settings, 'STATS_ENCODING', 'schema')
+    mongo_db.insert_player({'fbrefId': 'a', 'seasonStats': dict(SEASON), 'scoutingReport': dict(SCOUTING)})
+    raw = mongo_db.collection.find_one({'fbrefId': 'a'})
+    assert 'seasonStats' not in raw and PACKED_FIELD in raw
+
+    player = mongo_db.get_player('a')
+    assert player['seasonStats'] == SEASON and player['scoutingReport'] == SCOUTING
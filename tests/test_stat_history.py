@@ -0,0 +1,79 @@
+# tests/test_stat_history.py
+from datetime import datetime, timedelta
+
+import pytest
+
+from models.stat_history import StatHistory, replay, season_for, stat_delta
+
+START = datetime(2024, 9, 1)
+
+
+@pytest.fixture
+def history(mongo_collection):
+    history = StatHistory(mongo_collection, max_deltas=2)
+    history.ensure_indexes()
+    return history
+
+
+def snapshots(count):
+    """Her gün bir maç: (zaman, stat'lar)"""
+    return [(START + timedelta(days=day), {'games': day + 1, 'goals': day // 2}) for day in range(count)]
+
+
+def test_season_for_uses_start_month():
+    assert season_for(datetime(2025, 7, 1), start_month=7) == '2025-2026'
+    assert season_for(datetime(2026, 6, 30), start_month=7) == '2025-2026'
+
+
+def test_stat_delta():
+    assert stat_delta({'a': 1, 'b': 2}, {'a': 1, 'b': 3, 'c': 0}) == ({'b': 3, 'c': 0}, [])
+    assert stat_delta({'a': 1, 'b': 2}, {'a': 1}) == ({}, ['b'])
+
+
+def test_unchanged_stats_are_not_written(history):
+    assert history.record('p', {'games': 1}, at=START)
+    assert not history.record('p', {'games': 1}, at=START + timedelta(days=1))
+    assert history.collection.find_one({'fbrefId': 'p'})['deltaCount'] == 0
+
+
+def test_bucket_rolls_over_after_max_deltas(history):
+    for at, stats in snapshots(7):
+        assert history.record('p', stats, at=at)
+
+    buckets = list(history.collection.find({'fbrefId': 'p'}, sort=[('seq', 1)]))
+    assert [bucket['seq'] for bucket in buckets] == [0, 1, 2]
+    assert [bucket['deltaCount'] for bucket in buckets] == [2, 2, 0]
+    # Yeni kova önceki kovanın son halinden sonraki anlık görüntüyle başlar
+    assert buckets[1]['base'] == {'games': 4, 'goals': 1}
+    assert list(replay(buckets[0]))[-1] == (START + timedelta(days=2), {'games': 3, 'goals': 1})
+
+
+def test_stats_at_reads_across_buckets(history):
+    records = snapshots(7)
+    for at, stats in records:
+        history.record('p', stats, at=at)
+
+    assert history.stats_at('p', START - timedelta(days=1)) is None
+    for at, stats in records:
+        assert history.stats_at('p', at) == stats
+        assert history.stats_at('p', at + timedelta(hours=12)) == stats
+
+
+def test_history_and_series(history):
+    records = snapshots(7)
+    for at, stats in records:
+        history.record('p', stats, at=at)
+
+    assert history.history('p') == records
+    # Aralığın başında geçerli olan hal kendi kayıt zamanıyla gelir
+    middle = history.history('p', start=START + timedelta(days=3, hours=1), end=START + timedelta(days=5))
+    assert middle == records[3:6]
+    assert history.series('p', 'goals') == [(records[0][0], 0), (records[2][0], 1), (records[4][0], 2),
+                                             (records[6][0], 3)]
+
+
+def test_seasons_get_separate_buckets(history):
+    history.record('p', {'games': 30}, at=datetime(2024, 5, 1))
+    history.record('p', {'games': 1}, at=datetime(2024, 8, 20))
+    seasons = sorted(bucket['season'] for bucket in history.collection.find({'fbrefId': 'p'}))
+    assert seasons == ['2023-2024', '2024-2025']
@@ -0,0 +1,69 @@
+# tests/test_stat_matrix.py
+from datetime import datetime
+
+from analytics.stat_matrix import StatMatrix, StatMatrixWriter
+from tests.conftest import make_doc
+
+FIELDS = ['fbrefId', 'seasonStats', 'updatedAt', 'modifiedAt']
+
+
+def test_full_refresh_writes_all_players(store, tmp_path):
+    store.bulk_upsert_players([make_doc('a'), make_doc('b', seasonStats={'goals': 3})])
+    writer = StatMatrixWriter(str(tmp_path / 'matrix'))
+    assert writer.refresh(store.iter_players(fields=FIELDS)) == (0, 2)
+
+    matrix = StatMatrix(writer.path)
+    assert len(matrix) == 2
+    assert matrix.get('b', 'goals') == 3.0
+    assert writer.watermark > datetime(2024, 1, 1)  # modifiedAt: yazım zamanı
+
+
+def test_incremental_refresh_sees_partial_update(store, tmp_path):
+    store.insert_player(make_doc('a'))
+    store.insert_player(make_doc('b'))
+    writer = StatMatrixWriter(str(tmp_path / 'matrix'))
+    writer.refresh(store.iter_players(fields=FIELDS))
+
+    # Kısmi yazım modifiedAt'i ilerletir, artımlı okuma oyuncuyu bulur
+    assert store.update_player_fields('a', {'seasonStats': {'goals': 7, 'assists': 2}})
+    changed = list(store.iter_players(updated_since=writer.watermark, fields=FIELDS, inclusive=False))
+    assert [doc['fbrefId'] for doc in changed] == ['a']
+    writer.refresh(changed)
+
+    assert StatMatrix(writer.path).get('a', 'goals') == 7.0
+    assert StatMatrix(writer.path).get('b', 'goals') == 1.0
+
+
+def test_unchanged_partial_update_keeps_watermark(store):
+    store.insert_player(make_doc('a'))
+    modified_at = store.get_player('a')['modifiedAt']
+    store.update_player_fields('a', {'seasonStats': make_doc('a')['seasonStats']})
+    assert store.get_player('a')['modifiedAt'] == modified_at
+
+
+def test_bulk_update_advances_modified_at_only(store):
+    before = datetime(2024, 1, 1)
+    store.insert_player(make_doc('a', modifiedAt=before))
+    store.insert_player(make_doc('b', modifiedAt=before))
+    assert store.bulk_update_fields({'a': {'computedScoutingReport': {'rank': 1}}}) == 1
+    assert store.get_player('a')['modifiedAt'] > before
+    assert store.get_player('b')['modifiedAt'] == before
+    # updatedAt sadece kazıma zamanıdır, kısmi yazımda değişmez
+    assert store.get_player('a')['updatedAt'] == datetime(2024, 1, 1)
+
+
+def test_recomputed_meta_is_not_a_change(store):
+    store.insert_player(make_doc('a'))
+    report = {'goals': {'per90': 0.1, 'percentile': 50.0}}
+
+    def update(peers, computed_at):
+        return store.bulk_update_fields({'a': {'report': report,
+                                               'reportMeta': {'peers': peers, 'computedAt': computed_at}}})
+
+    assert update(3, datetime(2024, 2, 1)) == 1
+    modified_at = store.get_player('a')['modifiedAt']
+
+    # Sadece computedAt değişti: doküman yazılmaz
+    assert update(3, datetime(2024, 3, 1)) == 0
+    assert store.get_player('a')['modifiedAt'] == modified_at
+    assert update(4, datetime(2024, 3, 1)) == 1
@@ -0,0 +1,103 @@
+# tests/test_storage.py
+"""SQLite ve MongoDB (mongomock) oyuncu depolarının aynı davrandığı kontrol edilir"""
+from datetime import datetime
+
+from tests.conftest import make_doc
+
+
+# MongoDB'nin index'li sorgular için yazdığı türetilmiş alanlar (models/indexes.py) ve
+# yazım zamanı (modifiedAt) karşılaştırılmaz
+SKIPPED = {'_id', 'positionGroup', 'contractExpiresAt', 'modifiedAt'}
+
+
+def without_id(doc):
+    return {key: value for key, value in doc.items() if key not in SKIPPED} if doc else doc
+
+
+def test_update_player_fields_parity(mongo_db, sqlite_db):
+    results = {}
+    for db in (mongo_db, sqlite_db):
+        db.insert_player(make_doc('a'))
+        results[db.backend] = [
+            db.update_player_fields('missing', {'team': 'Chelsea'}),
+            db.update_player_fields('a', {'team': 'Chelsea'}),
+            db.update_player_fields('a', {'team': 'Chelsea'}),  # değişiklik yok, oyuncu var
+        ]
+        assert db.get_player('missing') is None
+    assert results['mongo'] == results['sqlite'] == [False, True, True]
+
+
+def seed(db):
+    # modifiedAt açıkça verilir ki artımlı okuma sonuçları sabit olsun
+    db.bulk_upsert_players([
+        make_doc('a', modifiedAt=datetime(2024, 1, 1)),
+        make_doc('b', updated_at=datetime(2024, 2, 1), modifiedAt=datetime(2024, 2, 1), team='Barcelona',
+                 league='La Liga', age=19),
+        make_doc('c', updated_at=datetime(2024, 3, 1), modifiedAt=datetime(2024, 3, 1), team='Chelsea',
+                 detailedPosition='FW (CF)'),
+    ], batch_size=2)
+
+
+def both(mongo_db, sqlite_db, read):
+    """Aynı işlemin iki backend'deki sonucu"""
+    for db in (mongo_db, sqlite_db):
+        seed(db)
+    return read(mongo_db), read(sqlite_db)
+
+
+def test_upsert_and_get_player_parity(mongo_db, sqlite_db):
+    mongo, sqlite = both(mongo_db, sqlite_db, lambda db: without_id(db.get_player('b')))
+    assert mongo == sqlite
+    assert sqlite['seasonStats'] == make_doc('b')['seasonStats'] and sqlite['updatedAt'] == datetime(2024, 2, 1)
+
+
+def test_upsert_keeps_missing_fields(mongo_db, sqlite_db):
+    def read(db):
+        db.insert_player({'fbrefId': 'a', 'team': 'Liverpool', 'updatedAt': datetime(2024, 4, 1)})
+        return without_id(db.get_player('a'))
+
+    mongo, sqlite = both(mongo_db, sqlite_db, read)
+    assert mongo == sqlite
+    assert sqlite['team'] == 'Liverpool' and sqlite['fullName'] == make_doc('a')['fullName']
+
+
+def test_queries_parity(mongo_db, sqlite_db):
+    def read(db):
+        return {
+            'league': sorted(player['fbrefId'] for player in db.get_all_players('Premier League')),
+            'leagues': sorted(player['fbrefId'] for player in db.get_all_players(['La Liga', 'Premier League'])),
+            'fields': sorted(map(without_id, db.get_all_players('La Liga', fields=['fbrefId', 'age'])),
+                             key=lambda player: player['fbrefId']),
+            'since': sorted(player['fbrefId'] for player in db.iter_players(updated_since=datetime(2024, 2, 1))),
+            'after': sorted(player['fbrefId'] for player in
+                            db.iter_players(updated_since=datetime(2024, 2, 1), inclusive=False)),
+            'count': db.count_by('league'),
+            'count_league': db.count_by('team', league='Premier League'),
+            'teams': db.get_team_leagues(),
+        }
+
+    mongo, sqlite = both(mongo_db, sqlite_db, read)
+    assert mongo == sqlite
+    assert sqlite['league'] == ['a', 'c'] and sqlite['leagues'] == ['a', 'b', 'c']
+    assert sqlite['fields'] == [{'fbrefId': 'b', 'age': 19}]
+    assert sqlite['since'] == ['b', 'c'] and sqlite['after'] == ['c']
+    assert sqlite['count'] == {'Premier League': 2, 'La Liga': 1}
+    assert sqlite['teams'] == {'Arsenal': 'Premier League', 'Barcelona': 'La Liga', 'Chelsea': 'Premier League'}
+
+
+def test_bulk_update_fields_parity(mongo_db, sqlite_db):
+    def read(db):
+        updates = {'a': {'team': 'Arsenal'}, 'b': {'team': 'Girona'}, 'missing': {'team': 'x'}}
+        return db.bulk_update_fields(updates), db.get_player('b')['team'], db.get_player('missing')
+
+    assert both(mongo_db, sqlite_db, read) == ((1, 'Girona', None), (1, 'Girona', None))
+
+
+def test_refresh_backlog_parity(mongo_db, sqlite_db):
+    def read(db):
+        empty = db.get_refresh_backlog()
+        db.save_refresh_backlog(['c', 'a'])
+        db.save_refresh_backlog(['b'], name='other')
+        return empty, db.get_refresh_backlog(), db.get_refresh_backlog('other')
+
+    assert both(mongo_db, sqlite_db, read) == (([], ['c', 'a'], ['b']), ([], ['c', 'a'], ['b']))
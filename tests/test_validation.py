@@ -0,0 +1,80 @@
+# tests/test_validation.py
+"""Toplu lig doğrulaması (LeagueValidator) ve oyuncu başına doğrulama (PlayerModel.validate) aynı kuralları uygular"""
+from models.player import PlayerModel
+from models.validation import LeagueValidator
+
+
+def record(fbref_id, full_name='Oyuncu', team='Arsenal', league='Premier League', age=24):
+    return {'fbrefId': fbref_id, 'fullName': full_name, 'team': team, 'league': league, 'age': age}
+
+
+def test_rejects_missing_critical_fields_and_invalid_id():
+    validator = LeagueValidator('Premier League')
+    accepted, rejected = validator.validate([
+        record('aaaaaaaa'),
+        record('', full_name='İsimsiz ID'),
+        record('bbbbbbbb', full_name=''),
+        record('XYZ12345'),
+    ])
+    assert [item['fbrefId'] for item in accepted] == ['aaaaaaaa']
+    assert rejected == {
+        '<İsimsiz ID>': ['missing_fbrefId'],
+        'bbbbbbbb': ['missing_fullName'],
+        'XYZ12345': ['invalid_fbref_id'],
+    }
+    assert validator.finish()['rejected_reasons'] == {'invalid_fbref_id': 1, 'missing_fbrefId': 1,
+                                                       'missing_fullName': 1}
+
+
+def test_rejects_duplicates_within_and_across_batches():
+    validator = LeagueValidator('Premier League')
+    accepted, rejected = validator.validate([record('aaaaaaaa'), record('aaaaaaaa'), record('bbbbbbbb')])
+    assert [item['fbrefId'] for item in accepted] == ['aaaaaaaa', 'bbbbbbbb']
+    assert rejected == {'aaaaaaaa': ['duplicate_id']}
+
+    accepted, rejected = validator.validate([record('bbbbbbbb'), record('cccccccc')])
+    assert [item['fbrefId'] for item in accepted] == ['cccccccc']
+    assert rejected == {'bbbbbbbb': ['duplicate_id']}
+    assert (validator.total, validator.accepted) == (5, 3)
+
+
+def test_placeholder_team_is_warning_not_rejection():
+    validator = LeagueValidator('Premier League')
+    accepted, rejected = validator.validate([record('aaaaaaaa', team='Unknown Team'),
+                                             record('bbbbbbbb', league='La Liga', age=12)])
+    assert len(accepted) == 2 and rejected == {}
+    assert validator.warnings == {'missing_team': ['aaaaaaaa'], 'suspicious_age': ['bbbbbbbb'],
+                                  'other_league': ['bbbbbbbb']}
+
+
+def test_team_count_mismatch_with_league_table():
+    table = [{'fbref_id': 'aaaaaaaa', 'team': 'Arsenal'}, {'fbref_id': 'bbbbbbbb', 'team': 'Arsenal'},
+             {'fbref_id': 'cccccccc', 'team': 'Chelsea'}, {'fbref_id': 'dddddddd', 'team': 'Chelsea'}]
+    validator = LeagueValidator('Premier League', league_players=table)
+    validator.validate([record('aaaaaaaa'), record('bbbbbbbb', team='Chelsea'), record('cccccccc', team='Chelsea')])
+
+    # dddddddd doğrulanmadı: sayıma girmez
+    assert validator.team_count_mismatches() == {'Arsenal': (2, 1), 'Chelsea': (1, 2)}
+    assert validator.warnings == {'team_mismatch': ['bbbbbbbb']}
+
+
+def test_accepts_same_records_as_player_model():
+    records = [
+        record('aaaaaaaa'),
+        record('bbbbbbbb', team='', league=''),
+        record('cccccccc', age=60),
+        record('', full_name='İsimsiz ID'),
+        record('dddddddd', full_name=''),
+        record('eeeeeeee', full_name='   '),
+        record('XYZ12345'),
+        record('abc'),
+    ]
+
+    def player_model_accepts(item):
+        player = PlayerModel()
+        player.data.update(item)
+        return player.validate()[0]
+
+    accepted, _ = LeagueValidator().validate(records)
+    assert accepted == [item for item in records if player_model_accepts(item)]
+    assert len(accepted) == 3